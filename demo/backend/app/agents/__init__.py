@@ -4,7 +4,7 @@ from .coordinator import CoordinatorAgent
 from .analyst import AnalystAgent
 from .specialist_math import MathSpecialistAgent
 from .specialist_text import TextSpecialistAgent
-from .super_critic import SuperCriticAgent
+from .super_critic import SuperCriticAgent, parse_verdict, verdict_issues
 
 __all__ = [
     "BaseAgent",
@@ -13,4 +13,6 @@ __all__ = [
     "MathSpecialistAgent",
     "TextSpecialistAgent",
     "SuperCriticAgent",
+    "parse_verdict",
+    "verdict_issues",
 ]
@@ -1,7 +1,7 @@
 """Analyst agent - performs analysis and synthesis."""
 from typing import Optional
 from .base_agent import BaseAgent
-from ..models import Message, MessageType, AgentType
+from ..models import AgentMessage, MessageType, AgentType
 from ..core.config import settings
 from ..core.logger import get_logger
 
@@ -28,7 +28,7 @@ Your role is to:
 
 Be analytical, thorough, and precise in your responses."""
     
-    async def process_message(self, message: Message) -> Optional[str]:
+    async def process_message(self, message: AgentMessage) -> Optional[str]:
         """Process analysis request."""
         if message.type not in [MessageType.REQUEST, MessageType.QUERY]:
             return None
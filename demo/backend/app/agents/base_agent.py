@@ -1,10 +1,14 @@
 """Base agent class."""
+import asyncio
 import time
 import uuid
 from typing import Optional, Callable, Awaitable
-from ..models import Message, MessageType, AgentType, AgentMetrics, TokenUsage
-from ..services import llm_service
+from ..models import AgentMessage, MessageType, AgentType, AgentMetrics, MetricDelta, TokenUsage
+from ..services import llm_service, task_stats
+from ..core.config import settings, CascadeConfig
 from ..core.logger import get_logger
+from ..core.prompt_builder import compact, build_messages
+from ..core.tracing import tracer, SPAN_KIND_CLIENT
 
 logger = get_logger(__name__)
 
@@ -21,35 +25,78 @@ class BaseAgent:
         """Initialize agent."""
         self.agent_type = agent_type
         self.model = model
-        self.system_prompt = system_prompt or self._default_system_prompt()
+        self.system_prompt = compact(system_prompt or self._default_system_prompt())
+        # Built once so every call sends a byte-identical cacheable prefix
+        self._system_message = {"role": "system", "content": self.system_prompt}
         self.metrics = AgentMetrics(
             agent_id=agent_type,
             status="idle",
         )
-        self.message_callback: Optional[Callable[[Message], Awaitable[None]]] = None
-        self.metric_callback: Optional[Callable[[AgentMetrics], Awaitable[None]]] = None
+        # Changes since the last metric update, published as one delta
+        self._pending = MetricDelta(agent_id=agent_type.value)
+        self.message_callback: Optional[Callable[[AgentMessage], Awaitable[None]]] = None
+        self.metric_callback: Optional[Callable[[AgentMetrics, MetricDelta], Awaitable[None]]] = None
+        # Shared PromptMemo when running inside a batch (services.batch)
+        self.prompt_memo = None
+        # Monotonic time by which the task should finish (TaskRequest.latency_budget_ms)
+        self.deadline: Optional[float] = None
+        # Set per stage by the budget planner (services.sla)
+        self.max_tokens_cap: Optional[int] = None
+        self.hedge_model: Optional[str] = None
+        self.hedge_winners: list[str] = []
+    
+    def remaining_budget_ms(self) -> Optional[float]:
+        """Milliseconds left before the task deadline, or None without one."""
+        if self.deadline is None:
+            return None
+        return (self.deadline - time.monotonic()) * 1000
     
     def _default_system_prompt(self) -> str:
         """Default system prompt for this agent."""
         return "You are a helpful AI assistant."
     
-    def set_message_callback(self, callback: Callable[[Message], Awaitable[None]]):
+    def set_message_callback(self, callback: Callable[[AgentMessage], Awaitable[None]]):
         """Set callback for when messages are sent."""
         self.message_callback = callback
     
-    def set_metric_callback(self, callback: Callable[[AgentMetrics], Awaitable[None]]):
-        """Set callback for metric updates."""
+    def set_metric_callback(self, callback: Callable[[AgentMetrics, MetricDelta], Awaitable[None]]):
+        """Set callback for metric updates (current metrics plus what changed)."""
         self.metric_callback = callback
     
-    async def _emit_message(self, message: Message):
+    async def _emit_message(self, message: AgentMessage):
         """Emit a message through callback."""
         if self.message_callback:
             await self.message_callback(message)
     
+    def _change_metrics(
+        self,
+        status: Optional[str] = None,
+        tokens: Optional[TokenUsage] = None,
+        **counters: float,
+    ):
+        """Apply a change to metrics and add it to the pending delta."""
+        if status is not None and status != self.metrics.status:
+            self.metrics.status = status
+            self._pending.status = status
+        add = self._pending.add
+        for name, amount in counters.items():
+            if amount:
+                setattr(self.metrics, name, getattr(self.metrics, name) + amount)
+                add[name] = add.get(name, 0) + amount
+        if tokens:
+            for name, amount in tokens:
+                if amount:
+                    setattr(self.metrics.tokens, name, getattr(self.metrics.tokens, name) + amount)
+                    key = f"tokens.{name}"
+                    add[key] = add.get(key, 0) + amount
+    
     async def _emit_metric_update(self):
-        """Emit metric update through callback."""
+        """Publish pending metric changes (if any) through callback."""
+        if not self._pending:
+            return
+        delta, self._pending = self._pending, MetricDelta(agent_id=self.agent_type.value)
         if self.metric_callback:
-            await self.metric_callback(self.metrics)
+            await self.metric_callback(self.metrics, delta)
     
     async def send_message(
         self,
@@ -57,25 +104,28 @@ class BaseAgent:
         content: str,
         type: MessageType = MessageType.INFORM,
         parent_id: Optional[str] = None,
-    ) -> Message:
+    ) -> AgentMessage:
         """Send a message to another agent."""
-        message = Message(
+        trace_id, span_id = tracer.context()
+        message = AgentMessage(
             id=f"msg-{uuid.uuid4().hex[:12]}",
             from_agent=self.agent_type,
             to_agent=to,
-            content=content,
+            body=content,
             type=type,
             timestamp=int(time.time() * 1000),
             parent_message_id=parent_id,
+            trace_id=trace_id,
+            span_id=span_id,
         )
         
-        self.metrics.messages_sent += 1
+        self._change_metrics(messages_sent=1)
         await self._emit_message(message)
         await self._emit_metric_update()
         
         return message
     
-    async def process_message(self, message: Message) -> Optional[str]:
+    async def process_message(self, message: AgentMessage) -> Optional[str]:
         """
         Process an incoming message.
         Should be overridden by subclasses.
@@ -89,39 +139,198 @@ class BaseAgent:
         self,
         user_message: str,
         context: Optional[list[dict]] = None,
+        max_tokens: Optional[int] = None,
+        on_text: Optional[Callable[[str], None]] = None,
     ) -> tuple[str, TokenUsage, float, int]:
-        """Call LLM with tracking."""
-        self.metrics.status = "thinking"
+        """
+        Call LLM with tracking.
+        
+        ``on_text`` receives the response as it streams. Calls that cannot
+        stream (hedged, cascaded, coalesced in a batch) do not invoke it, so
+        callers should handle the returned text they have not seen yet.
+        """
+        if self.max_tokens_cap:
+            max_tokens = min(max_tokens or self.max_tokens_cap, self.max_tokens_cap)
+        self._change_metrics(status="thinking")
         await self._emit_metric_update()
         
         start_time = time.time()
         
-        messages = [{"role": "system", "content": self.system_prompt}]
-        if context:
-            messages.extend(context)
-        messages.append({"role": "user", "content": user_message})
+        messages = build_messages(self._system_message, user_message, context)
         
-        response, tokens, cost, llm_time = await llm_service.chat_completion(
-            messages=messages,
-            model=self.model,
-        )
+        with tracer.span("llm.call", kind=SPAN_KIND_CLIENT, agent=self.agent_type.value, model=self.model) as span:
+            try:
+                if self.prompt_memo:
+                    response, tokens, cost, llm_time = await self.prompt_memo.call(
+                        messages,
+                        self.model,
+                        max_tokens,
+                        lambda: self._complete(messages, max_tokens, on_text),
+                    )
+                else:
+                    response, tokens, cost, llm_time = await self._complete(messages, max_tokens, on_text)
+            except asyncio.CancelledError:
+                # Task abandoned (client gone): the request was aborted mid-flight
+                self._change_metrics(
+                    status="cancelled",
+                    cancelled_calls=1,
+                    processing_time=int((time.time() - start_time) * 1000),
+                )
+                raise
+            if span:
+                span.set(
+                    prompt_tokens=tokens.prompt,
+                    completion_tokens=tokens.completion,
+                    cached_tokens=tokens.cached_prompt,
+                    cost=cost,
+                )
         
         # Update metrics
-        self.metrics.llm_calls += 1
-        self.metrics.tokens.prompt += tokens.prompt
-        self.metrics.tokens.completion += tokens.completion
-        self.metrics.tokens.total += tokens.total
-        self.metrics.cost += cost
-        self.metrics.processing_time += int((time.time() - start_time) * 1000)
-        self.metrics.status = "done"
+        self._change_metrics(
+            status="done",
+            processing_time=int((time.time() - start_time) * 1000),
+        )
+        
+        await self._emit_metric_update()
         
+        return response, tokens, cost, llm_time
+    
+    async def _record_local_call(self, started: float):
+        """Record a subtask answered locally, without an LLM call."""
+        self._change_metrics(
+            status="done",
+            local_calls=1,
+            processing_time=int((time.time() - started) * 1000),
+        )
         await self._emit_metric_update()
+    
+    async def _complete(
+        self,
+        messages: list[dict],
+        max_tokens: Optional[int] = None,
+        on_text: Optional[Callable[[str], None]] = None,
+    ) -> tuple[str, TokenUsage, float, int]:
+        """Run one LLM request (hedged, through the cascade or streamed) and record usage."""
+        if self.hedge_model and self.hedge_model != self.model:
+            return await self._call_hedged(messages, max_tokens)
+        
+        cascade = self._cascade_config()
+        if cascade:
+            return await self._call_cascade(messages, cascade, max_tokens)
         
+        if on_text:
+            response, tokens, cost, llm_time = await llm_service.chat_completion_streamed(
+                messages=messages,
+                on_text=on_text,
+                model=self.model,
+                max_tokens=max_tokens,
+            )
+        else:
+            response, tokens, cost, llm_time = await llm_service.chat_completion(
+                messages=messages,
+                model=self.model,
+                max_tokens=max_tokens,
+            )
+        self._record_usage(tokens, cost, self.model, llm_time)
         return response, tokens, cost, llm_time
     
+    def _cascade_config(self) -> Optional[CascadeConfig]:
+        """Get active cascade config for this agent, if any."""
+        if not settings.cascade_enabled:
+            return None
+        cascade = settings.cascade.get(self.agent_type)
+        if not cascade or not cascade.enabled or cascade.cheap_model == self.model:
+            return None
+        return cascade
+    
+    async def _call_cascade(
+        self,
+        messages: list[dict],
+        cascade: CascadeConfig,
+        max_tokens: Optional[int] = None,
+    ) -> tuple[str, TokenUsage, float, int]:
+        """Answer with the cheap model, escalating to ``self.model`` on low confidence."""
+        response, tokens, cost, llm_time, confidence = await llm_service.chat_completion_scored(
+            messages=messages,
+            model=cascade.cheap_model,
+            max_tokens=max_tokens,
+        )
+        self._record_usage(tokens, cost, cascade.cheap_model, llm_time)
+        self._change_metrics(cascade_calls=1)
+        
+        if confidence >= cascade.threshold:
+            return response, tokens, cost, llm_time
+        
+        logger.info(
+            f"{self.agent_type} escalating to {self.model} "
+            f"(confidence {confidence:.2f} < {cascade.threshold})"
+        )
+        self._change_metrics(escalations=1)
+        
+        response, big_tokens, big_cost, big_time = await llm_service.chat_completion(
+            messages=messages,
+            model=self.model,
+            max_tokens=max_tokens,
+        )
+        self._record_usage(big_tokens, big_cost, self.model, big_time)
+        
+        combined = TokenUsage(
+            prompt=tokens.prompt + big_tokens.prompt,
+            completion=tokens.completion + big_tokens.completion,
+            total=tokens.total + big_tokens.total,
+            cached_prompt=tokens.cached_prompt + big_tokens.cached_prompt,
+            uncached_prompt=tokens.uncached_prompt + big_tokens.uncached_prompt,
+        )
+        return response, combined, cost + big_cost, llm_time + big_time
+    
+    async def _call_hedged(
+        self,
+        messages: list[dict],
+        max_tokens: Optional[int] = None,
+    ) -> tuple[str, TokenUsage, float, int]:
+        """Race ``self.model`` against ``hedge_model``; the first answer wins, the other is cancelled."""
+        calls = {
+            asyncio.create_task(llm_service.chat_completion(
+                messages=messages,
+                model=model,
+                max_tokens=max_tokens,
+            )): model
+            for model in (self.model, self.hedge_model)
+        }
+        pending = set(calls)
+        winner = error = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for call in done:
+                    if call.exception():
+                        error = call.exception()
+                        continue
+                    # A call finishing alongside the winner was still paid for
+                    response, tokens, cost, llm_time = call.result()
+                    self._record_usage(tokens, cost, calls[call], llm_time)
+                    if winner is None:
+                        winner = (response, tokens, cost, llm_time)
+                        self.hedge_winners.append(calls[call])
+        finally:
+            for call in pending:
+                call.cancel()
+                if winner is not None:
+                    self._change_metrics(cancelled_calls=1)
+        if winner is None:
+            raise error
+        return winner
+    
+    def _record_usage(self, tokens: TokenUsage, cost: float, model: str, llm_time: int):
+        """Add one LLM call's usage to agent metrics and the stats rollups."""
+        self._change_metrics(tokens=tokens, llm_calls=1, cost=cost)
+        if settings.stats_enabled:
+            task_stats.record_call(self.agent_type.value, model, tokens, cost, llm_time)
+    
     def reset_metrics(self):
         """Reset agent metrics."""
         self.metrics = AgentMetrics(
             agent_id=self.agent_type,
             status="idle",
         )
+        self._pending = MetricDelta(agent_id=self.agent_type.value)
@@ -1,12 +1,52 @@
 """Coordinator agent - orchestrates the multi-agent system."""
-from typing import Optional
+from typing import Any, Callable, Optional
 from .base_agent import BaseAgent
-from ..models import Message, MessageType, AgentType
+from ..models import AgentMessage, MessageType, AgentType
 from ..core.config import settings
+from ..core.json_stream import JsonFieldParser
 from ..core.logger import get_logger
+from ..core.prompt_builder import PromptTemplate
+from ..core.token_budget import TokenBudget, PromptSection, count_tokens
 
 logger = get_logger(__name__)
 
+# Static instructions first, variable content last (prefix-cache friendly)
+ANALYSIS_TEMPLATE = PromptTemplate("""
+    Analyze the task below and determine which agents are needed.
+
+    Respond with a JSON object containing:
+    {{
+      "needs_analyst": true/false,
+      "needs_math": true/false,
+      "needs_text": true/false,
+      "delegation_plan": "Brief explanation of how to divide the work"
+    }}
+
+    Task: {task}
+""")
+
+SYNTHESIS_TEMPLATE = PromptTemplate("""
+    Synthesize the specialist responses below into a comprehensive, well-structured final answer that directly addresses the original task. Be thorough but concise.
+
+    Original task: {task}
+
+    Specialist responses:
+    {responses}
+""")
+
+# Same prefix as SYNTHESIS_TEMPLATE, plus the Super-Critic's issues to fix
+REVISED_SYNTHESIS_TEMPLATE = PromptTemplate("""
+    Synthesize the specialist responses below into a comprehensive, well-structured final answer that directly addresses the original task. Be thorough but concise.
+
+    Original task: {task}
+
+    Specialist responses:
+    {responses}
+
+    A reviewer flagged these issues in the specialist responses. Correct them in the final answer instead of repeating them:
+    {issues}
+""")
+
 
 class CoordinatorAgent(BaseAgent):
     """Coordinator agent that orchestrates task delegation."""
@@ -33,8 +73,19 @@ Available specialist agents:
 
 Be concise in your delegation. State clearly what each agent should do."""
     
-    async def process_message(self, message: Message) -> Optional[str]:
-        """Process task and coordinate agents."""
+    async def process_message(
+        self,
+        message: AgentMessage,
+        on_field: Optional[Callable[[str, Any], None]] = None,
+    ) -> Optional[str]:
+        """
+        Process task and coordinate agents.
+        
+        Args:
+            message: Task request
+            on_field: Called with (name, value) for each field of the JSON
+                analysis as soon as it is complete, while the rest streams
+        """
         if message.type != MessageType.REQUEST:
             return None
         
@@ -42,19 +93,20 @@ Be concise in your delegation. State clearly what each agent should do."""
         logger.info(f"Coordinator received task: {task[:100]}...")
         
         # Analyze task and create delegation plan
-        analysis_prompt = f"""Analyze this task and determine which agents are needed:
-
-Task: {task}
-
-Respond with a JSON object containing:
-{{
-  "needs_analyst": true/false,
-  "needs_math": true/false,
-  "needs_text": true/false,
-  "delegation_plan": "Brief explanation of how to divide the work"
-}}"""
+        analysis_prompt = ANALYSIS_TEMPLATE.render(task=task)
         
-        response, _, _, _ = await self._call_llm(analysis_prompt)
+        if on_field:
+            parser = JsonFieldParser()
+            
+            def on_text(chunk: str):
+                for name, value in parser.feed(chunk):
+                    on_field(name, value)
+            
+            response, _, _, _ = await self._call_llm(analysis_prompt, on_text=on_text)
+            # Calls that could not stream return the text in one piece
+            on_text(response[parser.consumed:])
+        else:
+            response, _, _, _ = await self._call_llm(analysis_prompt)
         
         # Send delegation message
         await self.send_message(
@@ -70,21 +122,32 @@ Respond with a JSON object containing:
         self,
         original_task: str,
         specialist_responses: dict[str, str],
+        issues: str = "",
     ) -> str:
-        """Synthesize specialist responses into final answer."""
-        logger.info("Coordinator synthesizing final answer")
+        """Synthesize specialist responses into final answer, fixing critic ``issues`` if given."""
+        logger.info("Coordinator synthesizing final answer" + (" (revising)" if issues else ""))
+        template = REVISED_SYNTHESIS_TEMPLATE if issues else SYNTHESIS_TEMPLATE
         
-        responses_text = "\n\n".join([
-            f"{agent}: {response}"
-            for agent, response in specialist_responses.items()
-        ])
+        # Keep the task intact; shrink specialist responses evenly if over budget
+        budget = TokenBudget(
+            model=self.model,
+            reserve=count_tokens(self.system_prompt + template.template + issues, self.model),
+        )
+        fitted = budget.fit(
+            [PromptSection("task", original_task, priority=1)]
+            + [
+                PromptSection(agent, f"{agent}: {response}", min_tokens=50)
+                for agent, response in specialist_responses.items()
+            ]
+        )
+        responses_text = "\n\n".join(fitted[agent] for agent in specialist_responses)
         
-        synthesis_prompt = f"""Original task: {original_task}
-
-Specialist responses:
-{responses_text}
-
-Synthesize these responses into a comprehensive, well-structured final answer that directly addresses the original task. Be thorough but concise."""
+        fields = {"issues": issues} if issues else {}
+        synthesis_prompt = template.render(
+            task=fitted["task"],
+            responses=responses_text,
+            **fields,
+        )
         
         final_answer, _, _, _ = await self._call_llm(synthesis_prompt)
         
@@ -1,12 +1,26 @@
 """Math Specialist agent - handles calculations and statistical analysis."""
+import time
 from typing import Optional
 from .base_agent import BaseAgent
-from ..models import Message, MessageType, AgentType
+from ..models import AgentMessage, MessageType, AgentType
 from ..core.config import settings
 from ..core.logger import get_logger
+from ..core.prompt_builder import PromptTemplate
+from ..core.tracing import tracer
 
 logger = get_logger(__name__)
 
+# Locally computed figures are handed to the LLM for narration only
+NARRATION_TEMPLATE = PromptTemplate("""
+    The figures below were computed exactly. Use them as given; do not recompute them.
+    Address the parts of the request they do not cover.
+
+    Computed results:
+    {results}
+
+    Request: {request}
+""")
+
 
 class MathSpecialistAgent(BaseAgent):
     """Math specialist for calculations and statistical analysis."""
@@ -26,14 +40,32 @@ class MathSpecialistAgent(BaseAgent):
 
 Provide precise, accurate mathematical results. Show your work when appropriate."""
     
-    async def process_message(self, message: Message) -> Optional[str]:
+    async def process_message(self, message: AgentMessage) -> Optional[str]:
         """Process math-related requests."""
         if message.type not in [MessageType.REQUEST, MessageType.QUERY]:
             return None
         
         logger.info(f"Math Specialist processing: {message.content[:100]}...")
         
-        response, _, _, _ = await self._call_llm(message.content)
+        started = time.time()
+        result = None
+        if settings.local_math_enabled:
+            from ..core.math_engine import solve  # Loads NumPy on first use, not at startup
+            with tracer.span("math.local") as span:
+                result = solve(message.content)
+                if span:
+                    span.set(computed=bool(result), complete=bool(result and result.complete))
+        
+        if result and result.complete:
+            # Pure computation: no LLM call at all
+            response = f"Computed exactly:\n{result.to_text()}"
+            await self._record_local_call(started)
+        elif result:
+            response, _, _, _ = await self._call_llm(
+                NARRATION_TEMPLATE.render(results=result.to_text(), request=message.content)
+            )
+        else:
+            response, _, _, _ = await self._call_llm(message.content)
         
         # Send response back
         await self.send_message(
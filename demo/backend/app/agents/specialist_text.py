@@ -1,16 +1,24 @@
 """Text Specialist agent - handles text processing and writing."""
+import time
 from typing import Optional
 from .base_agent import BaseAgent
-from ..models import Message, MessageType, AgentType
+from ..models import AgentMessage, MessageType, AgentType
 from ..core.config import settings
 from ..core.logger import get_logger
+from ..core.tracing import tracer
 
 logger = get_logger(__name__)
 
+# Smoothing factor for the running LLM latency estimate
+LATENCY_ALPHA = 0.3
+
 
 class TextSpecialistAgent(BaseAgent):
     """Text specialist for text processing and writing tasks."""
     
+    # Expected LLM latency (ms), shared across instances: orchestrators are per task
+    expected_llm_ms: float = 3000.0
+    
     def __init__(self):
         super().__init__(
             agent_type=AgentType.SPECIALIST_TEXT,
@@ -26,14 +34,28 @@ class TextSpecialistAgent(BaseAgent):
 
 Provide clear, well-written responses with proper structure and formatting."""
     
-    async def process_message(self, message: Message) -> Optional[str]:
+    async def process_message(self, message: AgentMessage) -> Optional[str]:
         """Process text-related requests."""
         if message.type not in [MessageType.REQUEST, MessageType.QUERY]:
             return None
         
         logger.info(f"Text Specialist processing: {message.content[:100]}...")
         
-        response, _, _, _ = await self._call_llm(message.content)
+        started = time.time()
+        route = self._local_route(message.content)
+        if route:
+            from ..core.text_engine import analyze
+            with tracer.span("text.local", route=route) as span:
+                analysis = analyze(message.content)
+                if span:
+                    span.set(documents=len(analysis.documents), intents=",".join(sorted(analysis.intents)))
+            response = f"Analyzed locally:\n{analysis.to_text()}"
+            await self._record_local_call(started)
+        else:
+            response, _, _, llm_time = await self._call_llm(message.content)
+            if llm_time:  # Cache hits report 0 and say nothing about the model
+                cls = type(self)
+                cls.expected_llm_ms += LATENCY_ALPHA * (llm_time - cls.expected_llm_ms)
         
         # Send response back
         await self.send_message(
@@ -44,3 +66,36 @@ Provide clear, well-written responses with proper structure and formatting."""
         )
         
         return response
+    
+    def _local_route(self, content: str) -> Optional[str]:
+        """
+        Decide whether the local text engine should answer.
+        
+        Only analytic requests (sentiment, summary, keywords, ratings) over
+        text the request supplies (list items, quoted passages or text after a
+        colon) qualify; writing tasks and questions about the world ("Summarize
+        the plot of Hamlet") always go to the LLM. In ``auto`` mode the engine
+        answers short inputs, and longer ones only when the remaining latency
+        budget is below the expected LLM latency.
+        
+        Returns:
+            Reason for answering locally ("always", "simple" or "budget"), or None
+        """
+        mode = settings.local_text_mode
+        if mode == "off":
+            return None
+        # The engine (and NumPy) loads on the first request that could use it
+        from ..core.text_engine import detect_intents, is_generative, is_knowledge_question, split_payload, tokenize
+        if not detect_intents(content):
+            return None
+        instruction, documents = split_payload(content)
+        if not documents or is_generative(instruction) or is_knowledge_question(instruction):
+            return None
+        if mode == "always":
+            return "always"
+        if len(tokenize(content)) <= settings.local_text_max_words:
+            return "simple"
+        remaining = self.remaining_budget_ms()
+        if remaining is not None and remaining < self.expected_llm_ms:
+            return "budget"
+        return None
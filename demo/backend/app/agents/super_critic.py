@@ -1,12 +1,20 @@
 """Super-Critic agent - validates and critiques responses."""
 from typing import Optional
 from .base_agent import BaseAgent
-from ..models import Message, MessageType, AgentType
+from ..models import AgentMessage, MessageType, AgentType
 from ..core.config import settings
 from ..core.logger import get_logger
+from ..core.prompt_builder import PromptTemplate
 
 logger = get_logger(__name__)
 
+VERDICT_TEMPLATE = PromptTemplate("""
+    Reply with exactly one line: APPROVED, or REVISE: <the specific issues to fix>.
+    Do not repeat or rewrite the content under review.
+
+    {content}
+""")
+
 
 class SuperCriticAgent(BaseAgent):
     """Super-Critic agent for quality assurance."""
@@ -28,14 +36,18 @@ Your role is to:
 
 Be thorough and constructive in your critique."""
     
-    async def process_message(self, message: Message) -> Optional[str]:
+    async def process_message(self, message: AgentMessage) -> Optional[str]:
         """Process critique request."""
         if message.type not in [MessageType.REQUEST, MessageType.QUERY]:
             return None
         
         logger.info(f"Super-Critic reviewing: {message.content[:100]}...")
         
-        response, _, _, _ = await self._call_llm(message.content)
+        # Compact verdict: the reviewed content is never echoed back
+        response, _, _, _ = await self._call_llm(
+            VERDICT_TEMPLATE.render(content=message.content),
+            max_tokens=settings.critic_verdict_max_tokens,
+        )
         
         # Send response back
         await self.send_message(
@@ -46,3 +58,25 @@ Be thorough and constructive in your critique."""
         )
         
         return response
+
+
+def parse_verdict(critique: Optional[str]) -> Optional[bool]:
+    """Parse an APPROVED/REVISE verdict from critic output."""
+    if not critique:
+        return None
+    head = critique.lstrip()[:20].upper()
+    if head.startswith("APPROVED"):
+        return True
+    if head.startswith("REVISE"):
+        return False
+    return None
+
+
+def verdict_issues(critique: Optional[str]) -> str:
+    """Issues listed after ``REVISE:`` in critic output ("" if none)."""
+    if not critique:
+        return ""
+    text = critique.strip()
+    if text[:6].upper() == "REVISE":
+        text = text[6:].lstrip(" :-")
+    return text.strip()
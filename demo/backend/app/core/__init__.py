@@ -1,5 +1,17 @@
 """Core package."""
 from .config import settings
 from .logger import setup_logging, get_logger
+from .prompt_builder import PromptTemplate, compact, build_messages
+from .token_budget import TokenBudget, PromptSection, count_tokens
 
-__all__ = ["settings", "setup_logging", "get_logger"]
+__all__ = [
+    "settings",
+    "setup_logging",
+    "get_logger",
+    "PromptTemplate",
+    "compact",
+    "build_messages",
+    "TokenBudget",
+    "PromptSection",
+    "count_tokens",
+]
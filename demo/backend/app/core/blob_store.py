@@ -0,0 +1,211 @@
+"""Content-addressed store for large message contents."""
+import hashlib
+import os
+import shutil
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Union
+from .config import settings
+from .logger import get_logger
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = get_logger(__name__)
+
+PREVIEW_CHARS = 100
+
+
+@dataclass(frozen=True, slots=True)
+class BlobRef:
+    """Reference to a stored text."""
+    key: str  # SHA-256 of the UTF-8 text
+    size: int  # Characters
+    preview: str  # First characters, for logs
+
+
+class BlobStore:
+    """
+    In-process store for large texts, keyed by content hash.
+
+    Identical texts share one entry. Entries are zstd-compressed when asked
+    for and the ``zstandard`` package is installed. Beyond ``max_memory_bytes``
+    the least recently used entries spill to a per-process directory under
+    ``spill_dir`` and are read back on access (without a spill directory
+    everything stays in memory).
+
+    Entries are reference counted: every ``put`` (or ``offload`` of a large
+    text) is one reference, dropped with ``release``. The last release
+    removes the entry, including its spill file.
+    """
+
+    def __init__(
+        self,
+        min_chars: int,
+        compression: str = "none",
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        spill_dir: Optional[str] = None,
+    ):
+        """Initialize empty store."""
+        self.min_chars = min_chars
+        self.max_memory_bytes = max_memory_bytes
+        self.spill_dir = spill_dir
+        # Worker processes share spill_dir; each spills into its own directory
+        self.spill_path = os.path.join(spill_dir, str(os.getpid())) if spill_dir else None
+        compress = compression == "zstd" and zstandard is not None
+        if compression == "zstd" and zstandard is None:
+            logger.info("zstandard not installed; blobs are stored uncompressed")
+        self._compressor = zstandard.ZstdCompressor(level=3) if compress else None
+        self._decompressor = zstandard.ZstdDecompressor() if compress else None
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._spilled: set[str] = set()
+        self._refs: dict[str, int] = {}
+        self._last: tuple[Optional[str], str] = (None, "")  # Last resolved (key, text)
+        self.stored_chars = 0
+        self.deduplicated_chars = 0
+
+    def offload(self, text: Union[str, BlobRef]) -> Union[str, BlobRef]:
+        """
+        Store ``text`` if it is large and return its reference; short text is returned as is.
+
+        A reference (new, or passed in) counts as one more holder to ``release``.
+        """
+        if isinstance(text, BlobRef):
+            self.retain(text)
+            return text
+        if len(text) < self.min_chars:
+            return text
+        return self.put(text)
+
+    def put(self, text: str) -> BlobRef:
+        """Store ``text`` once per distinct content and add a reference to it."""
+        data = text.encode("utf-8")
+        key = hashlib.sha256(data).hexdigest()
+        self._refs[key] = self._refs.get(key, 0) + 1
+        if key in self._memory or key in self._spilled:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+            self.deduplicated_chars += len(text)
+        else:
+            stored = self._compressor.compress(data) if self._compressor else data
+            self._memory[key] = stored
+            self._memory_bytes += len(stored)
+            self.stored_chars += len(text)
+            self._spill()
+        return BlobRef(key=key, size=len(text), preview=text[:PREVIEW_CHARS])
+
+    def get(self, ref: BlobRef) -> str:
+        """Text of a reference."""
+        if self._last[0] == ref.key:
+            return self._last[1]
+        stored = self._memory.get(ref.key)
+        if stored is not None:
+            self._memory.move_to_end(ref.key)
+        elif ref.key in self._spilled:
+            with open(self._path(ref.key), "rb") as f:
+                stored = f.read()
+        else:
+            raise KeyError(f"Unknown blob {ref.key}")
+        data = self._decompressor.decompress(stored) if self._decompressor else stored
+        text = data.decode("utf-8")
+        self._last = (ref.key, text)
+        return text
+
+    def resolve(self, content: Union[str, BlobRef]) -> str:
+        """Text of inline content or a reference."""
+        return self.get(content) if isinstance(content, BlobRef) else content
+
+    def retain(self, ref: BlobRef):
+        """Add a reference to a stored entry."""
+        if ref.key not in self._refs:
+            raise KeyError(f"Unknown blob {ref.key}")
+        self._refs[ref.key] += 1
+
+    def release(self, ref: BlobRef):
+        """Drop a reference; the last one removes the entry and its spill file."""
+        count = self._refs.get(ref.key, 0) - 1
+        if count > 0:
+            self._refs[ref.key] = count
+            return
+        self._refs.pop(ref.key, None)
+        stored = self._memory.pop(ref.key, None)
+        if stored is not None:
+            self._memory_bytes -= len(stored)
+        elif ref.key in self._spilled:
+            self._spilled.discard(ref.key)
+            try:
+                os.remove(self._path(ref.key))
+            except OSError as e:
+                logger.warning(f"Could not remove spilled blob: {e}")
+        if self._last[0] == ref.key:
+            self._last = (None, "")
+
+    def remove_stale_spills(self):
+        """Delete spill files left by processes that are no longer running (call at startup)."""
+        if not self.spill_dir or not os.path.isdir(self.spill_dir):
+            return
+        for name in os.listdir(self.spill_dir):
+            path = os.path.join(self.spill_dir, name)
+            if name.isdigit() and (_running(int(name)) or path == self.spill_path):
+                continue
+            if name.isdigit() and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif name.endswith((".zst", ".txt")):
+                try:
+                    os.remove(path)  # Flat layout of earlier versions
+                except OSError as e:
+                    logger.warning(f"Could not remove spilled blob: {e}")
+
+    def close(self):
+        """Delete this process's spill files (entries are gone with the process)."""
+        if self.spill_path:
+            shutil.rmtree(self.spill_path, ignore_errors=True)
+        self._spilled.clear()
+
+    def _spill(self):
+        """Write least recently used entries to disk while over the memory limit."""
+        if not self.spill_path:
+            return
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            key, stored = self._memory.popitem(last=False)
+            os.makedirs(self.spill_path, exist_ok=True)
+            with open(self._path(key), "wb") as f:
+                f.write(stored)
+            self._memory_bytes -= len(stored)
+            self._spilled.add(key)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.spill_path, key + (".zst" if self._compressor else ".txt"))
+
+    def stats(self) -> dict:
+        """Entry counts and sizes for this process."""
+        return {
+            "in_memory": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "spilled": len(self._spilled),
+            "stored_chars": self.stored_chars,
+            "deduplicated_chars": self.deduplicated_chars,
+            "compression": "zstd" if self._compressor else "none",
+        }
+
+
+def _running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    return True
+
+
+# Global blob store instance
+blob_store = BlobStore(
+    min_chars=settings.blob_min_chars,
+    compression=settings.blob_compression,
+    max_memory_bytes=settings.blob_max_memory_mb * 1024 * 1024,
+    spill_dir=settings.blob_spill_dir,
+)
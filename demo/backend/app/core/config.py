@@ -1,19 +1,30 @@
 """Configuration and settings."""
 from pydantic_settings import BaseSettings
 from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class CascadeConfig(BaseModel):
+    """Per-agent model cascade settings."""
+    enabled: bool = True
+    cheap_model: str = "gpt-3.5-turbo"
+    threshold: float = 0.6  # Minimum confidence to accept the cheap answer
 
 
 class Settings(BaseSettings):
     """Application settings."""
     
-    # API Keys
-    openai_api_key: str
+    # API Keys (checked when the LLM client is first used, not at import)
+    openai_api_key: Optional[str] = None
     anthropic_api_key: Optional[str] = None
     
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
     cors_origins: str = "http://localhost:3000,http://127.0.0.1:3000"
+    workers: int = 1  # >1 runs multiple processes (reload is then disabled)
+    reload: bool = True
+    warmup: bool = False  # Pre-connect to the LLM API and preload caches at startup
     
     # Models
     default_model: str = "gpt-4-turbo-preview"
@@ -22,6 +33,120 @@ class Settings(BaseSettings):
     specialist_model: str = "gpt-3.5-turbo"
     critic_model: str = "gpt-4-turbo-preview"
     
+    # Context budgets (prompt tokens per call)
+    context_budgets: dict[str, int] = Field(default_factory=lambda: {
+        "gpt-4-turbo-preview": 6000,
+        "gpt-4": 4000,
+        "gpt-3.5-turbo": 3000,
+    })
+    default_context_budget: int = 4000
+    critic_review_budget: int = 1000
+    
+    # Model cascade (cheap model first, escalate on low confidence)
+    cascade_enabled: bool = False
+    cascade: dict[str, CascadeConfig] = Field(default_factory=lambda: {
+        "coordinator": CascadeConfig(),
+        "analyst": CascadeConfig(),
+        "super_critic": CascadeConfig(),
+    })
+    
+    # Coordinator routing (specialists start as the streamed JSON plan selects them)
+    coordinator_routing: bool = True
+    
+    # Adaptive routing (contextual bandit over specialist subsets)
+    adaptive_routing: bool = False
+    router_min_samples: int = 20
+    router_token_penalty: float = 0.05  # Reward lost per 1K tokens
+    router_latency_penalty: float = 0.02  # Reward lost per second
+    
+    # Budgeted execution (TaskRequest latency_budget_ms / cost_budget_usd)
+    sla_fallback_model: str = "gpt-3.5-turbo"  # Cheaper, faster model stages are downgraded to
+    sla_expected_output_tokens: int = 400  # Completion length assumed for uncapped calls
+    sla_min_output_tokens: int = 150  # Never cap completions below this
+    sla_hedge_slack: float = 0.8  # Hedge stages when the plan uses more than this share of the deadline
+    model_latency: dict[str, dict[str, float]] = Field(default_factory=lambda: {  # Seeds; learned online
+        "gpt-4-turbo-preview": {"base_ms": 1000, "ms_per_token": 25},
+        "gpt-4": {"base_ms": 1200, "ms_per_token": 40},
+        "gpt-3.5-turbo": {"base_ms": 400, "ms_per_token": 8},
+    })
+    
+    # Super-Critic review policy
+    critic_mode: str = "blocking"  # blocking, audit (post-hoc, non-blocking) or off
+    critic_sample_rate: float = 1.0  # Fraction of tasks reviewed
+    critic_skip_task_classes: list[str] = Field(default_factory=list)  # e.g. ["specialist_math"]
+    critic_skip_confidence: Optional[float] = None  # Skip when specialist confidence >= this
+    critic_verdict_max_tokens: int = 80
+    
+    # Local engines: answer computable subtasks without the LLM
+    local_math_enabled: bool = True
+    local_text_mode: str = "auto"  # auto (simple text or tight budget), always or off
+    local_text_max_words: int = 300  # "Simple" text payloads analyzed locally in auto mode
+    
+    # Task scheduling and load shedding
+    max_concurrent_tasks: int = 4
+    max_queued_tasks: int = 100
+    queue_slas: dict[str, float] = Field(default_factory=lambda: {  # Max queue wait (s)
+        "interactive": 5.0,
+        "standard": 30.0,
+        "batch": 300.0,
+    })
+    
+    # Streaming: metric deltas are coalesced over this window (0 = send each)
+    metric_window_ms: int = 100
+    
+    # Cancellation: how often /process checks whether the client is still connected
+    disconnect_poll_ms: int = 250
+    
+    # Batch processing
+    batch_concurrency: int = 8
+    
+    # Multiplexed WebSocket (/api/process/ws)
+    ws_max_streams: int = 256  # Concurrent task streams per connection
+    ws_initial_credit: int = 64  # Progress events a stream may send before the client grants more
+    ws_compress_min_bytes: int = 512  # Smaller frames stay uncompressed text
+    
+    # Background jobs (asynchronous task API)
+    job_workers: int = 4
+    max_stored_jobs: int = 1000
+    max_queued_jobs: int = 500
+    shared_jobs_path: str = "memory/jobs.db"  # Used when workers > 1
+    
+    # Shared LLM response cache (SQLite, shared across worker processes)
+    response_cache_enabled: bool = False
+    response_cache_path: str = "memory/response_cache.db"
+    response_cache_ttl: int = 3600  # Seconds
+    response_cache_max_entries: int = 10000
+    response_cache_max_temperature: float = 0.0  # Hotter completions are sampled, not replayed (agents use 0.7)
+    
+    # Whole-task memo cache (in-process): repeated tasks skip the pipeline
+    task_cache_enabled: bool = False
+    task_cache_fresh_seconds: int = 300  # Served as-is
+    task_cache_stale_seconds: int = 3600  # Then served while a background re-run refreshes it
+    task_cache_max_entries: int = 1000
+    
+    # Task statistics: memory-mapped per-minute/hour/day rollups behind /api/stats
+    stats_enabled: bool = False
+    stats_dir: str = "memory/stats"
+    stats_max_series: int = 32  # (agent, model) pairs tracked; further ones count as "other"
+    
+    # Blob store: large message contents are kept once, by content hash
+    blob_min_chars: int = 2048  # Shorter contents stay inline
+    blob_compression: str = "none"  # none or zstd (needs the optional zstandard package)
+    blob_max_memory_mb: int = 64  # Beyond this, least recently used blobs spill to disk
+    blob_spill_dir: Optional[str] = "memory/blobs"  # Per-process subdirectories; None keeps everything in memory
+    
+    # Tracing (OTLP/JSON spans to a file and/or an OTLP/HTTP collector)
+    tracing_enabled: bool = False
+    trace_service_name: str = "neurofabric-backend"
+    trace_export_path: Optional[str] = "traces.jsonl"
+    trace_endpoint: Optional[str] = None  # e.g. http://localhost:4318/v1/traces
+    
+    # Event-loop instrumentation and /debug endpoints (opt-in)
+    instrumentation_enabled: bool = False
+    loop_lag_interval_ms: int = 50
+    slow_callback_ms: int = 100
+    profile_max_seconds: int = 60
+    
     # Logging
     log_level: str = "INFO"
     
@@ -0,0 +1,127 @@
+"""Incremental parsing of a JSON object while it is streamed."""
+import json
+from typing import Any
+
+_WHITESPACE = " \t\r\n"
+
+
+class JsonFieldParser:
+    """
+    Emits the top-level fields of a streamed JSON object as each value completes.
+
+    Text before the opening brace (prose, a Markdown code fence) is skipped.
+    Strings, objects and arrays are decoded once closed; ``true``, ``false``,
+    ``null`` and numbers once the next delimiter arrives. Parsing stops at the
+    closing brace, or silently at malformed input, keeping the fields already
+    emitted.
+    """
+
+    def __init__(self):
+        """Start before the object."""
+        self.consumed = 0  # Characters fed so far
+        self.done = False
+        self._state = "start"
+        self._key = ""
+        self._token: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """
+        Consume the next chunk of text.
+
+        Returns:
+            (key, value) pairs of the fields completed by this chunk
+        """
+        self.consumed += len(chunk)
+        fields = []
+        for char in chunk:
+            if self.done:
+                break
+            self._step(char, fields)
+        return fields
+
+    def _step(self, char: str, fields: list):
+        state = self._state
+        if state == "start":
+            if char == "{":
+                self._state = "key"
+        elif state in ("key", "colon", "value", "after"):
+            if char in _WHITESPACE:
+                return
+            if state == "key" and char == '"':
+                self._begin("key_string", char)
+            elif state == "colon" and char == ":":
+                self._state = "value"
+            elif state == "value":
+                if char == '"':
+                    self._begin("string", char)
+                elif char in "{[":
+                    self._begin("container", char)
+                    self._depth = 1
+                else:
+                    self._begin("scalar", char)
+            elif state == "after" and char == ",":
+                self._state = "key"
+            elif state in ("key", "after") and char == "}":
+                self.done = True
+            else:
+                self.done = True  # Malformed
+        elif state in ("key_string", "string"):
+            self._token.append(char)
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                if state == "key_string":
+                    try:
+                        self._key = self._decode()
+                    except ValueError:
+                        self.done = True  # Malformed
+                        return
+                    self._state = "colon"
+                else:
+                    self._emit(fields)
+        elif state == "container":
+            self._token.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(fields)
+        elif state == "scalar":
+            if char not in _WHITESPACE and char not in ",}":
+                self._token.append(char)
+                return
+            self._emit(fields)
+            if not self.done and char in ",}":
+                self._step(char, fields)  # The delimiter also ends the field
+
+    def _begin(self, state: str, char: str):
+        self._state = state
+        self._token = [char]
+        self._escape = False
+        self._in_string = False
+
+    def _decode(self) -> Any:
+        return json.loads("".join(self._token))
+
+    def _emit(self, fields: list):
+        try:
+            fields.append((self._key, self._decode()))
+        except ValueError:
+            self.done = True
+            return
+        self._state = "after"
@@ -0,0 +1,251 @@
+"""Event-loop health monitoring and sampling profiler."""
+import asyncio
+import collections.abc
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Any, Optional
+from .config import settings
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _TimedCoroutine(collections.abc.Coroutine):
+    """Wraps a task's coroutine to measure CPU and wall time of each step."""
+
+    __slots__ = ("_coro", "_monitor", "_stats", "name")
+
+    def __init__(self, coro, monitor: "LoopMonitor"):
+        self._coro = coro
+        self._monitor = monitor
+        self.name = getattr(coro, "__qualname__", type(coro).__name__)
+        self._stats = monitor._coroutine_stats(self.name)
+
+    @property
+    def __name__(self) -> str:
+        return self.name
+
+    def send(self, value):
+        return self._step(self._coro.send, value)
+
+    def throw(self, *args):
+        return self._step(self._coro.throw, *args)
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    def _step(self, method, *args):
+        cpu = time.thread_time_ns()
+        wall = time.perf_counter_ns()
+        try:
+            return method(*args)
+        finally:
+            wall = time.perf_counter_ns() - wall
+            stats = self._stats
+            stats[0] += 1
+            stats[1] += time.thread_time_ns() - cpu
+            stats[2] += wall
+            if wall > stats[3]:
+                stats[3] = wall
+            if wall > self._monitor.slow_ns:
+                self._monitor._slow_step(self.name, wall)
+
+
+class LoopMonitor:
+    """
+    Opt-in event-loop instrumentation.
+
+    - Lag: a probe sleeps ``interval_ms`` and records how late it wakes up.
+    - Stalls: a watchdog thread notices when the probe is overdue by more
+      than ``slow_ms`` and captures the loop thread's stack while it is
+      still blocked, so the blocking call itself shows up.
+    - Per-coroutine time: a task factory wraps every task's coroutine and
+      accumulates CPU and wall time per step, keyed by coroutine name. Time
+      spent in awaited sub-coroutines is attributed to the task's coroutine.
+    """
+
+    def __init__(self, interval_ms: int, slow_ms: int, max_events: int = 50):
+        """Initialize monitor (nothing is measured until ``install``)."""
+        self.interval = interval_ms / 1000
+        self.slow = slow_ms / 1000
+        self.slow_ns = slow_ms * 1_000_000
+        self.lags: deque[float] = deque(maxlen=1000)
+        self.stalls: deque[dict] = deque(maxlen=max_events)
+        self.slow_steps: deque[dict] = deque(maxlen=max_events)
+        self.coroutines: dict[str, list[int]] = {}
+        self.installed = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._heartbeat = 0.0
+        self._probe: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def thread_id(self) -> int:
+        """Identifier of the event-loop thread (the caller's if not installed)."""
+        return self._thread_id or threading.get_ident()
+
+    def install(self):
+        """Start measuring the running loop."""
+        if self.installed:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._loop.set_task_factory(self._task_factory)
+        self._heartbeat = time.perf_counter()
+        self._probe = self._loop.create_task(self._measure_lag())
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        self.installed = True
+        logger.info(f"Loop monitor installed (interval {self.interval * 1000:.0f} ms, slow {self.slow * 1000:.0f} ms)")
+
+    async def uninstall(self):
+        """Stop measuring and restore the default task factory."""
+        if not self.installed:
+            return
+        self._stop.set()
+        self._probe.cancel()
+        await asyncio.gather(self._probe, return_exceptions=True)
+        self._loop.set_task_factory(None)
+        self.installed = False
+
+    def _task_factory(self, loop, coro, **kwargs):
+        return asyncio.Task(_TimedCoroutine(coro, self), loop=loop, **kwargs)
+
+    def _coroutine_stats(self, name: str) -> list[int]:
+        # [steps, cpu_ns, wall_ns, max_step_ns]
+        stats = self.coroutines.get(name)
+        if stats is None:
+            stats = self.coroutines[name] = [0, 0, 0, 0]
+        return stats
+
+    def _slow_step(self, name: str, wall_ns: int):
+        self.slow_steps.append({
+            "at": time.time(),
+            "coroutine": name,
+            "duration_ms": round(wall_ns / 1e6, 1),
+        })
+
+    async def _measure_lag(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self.lags.append(max(0.0, now - expected) * 1000)
+            self._heartbeat = now
+
+    def _watch(self):
+        """Watchdog thread: capture the loop's stack while it is blocked."""
+        stall: Optional[dict] = None
+        due = 0.0
+        while not self._stop.wait(self.slow / 4):
+            if stall is not None:
+                if self._heartbeat + self.interval != due:
+                    # Probe woke up: it was due when the stall began
+                    stall["duration_ms"] = round((self._heartbeat - due) * 1000, 1)
+                    stall = None
+                continue
+            due = self._heartbeat + self.interval
+            if time.perf_counter() - due > self.slow:
+                frame = sys._current_frames().get(self._thread_id)
+                stall = {
+                    "at": time.time(),
+                    "duration_ms": None,  # Filled in once the loop recovers
+                    "stack": traceback.format_stack(frame) if frame else [],
+                }
+                self.stalls.append(stall)
+                logger.warning(
+                    f"Event loop blocked for >{self.slow * 1000:.0f} ms at: "
+                    f"{stall['stack'][-1].strip() if stall['stack'] else '?'}"
+                )
+
+    def report(self, top: int = 20) -> dict:
+        """Lag percentiles, recent stalls and slow steps, and the busiest coroutines."""
+        lags = sorted(self.lags)
+
+        def percentile(p: float) -> Optional[float]:
+            return round(lags[min(len(lags) - 1, int(p * len(lags)))], 2) if lags else None
+
+        busiest = sorted(self.coroutines.items(), key=lambda item: item[1][1], reverse=True)[:top]
+        return {
+            "installed": self.installed,
+            "lag_ms": {
+                "p50": percentile(0.5),
+                "p99": percentile(0.99),
+                "max": round(lags[-1], 2) if lags else None,
+                "samples": len(lags),
+            },
+            "stalls": list(self.stalls),
+            "slow_steps": list(self.slow_steps),
+            "coroutines": [
+                {
+                    "name": name,
+                    "steps": steps,
+                    "cpu_ms": round(cpu / 1e6, 2),
+                    "wall_ms": round(wall / 1e6, 2),
+                    "max_step_ms": round(longest / 1e6, 2),
+                }
+                for name, (steps, cpu, wall, longest) in busiest
+            ],
+        }
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})"
+
+
+def sample_profile(thread_id: int, seconds: float, interval_ms: float) -> dict[str, Any]:
+    """
+    Sample one thread's stack at a fixed interval (blocking; run off the loop).
+
+    Returns folded stacks (``frame;frame;frame count``, the input format of
+    flame graph tools) plus the frames with the most self and total samples.
+    Samples whose innermost frame is the selector wait are counted as idle.
+    """
+    folded: Counter = Counter()
+    own: Counter = Counter()
+    total: Counter = Counter()
+    samples = idle = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            break
+        stack = []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        samples += 1
+        if stack[0].startswith("select ("):
+            idle += 1
+        else:
+            own[stack[0]] += 1
+            for label in set(stack):
+                total[label] += 1
+        folded[";".join(reversed(stack))] += 1
+        time.sleep(interval_ms / 1000)
+
+    busy = max(samples - idle, 1)
+    return {
+        "samples": samples,
+        "idle_samples": idle,
+        "interval_ms": interval_ms,
+        "top_self": [{"frame": f, "samples": n, "share": round(n / busy, 3)} for f, n in own.most_common(20)],
+        "top_total": [{"frame": f, "samples": n, "share": round(n / busy, 3)} for f, n in total.most_common(20)],
+        "folded": [f"{stack} {count}" for stack, count in folded.most_common()],
+    }
+
+
+# Global loop monitor instance (installed at startup when enabled)
+loop_monitor = LoopMonitor(
+    interval_ms=settings.loop_lag_interval_ms,
+    slow_ms=settings.slow_callback_ms,
+)
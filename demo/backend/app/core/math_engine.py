@@ -0,0 +1,366 @@
+"""Deterministic local computation for math subtasks."""
+import ast
+import math
+import operator
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+import numpy as np
+
+# Largest exponent and power result (in digits) the evaluator accepts; both
+# bound the work of nested powers such as 9**9**9 or ((10**1000)**1000)**1000
+MAX_EXPONENT = 1000
+MAX_POWER_DIGITS = 1000
+# Floats at or beyond 2**53 no longer hold every integer exactly
+_EXACT_FLOAT_LIMIT = 2.0 ** 53
+MAX_EXPRESSION_LENGTH = 200
+
+_BINARY: dict[type, Callable] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY: dict[type, Callable] = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+_FUNCTIONS: dict[str, Callable] = {
+    "sqrt": math.sqrt,
+    "abs": abs,
+    "round": round,
+    "floor": math.floor,
+    "ceil": math.ceil,
+    "log": math.log,
+    "ln": math.log,
+    "log10": math.log10,
+    "exp": math.exp,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "min": min,
+    "max": max,
+}
+_CONSTANTS = {"pi": math.pi, "e": math.e}
+
+
+def safe_eval(expression: str) -> float:
+    """
+    Evaluate an arithmetic expression without ``eval``.
+
+    Supports numbers, ``+ - * / // % **`` (``^`` means power), parentheses,
+    ``pi``/``e`` and a fixed set of math functions.
+
+    Raises:
+        ValueError: For anything else, or results that are not finite
+    """
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ValueError("Expression too long")
+    text = expression.replace("^", "**").replace("×", "*").replace("÷", "/")
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+        result = _evaluate(tree.body)
+        # Integers beyond the float range overflow here
+        finite = not isinstance(result, complex) and math.isfinite(result)
+    except (SyntaxError, TypeError, ZeroDivisionError, OverflowError) as e:
+        raise ValueError(f"Cannot evaluate {expression!r}: {e}") from e
+    if not finite:
+        raise ValueError(f"Result of {expression!r} is not a finite real number")
+    return result
+
+
+def _evaluate(node: ast.AST) -> float:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return node.value
+    if isinstance(node, ast.Name) and node.id in _CONSTANTS:
+        return _CONSTANTS[node.id]
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+        left, right = _evaluate(node.left), _evaluate(node.right)
+        if isinstance(node.op, ast.Pow):
+            if abs(right) > MAX_EXPONENT:
+                raise ValueError("Exponent too large")
+            if abs(left) > 1 and right * math.log10(abs(left)) > MAX_POWER_DIGITS:
+                raise ValueError("Power too large")
+        return _BINARY[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+        return _UNARY[type(node.op)](_evaluate(node.operand))
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in _FUNCTIONS
+        and not node.keywords
+    ):
+        return _FUNCTIONS[node.func.id](*[_evaluate(arg) for arg in node.args])
+    raise ValueError(f"Unsupported syntax: {ast.dump(node)[:60]}")
+
+
+_NUMBER = r"-?\d+(?:,\d{3})*(?:\.\d+)?"
+_RATING = re.compile(
+    rf"\b(?:rating|rated|score|stars?)\b\s*[:=]?\s*({_NUMBER})\s*(?:/|out of)\s*(\d+)"
+    rf"|({_NUMBER})\s*(?:/\s*(\d+)\s*stars?\b|out of\s*(\d+))"
+    rf"|(?<![\w./])({_NUMBER})\s*/\s*(\d+)(?![\w./])",
+    re.IGNORECASE,
+)
+# A bare "4/5" is only a rating next to rating words (otherwise it is a division)
+_RATING_CONTEXT = re.compile(r"\b(reviews?|ratings?|rated|scores?|stars?|out of)\b", re.IGNORECASE)
+_PAIR = re.compile(rf"\(\s*({_NUMBER})\s*,\s*({_NUMBER})\s*\)")
+_ENUMERATOR = re.compile(r"^\s*\d+[.)]\s", re.MULTILINE)
+_PERCENT_OF = re.compile(rf"({_NUMBER})\s*%\s*of\s*({_NUMBER})", re.IGNORECASE)
+_PERCENTILE = re.compile(r"\b(\d{1,2}(?:\.\d+)?)(?:st|nd|rd|th)?\s*percentile\b|\bp(\d{1,2})\b", re.IGNORECASE)
+_QUARTILES = re.compile(r"\b(quartiles?|iqr|interquartile)\b", re.IGNORECASE)
+_FUNCTION_NAMES = "|".join(sorted(_FUNCTIONS, key=len, reverse=True))
+_EXPRESSION = re.compile(
+    rf"(?:(?:{_FUNCTION_NAMES})\s*\(|[\d(])"
+    rf"(?:[\d\s.()+\-*/^×÷]|(?:{_FUNCTION_NAMES}|pi)\b)*"
+    rf"[\d)]"
+)
+_OPERATOR = re.compile(rf"[\d)]\s*[-+*/^×÷]\s*[\d(]|(?:{_FUNCTION_NAMES})\s*\(")
+_NUMBER_TOKEN = re.compile(rf"(?<![\w.]){_NUMBER}(?![\w])")
+# Explicit data: numbers separated by commas/semicolons, listed after a colon,
+# or one per line. Numbers merely mentioned in prose are never operands.
+_NUMBER_LIST = re.compile(
+    rf"(?<![\w.]){_NUMBER}(?:\s*[,;]\s*(?:and\s+)?{_NUMBER})+(?:,?\s+and\s+{_NUMBER})?(?![\w.])"
+    rf"|:\s*{_NUMBER}(?:\s+{_NUMBER})+(?![\w.])"
+)
+_LIST_LINE = re.compile(rf"^[ \t]*(?:[-*•][ \t]*)?({_NUMBER})[ \t]*$", re.MULTILINE)
+_MONTH = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|"
+    r"sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+)
+# Dates, year ranges and years in a time context ("in 2023", "compared to 2022")
+_DATES = re.compile(
+    rf"\b{_MONTH}\s+\d{{1,2}}(?:st|nd|rd|th)?\b(?:,?\s+\d{{4}}\b)?"
+    rf"|\b\d{{1,2}}(?:st|nd|rd|th)?\s+(?:of\s+)?{_MONTH}\b(?:,?\s+\d{{4}}\b)?"
+    rf"|\b{_MONTH}\s+\d{{4}}\b"
+    r"|\b\d{4}-\d{2}-\d{2}\b|\b\d{1,2}/\d{1,2}/\d{2,4}\b"
+    r"|\b(?:19|20)\d{2}\s*[-–]\s*(?:19|20)?\d{2}\b"
+    r"|\b(?:in|since|from|until|through|during|before|after|between|year|fy|q[1-4]|h[12]|vs\.?|than|compared to)"
+    r"\s+(?:19|20)\d{2}\b",
+    re.IGNORECASE,
+)
+# Words allowed around a bare expression answered without the LLM
+_FILLER = re.compile(
+    r"\b(?:what(?:'s|\s+is)|calculate|compute|evaluate|work\s+out|the|value|result|of|please)\b|[\s?=.:!,]",
+    re.IGNORECASE,
+)
+
+_OPERATIONS: list[tuple[str, re.Pattern]] = [
+    ("count", re.compile(r"\b(count|how many|number of)\b", re.IGNORECASE)),
+    ("sum", re.compile(r"\b(sum|total|add up)\b", re.IGNORECASE)),
+    ("mean", re.compile(r"\b(average|mean|avg)\b", re.IGNORECASE)),
+    ("median", re.compile(r"\bmedian\b", re.IGNORECASE)),
+    ("stdev", re.compile(r"\b(standard deviation|std\.?|stdev|spread|dispersion)\b", re.IGNORECASE)),
+    ("variance", re.compile(r"\bvariance\b", re.IGNORECASE)),
+    ("min", re.compile(r"\b(min|minimum|lowest|smallest)\b", re.IGNORECASE)),
+    ("max", re.compile(r"\b(max|maximum|highest|largest)\b", re.IGNORECASE)),
+    ("range", re.compile(r"\brange\b", re.IGNORECASE)),
+    ("regression", re.compile(r"\b(regression|slope|linear fit|trend ?line|linear trend|correlat\w*)\b", re.IGNORECASE)),
+]
+_DESCRIPTIVE = re.compile(r"\b(statistics|stats|describe the (?:data|numbers)|summary statistics)\b", re.IGNORECASE)
+_DESCRIPTIVE_SET = ["count", "mean", "median", "stdev", "min", "max"]
+
+# Requests the engine cannot answer on its own; these get LLM narration
+_NEEDS_REASONING = re.compile(
+    r"\b(why|explain|interpret\w*|implications?|recommend\w*|probabilit\w*|forecast\w*|"
+    r"predict\w*|projections?|solve|equations?|derivatives?|integrals?|optimi[sz]\w*|"
+    r"hypothes[ie]s|significan\w*|confidence interval)\b",
+    re.IGNORECASE,
+)
+
+
+def _to_float(token: str) -> float:
+    return float(token.replace(",", ""))
+
+
+def format_number(value: float) -> str:
+    """Compact number formatting (at most 4 decimals, no trailing zeros)."""
+    if isinstance(value, int):
+        return str(value)  # Exact, however large
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return f"{value:.4f}".rstrip("0").rstrip(".")
+
+
+def extract_ratings(text: str) -> tuple[list[float], Optional[int]]:
+    """
+    Ratings such as ``Rating: 4/5``, ``4 out of 5`` or ``3/5 stars``.
+
+    A bare ``5/5`` counts as a rating only when the text mentions ratings
+    or reviews and the value does not exceed the scale.
+
+    Returns:
+        Rating values and their common scale (None if scales differ or no ratings)
+    """
+    values, scales = [], set()
+    in_context = bool(_RATING_CONTEXT.search(text))
+    for match in _RATING.finditer(text):
+        if match.group(6):
+            value, scale = _to_float(match.group(6)), int(match.group(7))
+            if not in_context or not 0 <= value <= scale:
+                continue
+        else:
+            value = _to_float(match.group(1) or match.group(3))
+            scale = int(match.group(2) or match.group(4) or match.group(5))
+        values.append(value)
+        scales.add(scale)
+    return values, (scales.pop() if len(scales) == 1 else None)
+
+
+@dataclass
+class MathResult:
+    """Locally computed answer to a math request."""
+    source: str  # What the values are, e.g. "ratings out of 5"
+    values: list[float] = field(default_factory=list)
+    statistics: dict[str, float] = field(default_factory=dict)
+    expressions: dict[str, float] = field(default_factory=dict)
+    complete: bool = True  # False: request also needs reasoning the engine can't do
+
+    def __bool__(self) -> bool:
+        return bool(self.statistics or self.expressions)
+
+    def to_text(self) -> str:
+        """Human-readable result lines."""
+        lines = []
+        for expression, value in self.expressions.items():
+            lines.append(f"{expression.strip()} = {format_number(value)}")
+        if self.statistics:
+            shown = ", ".join(format_number(v) for v in self.values[:20])
+            more = f", … ({len(self.values)} values)" if len(self.values) > 20 else ""
+            lines.append(f"Data ({self.source}): {shown}{more}")
+            lines.extend(f"- {name}: {format_number(value)}" for name, value in self.statistics.items())
+        return "\n".join(lines)
+
+
+def describe(values: np.ndarray, operations: list[str], percentiles: list[float]) -> dict[str, float]:
+    """Compute the requested statistics over ``values`` with NumPy."""
+    n = values.size
+    stats: dict[str, float] = {}
+    for name in operations:
+        if name == "count":
+            stats["count"] = n
+        elif name == "sum":
+            stats["sum"] = float(values.sum())
+        elif name == "mean":
+            stats["mean"] = float(values.mean())
+        elif name == "median":
+            stats["median"] = float(np.median(values))
+        elif name == "stdev" and n > 1:
+            stats["stdev"] = float(values.std(ddof=1))
+        elif name == "variance" and n > 1:
+            stats["variance"] = float(values.var(ddof=1))
+        elif name == "min":
+            stats["min"] = float(values.min())
+        elif name == "max":
+            stats["max"] = float(values.max())
+        elif name == "range":
+            stats["range"] = float(np.ptp(values))
+    if percentiles:
+        for q, value in zip(percentiles, np.percentile(values, percentiles)):
+            stats[f"p{format_number(q)}"] = float(value)
+    return stats
+
+
+def regression(x: np.ndarray, y: np.ndarray) -> dict[str, float]:
+    """Least-squares line ``y = slope * x + intercept`` with r²."""
+    if not np.ptp(x):
+        return {}  # All x equal: no line fits
+    slope, intercept = np.polyfit(x, y, 1)
+    predicted = slope * x + intercept
+    total = float(((y - y.mean()) ** 2).sum())
+    r2 = 1.0 - float(((y - predicted) ** 2).sum()) / total if total else 1.0
+    return {"slope": float(slope), "intercept": float(intercept), "r2": r2}
+
+
+def extract_values(text: str) -> list[float]:
+    """
+    Numbers the request lists explicitly as data (see ``_NUMBER_LIST``).
+
+    Dates and years are dropped first, so "March 3" or "Q3 2023" never
+    become operands.
+    """
+    text = _DATES.sub(" ", text)
+    values = []
+    for match in _NUMBER_LIST.finditer(text):
+        values.extend(_to_float(t) for t in _NUMBER_TOKEN.findall(match.group(0)))
+    if not values:
+        lines = _LIST_LINE.findall(_ENUMERATOR.sub(" ", text))
+        if len(lines) >= 2:
+            values = [_to_float(t) for t in lines]
+    return values
+
+
+def solve(text: str) -> Optional[MathResult]:
+    """
+    Extract data and operations from a request and compute them locally.
+
+    The result is ``complete`` (needs no LLM) only for a recognized operation
+    over explicit data (ratings, ``(x, y)`` pairs or a number list), or for a
+    request that is nothing but arithmetic. Anything else is left to the LLM,
+    with whatever was computed handed over as exact figures.
+
+    Returns:
+        The result, or None if the request holds nothing computable
+    """
+    operations = [name for name, pattern in _OPERATIONS if pattern.search(text)]
+    if _DESCRIPTIVE.search(text):
+        operations += [name for name in _DESCRIPTIVE_SET if name not in operations]
+    percentiles = [float(a or b) for a, b in _PERCENTILE.findall(text)]
+    if _QUARTILES.search(text):
+        percentiles += [25.0, 50.0, 75.0]
+    wants_regression = "regression" in operations
+    operations = [name for name in operations if name != "regression"]
+
+    result = MathResult(source="", complete=False)
+
+    # Percentages of amounts, then explicit arithmetic
+    for match in _PERCENT_OF.finditer(text):
+        result.expressions[match.group(0)] = _to_float(match.group(1)) / 100 * _to_float(match.group(2))
+    remaining = _PERCENT_OF.sub(" ", text)
+
+    # Data set: ratings, (x, y) pairs or an explicit list of numbers
+    ratings, scale = extract_ratings(remaining)
+    pairs = _PAIR.findall(remaining)
+    if ratings:
+        result.source = f"ratings out of {scale}" if scale else "ratings"
+        result.values = ratings
+    elif len(pairs) >= 2:
+        result.source = "(x, y) pairs"
+        result.values = [_to_float(y) for _, y in pairs]
+    elif operations or percentiles or wants_regression:
+        result.source = "numbers in the request"
+        result.values = extract_values(_PERCENTILE.sub(" ", remaining))
+    else:
+        remaining = _DATES.sub(" ", remaining)
+        for match in _EXPRESSION.finditer(remaining):
+            expression = match.group(0)
+            if not _OPERATOR.search(expression):
+                continue
+            try:
+                result.expressions[expression] = safe_eval(expression.replace(",", ""))
+            except ValueError:
+                continue
+        if result.expressions:
+            for expression in result.expressions:
+                remaining = remaining.replace(expression, " ")
+            # Only a bare calculation ("What is 17 * 23?") skips the LLM, and
+            # only when no float result was rounded to its 53-bit mantissa
+            result.complete = not _FILLER.sub("", remaining) and all(
+                isinstance(value, int) or abs(value) < _EXACT_FLOAT_LIMIT
+                for value in result.expressions.values()
+            )
+
+    if result.values and (operations or percentiles):
+        values = np.asarray(result.values, dtype=float)
+        result.statistics = describe(values, operations, percentiles)
+    if wants_regression and len(result.values) >= 2:
+        if pairs and not ratings:
+            x = np.asarray([_to_float(x) for x, _ in pairs], dtype=float)
+        else:
+            x = np.arange(len(result.values), dtype=float)  # Trend over position
+        result.statistics.update(regression(x, np.asarray(result.values, dtype=float)))
+    if result.statistics:
+        result.complete = True
+
+    if _NEEDS_REASONING.search(text):
+        result.complete = False
+    return result if result else None
@@ -0,0 +1,59 @@
+"""Prompt assembly helpers."""
+import re
+import textwrap
+from string import Formatter
+from typing import Optional
+
+_TRAILING_WHITESPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def compact(text: str) -> str:
+    """Strip indentation and redundant whitespace from prompt text."""
+    text = textwrap.dedent(text).strip()
+    text = _TRAILING_WHITESPACE.sub("", text)
+    return _BLANK_LINES.sub("\n\n", text)
+
+
+class PromptTemplate:
+    """
+    Precompiled prompt template.
+
+    The template is compacted and parsed once at construction; field
+    values are substituted verbatim, so code and tables keep their layout.
+    Static instructions should come before the placeholders so consecutive
+    calls share the longest possible prefix for provider-side prompt caching.
+    """
+
+    def __init__(self, template: str):
+        """Compile template."""
+        self.template = compact(template)
+        self._parts = list(Formatter().parse(self.template))
+        self.fields = tuple(name for _, name, _, _ in self._parts if name)
+        self.static_prefix = self._parts[0][0] if self._parts else ""
+
+    def render(self, **values) -> str:
+        """Render template with the given field values."""
+        missing = set(self.fields) - values.keys()
+        if missing:
+            raise KeyError(f"Missing prompt fields: {', '.join(sorted(missing))}")
+
+        rendered = []
+        for literal, name, _, _ in self._parts:
+            rendered.append(literal)
+            if name:
+                rendered.append(str(values[name]))
+        return "".join(rendered)
+
+
+def build_messages(
+    system_message: dict,
+    user_message: str,
+    context: Optional[list[dict]] = None,
+) -> list[dict]:
+    """Assemble chat messages with the stable system prompt first."""
+    messages = [system_message]
+    if context:
+        messages.extend(context)
+    messages.append({"role": "user", "content": user_message})
+    return messages
@@ -0,0 +1,15 @@
+"""Fast JSON serialization for the API boundary."""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    """Serialize to compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
@@ -0,0 +1,32 @@
+"""SQLite helpers for state shared between worker processes."""
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+@contextmanager
+def connect(
+    path: Path,
+    timeout: float = 30.0,
+    immediate: bool = False,
+) -> Iterator[sqlite3.Connection]:
+    """
+    Open a short-lived connection safe for concurrent multi-process use.
+    
+    WAL mode lets readers proceed while one process writes; writers wait up
+    to ``timeout`` seconds for the lock. The block runs in one transaction,
+    committed on success and rolled back on error. ``immediate`` takes the
+    write lock up front, for read-then-write blocks that must not interleave.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=timeout)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            if immediate:
+                conn.execute("BEGIN IMMEDIATE")
+            yield conn
+    finally:
+        conn.close()
@@ -0,0 +1,33 @@
+"""Startup phase timings."""
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class StartupProfile:
+    """Wall-clock durations of named startup phases."""
+
+    def __init__(self):
+        """Initialize profile."""
+        self.phases: dict[str, float] = {}
+
+    def record(self, name: str, started: float):
+        """Record a phase that began at ``started`` (``time.perf_counter``)."""
+        self.phases[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started)
+
+    def report(self) -> dict:
+        """Phase durations in milliseconds."""
+        return {"phases_ms": dict(self.phases), "total_ms": round(sum(self.phases.values()), 1)}
+
+
+# Global startup profile
+startup_profile = StartupProfile()
@@ -0,0 +1,164 @@
+"""Token counting and context budgeting for prompts."""
+import hashlib
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+from .config import settings
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+# Rough characters-per-token ratio used when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = " …[truncated]"
+TOKEN_CACHE_SIZE = 4096  # Token counts remembered, keyed by content hash
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n")
+_token_counts: OrderedDict[tuple[bytes, str], int] = OrderedDict()
+
+
+@lru_cache(maxsize=32)
+def _get_encoding(model: str):
+    """Get tiktoken encoding for a model."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Count tokens in text (cached by content hash, so cached texts are not kept alive)."""
+    if not text:
+        return 0
+    model = model or settings.default_model
+    key = (hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest(), model)
+    count = _token_counts.get(key)
+    if count is not None:
+        _token_counts.move_to_end(key)
+        return count
+    if tiktoken is not None:
+        count = len(_get_encoding(model).encode(text))
+    else:
+        count = -(-len(text) // CHARS_PER_TOKEN)
+    _token_counts[key] = count
+    while len(_token_counts) > TOKEN_CACHE_SIZE:
+        _token_counts.popitem(last=False)
+    return count
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """Truncate text to a token limit, preferring sentence boundaries."""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+
+    limit = max(max_tokens - count_tokens(TRUNCATION_MARKER, model), 1)
+    if tiktoken is not None:
+        encoding = _get_encoding(model or settings.default_model)
+        head = encoding.decode(encoding.encode(text)[:limit])
+    else:
+        head = text[:limit * CHARS_PER_TOKEN]
+
+    # Drop the trailing partial sentence if a boundary exists in the last half
+    boundaries = [m.start() for m in _SENTENCE_END.finditer(head)]
+    if boundaries and boundaries[-1] > len(head) // 2:
+        head = head[:boundaries[-1]]
+
+    return head.rstrip() + TRUNCATION_MARKER
+
+
+@dataclass
+class PromptSection:
+    """A named piece of prompt content with a retention priority."""
+    name: str
+    content: str
+    priority: int = 0  # Higher priority content is kept longer
+    min_tokens: int = 0
+
+
+class TokenBudget:
+    """
+    Allocate a per-model context budget across prompt sections.
+
+    When the sections do not fit, the lowest-priority sections are
+    truncated first. Sections sharing a priority are shrunk together so
+    that the largest ones give up tokens before the smallest. A section
+    keeps its ``min_tokens`` unless a higher-priority section would
+    otherwise be cut, so the top-priority section (the task) is truncated
+    only when it alone exceeds the budget.
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        limit: Optional[int] = None,
+        reserve: int = 0,
+    ):
+        """Initialize budget for a model, minus tokens reserved for fixed prompt text."""
+        self.model = model or settings.default_model
+        if limit is None:
+            limit = settings.context_budgets.get(self.model, settings.default_context_budget)
+        self.limit = max(limit - reserve, 0)
+
+    def count(self, text: str) -> int:
+        """Count tokens for this budget's model."""
+        return count_tokens(text, self.model)
+
+    def fit(self, sections: list[PromptSection]) -> dict[str, str]:
+        """
+        Fit sections into the budget.
+
+        Returns:
+            Mapping of section name to (possibly truncated) content
+        """
+        sizes = {s.name: self.count(s.content) for s in sections}
+        overflow = sum(sizes.values()) - self.limit
+        allowed = dict(sizes)
+
+        lower: list[list[PromptSection]] = []
+        for priority in sorted({s.priority for s in sections}):
+            # Lower-priority floors give way, lowest first, before this priority is cut
+            for lower_group in lower:
+                if overflow <= 0:
+                    break
+                overflow -= _shrink(lower_group, allowed, overflow, keep_floors=False)
+            if overflow <= 0:
+                break
+            group = [s for s in sections if s.priority == priority]
+            overflow -= _shrink(group, allowed, overflow, keep_floors=True)
+            lower.append(group)
+
+        return {
+            s.name: (
+                s.content if allowed[s.name] >= sizes[s.name]
+                else truncate_to_tokens(s.content, allowed[s.name], self.model)
+            )
+            for s in sections
+        }
+
+
+def _shrink(group: list[PromptSection], allowed: dict[str, int], overflow: int, keep_floors: bool) -> int:
+    """Lower the group's allowances by up to ``overflow`` tokens; returns tokens freed."""
+    total = sum(allowed[s.name] for s in group)
+    floors = {s.name: min(s.min_tokens, allowed[s.name]) if keep_floors else 0 for s in group}
+    cap = _water_level([allowed[s.name] for s in group], max(total - overflow, sum(floors.values())))
+    for s in group:
+        allowed[s.name] = max(min(allowed[s.name], cap), floors[s.name])
+    return total - sum(allowed[s.name] for s in group)
+
+
+def _water_level(sizes: list[int], target: int) -> int:
+    """Largest per-item cap such that the capped sizes sum to at most target."""
+    remaining = target
+    ordered = sorted(sizes)
+    for i, size in enumerate(ordered):
+        share = remaining // (len(ordered) - i)
+        if size > share:
+            return share
+        remaining -= size
+    return ordered[-1] if ordered else 0
@@ -0,0 +1,228 @@
+"""Lightweight distributed tracing with OTLP/JSON export."""
+import asyncio
+import json
+import os
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+from .config import settings
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+
+@dataclass(slots=True)
+class Span:
+    """One timed operation within a trace."""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    kind: int = SPAN_KIND_INTERNAL
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set(self, **attributes: Any):
+        """Add attributes."""
+        self.attributes.update(attributes)
+
+    def to_otlp(self) -> dict:
+        """OTLP/JSON span."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items() if v is not None],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+def _new_id(n_bytes: int) -> str:
+    return os.urandom(n_bytes).hex()
+
+
+class OTLPJsonExporter:
+    """
+    Writes finished spans as OTLP/JSON ``ExportTraceServiceRequest`` payloads.
+
+    Each export is appended as one line to ``path`` and/or POSTed to an
+    OTLP/HTTP collector ``endpoint`` (e.g. ``http://localhost:4318/v1/traces``).
+    """
+
+    def __init__(self, service_name: str, path: Optional[str] = None, endpoint: Optional[str] = None):
+        """Initialize exporter."""
+        self.service_name = service_name
+        self.path = path
+        self.endpoint = endpoint
+        self._lock = threading.Lock()
+
+    def payload(self, spans: list[Span]) -> dict:
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "neurofabric"},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }],
+        }
+
+    def export(self, spans: list[Span]):
+        """Write one batch (blocking; called off the event loop)."""
+        body = json.dumps(self.payload(spans))
+        try:
+            if self.path:
+                with self._lock, open(self.path, "a") as f:
+                    f.write(body + "\n")
+            if self.endpoint:
+                request = urllib.request.Request(
+                    self.endpoint,
+                    data=body.encode("utf-8"),
+                    headers={"Content-Type": "application/json"},
+                )
+                urllib.request.urlopen(request, timeout=5).close()
+        except Exception as e:
+            logger.warning(f"Trace export failed: {e}")
+
+
+class Tracer:
+    """
+    Creates spans, tracks the current one per task and batches exports.
+
+    The current span lives in a context variable, so it follows ``await``
+    and is inherited by ``asyncio.gather``/``create_task`` children. Work that
+    crosses a message hop passes ``(trace_id, span_id)`` explicitly. When
+    disabled, spans cost one branch and are never recorded.
+    """
+
+    def __init__(self, exporter: Optional[OTLPJsonExporter], enabled: bool, batch_size: int = 256):
+        """Initialize tracer."""
+        self.exporter = exporter
+        self.enabled = enabled and exporter is not None
+        self.batch_size = batch_size
+        self._current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+        self._finished: list[Span] = []
+
+    def current(self) -> Optional[Span]:
+        """Span active in this context, if any."""
+        return self._current.get()
+
+    def context(self) -> tuple[Optional[str], Optional[str]]:
+        """``(trace_id, span_id)`` of the current span, for propagation."""
+        span = self._current.get()
+        return (span.trace_id, span.span_id) if span else (None, None)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        parent: Optional[tuple[Optional[str], Optional[str]]] = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        **attributes: Any,
+    ) -> Iterator[Optional[Span]]:
+        """
+        Time the enclosed block as a span.
+
+        Args:
+            name: Span name
+            parent: Explicit ``(trace_id, span_id)``; defaults to the current span
+            kind: OTLP span kind
+            **attributes: Initial attributes
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        span = self._start(name, parent, kind, attributes)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._current.reset(token)
+            self._finish(span)
+
+    def record(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        parent: Optional[tuple[Optional[str], Optional[str]]] = None,
+        **attributes: Any,
+    ):
+        """Record an already-elapsed interval (e.g. queue wait) as a span."""
+        if not self.enabled:
+            return
+        span = self._start(name, parent, SPAN_KIND_INTERNAL, attributes)
+        span.start_ns = start_ns
+        self._finish(span, end_ns)
+
+    def _start(self, name, parent, kind, attributes) -> Span:
+        trace_id, parent_id = parent if parent else self.context()
+        return Span(
+            name=name,
+            trace_id=trace_id or _new_id(16),
+            span_id=_new_id(8),
+            parent_span_id=parent_id,
+            kind=kind,
+            attributes=attributes,
+        )
+
+    def _finish(self, span: Span, end_ns: Optional[int] = None):
+        span.end_ns = end_ns or time.time_ns()
+        self._finished.append(span)
+        # Export when a trace's root ends or the batch is full
+        if span.parent_span_id is None or len(self._finished) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Export finished spans without blocking the event loop."""
+        if not self._finished:
+            return
+        batch, self._finished = self._finished, []
+        try:
+            asyncio.get_running_loop().run_in_executor(None, self.exporter.export, batch)
+        except RuntimeError:
+            self.exporter.export(batch)
+
+
+# Global tracer instance
+tracer = Tracer(
+    exporter=OTLPJsonExporter(
+        service_name=settings.trace_service_name,
+        path=settings.trace_export_path,
+        endpoint=settings.trace_endpoint,
+    ) if settings.trace_export_path or settings.trace_endpoint else None,
+    enabled=settings.tracing_enabled,
+)
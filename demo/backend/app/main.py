@@ -1,17 +1,44 @@
 """Main FastAPI application."""
+import time
+
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .core import setup_logging, settings
-from .routers import tasks_router
+from .core import setup_logging, settings, get_logger
+from .core.blob_store import blob_store
+from .core.startup import startup_profile
+from .core.loop_monitor import loop_monitor
+from .routers import tasks_router, jobs_router, debug_router
+from .services import lifecycle
 
 # Setup logging
 setup_logging()
+logger = get_logger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up services on startup (optional); release them on shutdown."""
+    if settings.instrumentation_enabled:
+        loop_monitor.install()
+    blob_store.remove_stale_spills()
+    if settings.warmup:
+        with startup_profile.phase("warmup"):
+            await lifecycle.warmup()
+    logger.info(f"Startup profile: {startup_profile.report()}")
+    yield
+    await lifecycle.shutdown()
+    await loop_monitor.uninstall()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="NeuroFabric Cognitive Framework API",
     description="Multi-agent cognitive framework inspired by neuroscience",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -26,6 +53,11 @@ app.add_middleware(
 
 # Include routers
 app.include_router(tasks_router)
+app.include_router(jobs_router)
+if settings.instrumentation_enabled:
+    app.include_router(debug_router)
+
+startup_profile.record("import", _import_started)
 
 
 @app.get("/")
@@ -39,11 +71,19 @@ async def root():
     }
 
 
+@app.get("/api/startup")
+async def startup_report():
+    """Startup phase timings (import, optional warmup)."""
+    return startup_profile.report()
+
+
 if __name__ == "__main__":
     import uvicorn
+    # Production: WORKERS=N RELOAD=false (uvicorn cannot reload multiple workers)
     uvicorn.run(
         "app.main:app",
         host=settings.host,
         port=settings.port,
-        reload=True,
+        reload=settings.reload and settings.workers == 1,
+        workers=settings.workers,
     )
@@ -1,16 +1,29 @@
 """Models package."""
-from .message import Message, MessageType, AgentType
-from .metrics import AgentMetrics, TokenUsage, PerformanceMetrics
-from .task import TaskRequest, TaskResponse, StreamEvent
+from .message import Message, AgentMessage, MessageType, AgentType
+from .metrics import AgentMetrics, TokenUsage, PerformanceMetrics, MetricDelta, apply_delta
+from .task import Priority, TaskRequest, TaskResponse, StreamEvent, StageBudget, BudgetReport
+from .job import JobStatus, JobInfo
+from .batch import BatchRequest, BatchResult, BatchSummary
 
 __all__ = [
     "Message",
+    "AgentMessage",
     "MessageType",
     "AgentType",
     "AgentMetrics",
     "TokenUsage",
     "PerformanceMetrics",
+    "MetricDelta",
+    "apply_delta",
+    "Priority",
     "TaskRequest",
     "TaskResponse",
     "StreamEvent",
+    "StageBudget",
+    "BudgetReport",
+    "JobStatus",
+    "JobInfo",
+    "BatchRequest",
+    "BatchResult",
+    "BatchSummary",
 ]
@@ -0,0 +1,33 @@
+"""Batch processing models."""
+from typing import Optional
+from pydantic import BaseModel, Field
+from .task import Priority, TaskResponse
+
+
+class BatchRequest(BaseModel):
+    """Request to process many tasks in one call."""
+    tasks: list[str] = Field(..., description="Tasks to process", min_length=1)
+    priority: Priority = Field(Priority.BATCH, description="Scheduling priority class")
+    concurrency: Optional[int] = Field(None, description="Max tasks in flight (defaults to BATCH_CONCURRENCY)", ge=1)
+    share_routing: bool = Field(True, description="Reuse one coordinator plan per task shape")
+
+
+class BatchResult(BaseModel):
+    """One NDJSON line per finished task."""
+    type: str = Field("result", description="Line type")
+    index: int = Field(..., description="Position of the task in the request")
+    duplicate_of: Optional[int] = Field(None, description="Index of the identical task whose result was reused")
+    result: TaskResponse = Field(..., description="Task result")
+
+
+class BatchSummary(BaseModel):
+    """Final NDJSON line of a batch."""
+    type: str = Field("summary", description="Line type")
+    tasks: int = Field(..., description="Tasks submitted")
+    unique_tasks: int = Field(..., description="Tasks actually processed")
+    succeeded: int = Field(..., description="Tasks that completed successfully")
+    routing_plans: int = Field(..., description="Coordinator plans computed")
+    routing_reused: int = Field(..., description="Tasks that reused a plan")
+    prompt_hits: int = Field(..., description="LLM calls served from identical sub-prompts")
+    total_cost: float = Field(..., description="Total LLM cost in USD")
+    elapsed_ms: int = Field(..., description="Wall-clock time for the batch")
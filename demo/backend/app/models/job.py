@@ -0,0 +1,30 @@
+"""Job models for the asynchronous task API."""
+from enum import Enum
+from typing import Optional
+from pydantic import BaseModel, Field
+from .task import Priority, TaskResponse
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a background job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"  # Stopped by server shutdown before finishing
+
+
+class JobInfo(BaseModel):
+    """Status (and result, once finished) of a background job."""
+    id: str = Field(..., description="Job identifier")
+    status: JobStatus = Field(..., description="Current job status")
+    task: str = Field(..., description="Original task")
+    priority: Priority = Field(Priority.STANDARD, description="Scheduling priority class")
+    created_at: int = Field(..., description="Submission time (Unix ms)")
+    started_at: Optional[int] = Field(None, description="Start time (Unix ms)")
+    finished_at: Optional[int] = Field(None, description="Completion time (Unix ms)")
+    result: Optional[TaskResponse] = Field(None, description="Task result when finished")
+    error: Optional[str] = Field(None, description="Error message if failed")
+
+    class Config:
+        use_enum_values = True
@@ -1,7 +1,11 @@
 """Message models for agent communication."""
+import weakref
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import Optional, Union
 from pydantic import BaseModel, Field
+from ..core.blob_store import BlobRef, blob_store
+from ..core.serialization import dumps
 
 
 class MessageType(str, Enum):
@@ -38,7 +42,73 @@ class Message(BaseModel):
     parent_message_id: Optional[str] = Field(None, description="Parent message ID for threading")
     from_instance_id: Optional[str] = Field(None, description="Sender instance identifier")
     to_instance_id: Optional[str] = Field(None, description="Recipient instance identifier")
+    trace_id: Optional[str] = Field(None, description="Trace the message belongs to")
+    span_id: Optional[str] = Field(None, description="Span that sent the message")
 
     class Config:
         populate_by_name = True
         use_enum_values = True
+
+
+@dataclass(slots=True, weakref_slot=True)
+class AgentMessage:
+    """
+    Lightweight message for internal agent traffic.
+
+    Same fields as ``Message`` but unvalidated and slotted, so agents can
+    exchange many per task cheaply. It is converted to ``Message`` only when
+    a ``TaskResponse`` is built, and serialized once for streaming.
+
+    A large ``body`` is moved to the blob store and read back through
+    ``content`` when needed, so the messages a task keeps hold references.
+    The blob is released when the message is garbage collected.
+    """
+    id: str
+    from_agent: AgentType
+    to_agent: AgentType
+    body: Union[str, BlobRef]
+    type: MessageType
+    timestamp: int
+    parent_message_id: Optional[str] = None
+    trace_id: Optional[str] = None
+    span_id: Optional[str] = None
+    _json: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.body = blob_store.offload(self.body)
+        if isinstance(self.body, BlobRef):
+            weakref.finalize(self, blob_store.release, self.body)
+
+    @property
+    def content(self) -> str:
+        """Message text."""
+        return blob_store.resolve(self.body)
+
+    def to_dict(self) -> dict:
+        """Dict in the API (by-alias) shape of ``Message``."""
+        return {
+            "id": self.id,
+            "from": self.from_agent,
+            "to": self.to_agent,
+            "content": self.content,
+            "type": self.type,
+            "timestamp": self.timestamp,
+            "parent_message_id": self.parent_message_id,
+            "from_instance_id": None,
+            "to_instance_id": None,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+        }
+
+    def to_json(self) -> str:
+        """JSON for the API boundary, serialized once (not kept for offloaded bodies)."""
+        if self._json is not None:
+            return self._json
+        data = dumps(self.to_dict())
+        if not isinstance(self.body, BlobRef):
+            self._json = data
+        return data
+
+    def to_model(self) -> Message:
+        """Validated API model."""
+        return Message(**self.to_dict())
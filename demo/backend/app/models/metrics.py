@@ -1,4 +1,5 @@
 """Metrics models for agent performance tracking."""
+from dataclasses import dataclass, field
 from typing import Optional
 from pydantic import BaseModel, Field
 from .message import AgentType
@@ -9,6 +10,8 @@ class TokenUsage(BaseModel):
     prompt: int = Field(0, description="Prompt tokens used")
     completion: int = Field(0, description="Completion tokens used")
     total: int = Field(0, description="Total tokens used")
+    cached_prompt: int = Field(0, description="Prompt tokens served from the provider prefix cache")
+    uncached_prompt: int = Field(0, description="Prompt tokens processed without cache")
 
 
 class AgentMetrics(BaseModel):
@@ -19,6 +22,10 @@ class AgentMetrics(BaseModel):
     cost: float = Field(0.0, description="Estimated cost in USD")
     messages_sent: int = Field(0, description="Number of messages sent")
     processing_time: int = Field(0, description="Processing time in milliseconds")
+    cascade_calls: int = Field(0, description="LLM calls that went through the model cascade")
+    escalations: int = Field(0, description="Cascade calls escalated to the larger model")
+    local_calls: int = Field(0, description="Subtasks answered by a local engine instead of the LLM")
+    cancelled_calls: int = Field(0, description="LLM calls aborted in flight (task cancelled, or lost a hedged race)")
     status: str = Field("idle", description="Current status: idle, thinking, done, error")
 
     class Config:
@@ -32,3 +39,57 @@ class PerformanceMetrics(BaseModel):
     total_tokens: int = Field(..., description="Total tokens used")
     processing_rate: float = Field(..., description="Tokens per second")
     agent_metrics: list[AgentMetrics] = Field(default_factory=list, description="Individual agent metrics")
+
+
+@dataclass(slots=True)
+class MetricDelta:
+    """
+    Change to one agent's metrics.
+
+    ``add`` holds counter increments keyed by ``AgentMetrics`` field name,
+    with token counters as ``tokens.<field>``; ``status`` is set only when it
+    changed. ``seq`` is assigned when the delta is published on a stream.
+    """
+    agent_id: str
+    status: Optional[str] = None
+    add: dict[str, float] = field(default_factory=dict)
+    seq: int = 0
+
+    def __bool__(self) -> bool:
+        return self.status is not None or bool(self.add)
+
+    def merge(self, later: "MetricDelta"):
+        """Fold a later delta for the same agent into this one."""
+        if later.status is not None:
+            self.status = later.status
+        for key, amount in later.add.items():
+            self.add[key] = self.add.get(key, 0) + amount
+
+    def to_dict(self) -> dict:
+        """Wire format (see ``apply_delta``)."""
+        data = {"seq": self.seq, "agent": self.agent_id}
+        if self.status is not None:
+            data["status"] = self.status
+        if self.add:
+            data["add"] = self.add
+        return data
+
+
+def apply_delta(state: dict[str, AgentMetrics], delta: dict) -> dict[str, AgentMetrics]:
+    """
+    Reference reducer for wire-format metric deltas.
+
+    Starting from an empty ``state``, applying every delta of a stream in
+    ``seq`` order reproduces each agent's ``AgentMetrics``.
+    """
+    metrics = state.get(delta["agent"])
+    if metrics is None:
+        metrics = state[delta["agent"]] = AgentMetrics(agent_id=delta["agent"])
+    if "status" in delta:
+        metrics.status = delta["status"]
+    for key, amount in delta.get("add", {}).items():
+        target, name = metrics, key
+        if key.startswith("tokens."):
+            target, name = metrics.tokens, key[len("tokens."):]
+        setattr(target, name, getattr(target, name) + amount)
+    return state
@@ -1,14 +1,55 @@
 """Task models for request/response."""
+from enum import Enum
 from typing import Optional
 from pydantic import BaseModel, Field
 from .message import Message
 from .metrics import AgentMetrics
 
 
+class Priority(str, Enum):
+    """Scheduling priority classes."""
+    INTERACTIVE = "interactive"
+    STANDARD = "standard"
+    BATCH = "batch"
+
+
 class TaskRequest(BaseModel):
     """Request to process a task."""
     task: str = Field(..., description="Task description to process", min_length=1)
     stream: bool = Field(True, description="Enable streaming responses")
+    priority: Priority = Field(Priority.STANDARD, description="Scheduling priority class")
+    latency_budget_ms: Optional[int] = Field(
+        None, ge=1, description="Latency deadline; the fabric plans models, tokens and stages to meet it"
+    )
+    cost_budget_usd: Optional[float] = Field(
+        None, gt=0, description="Cost ceiling in USD; the fabric plans models, tokens and stages to stay under it"
+    )
+
+
+class StageBudget(BaseModel):
+    """How one pipeline stage was planned and what it spent."""
+    stage: str = Field(..., description="Stage: plan, specialists, review or synthesis")
+    models: dict[str, str] = Field(default_factory=dict, description="Model chosen per agent")
+    max_tokens: Optional[int] = Field(None, description="Completion cap, if any")
+    hedge_model: Optional[str] = Field(None, description="Model raced against the planned one")
+    hedge_winners: list[str] = Field(default_factory=list, description="Model that answered each hedged call")
+    skipped: bool = Field(False, description="Stage skipped to stay within budget")
+    estimated_ms: int = Field(0, description="Planned latency")
+    estimated_cost: float = Field(0.0, description="Planned cost in USD")
+    elapsed_ms: int = Field(0, description="Actual latency")
+    cost: float = Field(0.0, description="Actual cost in USD")
+
+
+class BudgetReport(BaseModel):
+    """How a task's latency and cost budget was spent."""
+    latency_budget_ms: Optional[int] = Field(None, description="Requested latency deadline")
+    cost_budget_usd: Optional[float] = Field(None, description="Requested cost ceiling")
+    elapsed_ms: int = Field(0, description="Total task latency")
+    cost: float = Field(0.0, description="Total cost in USD")
+    within_latency: Optional[bool] = Field(None, description="Deadline met (None without one)")
+    within_cost: Optional[bool] = Field(None, description="Cost ceiling respected (None without one)")
+    decisions: list[str] = Field(default_factory=list, description="Trade-offs made to fit the budget")
+    stages: list[StageBudget] = Field(default_factory=list, description="Per-stage plan and spend")
 
 
 class TaskResponse(BaseModel):
@@ -19,6 +60,16 @@ class TaskResponse(BaseModel):
     final_answer: str = Field(..., description="Final synthesized answer")
     success: bool = Field(True, description="Whether task completed successfully")
     error: Optional[str] = Field(None, description="Error message if failed")
+    cached: Optional[str] = Field(
+        None, description="Served from the task memo cache: fresh, or stale (refreshing in the background)"
+    )
+    budget: Optional[BudgetReport] = Field(None, description="Budget plan and spend, when the request set limits")
+    critic_approved: Optional[bool] = Field(
+        None, description="Blocking Super-Critic verdict (None when not reviewed, audited later or unparsed)"
+    )
+    critic_issues: Optional[str] = Field(
+        None, description="Issues the Super-Critic raised; the final answer was synthesized to correct them"
+    )
 
 
 class StreamEvent(BaseModel):
@@ -0,0 +1,55 @@
+"""
+Import-time profile of the backend.
+
+Run ``python -m app.profile_imports`` to list the slowest imports measured in a
+fresh interpreter; useful for keeping cold starts fast.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+
+def import_profile(module: str = "app.main", top: int = 15) -> list[tuple[str, int, int]]:
+    """
+    Profile importing a module in a fresh interpreter (``python -X importtime``).
+
+    Returns:
+        The ``top`` slowest imports as (module, self_us, cumulative_us),
+        sorted by cumulative time
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    seen = set()
+    unique = [row for row in rows if not (row[0] in seen or seen.add(row[0]))]
+    return unique[:top]
+
+
+def main():
+    """Print the report: ``python -m app.profile_imports``."""
+    parser = argparse.ArgumentParser(description="Report the slowest imports of the backend.")
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    parser.add_argument("--top", type=int, default=15, help="Number of imports to show")
+    args = parser.parse_args()
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us in import_profile(args.module, args.top):
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 """Routers package."""
 from .tasks import router as tasks_router
+from .jobs import router as jobs_router
+from .debug import router as debug_router
 
-__all__ = ["tasks_router"]
+__all__ = ["tasks_router", "jobs_router", "debug_router"]
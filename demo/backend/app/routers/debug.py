@@ -0,0 +1,42 @@
+"""Debug endpoints for event-loop health and profiling (opt-in)."""
+import asyncio
+from fastapi import APIRouter, Query
+from fastapi.responses import PlainTextResponse
+from ..core.config import settings
+from ..core.loop_monitor import loop_monitor, sample_profile
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+# One profile at a time: concurrent samplers would skew each other
+_profile_lock = asyncio.Lock()
+
+
+@router.get("/loop")
+async def loop_health():
+    """Event-loop lag, recent stalls with stacks, and per-coroutine CPU time."""
+    return loop_monitor.report()
+
+
+@router.get("/profile")
+async def profile(
+    seconds: float = Query(5.0, gt=0),
+    interval_ms: float = Query(5.0, ge=1),
+    format: str = Query("json", pattern="^(json|folded)$"),
+):
+    """
+    Sample the event-loop thread's stack for ``seconds`` under live load.
+    
+    ``format=folded`` returns collapsed stacks for flame graph tools
+    (e.g. ``flamegraph.pl`` or speedscope).
+    """
+    seconds = min(seconds, settings.profile_max_seconds)
+    async with _profile_lock:
+        report = await asyncio.to_thread(
+            sample_profile,
+            loop_monitor.thread_id(),
+            seconds,
+            interval_ms,
+        )
+    if format == "folded":
+        return PlainTextResponse("\n".join(report["folded"]) + "\n")
+    return report
@@ -0,0 +1,68 @@
+"""API endpoints for asynchronous task jobs."""
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException
+from sse_starlette.sse import EventSourceResponse
+from ..models import TaskRequest, JobInfo
+from ..services import job_manager, SchedulerOverloaded
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+router = APIRouter(prefix="/api", tags=["jobs"])
+
+
+def _not_found(job_id: str) -> HTTPException:
+    return HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+
+@router.post("/tasks", response_model=JobInfo, status_code=202)
+async def submit_task(request: TaskRequest) -> JobInfo:
+    """
+    Submit a task for background processing.
+    
+    Returns immediately with a job id; poll ``GET /api/tasks/{id}`` or
+    subscribe to ``GET /api/tasks/{id}/events`` for progress.
+    """
+    try:
+        job = job_manager.submit(
+            request.task, request.priority, request.latency_budget_ms, request.cost_budget_usd
+        )
+    except SchedulerOverloaded as e:
+        raise HTTPException(
+            status_code=503,
+            detail=e.reason,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    return job.info()
+
+
+@router.get("/tasks/{job_id}", response_model=JobInfo)
+async def get_task(job_id: str) -> JobInfo:
+    """Get job status, and the result once finished."""
+    info = await job_manager.info(job_id)
+    if not info:
+        raise _not_found(job_id)
+    return info
+
+
+@router.get("/tasks/{job_id}/events")
+async def task_events(
+    job_id: str,
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Replay and follow a job's events via Server-Sent Events (SSE).
+    
+    Emits the same events as ``/api/process/stream``. Reconnecting clients
+    resume after the ``Last-Event-ID`` they last received.
+    """
+    start = int(last_event_id) + 1 if last_event_id and last_event_id.isdigit() else 0
+    events = await job_manager.events(job_id, start)
+    if events is None:
+        raise _not_found(job_id)
+    return EventSourceResponse(events)
+
+
+@router.get("/jobs/stats")
+async def job_stats():
+    """Worker pool and job store metrics."""
+    return job_manager.stats()
@@ -1,18 +1,80 @@
 """API endpoints for task processing."""
-from fastapi import APIRouter, HTTPException
+from typing import Awaitable, Optional, TypeVar
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from sse_starlette.sse import EventSourceResponse
-from ..models import TaskRequest, TaskResponse, StreamEvent, Message, AgentMetrics
-from ..services import orchestrator
+from ..models import TaskRequest, TaskResponse, BatchRequest
+from ..services import (
+    NeuroFabricOrchestrator,
+    task_scheduler,
+    task_cache,
+    cached_response,
+    SchedulerOverloaded,
+    run_batch,
+    MultiplexSession,
+    COMPRESSIONS,
+)
+from ..services.task_stats import task_stats, parse_window, RESOLUTIONS
+from ..services.events import TaskEventLog, attach_event_log, record_result, record_cached, record_error
+from ..core.blob_store import blob_store
+from ..core.config import settings
 from ..core.logger import get_logger
+from ..core.tracing import tracer, SPAN_KIND_SERVER
 import asyncio
-import json
+import time
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api", tags=["tasks"])
 
+T = TypeVar("T")
+
+
+def _overloaded(error: SchedulerOverloaded) -> HTTPException:
+    """503 response telling the client when to retry."""
+    return HTTPException(
+        status_code=503,
+        detail=error.reason,
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+
+def _require_stats():
+    if not settings.stats_enabled:
+        raise HTTPException(status_code=404, detail="Task statistics are disabled (STATS_ENABLED=false)")
+
+
+async def _cancel_on_disconnect(http_request: Request, work: Awaitable[T]) -> T:
+    """
+    Await ``work``, cancelling it if the client disconnects first.
+    
+    The server keeps running a handler after its client has gone (closed
+    tab, HTTP timeout), so this polls the connection and cancels the task
+    tree, including in-flight LLM requests, to free capacity at once.
+    """
+    runner = asyncio.ensure_future(work)
+    
+    async def watch():
+        while not await http_request.is_disconnected():
+            await asyncio.sleep(settings.disconnect_poll_ms / 1000)
+    
+    watcher = asyncio.create_task(watch())
+    try:
+        await asyncio.wait({runner, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not runner.done():
+            runner.cancel()
+    if not runner.done():
+        logger.info("Client disconnected; cancelling task")
+        await asyncio.wait({runner})  # Let it unwind (metrics, scheduler slot)
+    if runner.cancelled():
+        # Nobody is listening; the status is for logs only
+        raise HTTPException(status_code=499, detail="Client closed request")
+    return runner.result()
+
 
 @router.post("/process", response_model=TaskResponse)
-async def process_task(request: TaskRequest) -> TaskResponse:
+async def process_task(request: TaskRequest, http_request: Request) -> TaskResponse:
     """
     Process a task through the NeuroFabric multi-agent system.
     
@@ -20,9 +82,24 @@ async def process_task(request: TaskRequest) -> TaskResponse:
     """
     logger.info(f"Processing task: {request.task[:100]}...")
     
+    cached = cached_response(request.task)
+    if cached:
+        return cached
+    
     try:
-        result = await orchestrator.process_task(request.task)
+        # Fresh orchestrator per task: agents hold per-task state
+        with tracer.span("http.process", kind=SPAN_KIND_SERVER, priority=request.priority.value):
+            result = await _cancel_on_disconnect(http_request, task_scheduler.run(
+                lambda: NeuroFabricOrchestrator().process_task(
+                    request.task, request.latency_budget_ms, request.cost_budget_usd
+                ),
+                priority=request.priority,
+            ))
         return result
+    except SchedulerOverloaded as e:
+        raise _overloaded(e)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Task processing error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -35,95 +112,93 @@ async def process_task_stream(request: TaskRequest):
     
     Events emitted:
     - message: New agent communication
-    - metric: Agent metric update
+    - metrics: Agent metric deltas (``{"deltas": [{"seq", "agent", "status"?, "add"?}]}``)
+    - cached: Served from the task memo cache (``{"state": "fresh"|"stale"}``)
     - answer: Final answer ready
     - done: Processing complete
     - error: An error occurred
     """
-    async def event_generator():
-        """Generate SSE events during task processing."""
-        messages_sent = set()
-        metrics_sent = {}
-        
-        # Setup callbacks
-        async def on_message(message: Message):
-            if message.id not in messages_sent:
-                messages_sent.add(message.id)
-                event = StreamEvent(
-                    type="message",
-                    data=message.dict(by_alias=True)
-                )
-                yield {
-                    "event": "message",
-                    "data": json.dumps(event.data)
-                }
-        
-        async def on_metric(metric: AgentMetrics):
-            # Only send if changed
-            key = str(metric.agent_id)
-            if metrics_sent.get(key) != metric.dict():
-                metrics_sent[key] = metric.dict()
-                event = StreamEvent(
-                    type="metric",
-                    data=metric.dict()
-                )
-                yield {
-                    "event": "metric",
-                    "data": json.dumps(event.data)
-                }
-        
-        orchestrator.set_message_callback(on_message)
-        orchestrator.set_metric_callback(on_metric)
-        
+    cached = cached_response(request.task)
+    if cached:
+        # Memo hit: replay the stored run without touching the scheduler
+        log = TaskEventLog()
+        record_cached(log, cached)
+        return EventSourceResponse(log.follow())
+    
+    # Shed before opening the stream so the client gets a real 503
+    try:
+        task_scheduler.check_admission(request.priority)
+    except SchedulerOverloaded as e:
+        raise _overloaded(e)
+    
+    orchestrator = NeuroFabricOrchestrator()
+    log = TaskEventLog()
+    attach_event_log(orchestrator, log)
+    
+    async def run_task():
         try:
-            # Process task
-            result = await orchestrator.process_task(request.task)
-            
-            # Send final answer
-            if result.success:
-                answer_event = StreamEvent(
-                    type="answer",
-                    data={"answer": result.final_answer}
-                )
-                yield {
-                    "event": "answer",
-                    "data": json.dumps(answer_event.data)
-                }
-                
-                # Send done event
-                done_event = StreamEvent(
-                    type="done",
-                    data={"success": True}
-                )
-                yield {
-                    "event": "done",
-                    "data": json.dumps(done_event.data)
-                }
-            else:
-                # Send error event
-                error_event = StreamEvent(
-                    type="error",
-                    data={"error": result.error or "Unknown error"}
-                )
-                yield {
-                    "event": "error",
-                    "data": json.dumps(error_event.data)
-                }
-        
+            with tracer.span("http.process_stream", kind=SPAN_KIND_SERVER, priority=request.priority.value):
+                log.trace = tracer.context()
+                async with task_scheduler.slot(request.priority):
+                    result = await orchestrator.process_task(
+                        request.task, request.latency_budget_ms, request.cost_budget_usd
+                    )
+            record_result(log, result)
         except Exception as e:
             logger.error(f"Streaming error: {e}")
-            error_event = StreamEvent(
-                type="error",
-                data={"error": str(e)}
-            )
-            yield {
-                "event": "error",
-                "data": json.dumps(error_event.data)
-            }
+            record_error(log, e)
+    
+    async def event_generator():
+        """Generate SSE events during task processing."""
+        # Run the task separately so callbacks never block on the client
+        runner = asyncio.create_task(run_task())
+        try:
+            async for event in log.follow():
+                yield event
+        finally:
+            # Client disconnected (or stream ended early): cancel the task tree
+            if not runner.done():
+                logger.info("Stream closed before the task finished; cancelling it")
+                runner.cancel()
     
     return EventSourceResponse(event_generator())
 
 
+@router.websocket("/process/ws")
+async def process_task_ws(websocket: WebSocket, compression: str = "none"):
+    """
+    Run many tasks over one WebSocket, each as a stream with its own id.
+    
+    The client opens, cancels and re-prioritizes streams and grants
+    flow-control credit with JSON messages; the server sends compact frames
+    carrying the ``/api/process/stream`` events, compressed above
+    ``WS_COMPRESS_MIN_BYTES`` when ``compression`` is ``deflate`` or ``zstd``.
+    See ``MultiplexSession`` for the protocol.
+    """
+    await websocket.accept()
+    if compression not in COMPRESSIONS:
+        await websocket.close(code=1008, reason=f"compression must be one of: {', '.join(COMPRESSIONS)}")
+        return
+    try:
+        await MultiplexSession(websocket, compression).run()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.post("/process/batch")
+async def process_batch(request: BatchRequest):
+    """
+    Process many tasks, streaming one NDJSON line per task as it finishes.
+    
+    Identical tasks and identical LLM sub-prompts are run once, and tasks of
+    the same shape reuse one coordinator routing plan. Lines are
+    ``BatchResult`` objects (with the task's ``index``) followed by a final
+    ``BatchSummary``.
+    """
+    logger.info(f"Processing batch of {len(request.tasks)} tasks")
+    return StreamingResponse(run_batch(request), media_type="application/x-ndjson")
+
+
 @router.post("/process/traditional", response_model=TaskResponse)
 async def process_traditional(request: TaskRequest) -> TaskResponse:
     """
@@ -153,9 +228,12 @@ async def process_traditional(request: TaskRequest) -> TaskResponse:
             }
         ]
         
-        response, tokens, cost, llm_time = await llm_service.chat_completion(
-            messages=messages,
-            model="gpt-4-turbo-preview",
+        response, tokens, cost, llm_time = await task_scheduler.run(
+            lambda: llm_service.chat_completion(
+                messages=messages,
+                model="gpt-4-turbo-preview",
+            ),
+            priority=request.priority,
         )
         
         total_time = int((time.time() - start_time) * 1000)
@@ -198,11 +276,73 @@ async def process_traditional(request: TaskRequest) -> TaskResponse:
             success=True,
         )
     
+    except SchedulerOverloaded as e:
+        raise _overloaded(e)
     except Exception as e:
         logger.error(f"Traditional processing error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/scheduler/stats")
+async def scheduler_stats():
+    """Queue depth, wait-time and load-shedding metrics."""
+    return task_scheduler.stats()
+
+
+@router.get("/task-cache/stats")
+async def task_cache_stats():
+    """Task memo cache hits, stale hits and background refreshes."""
+    return task_cache.stats()
+
+
+@router.get("/blobs/stats")
+async def blob_stats():
+    """Blob store entries, memory use, spilled and deduplicated sizes."""
+    return blob_store.stats()
+
+
+@router.get("/stats")
+async def stats(
+    window: str = "1h",
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    agent: Optional[str] = None,
+    model: Optional[str] = None,
+    percentiles: str = "50,90,99",
+):
+    """
+    Task and LLM-call totals with latency percentiles over a time window.
+    
+    The window is the last ``window`` (e.g. ``15m``, ``24h``, ``7d``), or
+    ``start``..``end`` in Unix seconds. One entry per agent and model, plus
+    ``task`` for whole tasks; ``agent`` and ``model`` filter them.
+    """
+    _require_stats()
+    try:
+        quantiles = tuple(float(q) for q in percentiles.split(",") if q.strip())
+        if start is None:
+            start = (end or time.time()) - parse_window(window)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if any(not 0 <= q <= 100 for q in quantiles):
+        raise HTTPException(status_code=400, detail="Percentiles must be between 0 and 100")
+    return await task_stats.query(start, end, agent=agent, model=model, percentiles=quantiles)
+
+
+@router.get("/stats/rollups")
+async def stats_rollups(
+    resolution: str = "minute",
+    buckets: int = 60,
+    agent: Optional[str] = None,
+    model: Optional[str] = None,
+):
+    """Per-bucket task totals (or LLM-call totals for an ``agent``/``model``) at one resolution."""
+    _require_stats()
+    if resolution not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"resolution must be one of: {', '.join(RESOLUTIONS)}")
+    return await task_stats.rollups(resolution, buckets, agent=agent, model=model)
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -1,6 +1,31 @@
 """Services package."""
 from .llm_service import llm_service
+from .task_stats import task_stats
 from .memory_manager import memory_manager
-from .orchestrator import orchestrator
+from .adaptive_router import adaptive_router
+from .orchestrator import get_orchestrator, NeuroFabricOrchestrator, cached_response
+from .scheduler import task_scheduler, SchedulerOverloaded
+from .task_cache import task_cache
+from .jobs import job_manager
+from .batch import run_batch
+from .multiplex import MultiplexSession, COMPRESSIONS
+from . import lifecycle
+
+__all__ = [
+    "llm_service",
+    "memory_manager",
+    "task_stats",
+    "adaptive_router",
+    "get_orchestrator",
+    "NeuroFabricOrchestrator",
+    "cached_response",
+    "task_cache",
+    "task_scheduler",
+    "SchedulerOverloaded",
+    "job_manager",
+    "run_batch",
+    "MultiplexSession",
+    "COMPRESSIONS",
+    "lifecycle",
+]
 
-__all__ = ["llm_service", "memory_manager", "orchestrator"]
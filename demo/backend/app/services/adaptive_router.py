@@ -0,0 +1,163 @@
+"""Contextual-bandit router that learns which specialists to invoke."""
+import math
+import random
+import re
+import zlib
+from itertools import combinations
+from typing import Iterable, Optional
+from ..core.config import settings
+from ..core.logger import get_logger
+from ..models import AgentType
+
+logger = get_logger(__name__)
+
+SPECIALISTS = (
+    AgentType.ANALYST.value,
+    AgentType.SPECIALIST_MATH.value,
+    AgentType.SPECIALIST_TEXT.value,
+)
+
+# Every non-empty subset of specialists is an arm
+ARMS: tuple[frozenset, ...] = tuple(
+    frozenset(combo)
+    for size in range(1, len(SPECIALISTS) + 1)
+    for combo in combinations(SPECIALISTS, size)
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class _ArmModel:
+    """Linear reward model for one arm with diagonal confidence bounds."""
+
+    __slots__ = ("weights", "counts", "pulls")
+
+    def __init__(self, dim: int):
+        self.weights = [0.0] * dim
+        self.counts = [0.0] * dim
+        self.pulls = 0
+
+    def score(self, features: list[tuple[int, float]], alpha: float) -> float:
+        """Predicted reward plus exploration bonus."""
+        mean = 0.0
+        spread = 0.0
+        for i, x in features:
+            mean += self.weights[i] * x
+            spread += x * x / (1.0 + self.counts[i])
+        return mean + alpha * math.sqrt(spread)
+
+    def update(self, features: list[tuple[int, float]], reward: float, learning_rate: float):
+        """Single SGD step on squared error."""
+        error = reward - sum(self.weights[i] * x for i, x in features)
+        for i, x in features:
+            self.weights[i] += learning_rate * error * x
+            self.counts[i] += x * x
+        self.pulls += 1
+
+
+class AdaptiveRouter:
+    """
+    Contextual bandit over specialist subsets.
+
+    Tasks are represented as sparse hashed bag-of-words features. Each arm
+    keeps an online linear estimate of reward (acceptable critic verdict
+    minus token and latency penalties) and is chosen by upper confidence
+    bound, so selection costs a few float operations per arm.
+    """
+
+    def __init__(
+        self,
+        dim: int = 256,
+        alpha: float = 0.3,
+        learning_rate: float = 0.1,
+        min_samples: int = 20,
+    ):
+        """Initialize router."""
+        self.dim = dim
+        self.alpha = alpha
+        self.learning_rate = learning_rate
+        self.min_samples = min_samples
+        self.models = {arm: _ArmModel(dim + 1) for arm in ARMS}
+        self.samples = 0
+        self.loaded = False
+
+    @property
+    def ready(self) -> bool:
+        """Whether enough outcomes have been observed to trust the router."""
+        return self.samples >= self.min_samples
+
+    def featurize(self, task: str) -> list[tuple[int, float]]:
+        """Hash task words into a sparse, L2-normalized feature list."""
+        buckets: dict[int, float] = {}
+        for word in _WORD.findall(task.lower()):
+            index = zlib.crc32(word.encode()) % self.dim
+            buckets[index] = buckets.get(index, 0.0) + 1.0
+        norm = math.sqrt(sum(v * v for v in buckets.values())) or 1.0
+        features = [(i, v / norm) for i, v in buckets.items()]
+        features.append((self.dim, 1.0))  # Bias
+        return features
+
+    def select(self, task: str, explore: bool = True) -> frozenset:
+        """Choose the specialist subset with the best upper confidence bound."""
+        features = self.featurize(task)
+        alpha = self.alpha if explore else 0.0
+        best = max(self.models.items(), key=lambda item: (
+            item[1].score(features, alpha), random.random()
+        ))
+        return best[0]
+
+    def update(self, task: str, arm: Iterable[str], reward: float):
+        """Learn from one observed outcome."""
+        arm = frozenset(arm) & frozenset(SPECIALISTS)
+        if arm not in self.models:
+            return
+        self.models[arm].update(self.featurize(task), reward, self.learning_rate)
+        self.samples += 1
+
+    def train(self, records: list[dict]):
+        """Incrementally train from stored task memories."""
+        for record in records:
+            arm = [a for a in record.get("agents_used", []) if a in SPECIALISTS]
+            metrics = record.get("metrics", {})
+            self.update(
+                record.get("task", ""),
+                arm,
+                self.reward(
+                    success=record.get("success", True),
+                    critic_approved=record.get("critic_approved"),
+                    total_tokens=metrics.get("total_tokens", 0),
+                    total_time_ms=metrics.get("total_time_ms", 0),
+                ),
+            )
+        self.loaded = True
+        logger.info(f"Adaptive router trained on {len(records)} records ({self.samples} total)")
+
+    @staticmethod
+    def reward(
+        success: bool,
+        critic_approved: Optional[bool],
+        total_tokens: int,
+        total_time_ms: int,
+    ) -> float:
+        """Reward: acceptable outcome minus token cost and latency penalties."""
+        acceptable = success and critic_approved is not False
+        return (
+            float(acceptable)
+            - settings.router_token_penalty * total_tokens / 1000
+            - settings.router_latency_penalty * total_time_ms / 1000
+        )
+
+    def stats(self) -> dict:
+        """Summary of arm usage."""
+        return {
+            "samples": self.samples,
+            "ready": self.ready,
+            "arms": {
+                "+".join(sorted(arm)): model.pulls
+                for arm, model in self.models.items()
+            },
+        }
+
+
+# Global adaptive router instance
+adaptive_router = AdaptiveRouter(min_samples=settings.router_min_samples)
@@ -0,0 +1,219 @@
+"""Batch execution with shared routing and sub-prompt deduplication."""
+import asyncio
+import hashlib
+import json
+import re
+import time
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+from ..core.config import settings
+from ..core.logger import get_logger
+from ..models import (
+    TaskResponse,
+    TokenUsage,
+    BatchRequest,
+    BatchResult,
+    BatchSummary,
+)
+from .orchestrator import NeuroFabricOrchestrator, cached_response
+from .scheduler import task_scheduler, SchedulerOverloaded
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_QUOTED = re.compile(r"\"[^\"]*\"|'[^']*'|`[^`]*`")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def task_shape(task: str) -> str:
+    """
+    Routing key for tasks that differ only in their payload.
+
+    Uses the instruction part of the task (before the first colon or line
+    break) with quoted spans and numbers masked, so "Summarize reviews for
+    product 12: ..." and "Summarize reviews for product 97: ..." match.
+    """
+    instruction = re.split(r"[:\n]", task, maxsplit=1)[0]
+    instruction = _QUOTED.sub('"…"', instruction.lower())
+    instruction = _NUMBER.sub("#", instruction)
+    return _WHITESPACE.sub(" ", instruction).strip()[:200]
+
+
+class _Memo:
+    """
+    Async single-flight memo: concurrent callers of one key share one call.
+
+    If the caller running the call is cancelled, its waiters are not: the
+    first to resume runs the call again and the others wait on that run.
+    """
+
+    def __init__(self):
+        self._futures: dict[str, asyncio.Future] = {}
+        self.misses = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    async def get(self, key: str, factory: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Return ``(value, hit)``; failed calls are not memoized."""
+        future = self._futures.get(key)
+        while future is not None:
+            try:
+                value = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise  # This caller was cancelled, not the one running the call
+                future = self._futures.get(key)
+                continue
+            self.hits += 1
+            return value, True
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._futures[key] = future
+        try:
+            value = await factory()
+        except asyncio.CancelledError:
+            del self._futures[key]
+            future.cancel()
+            raise
+        except Exception as e:
+            del self._futures[key]
+            future.set_exception(e)
+            future.exception()  # Waiters re-raise it; don't warn if there are none
+            raise
+        future.set_result(value)
+        return value, False
+
+
+class PromptMemo(_Memo):
+    """Deduplicates identical LLM requests within a batch."""
+
+    @staticmethod
+    def key(messages: list[dict], model: Optional[str], max_tokens: Optional[int]) -> str:
+        payload = json.dumps([model, max_tokens, messages], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def call(
+        self,
+        messages: list[dict],
+        model: Optional[str],
+        max_tokens: Optional[int],
+        factory: Callable[[], Awaitable[tuple[str, TokenUsage, float, int]]],
+    ) -> tuple[str, TokenUsage, float, int]:
+        """Run ``factory`` once per identical request; repeats cost nothing."""
+        (response, tokens, cost, llm_time), hit = await self.get(
+            self.key(messages, model, max_tokens), factory
+        )
+        if hit:
+            return response, TokenUsage(), 0.0, 0
+        return response, tokens, cost, llm_time
+
+
+class BatchContext:
+    """State shared by every task of one batch."""
+
+    def __init__(self, share_routing: bool = True):
+        """Initialize batch context."""
+        self.share_routing = share_routing
+        self.prompts = PromptMemo()
+        self.routing = _Memo()
+
+    async def plan(self, task: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Coordinator routing for a task, computed once per task shape."""
+        if not self.share_routing:
+            return await factory()
+        plan, hit = await self.routing.get(task_shape(task), factory)
+        if hit:
+            logger.debug(f"Reusing routing plan for shape: {task_shape(task)[:80]}")
+        return plan
+
+
+async def run_batch(request: BatchRequest) -> AsyncIterator[str]:
+    """
+    Process a batch and yield NDJSON lines as tasks finish.
+
+    Identical tasks run once. Distinct tasks run with at most
+    ``concurrency`` in flight, each still admitted by the task scheduler.
+    The last line is a ``BatchSummary``.
+    """
+    started = time.monotonic()
+    concurrency = request.concurrency or settings.batch_concurrency
+    context = BatchContext(share_routing=request.share_routing)
+
+    # Group identical tasks: first index runs, the rest reuse its result
+    first_index: dict[str, int] = {}
+    duplicates: dict[int, list[int]] = {}
+    for index, task in enumerate(request.tasks):
+        key = _WHITESPACE.sub(" ", task.strip())
+        if key in first_index:
+            duplicates[first_index[key]].append(index)
+        else:
+            first_index[key] = index
+            duplicates[index] = []
+
+    semaphore = asyncio.Semaphore(concurrency)
+    results: asyncio.Queue = asyncio.Queue()
+    stopping = False
+
+    async def run_one(index: int):
+        task = request.tasks[index]
+        result = _failed(task, "Task was cancelled")
+        try:
+            cached = cached_response(task)
+            if cached:
+                result = cached
+                return
+            async with semaphore:
+                try:
+                    async with task_scheduler.slot(request.priority):
+                        result = await NeuroFabricOrchestrator(batch=context).process_task(task)
+                except SchedulerOverloaded as e:
+                    result = _failed(task, e.reason)
+                except Exception as e:
+                    logger.error(f"Batch task {index} failed: {e}")
+                    result = _failed(task, str(e))
+        finally:
+            # Every task reports, even one cancelled from elsewhere, or the
+            # batch would wait for it forever; only a stopped batch needs none
+            if not stopping:
+                results.put_nowait((index, result))
+
+    runners = [asyncio.create_task(run_one(i)) for i in duplicates]
+    succeeded = 0
+    total_cost = 0.0
+    try:
+        for _ in runners:
+            index, result = await results.get()
+            if not result.cached:
+                total_cost += sum(m.cost for m in result.metrics)
+            for line_index in [index] + duplicates[index]:
+                if result.success:
+                    succeeded += 1
+                yield BatchResult(
+                    index=line_index,
+                    duplicate_of=index if line_index != index else None,
+                    result=result,
+                ).json() + "\n"
+    finally:
+        # Client went away: stop the remaining work
+        stopping = True
+        for runner in runners:
+            runner.cancel()
+
+    yield BatchSummary(
+        tasks=len(request.tasks),
+        unique_tasks=len(duplicates),
+        succeeded=succeeded,
+        routing_plans=context.routing.misses,
+        routing_reused=context.routing.hits,
+        prompt_hits=context.prompts.hits,
+        total_cost=round(total_cost, 6),
+        elapsed_ms=int((time.monotonic() - started) * 1000),
+    ).json() + "\n"
+
+
+def _failed(task: str, error: str) -> TaskResponse:
+    return TaskResponse(task=task, final_answer="", success=False, error=error)
@@ -0,0 +1,35 @@
+"""Confidence scoring for the cheap-model-first cascade."""
+import math
+import re
+from typing import Optional
+
+# Phrases that indicate the model is unsure or refusing
+_HEDGES = re.compile(
+    r"\b(i'?m not sure|i am not sure|not certain|i cannot|i can'?t|unable to|"
+    r"insufficient information|not enough information|as an ai)\b",
+    re.IGNORECASE,
+)
+
+
+def score_confidence(
+    text: str,
+    mean_logprob: Optional[float] = None,
+    finish_reason: Optional[str] = None,
+) -> float:
+    """
+    Score confidence in a completion between 0 and 1.
+    
+    Starts from the geometric-mean token probability when logprobs are
+    available and applies critic-style penalties for empty, truncated or
+    hedging answers.
+    """
+    if not text.strip():
+        return 0.0
+    
+    score = math.exp(mean_logprob) if mean_logprob is not None else 1.0
+    if finish_reason == "length":
+        score *= 0.5
+    if _HEDGES.search(text):
+        score *= 0.6
+    
+    return score
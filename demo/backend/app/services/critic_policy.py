@@ -0,0 +1,34 @@
+"""Review policy deciding how (and whether) the Super-Critic runs."""
+import random
+from enum import Enum
+from typing import Iterable, Optional
+from ..core.config import settings
+
+
+class ReviewMode(str, Enum):
+    """How a result is reviewed."""
+    BLOCKING = "blocking"  # Wait for the verdict before answering
+    AUDIT = "audit"  # Answer immediately, review asynchronously
+    SKIP = "skip"  # No review
+
+
+def task_class(specialists: Iterable[str]) -> str:
+    """Task class label, e.g. 'analyst+specialist_math'."""
+    return "+".join(sorted(specialists))
+
+
+def review_mode(specialists: Iterable[str], confidence: Optional[float] = None) -> ReviewMode:
+    """Decide review mode from task class, result confidence and sampling rate."""
+    if settings.critic_mode == "off":
+        return ReviewMode.SKIP
+    if task_class(specialists) in settings.critic_skip_task_classes:
+        return ReviewMode.SKIP
+    if (
+        settings.critic_skip_confidence is not None
+        and confidence is not None
+        and confidence >= settings.critic_skip_confidence
+    ):
+        return ReviewMode.SKIP
+    if settings.critic_sample_rate < 1.0 and random.random() >= settings.critic_sample_rate:
+        return ReviewMode.SKIP
+    return ReviewMode.AUDIT if settings.critic_mode == "audit" else ReviewMode.BLOCKING
@@ -0,0 +1,183 @@
+"""Replayable per-task event logs for streaming endpoints."""
+import asyncio
+import time
+from typing import AsyncIterator, Callable, Optional
+from ..core.config import settings
+from ..core.serialization import dumps
+from ..core.tracing import tracer
+from ..models import AgentMessage, AgentMetrics, MetricDelta, TaskResponse
+
+
+class TaskEventLog:
+    """
+    Append-only log of stream events for one task.
+
+    Events are kept in SSE shape (``id``, ``event``, ``data``) so any number
+    of readers can replay from an offset and then follow new events.
+    """
+
+    def __init__(self, sink: Optional[Callable[[dict], None]] = None):
+        """
+        Initialize empty log.
+
+        Args:
+            sink: Optional callback receiving every appended event
+                (e.g. to mirror it into a shared store)
+        """
+        self.events: list[dict] = []
+        self.closed = False
+        self.sink = sink
+        # (trace_id, span_id) that emission spans are recorded under
+        self.trace: Optional[tuple[str, str]] = None
+        self._flushers: list[Callable[[], None]] = []
+        self._signal = asyncio.Event()
+
+    def append(self, event: str, data: dict):
+        """Record an event and wake followers."""
+        self.append_json(event, dumps(data))
+
+    def append_json(self, event: str, data: str):
+        """Record an event whose data is already serialized."""
+        record = {
+            "id": str(len(self.events)),
+            "event": event,
+            "data": data,
+        }
+        self.events.append(record)
+        if self.sink:
+            self.sink(record)
+        self._wake()
+
+    def add_flusher(self, flush: Callable[[], None]):
+        """Register a buffer (e.g. metric aggregation) to drain before terminal events."""
+        self._flushers.append(flush)
+
+    def flush(self):
+        """Append everything still buffered by registered flushers."""
+        for flush in self._flushers:
+            flush()
+
+    def close(self):
+        """Mark the log complete; followers stop after draining it."""
+        self.flush()
+        self.closed = True
+        self._wake()
+
+    def _wake(self):
+        self._signal.set()
+        self._signal = asyncio.Event()
+
+    async def follow(self, start: int = 0) -> AsyncIterator[dict]:
+        """Replay events from ``start``, then yield new ones until closed."""
+        index = start
+        try:
+            while True:
+                while index < len(self.events):
+                    event = self.events[index]
+                    started = time.time_ns()
+                    yield event
+                    if self.trace:
+                        # Time until the client pulled the next event
+                        tracer.record("sse.emit", started, time.time_ns(), parent=self.trace, event=event["event"])
+                    index += 1
+                if self.closed:
+                    return
+                await self._signal.wait()
+        finally:
+            if self.trace:
+                # Emission spans finish after the root span; export them now
+                tracer.flush()
+
+
+class MetricAggregator:
+    """
+    Coalesces metric deltas over a time window before they reach a log.
+
+    Within a window, deltas for the same agent are merged (last status wins,
+    counters are summed). Each flush appends one ``metrics`` event listing
+    the merged deltas, numbered with consecutive ``seq`` values so clients
+    can detect gaps. A window of 0 publishes every delta immediately.
+    """
+
+    def __init__(self, log: TaskEventLog, window: float):
+        """Initialize aggregator."""
+        self.log = log
+        self.window = window
+        self.seq = 0
+        self._pending: dict[str, MetricDelta] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        log.add_flusher(self.flush)
+
+    def add(self, delta: MetricDelta):
+        """Buffer a delta; flushes when the window closes."""
+        pending = self._pending.get(delta.agent_id)
+        if pending:
+            pending.merge(delta)
+        else:
+            self._pending[delta.agent_id] = delta
+        if self.window <= 0:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self.flush)
+
+    def flush(self):
+        """Append buffered deltas as one event."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        deltas = []
+        for delta in self._pending.values():
+            if delta:
+                self.seq += 1
+                delta.seq = self.seq
+                deltas.append(delta.to_dict())
+        self._pending = {}
+        if deltas:
+            self.log.append("metrics", {"deltas": deltas})
+
+
+def attach_event_log(orchestrator, log: TaskEventLog, window_ms: Optional[int] = None):
+    """Record an orchestrator's messages and metric deltas into a log."""
+    if window_ms is None:
+        window_ms = settings.metric_window_ms
+    aggregator = MetricAggregator(log, window_ms / 1000)
+
+    async def on_message(message: AgentMessage):
+        log.append_json("message", message.to_json())
+
+    async def on_metric(metrics: AgentMetrics, delta: MetricDelta):
+        aggregator.add(delta)
+
+    orchestrator.set_message_callback(on_message)
+    orchestrator.set_metric_callback(on_metric)
+
+
+def record_result(log: TaskEventLog, result: TaskResponse):
+    """Append the terminal events for a finished task and close the log."""
+    log.flush()
+    if result.success:
+        answer = {"answer": result.final_answer}
+        if result.critic_approved is not None:
+            answer.update(critic_approved=result.critic_approved, critic_issues=result.critic_issues)
+        log.append("answer", answer)
+        log.append("done", {"success": True})
+    else:
+        log.append("error", {"error": result.error or "Unknown error"})
+    log.close()
+
+
+def record_cached(log: TaskEventLog, result: TaskResponse):
+    """Replay a memoized task's messages, then its terminal events."""
+    for message in result.messages:
+        log.append("message", message.dict(by_alias=True))
+    log.append("cached", {"state": result.cached})
+    record_result(log, result)
+
+
+def record_error(log: TaskEventLog, error: Exception):
+    """Append an error event and close the log."""
+    log.flush()
+    log.append("error", {"error": str(error)})
+    log.close()
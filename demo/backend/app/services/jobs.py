@@ -0,0 +1,394 @@
+"""Background job execution for the asynchronous task API."""
+import asyncio
+import itertools
+import json
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Optional
+from ..core.config import settings
+from ..core.logger import get_logger
+from ..core.sqlite import connect
+from ..core.tracing import tracer, SPAN_KIND_SERVER
+from ..models import Priority, TaskResponse
+from ..models.job import JobStatus, JobInfo
+from .events import TaskEventLog, attach_event_log, record_result, record_cached, record_error
+from .orchestrator import NeuroFabricOrchestrator, cached_response
+from .scheduler import PRIORITY_RANK, SchedulerOverloaded, task_scheduler
+
+logger = get_logger(__name__)
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+@dataclass
+class Job:
+    """A submitted task and its recorded events."""
+    id: str
+    task: str
+    priority: Priority
+    latency_budget_ms: Optional[int] = None
+    cost_budget_usd: Optional[float] = None
+    status: JobStatus = JobStatus.QUEUED
+    created_at: int = field(default_factory=_now_ms)
+    started_at: Optional[int] = None
+    finished_at: Optional[int] = None
+    result: Optional[TaskResponse] = None
+    error: Optional[str] = None
+    events: TaskEventLog = field(default_factory=TaskEventLog)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+    def info(self) -> JobInfo:
+        """Public view of the job."""
+        return JobInfo(
+            id=self.id,
+            status=self.status,
+            task=self.task,
+            priority=self.priority,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            result=self.result,
+            error=self.error,
+        )
+
+
+class SharedJobStore:
+    """
+    SQLite mirror of job state and events for multi-process serving.
+
+    A job runs in the worker process that accepted it; other processes
+    answer status and event requests for it from this store. All SQLite
+    work runs on one store thread, in submission order: writes are queued
+    without blocking the event loop, and reads wait for the writes queued
+    before them.
+    """
+
+    # Seconds between polls when following another process's job
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, path: str):
+        """Initialize store (the database is created on first use)."""
+        self.path = Path(path)
+        self._ready = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-store")
+
+    def _connect(self):
+        if not self._ready:
+            self._create_tables()
+            self._ready = True
+        return connect(self.path)
+
+    def _create_tables(self):
+        with connect(self.path) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, info TEXT NOT NULL, finished INTEGER NOT NULL, "
+                "created INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_events ("
+                "job_id TEXT NOT NULL, seq INTEGER NOT NULL, event TEXT NOT NULL, "
+                "data TEXT NOT NULL, PRIMARY KEY (job_id, seq))"
+            )
+
+    def _write(self, sql: str, params: tuple):
+        """Queue a write on the store thread."""
+        self._executor.submit(self._execute, sql, params).add_done_callback(_log_write_error)
+
+    def _execute(self, sql: str, params: tuple):
+        with self._connect() as conn:
+            conn.execute(sql, params)
+
+    async def _read(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def save(self, job: Job):
+        """Queue a snapshot of the job's state."""
+        self._write(
+            "INSERT OR REPLACE INTO jobs (id, info, finished, created) VALUES (?, ?, ?, ?)",
+            (job.id, job.info().json(), int(job.finished), job.created_at),
+        )
+
+    def append_event(self, job_id: str, record: dict):
+        """Queue one event (the ``TaskEventLog`` sink)."""
+        self._write(
+            "INSERT OR REPLACE INTO job_events (job_id, seq, event, data) VALUES (?, ?, ?, ?)",
+            (job_id, int(record["id"]), record["event"], record["data"]),
+        )
+
+    async def load(self, job_id: str) -> Optional[JobInfo]:
+        return await self._read(self._load, job_id)
+
+    def _load(self, job_id: str) -> Optional[JobInfo]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT info FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return JobInfo(**json.loads(row[0])) if row else None
+
+    async def follow(self, job_id: str, start: int = 0) -> AsyncIterator[dict]:
+        """Replay and poll a job's events until it finishes."""
+        index = start
+        while True:
+            finished, rows = await self._read(self._poll, job_id, index)
+            for seq, event, data in rows:
+                yield {"id": str(seq), "event": event, "data": data}
+                index = seq + 1
+            if not finished or finished[0]:
+                return
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+    def _poll(self, job_id: str, index: int) -> tuple[Optional[tuple], list[tuple]]:
+        with self._connect() as conn:
+            finished = conn.execute(
+                "SELECT finished FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            rows = conn.execute(
+                "SELECT seq, event, data FROM job_events "
+                "WHERE job_id = ? AND seq >= ? ORDER BY seq",
+                (job_id, index),
+            ).fetchall()
+        return finished, rows
+
+    def evict(self, max_jobs: int):
+        """Queue dropping the oldest finished jobs beyond capacity."""
+        self._executor.submit(self._evict, max_jobs).add_done_callback(_log_write_error)
+
+    def _evict(self, max_jobs: int):
+        with self._connect() as conn:
+            stale = conn.execute(
+                "SELECT id FROM jobs WHERE finished = 1 ORDER BY created "
+                "LIMIT max(0, (SELECT count(*) FROM jobs) - ?)",
+                (max_jobs,),
+            ).fetchall()
+            conn.executemany("DELETE FROM jobs WHERE id = ?", stale)
+            conn.executemany("DELETE FROM job_events WHERE job_id = ?", stale)
+
+    async def close(self):
+        """Finish queued writes and stop the store thread."""
+        await asyncio.to_thread(self._executor.shutdown)
+
+
+def _log_write_error(future: Future):
+    if future.exception():
+        logger.error(f"Shared job store write failed: {future.exception()}")
+
+
+class JobManager:
+    """
+    Worker pool plus bounded job store.
+
+    Jobs are queued by priority and executed by ``workers`` background
+    coroutines, independently of HTTP request handlers. Each job runs in a
+    ``task_scheduler`` slot, so jobs share ``max_concurrent_tasks`` with
+    interactive requests. At most ``max_jobs`` jobs are retained; the oldest
+    finished jobs are evicted first.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_jobs: int,
+        max_queued: int,
+        shared_store: Optional[SharedJobStore] = None,
+    ):
+        """Initialize job manager (workers start on first submit)."""
+        self.worker_count = workers
+        self.max_jobs = max_jobs
+        self.max_queued = max_queued
+        self.shared = shared_store
+        self.jobs: OrderedDict[str, Job] = OrderedDict()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._counter = itertools.count()
+        self._workers: list[asyncio.Task] = []
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def submit(
+        self,
+        task: str,
+        priority: Priority = Priority.STANDARD,
+        latency_budget_ms: Optional[int] = None,
+        cost_budget_usd: Optional[float] = None,
+    ) -> Job:
+        """Queue a task for background execution (memo cache hits finish at once)."""
+        cached = cached_response(task)
+        if cached:
+            return self._finish_cached(task, priority, cached)
+        if self.queued >= self.max_queued:
+            raise SchedulerOverloaded("Job queue is full", retry_after=10)
+
+        self._ensure_workers()
+        job = Job(
+            id=f"job-{uuid.uuid4().hex[:12]}",
+            task=task,
+            priority=priority,
+            latency_budget_ms=latency_budget_ms,
+            cost_budget_usd=cost_budget_usd,
+        )
+        if self.shared:
+            job.events.sink = lambda record: self.shared.append_event(job.id, record)
+            self.shared.save(job)
+        self.jobs[job.id] = job
+        self._evict()
+        self._queue.put_nowait((PRIORITY_RANK[priority], next(self._counter), job))
+        logger.info(f"Job submitted: {job.id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Job accepted by this process."""
+        return self.jobs.get(job_id)
+
+    async def info(self, job_id: str) -> Optional[JobInfo]:
+        """Status of a job accepted by any process."""
+        job = self.jobs.get(job_id)
+        if job:
+            return job.info()
+        return await self.shared.load(job_id) if self.shared else None
+
+    async def events(self, job_id: str, start: int = 0) -> Optional[AsyncIterator[dict]]:
+        """Event stream of a job accepted by any process, or None if unknown."""
+        job = self.jobs.get(job_id)
+        if job:
+            return job.events.follow(start)
+        if self.shared and await self.shared.load(job_id):
+            return self.shared.follow(job_id, start)
+        return None
+
+    def _ensure_workers(self):
+        """Start the worker pool inside the running event loop."""
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(i))
+                for i in range(self.worker_count)
+            ]
+
+    def _evict(self):
+        """Drop the oldest finished jobs beyond capacity."""
+        excess = len(self.jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self.jobs.values() if j.finished][:excess]:
+            del self.jobs[job_id]
+        if self.shared:
+            self.shared.evict(self.max_jobs)
+
+    def _finish_cached(self, task: str, priority: Priority, result: TaskResponse) -> Job:
+        """Record a job that was answered from the task memo cache."""
+        job = Job(
+            id=f"job-{uuid.uuid4().hex[:12]}",
+            task=task,
+            priority=priority,
+            status=JobStatus.SUCCEEDED,
+            result=result,
+        )
+        job.started_at = job.finished_at = job.created_at
+        if self.shared:
+            job.events.sink = lambda record: self.shared.append_event(job.id, record)
+        record_cached(job.events, result)
+        if self.shared:
+            self.shared.save(job)
+        self.jobs[job.id] = job
+        self._evict()
+        logger.info(f"Job answered from task cache: {job.id}")
+        return job
+
+    async def _worker(self, worker_id: int):
+        while True:
+            _, _, job = await self._queue.get()
+            try:
+                await self._run(job)
+            except Exception as e:
+                logger.error(f"Worker {worker_id} failed on {job.id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        """Execute one job in a scheduler slot, recording events and result."""
+        orchestrator = NeuroFabricOrchestrator()
+        attach_event_log(orchestrator, job.events)
+        try:
+            with tracer.span("job.run", kind=SPAN_KIND_SERVER, job_id=job.id, priority=job.priority.value):
+                # The job queue already bounds jobs, so they wait for a slot instead of being shed
+                async with task_scheduler.slot(job.priority, shed=False):
+                    job.status = JobStatus.RUNNING
+                    job.started_at = _now_ms()
+                    if self.shared:
+                        self.shared.save(job)
+                    tracer.record("job.queue_wait", job.created_at * 1_000_000, time.time_ns())
+                    job.events.trace = tracer.context()
+                    result = await orchestrator.process_task(
+                        job.task, job.latency_budget_ms, job.cost_budget_usd
+                    )
+        except asyncio.CancelledError:
+            self._cancel(job)
+            raise
+        except Exception as e:
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+            record_error(job.events, e)
+        else:
+            job.result = result
+            job.error = result.error
+            job.status = JobStatus.SUCCEEDED if result.success else JobStatus.FAILED
+            record_result(job.events, result)
+        finally:
+            job.finished_at = _now_ms()
+            if self.shared:
+                self.shared.save(job)
+
+    def _cancel(self, job: Job):
+        """Record a job stopped by shutdown (its worker saves it)."""
+        job.status = JobStatus.CANCELLED
+        job.error = "Cancelled by server shutdown"
+        job.events.flush()
+        job.events.append("cancelled", {})
+        job.events.close()
+
+    async def shutdown(self):
+        """Stop the worker pool; running and queued jobs are marked cancelled."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        while self._queue and not self._queue.empty():
+            _, _, job = self._queue.get_nowait()
+            self._cancel(job)
+            job.finished_at = _now_ms()
+            if self.shared:
+                self.shared.save(job)
+        if self.shared:
+            await self.shared.close()
+
+    def stats(self) -> dict:
+        """Job counts by status."""
+        counts = {status.value: 0 for status in JobStatus}
+        for job in self.jobs.values():
+            counts[job.status.value] += 1
+        return {
+            "workers": len(self._workers),
+            "queued": self.queued,
+            "stored": len(self.jobs),
+            "max_jobs": self.max_jobs,
+            "by_status": counts,
+        }
+
+
+# Global job manager instance
+job_manager = JobManager(
+    workers=settings.job_workers,
+    max_jobs=settings.max_stored_jobs,
+    max_queued=settings.max_queued_jobs,
+    shared_store=SharedJobStore(settings.shared_jobs_path) if settings.workers > 1 else None,
+)
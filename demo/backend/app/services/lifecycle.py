@@ -0,0 +1,35 @@
+"""Service startup warmup and shutdown."""
+import asyncio
+from ..core.blob_store import blob_store
+from ..core.config import settings
+from ..core.logger import get_logger
+from ..core.token_budget import count_tokens
+from .llm_service import llm_service
+from .memory_manager import memory_manager
+from .task_stats import task_stats
+from .adaptive_router import adaptive_router
+from .jobs import job_manager
+
+logger = get_logger(__name__)
+
+
+async def _preload_caches():
+    """Open the memory store, load the tokenizer and train the router."""
+    records = await memory_manager.load_task_records()
+    count_tokens("warmup", settings.default_model)
+    if settings.adaptive_routing and not adaptive_router.loaded:
+        adaptive_router.train(records)
+    logger.info(f"Caches preloaded ({len(records)} task memories)")
+
+
+async def warmup():
+    """Pre-establish the LLM connection and preload caches concurrently."""
+    await asyncio.gather(llm_service.warmup(), _preload_caches())
+
+
+async def shutdown():
+    """Stop background workers and close client connections."""
+    await job_manager.shutdown()
+    await llm_service.close()
+    await task_stats.close()
+    blob_store.close()
@@ -1,25 +1,60 @@
 """LLM service for interacting with AI models."""
+import asyncio
 import time
-from typing import AsyncGenerator, Optional
-from openai import AsyncOpenAI
+from typing import AsyncGenerator, Callable, Optional
 from ..core.config import settings
 from ..core.logger import get_logger
+from ..core.token_budget import count_tokens
 from ..models.metrics import TokenUsage
+from .cascade import score_confidence
+from .response_cache import response_cache
 
 logger = get_logger(__name__)
 
+# Latency profile for models without a configured one
+DEFAULT_LATENCY = {"base_ms": 1000.0, "ms_per_token": 25.0}
+
+# Share of the prompt price charged for prefix-cached prompt tokens
+CACHED_PROMPT_PRICE_RATIO = 0.5
+
 
 class LLMService:
     """Service for LLM interactions."""
     
     def __init__(self):
-        """Initialize LLM clients."""
-        self.openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+        """Initialize LLM service (the client is created on first use)."""
+        self._openai_client = None
         self.pricing = {
             "gpt-4-turbo-preview": {"prompt": 0.01 / 1000, "completion": 0.03 / 1000},
             "gpt-4": {"prompt": 0.03 / 1000, "completion": 0.06 / 1000},
             "gpt-3.5-turbo": {"prompt": 0.0005 / 1000, "completion": 0.0015 / 1000},
         }
+        # Per-model latency profile (base_ms + ms_per_token * completion), refined by observed calls
+        self.latency = {model: dict(profile) for model, profile in settings.model_latency.items()}
+    
+    @property
+    def openai_client(self):
+        """OpenAI client, imported and constructed lazily."""
+        if self._openai_client is None:
+            if not settings.openai_api_key:
+                raise RuntimeError("OPENAI_API_KEY is not set")
+            from openai import AsyncOpenAI
+            self._openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+        return self._openai_client
+    
+    async def warmup(self):
+        """Create the client and open a pooled connection to the API."""
+        try:
+            await self.openai_client.models.list()
+            logger.info("LLM client warmed up")
+        except Exception as e:
+            logger.warning(f"LLM warmup failed: {e}")
+    
+    async def close(self):
+        """Close the client's connection pool."""
+        if self._openai_client is not None:
+            await self._openai_client.close()
+            self._openai_client = None
     
     async def chat_completion(
         self,
@@ -31,9 +66,133 @@ class LLMService:
         """
         Get chat completion from LLM.
         
+        Served from the shared response cache when enabled (cache hits report
+        zero tokens and cost).
+        
+        Returns:
+            Tuple of (response_text, token_usage, cost, processing_time_ms)
+        """
+        cache_key = self._cache_key(messages, model, temperature, max_tokens, "chat")
+        cached = cache_key and await response_cache.get(cache_key)
+        if cached:
+            return cached["text"], TokenUsage(), 0.0, 0
+        
+        _, response_text, token_usage, cost, processing_time = await self._complete(
+            messages, model, temperature, max_tokens
+        )
+        if cache_key:
+            await response_cache.put(cache_key, {"text": response_text})
+        return response_text, token_usage, cost, processing_time
+    
+    async def chat_completion_scored(
+        self,
+        messages: list[dict],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> tuple[str, TokenUsage, float, int, float]:
+        """
+        Get chat completion together with a confidence score.
+        
+        Token logprobs are requested from the provider and combined with
+        response heuristics (see ``cascade.score_confidence``).
+        
+        Returns:
+            Tuple of (response_text, token_usage, cost, processing_time_ms, confidence)
+        """
+        cache_key = self._cache_key(messages, model, temperature, max_tokens, "scored")
+        cached = cache_key and await response_cache.get(cache_key)
+        if cached:
+            return cached["text"], TokenUsage(), 0.0, 0, cached["confidence"]
+        
+        response, response_text, token_usage, cost, processing_time = await self._complete(
+            messages, model, temperature, max_tokens, logprobs=True
+        )
+        
+        choice = response.choices[0]
+        mean_logprob = None
+        content_logprobs = getattr(choice.logprobs, "content", None) if choice.logprobs else None
+        if content_logprobs:
+            mean_logprob = sum(t.logprob for t in content_logprobs) / len(content_logprobs)
+        
+        confidence = score_confidence(response_text, mean_logprob, choice.finish_reason)
+        if cache_key:
+            await response_cache.put(cache_key, {"text": response_text, "confidence": confidence})
+        return response_text, token_usage, cost, processing_time, confidence
+    
+    async def chat_completion_streamed(
+        self,
+        messages: list[dict],
+        on_text: Callable[[str], None],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> tuple[str, TokenUsage, float, int]:
+        """
+        Get chat completion, passing the text to ``on_text`` as it is generated.
+        
+        Streamed responses carry no usage, so tokens are counted locally. A
+        response cache hit is passed to ``on_text`` in one piece.
+        
         Returns:
             Tuple of (response_text, token_usage, cost, processing_time_ms)
         """
+        cache_key = self._cache_key(messages, model, temperature, max_tokens, "chat")
+        cached = cache_key and await response_cache.get(cache_key)
+        if cached:
+            on_text(cached["text"])
+            return cached["text"], TokenUsage(), 0.0, 0
+        
+        model = model or settings.default_model
+        start_time = time.time()
+        parts = []
+        async for chunk in self.chat_completion_stream(messages, model, temperature, max_tokens):
+            parts.append(chunk)
+            on_text(chunk)
+        response_text = "".join(parts)
+        processing_time = int((time.time() - start_time) * 1000)
+        
+        prompt = sum(count_tokens(m["content"], model) for m in messages)
+        completion = count_tokens(response_text, model)
+        token_usage = TokenUsage(
+            prompt=prompt,
+            completion=completion,
+            total=prompt + completion,
+            uncached_prompt=prompt,
+        )
+        cost = self._calculate_cost(model, token_usage)
+        self._observe_latency(model, processing_time, completion)
+        logger.info(
+            f"LLM stream completed: model={model}, tokens~{token_usage.total}, "
+            f"cost~${cost:.6f}, time={processing_time}ms"
+        )
+        
+        if cache_key:
+            await response_cache.put(cache_key, {"text": response_text})
+        return response_text, token_usage, cost, processing_time
+    
+    def _cache_key(
+        self,
+        messages: list[dict],
+        model: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        kind: str,
+    ) -> Optional[str]:
+        """Response cache key, or None when the cache is disabled or the call samples too randomly."""
+        if not settings.response_cache_enabled or temperature > settings.response_cache_max_temperature:
+            return None
+        return response_cache.key(messages, model or settings.default_model, temperature, max_tokens, kind)
+    
+    async def _complete(
+        self,
+        messages: list[dict],
+        model: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        **extra,
+    ):
+        """Run a completion request and extract usage, cost and text."""
         model = model or settings.default_model
         start_time = time.time()
         
@@ -43,31 +202,41 @@ class LLMService:
                 messages=messages,
                 temperature=temperature,
                 max_tokens=max_tokens,
+                **extra,
             )
             
             processing_time = int((time.time() - start_time) * 1000)
             
             # Extract usage
             usage = response.usage
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached_tokens = getattr(details, "cached_tokens", 0) or 0
             token_usage = TokenUsage(
                 prompt=usage.prompt_tokens,
                 completion=usage.completion_tokens,
                 total=usage.total_tokens,
+                cached_prompt=cached_tokens,
+                uncached_prompt=usage.prompt_tokens - cached_tokens,
             )
             
             # Calculate cost
             cost = self._calculate_cost(model, token_usage)
+            self._observe_latency(model, processing_time, token_usage.completion)
             
             # Get response text
             response_text = response.choices[0].message.content or ""
             
             logger.info(
                 f"LLM call completed: model={model}, tokens={token_usage.total}, "
-                f"cost=${cost:.6f}, time={processing_time}ms"
+                f"cached={token_usage.cached_prompt}, cost=${cost:.6f}, time={processing_time}ms"
             )
             
-            return response_text, token_usage, cost, processing_time
+            return response, response_text, token_usage, cost, processing_time
             
+        except asyncio.CancelledError:
+            # Cancelling the await closes the HTTP request; the API stops generating
+            logger.info(f"LLM call cancelled after {int((time.time() - start_time) * 1000)}ms: model={model}")
+            raise
         except Exception as e:
             logger.error(f"LLM call failed: {e}")
             raise
@@ -96,14 +265,42 @@ class LLMService:
                 stream=True,
             )
             
-            async for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+            try:
+                async for chunk in stream:
+                    if chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                # Abort the HTTP stream when the consumer stops early or is cancelled
+                await stream.close()
                     
         except Exception as e:
             logger.error(f"LLM streaming failed: {e}")
             raise
     
+    def _latency_profile(self, model: str) -> dict[str, float]:
+        if model not in self.latency:
+            # Unknown models are assumed to be as slow as the default model
+            self.latency[model] = dict(self.latency.get(settings.default_model, DEFAULT_LATENCY))
+        return self.latency[model]
+    
+    def _observe_latency(self, model: str, elapsed_ms: int, completion_tokens: int):
+        """Refine the model's per-token latency from one call (EWMA)."""
+        profile = self._latency_profile(model)
+        if completion_tokens > 0:
+            per_token = max(0.0, elapsed_ms - profile["base_ms"]) / completion_tokens
+            profile["ms_per_token"] += 0.2 * (per_token - profile["ms_per_token"])
+    
+    def estimate_latency(self, model: str, completion_tokens: int) -> float:
+        """Expected milliseconds for a call producing ``completion_tokens``."""
+        profile = self._latency_profile(model)
+        return profile["base_ms"] + profile["ms_per_token"] * completion_tokens
+    
+    def estimate_cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """Expected USD cost of a call."""
+        return self._calculate_cost(
+            model, TokenUsage(prompt=prompt_tokens, completion=completion_tokens)
+        )
+    
     def _calculate_cost(self, model: str, usage: TokenUsage) -> float:
         """Calculate cost based on token usage."""
         if model not in self.pricing:
@@ -111,7 +308,13 @@ class LLMService:
             model = "gpt-4"
         
         prices = self.pricing[model]
-        cost = (usage.prompt * prices["prompt"]) + (usage.completion * prices["completion"])
+        # Prompt tokens served from the provider prefix cache are billed at a discount
+        uncached = usage.prompt - usage.cached_prompt
+        cost = (
+            uncached * prices["prompt"]
+            + usage.cached_prompt * prices["prompt"] * CACHED_PROMPT_PRICE_RATIO
+            + usage.completion * prices["completion"]
+        )
         return cost
 
 
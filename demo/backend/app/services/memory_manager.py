@@ -1,46 +1,95 @@
 """Simple memory manager for task history and learnings."""
+import asyncio
 import json
-import os
 from typing import Optional, List
 from datetime import datetime
 from pathlib import Path
+from ..core.config import settings
 from ..core.logger import get_logger
+from ..core.sqlite import connect
 from ..models import AgentMetrics
+from .task_stats import task_stats
 
 logger = get_logger(__name__)
 
+# Number of recent task memories retained
+MAX_MEMORIES = 100
+
 
 class MemoryManager:
-    """Simple file-based memory manager."""
+    """
+    SQLite-backed memory manager.
+    
+    Every operation is a single transaction on a WAL-mode database, so any
+    number of worker processes can read and append concurrently without
+    losing updates. The async methods run SQLite in a worker thread.
+    """
     
     def __init__(self, memory_dir: str = "memory"):
-        """Initialize memory manager."""
+        """Initialize memory manager (storage is opened on first use)."""
         self.memory_dir = Path(memory_dir)
-        self.memory_dir.mkdir(exist_ok=True)
+        self.db_file = self.memory_dir / "memory.db"
+        # Pre-SQLite store, imported once if present
         self.consolidated_file = self.memory_dir / "consolidated_memory.json"
-        self._ensure_memory_file()
+        self._ready = False
     
-    def _ensure_memory_file(self):
-        """Ensure memory file exists."""
-        if not self.consolidated_file.exists():
-            self._save_memories([])
+    def _ensure_schema(self):
+        """Create tables and import the legacy JSON store if needed."""
+        if self._ready:
+            return
+        with connect(self.db_file, immediate=True) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS memories ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)"
+            )
+            empty = conn.execute("SELECT 1 FROM memories LIMIT 1").fetchone() is None
+            if empty and self.consolidated_file.exists():
+                try:
+                    legacy = json.loads(self.consolidated_file.read_text())
+                except Exception as e:
+                    logger.error(f"Failed to import legacy memories: {e}")
+                    legacy = []
+                conn.executemany(
+                    "INSERT INTO memories (data) VALUES (?)",
+                    [(json.dumps(m),) for m in legacy[-MAX_MEMORIES:]],
+                )
+                logger.info(f"Imported {len(legacy)} memories from {self.consolidated_file}")
+        self._ready = True
     
     def _load_memories(self) -> List[dict]:
-        """Load memories from file."""
+        """Load memories, oldest first."""
         try:
-            with open(self.consolidated_file, 'r') as f:
-                return json.load(f)
+            self._ensure_schema()
+            with connect(self.db_file) as conn:
+                rows = conn.execute("SELECT data FROM memories ORDER BY seq").fetchall()
+            return [json.loads(data) for (data,) in rows]
         except Exception as e:
             logger.error(f"Failed to load memories: {e}")
             return []
     
-    def _save_memories(self, memories: List[dict]):
-        """Save memories to file."""
+    def _append_memory(self, memory: dict, keep_last: int = MAX_MEMORIES):
+        """Append a memory and trim to the most recent ``keep_last`` atomically."""
         try:
-            with open(self.consolidated_file, 'w') as f:
-                json.dump(memories, f, indent=2)
+            self._ensure_schema()
+            with connect(self.db_file) as conn:
+                conn.execute("INSERT INTO memories (data) VALUES (?)", (json.dumps(memory),))
+                self._trim(conn, keep_last)
         except Exception as e:
-            logger.error(f"Failed to save memories: {e}")
+            logger.error(f"Failed to save memory: {e}")
+    
+    def _keep_recent(self, keep_last: int):
+        """Trim stored memories to the most recent ``keep_last``."""
+        self._ensure_schema()
+        with connect(self.db_file) as conn:
+            self._trim(conn, keep_last)
+    
+    @staticmethod
+    def _trim(conn, keep_last: int):
+        conn.execute(
+            "DELETE FROM memories WHERE seq NOT IN "
+            "(SELECT seq FROM memories ORDER BY seq DESC LIMIT ?)",
+            (keep_last,),
+        )
     
     async def store_task_memory(
         self,
@@ -49,6 +98,7 @@ class MemoryManager:
         agents_used: List[str],
         metrics: List[AgentMetrics],
         success: bool = True,
+        critic_approved: Optional[bool] = None,
     ):
         """
         Store a completed task in memory.
@@ -59,9 +109,8 @@ class MemoryManager:
             agents_used: List of agent IDs that worked on this
             metrics: Performance metrics
             success: Whether task completed successfully
+            critic_approved: Super-Critic verdict, if one was parsed
         """
-        memories = self._load_memories()
-        
         # Calculate totals
         total_tokens = sum(m.tokens.total for m in metrics)
         total_cost = sum(m.cost for m in metrics)
@@ -69,12 +118,13 @@ class MemoryManager:
         
         # Create memory entry
         memory = {
-            "id": f"task_{int(datetime.now().timestamp())}",
+            "id": f"task_{int(datetime.now().timestamp() * 1000)}",
             "task": task,
             "task_length": len(task),
             "final_answer": final_answer[:500],  # Store first 500 chars
             "agents_used": agents_used,
             "success": success,
+            "critic_approved": critic_approved,
             "metrics": {
                 "total_tokens": total_tokens,
                 "total_cost": round(total_cost, 6),
@@ -84,10 +134,7 @@ class MemoryManager:
         }
         
         # Add to memories (keep last 100)
-        memories.append(memory)
-        memories = memories[-100:]  # Keep only recent 100
-        
-        self._save_memories(memories)
+        await asyncio.to_thread(self._append_memory, memory)
         logger.info(f"Stored task memory: {memory['id']}")
     
     async def retrieve_similar_tasks(
@@ -105,7 +152,7 @@ class MemoryManager:
         Returns:
             List of similar task memories
         """
-        memories = self._load_memories()
+        memories = await asyncio.to_thread(self._load_memories)
         
         if not memories:
             return []
@@ -138,9 +185,32 @@ class MemoryManager:
         
         return similar
     
+    async def load_task_records(self) -> List[dict]:
+        """Load all stored task memories."""
+        return await asyncio.to_thread(self._load_memories)
+    
     async def get_task_stats(self) -> dict:
-        """Get statistics about stored tasks."""
-        memories = self._load_memories()
+        """
+        Get task statistics.
+        
+        With ``STATS_ENABLED``, read from the ``task_stats`` rollups: every
+        task since the store was created, wall-clock times, and averages
+        over all tasks (the rollups do not split cost and time by outcome).
+        Otherwise computed from the retained memories, averaging over
+        successful tasks only.
+        """
+        if settings.stats_enabled:
+            totals = await task_stats.all_time()
+            count = totals["count"]
+            return {
+                "total_tasks": count,
+                "successful_tasks": count - totals["errors"],
+                "avg_cost": totals["cost"] / count if count else 0,
+                "avg_time_ms": totals["latency_ms_sum"] / count if count else 0,
+                "total_tokens": totals["tokens"]["total"],
+            }
+        
+        memories = await asyncio.to_thread(self._load_memories)
         
         if not memories:
             return {
@@ -163,9 +233,7 @@ class MemoryManager:
     
     async def clear_old_memories(self, keep_last: int = 50):
         """Clear old memories, keeping only recent ones."""
-        memories = self._load_memories()
-        memories = memories[-keep_last:]
-        self._save_memories(memories)
+        await asyncio.to_thread(self._keep_recent, keep_last)
         logger.info(f"Cleared old memories, kept last {keep_last}")
 
 
@@ -0,0 +1,258 @@
+"""Many task streams multiplexed over one WebSocket connection."""
+import asyncio
+import json
+import zlib
+from typing import Any, Optional, Union
+from pydantic import ValidationError
+from ..core.config import settings
+from ..core.logger import get_logger
+from ..core.serialization import dumps
+from ..core.tracing import tracer, SPAN_KIND_SERVER
+from ..models import TaskRequest
+from ..models.task import Priority
+from .events import TaskEventLog, attach_event_log, record_result, record_cached, record_error
+from .orchestrator import NeuroFabricOrchestrator, cached_response
+from .scheduler import task_scheduler, SchedulerOverloaded, QueueTicket
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = get_logger(__name__)
+
+COMPRESSIONS = ("none", "deflate", "zstd")
+
+# Events that consume flow-control credit
+PROGRESS_EVENTS = {"message", "metrics"}
+
+
+class FrameEncoder:
+    """
+    Encodes stream events as compact frames.
+
+    A frame is ``{"s": stream, "i": event id, "e": event, "d": data}`` (``i``
+    is omitted on control frames). Event data is already serialized in the
+    event log and is spliced in without re-encoding. Frames of at least
+    ``min_bytes`` are compressed with the connection's codec (``deflate`` is
+    zlib format, ``zstd`` needs the ``zstandard`` package) and sent as binary
+    messages; all other frames are text.
+    """
+
+    def __init__(self, compression: str = "none", min_bytes: Optional[int] = None):
+        """Initialize encoder; ``zstd`` falls back to ``deflate`` when unavailable."""
+        if compression == "zstd" and zstandard is None:
+            logger.info("zstandard not installed; WebSocket frames use deflate")
+            compression = "deflate"
+        self.compression = compression
+        self.min_bytes = settings.ws_compress_min_bytes if min_bytes is None else min_bytes
+        self._zstd = zstandard.ZstdCompressor(level=3) if compression == "zstd" else None
+
+    def event(self, stream_id: Any, event: dict) -> Union[str, bytes]:
+        """Frame an event from a ``TaskEventLog``."""
+        return self._finish(
+            f'{{"s":{dumps(stream_id)},"i":{event["id"]},"e":"{event["event"]}","d":{event["data"]}}}'
+        )
+
+    def control(self, stream_id: Any, event: str, data: dict) -> Union[str, bytes]:
+        """Frame a session reply (``stream_id`` None for the connection)."""
+        return self._finish(dumps({"s": stream_id, "e": event, "d": data}))
+
+    def _finish(self, frame: str) -> Union[str, bytes]:
+        if self.compression == "none" or len(frame) < self.min_bytes:
+            return frame
+        data = frame.encode("utf-8")
+        return self._zstd.compress(data) if self._zstd else zlib.compress(data, 6)
+
+
+class _Stream:
+    """One task running on a multiplexed connection."""
+
+    def __init__(self, stream_id: Any, priority: Priority, progress: bool = True):
+        self.id = stream_id
+        self.progress = progress
+        self.log = TaskEventLog()
+        self.ticket = QueueTicket(priority)
+        self.credit = settings.ws_initial_credit
+        self.credited = asyncio.Event()
+        self.runner: Optional[asyncio.Task] = None
+        self.pump: Optional[asyncio.Task] = None
+
+    def grant(self, events: int):
+        """Allow ``events`` more progress events."""
+        self.credit += events
+        self.credited.set()
+
+
+class MultiplexSession:
+    """
+    Serves one WebSocket connection carrying many task streams.
+
+    Client messages are JSON objects with a ``type``:
+
+    - ``open``: start a task (``stream`` id chosen by the client, plus the
+      ``TaskRequest`` fields; ``"progress": false`` sends only the terminal
+      events, as batch clients want)
+    - ``credit``: allow ``n`` more progress events on ``stream`` (ignored
+      once the stream has ended)
+    - ``cancel``: cancel ``stream``'s task tree
+    - ``priority``: move ``stream`` to another priority class while queued
+
+    Each stream delivers the events of ``/api/process/stream`` plus
+    ``cancelled``, in order. ``message`` and ``metrics`` events consume one
+    credit each; while a stream has none, its events wait in the stream's
+    event log, so a slow consumer never blocks the task or the other streams.
+    """
+
+    def __init__(self, websocket, compression: str = "none"):
+        """Initialize session for an accepted WebSocket."""
+        self.websocket = websocket
+        self.encoder = FrameEncoder(compression)
+        self.streams: dict[Any, _Stream] = {}
+        self._send_lock = asyncio.Lock()
+
+    async def run(self):
+        """Handle client messages until the connection closes, then cancel its tasks."""
+        await self._control(None, "hello", {
+            "compression": self.encoder.compression,
+            "compress_min_bytes": self.encoder.min_bytes,
+            "max_streams": settings.ws_max_streams,
+            "initial_credit": settings.ws_initial_credit,
+        })
+        try:
+            while True:
+                text = await self.websocket.receive_text()
+                try:
+                    message = json.loads(text)
+                except ValueError:
+                    await self._control(None, "error", {"error": "Invalid JSON"})
+                    continue
+                await self.handle(message)
+        finally:
+            await self.close()
+
+    async def handle(self, message: Any):
+        """Dispatch one client control message."""
+        if not isinstance(message, dict):
+            await self._control(None, "error", {"error": "Expected a JSON object"})
+            return
+        kind = message.get("type")
+        stream_id = message.get("stream")
+        if kind == "open":
+            await self._open(stream_id, message)
+            return
+        stream = self.streams.get(stream_id)
+        if kind not in ("credit", "cancel", "priority"):
+            await self._control(stream_id, "error", {"error": f"Unknown message type: {kind}"})
+        elif stream is None:
+            if kind == "credit":
+                return  # Raced the end of the stream
+            await self._control(stream_id, "error", {"error": f"Unknown stream: {stream_id}"})
+        elif kind == "credit":
+            events = message.get("n")
+            if not isinstance(events, int) or events < 0:
+                await self._control(stream_id, "error", {"error": "Credit n must be a non-negative integer"})
+                return
+            stream.grant(events)
+        elif kind == "cancel":
+            if stream.runner and not stream.runner.done():
+                stream.runner.cancel()
+        else:
+            try:
+                priority = Priority(message.get("priority"))
+            except ValueError:
+                await self._control(stream_id, "error", {"error": f"Unknown priority: {message.get('priority')}"})
+                return
+            queued = task_scheduler.reprioritize(stream.ticket, priority)
+            await self._control(stream_id, "priority", {"priority": priority.value, "queued": queued})
+
+    async def _open(self, stream_id: Any, message: dict):
+        """Start a task on a new stream."""
+        if not isinstance(stream_id, (str, int)) or stream_id in self.streams:
+            await self._control(stream_id, "error", {"error": "Stream id missing or already open"})
+            return
+        if len(self.streams) >= settings.ws_max_streams:
+            await self._control(stream_id, "error", {"error": f"Too many open streams ({settings.ws_max_streams})"})
+            return
+        try:
+            request = TaskRequest(**{k: v for k, v in message.items() if k not in ("type", "stream", "progress")})
+        except ValidationError as e:
+            await self._control(stream_id, "error", {"error": str(e)})
+            return
+
+        stream = _Stream(stream_id, request.priority, progress=message.get("progress", True) is not False)
+        cached = cached_response(request.task)
+        if cached:
+            # Memo hit: replay the stored run without touching the scheduler
+            record_cached(stream.log, cached)
+        else:
+            try:
+                task_scheduler.check_admission(request.priority)
+            except SchedulerOverloaded as e:
+                await self._control(stream_id, "error", {"error": e.reason, "retry_after": e.retry_after})
+                return
+        self.streams[stream_id] = stream
+        if not cached:
+            stream.runner = asyncio.create_task(self._run_task(stream, request))
+        stream.pump = asyncio.create_task(self._pump(stream))
+
+    async def _run_task(self, stream: _Stream, request: TaskRequest):
+        """Run the stream's task into its event log."""
+        orchestrator = NeuroFabricOrchestrator()
+        attach_event_log(orchestrator, stream.log)
+        try:
+            with tracer.span("ws.process", kind=SPAN_KIND_SERVER, priority=request.priority.value):
+                stream.log.trace = tracer.context()
+                async with task_scheduler.slot(request.priority, stream.ticket):
+                    result = await orchestrator.process_task(
+                        request.task, request.latency_budget_ms, request.cost_budget_usd
+                    )
+            record_result(stream.log, result)
+        except asyncio.CancelledError:
+            stream.log.flush()
+            stream.log.append("cancelled", {})
+            stream.log.close()
+            raise
+        except Exception as e:
+            logger.error(f"WebSocket stream error: {e}")
+            record_error(stream.log, e)
+
+    async def _pump(self, stream: _Stream):
+        """Send a stream's events as its credit allows."""
+        try:
+            async for event in stream.log.follow():
+                if event["event"] in PROGRESS_EVENTS:
+                    if not stream.progress:
+                        continue
+                    while stream.credit <= 0:
+                        stream.credited.clear()
+                        await stream.credited.wait()
+                    stream.credit -= 1
+                await self._send(self.encoder.event(stream.id, event))
+        finally:
+            if self.streams.get(stream.id) is stream:
+                del self.streams[stream.id]
+
+    async def _control(self, stream_id: Any, event: str, data: dict):
+        await self._send(self.encoder.control(stream_id, event, data))
+
+    async def _send(self, frame: Union[str, bytes]):
+        # Stream pumps send concurrently; frames must not interleave
+        async with self._send_lock:
+            if isinstance(frame, bytes):
+                await self.websocket.send_bytes(frame)
+            else:
+                await self.websocket.send_text(frame)
+
+    async def close(self):
+        """Cancel every open stream's task and stop sending."""
+        tasks = []
+        for stream in list(self.streams.values()):
+            for task in (stream.runner, stream.pump):
+                if task and not task.done():
+                    task.cancel()
+                    tasks.append(task)
+        if tasks:
+            logger.info(f"WebSocket closed with {len(self.streams)} open streams; cancelling them")
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self.streams.clear()
@@ -1,25 +1,60 @@
 """Orchestrator for coordinating the multi-agent system."""
 import asyncio
+import time
+from contextlib import nullcontext
 from typing import Optional, Callable, Awaitable, Dict
-from ..models import Message, MessageType, AgentType, AgentMetrics, TaskResponse
+from ..models import AgentMessage, MessageType, AgentType, AgentMetrics, MetricDelta, TaskResponse, Priority, TokenUsage
 from ..agents import (
     CoordinatorAgent,
     AnalystAgent,
     MathSpecialistAgent,
     TextSpecialistAgent,
     SuperCriticAgent,
+    parse_verdict,
+    verdict_issues,
 )
-from ..services import memory_manager
+from ..services import memory_manager, adaptive_router, task_stats
+from ..core.config import settings
 from ..core.logger import get_logger
+from ..core.token_budget import TokenBudget, PromptSection, count_tokens
+from ..core.tracing import tracer
+from .cascade import score_confidence
+from .critic_policy import ReviewMode, review_mode
+from .scheduler import task_scheduler, SchedulerOverloaded
+from .sla import BudgetTracker, Stage, StagePlan
+from .task_cache import task_cache
 
 logger = get_logger(__name__)
 
+# Specialist response keys -> agent ids
+SPECIALIST_AGENTS = {
+    "analyst": AgentType.ANALYST.value,
+    "math": AgentType.SPECIALIST_MATH.value,
+    "text": AgentType.SPECIALIST_TEXT.value,
+}
+
+# Coordinator plan fields -> specialist response keys
+ROUTING_FIELDS = {
+    "needs_analyst": "analyst",
+    "needs_math": "math",
+    "needs_text": "text",
+}
+
+# Prompt tokens added to the task by system prompts and templates (budget estimates)
+PROMPT_OVERHEAD_TOKENS = 200
+
 
 class NeuroFabricOrchestrator:
     """Orchestrates the multi-agent cognitive framework."""
     
-    def __init__(self):
-        """Initialize orchestrator and agents."""
+    def __init__(self, batch=None):
+        """
+        Initialize orchestrator and agents.
+        
+        Args:
+            batch: Optional ``BatchContext`` shared with the other tasks of a
+                batch (routing reuse and sub-prompt deduplication)
+        """
         self.coordinator = CoordinatorAgent()
         self.analyst = AnalystAgent()
         self.math_specialist = MathSpecialistAgent()
@@ -35,15 +70,27 @@ class NeuroFabricOrchestrator:
         }
         
         # Message and metric collection
-        self.messages: list[Message] = []
+        self.messages: list[AgentMessage] = []
         self.metrics_map: Dict[AgentType, AgentMetrics] = {}
         
+        # Post-hoc work (critic audits) still in flight
+        self._background_tasks: set[asyncio.Task] = set()
+        
         # Callbacks for streaming
-        self.message_callback: Optional[Callable[[Message], Awaitable[None]]] = None
-        self.metric_callback: Optional[Callable[[AgentMetrics], Awaitable[None]]] = None
+        self.message_callback: Optional[Callable[[AgentMessage], Awaitable[None]]] = None
+        self.metric_callback: Optional[Callable[[AgentMetrics, MetricDelta], Awaitable[None]]] = None
         
         # Setup agent callbacks
         self._setup_callbacks()
+        
+        # Budget planning swaps models per stage; these are the configured ones
+        self._default_models = {t.value: agent.model for t, agent in self.agents.items()}
+        self.budget: Optional[BudgetTracker] = None
+        
+        self.batch = batch
+        if batch:
+            for agent in self.agents.values():
+                agent.prompt_memo = batch.prompts
     
     def _setup_callbacks(self):
         """Setup callbacks for all agents."""
@@ -51,26 +98,26 @@ class NeuroFabricOrchestrator:
             agent.set_message_callback(self._on_message)
             agent.set_metric_callback(self._on_metric_update)
     
-    def set_message_callback(self, callback: Callable[[Message], Awaitable[None]]):
+    def set_message_callback(self, callback: Callable[[AgentMessage], Awaitable[None]]):
         """Set callback for message events."""
         self.message_callback = callback
     
-    def set_metric_callback(self, callback: Callable[[AgentMetrics], Awaitable[None]]):
+    def set_metric_callback(self, callback: Callable[[AgentMetrics, MetricDelta], Awaitable[None]]):
         """Set callback for metric events."""
         self.metric_callback = callback
     
-    async def _on_message(self, message: Message):
+    async def _on_message(self, message: AgentMessage):
         """Handle message from agent."""
         self.messages.append(message)
         if self.message_callback:
             await self.message_callback(message)
         logger.debug(f"Message: {message.from_agent} -> {message.to_agent}")
     
-    async def _on_metric_update(self, metrics: AgentMetrics):
+    async def _on_metric_update(self, metrics: AgentMetrics, delta: MetricDelta):
         """Handle metric update from agent."""
         self.metrics_map[metrics.agent_id] = metrics
         if self.metric_callback:
-            await self.metric_callback(metrics)
+            await self.metric_callback(metrics, delta)
         logger.debug(f"Metrics updated: {metrics.agent_id} - {metrics.status}")
     
     def reset(self):
@@ -80,18 +127,68 @@ class NeuroFabricOrchestrator:
         for agent in self.agents.values():
             agent.reset_metrics()
     
-    async def process_task(self, task: str) -> TaskResponse:
+    async def process_task(
+        self,
+        task: str,
+        latency_budget_ms: Optional[int] = None,
+        cost_budget_usd: Optional[float] = None,
+    ) -> TaskResponse:
         """
         Process a task through the multi-agent system.
         
         Args:
             task: The task to process
+            latency_budget_ms: Optional deadline; stages are planned to meet it
+                and agents may trade depth for speed (e.g. local engines)
+            cost_budget_usd: Optional cost ceiling; stages are planned under it
         
         Returns:
-            TaskResponse with messages, metrics, and final answer
+            TaskResponse with messages, metrics, and final answer (plus a
+            budget report when a limit was set)
         """
+        started = time.monotonic()
+        deadline = started + latency_budget_ms / 1000 if latency_budget_ms else None
+        for agent_type, agent in self.agents.items():
+            # Undo the previous task's budget plan
+            agent.model = self._default_models[agent_type.value]
+            agent.max_tokens_cap = None
+            agent.hedge_model = None
+            agent.hedge_winners = []
+            agent.deadline = deadline
+        self.budget = BudgetTracker(latency_budget_ms, cost_budget_usd) if deadline or cost_budget_usd else None
+        
+        with tracer.span(
+            "fabric.task",
+            task_length=len(task),
+            latency_budget_ms=latency_budget_ms,
+            cost_budget_usd=cost_budget_usd,
+        ) as span:
+            result = await self._process_task(task)
+            if span:
+                span.set(success=result.success)
+                span.error = result.error
+        # A budgeted run may be degraded (cheaper models, capped output, local
+        # engines); only unconstrained runs are memoized
+        if settings.task_cache_enabled and self.budget is None:
+            task_cache.put(task, result)
+        if settings.stats_enabled:
+            task_stats.record_task(
+                success=result.success,
+                cost=sum(m.cost for m in result.metrics),
+                tokens=TokenUsage(
+                    prompt=sum(m.tokens.prompt for m in result.metrics),
+                    completion=sum(m.tokens.completion for m in result.metrics),
+                ),
+                latency_ms=(time.monotonic() - started) * 1000,
+            )
+        return result
+    
+    async def _process_task(self, task: str) -> TaskResponse:
+        """Run the fabric pipeline for one task."""
         self.reset()
         logger.info(f"Processing task: {task[:100]}...")
+        audit_task = None
+        launched: dict[str, asyncio.Task] = {}
         
         try:
             # Check memory for similar tasks
@@ -106,114 +203,388 @@ class NeuroFabricOrchestrator:
             
             # Step 1: Coordinator analyzes task
             enriched_task = task + context_info
-            user_msg = Message(
+            trace_id, span_id = tracer.context()
+            user_msg = AgentMessage(
                 id="msg_user_request",
                 from_agent=AgentType.USER,
                 to_agent=AgentType.COORDINATOR,
-                content=enriched_task,
+                body=enriched_task,
                 type=MessageType.REQUEST,
                 timestamp=0,
+                trace_id=trace_id,
+                span_id=span_id,
             )
             await self._on_message(user_msg)
             
-            delegation_plan = await self.coordinator.process_message(user_msg)
-            
-            # Step 2: Delegate to specialists in parallel
-            specialist_tasks = []
-            
-            # Check which specialists are needed based on task
-            needs_analyst = "analy" in task.lower() or "insight" in task.lower()
-            needs_math = any(word in task.lower() for word in ["calculate", "number", "statistic", "data"])
-            needs_text = any(word in task.lower() for word in ["write", "summarize", "text", "document"])
-            
-            # Always use at least analyst if nothing specific
-            if not (needs_math or needs_text):
-                needs_analyst = True
-            
             specialist_responses = {}
             
-            if needs_analyst:
-                specialist_tasks.append(self._delegate_to_specialist(
-                    self.analyst,
-                    AgentType.ANALYST,
-                    f"Analyze this task and provide insights: {task}",
-                    specialist_responses,
-                    "analyst"
-                ))
+            def launch(key: str):
+                if key not in launched:
+                    launched[key] = asyncio.create_task(
+                        self._delegate(key, task, specialist_responses)
+                    )
             
-            if needs_math:
-                specialist_tasks.append(self._delegate_to_specialist(
-                    self.math_specialist,
-                    AgentType.SPECIALIST_MATH,
-                    f"Handle mathematical/statistical aspects of: {task}",
-                    specialist_responses,
-                    "math"
-                ))
+            plan = self._plan_stage("plan", task)
+            with self._stage(plan, [self.coordinator]), tracer.span("fabric.route") as span:
+                if self.batch:
+                    # Tasks of the same shape in a batch share one plan
+                    delegation_plan, selection = await self.batch.plan(
+                        task, lambda: self._plan(user_msg, task)
+                    )
+                elif self.budget:
+                    # Budgeted stages run one after another so each can be planned
+                    delegation_plan, selection = await self._plan(user_msg, task)
+                else:
+                    # Specialists start while the coordinator is still writing its plan
+                    delegation_plan, selection = await self._plan(user_msg, task, launch)
+                if span:
+                    span.set(
+                        analyst=selection[0],
+                        math=selection[1],
+                        text=selection[2],
+                        started_early=len(launched),
+                    )
             
-            if needs_text:
-                specialist_tasks.append(self._delegate_to_specialist(
-                    self.text_specialist,
-                    AgentType.SPECIALIST_TEXT,
-                    f"Handle text processing aspects of: {task}",
-                    specialist_responses,
-                    "text"
-                ))
+            # Step 2: Delegate to the remaining specialists; all run in parallel
+            for key, needed in zip(ROUTING_FIELDS.values(), selection):
+                if needed:
+                    launch(key)
             
             # Wait for all specialists
-            if specialist_tasks:
-                await asyncio.gather(*specialist_tasks)
+            if launched:
+                plan = self._plan_stage("specialists", task, selection)
+                with self._stage(plan, self._specialists(selection)):
+                    await asyncio.gather(*launched.values())
             
-            # Step 3: Super-Critic reviews (optional, for quality)
+            # Step 3: Super-Critic reviews (policy: blocking, post-hoc audit or skip)
+            critic_approved = None
+            issues = ""
             if specialist_responses:
-                critique_content = "Review these responses:\n\n" + "\n\n".join([
-                    f"{k}: {v[:200]}..." for k, v in specialist_responses.items()
-                ])
+                specialists = [SPECIALIST_AGENTS[k] for k in specialist_responses]
+                confidence = min(score_confidence(v) for v in specialist_responses.values())
+                mode = review_mode(specialists, confidence)
+                plan = self._plan_stage("review", task, selection) if mode != ReviewMode.SKIP else None
+                if plan and plan.skipped:
+                    # Optional stage dropped to stay within the deadline or cost ceiling
+                    mode = ReviewMode.SKIP
+                    self.budget.skip(plan)
+                logger.info(f"Critic review mode: {mode.value}")
                 
-                critique_msg = Message(
-                    id="msg_critique_request",
-                    from_agent=AgentType.COORDINATOR,
-                    to_agent=AgentType.SUPER_CRITIC,
-                    content=critique_content,
-                    type=MessageType.REQUEST,
-                    timestamp=0,
-                )
-                critique = await self.super_critic.process_message(critique_msg)
+                if mode == ReviewMode.BLOCKING:
+                    critic_approved, critique = await self._review(specialist_responses, plan)
+                    if critic_approved is False:
+                        # Synthesis corrects what the critic flagged
+                        issues = verdict_issues(critique)
+                        logger.info(f"Critic requested revision: {issues[:100]}")
+                elif mode == ReviewMode.AUDIT:
+                    # Overlaps with synthesis; the verdict is recorded when it arrives
+                    audit_task = asyncio.create_task(self._review(specialist_responses, plan))
             
             # Step 4: Coordinator synthesizes final answer
-            final_answer = await self.coordinator.synthesize_final_answer(
-                original_task=task,
-                specialist_responses=specialist_responses,
-            )
+            plan = self._plan_stage("synthesis", task, selection)
+            with self._stage(plan, [self.coordinator]), tracer.span("fabric.synthesize"):
+                final_answer = await self.coordinator.synthesize_final_answer(
+                    original_task=task,
+                    specialist_responses=specialist_responses,
+                    issues=issues,
+                )
             
             # Store in memory
-            agents_used = list(self.metrics_map.keys())
-            await memory_manager.store_task_memory(
-                task=task,
-                final_answer=final_answer,
-                agents_used=[str(a) for a in agents_used],
-                metrics=list(self.metrics_map.values()),
-                success=True,
-            )
+            if audit_task:
+                self._run_in_background(self._record_after_audit(
+                    audit_task, task, final_answer, self.metrics_map
+                ))
+            else:
+                await self._record_outcome(task, final_answer, self.metrics_map, critic_approved)
             
             # Return response
             return TaskResponse(
                 task=task,
-                messages=self.messages,
+                messages=[m.to_model() for m in self.messages],
                 metrics=list(self.metrics_map.values()),
                 final_answer=final_answer,
                 success=True,
+                budget=self.budget.finish() if self.budget else None,
+                critic_approved=critic_approved,
+                critic_issues=issues or None,
             )
             
+        except asyncio.CancelledError:
+            # Cancelling this task already cancelled the awaited gather() children
+            # and in-flight LLM requests; tasks spawned on the side go too
+            if audit_task:
+                audit_task.cancel()
+            self._log_cancelled(task)
+            raise
         except Exception as e:
             logger.error(f"Task processing failed: {e}")
             return TaskResponse(
                 task=task,
-                messages=self.messages,
+                messages=[m.to_model() for m in self.messages],
                 metrics=list(self.metrics_map.values()),
                 final_answer="",
                 success=False,
+                budget=self.budget.finish() if self.budget else None,
                 error=str(e),
             )
+        finally:
+            # Specialists started during routing are orphaned if it failed
+            for running in launched.values():
+                running.cancel()
+    
+    async def _plan(
+        self,
+        user_msg: AgentMessage,
+        task: str,
+        on_route: Optional[Callable[[str], None]] = None,
+    ) -> tuple[str, tuple[bool, bool, bool]]:
+        """
+        Coordinator analysis plus specialist selection for a task.
+        
+        With coordinator routing the analysis is parsed while it streams, and
+        ``on_route(key)`` is called as soon as a ``needs_*`` field selects a
+        specialist, before the delegation plan is finished.
+        """
+        decisions: dict[str, bool] = {}
+        
+        def on_field(name: str, value):
+            if name in ROUTING_FIELDS and isinstance(value, bool):
+                decisions[name] = value
+                if value and on_route:
+                    on_route(ROUTING_FIELDS[name])
+        
+        follow_coordinator = settings.coordinator_routing and not await self._adaptive_ready()
+        delegation_plan = await self.coordinator.process_message(
+            user_msg, on_field if follow_coordinator else None
+        )
+        if decisions:
+            logger.info(f"Coordinator routed: {decisions}")
+        return delegation_plan, await self._select_specialists(task, decisions)
+    
+    async def _review(
+        self,
+        specialist_responses: dict[str, str],
+        plan: Optional[StagePlan] = None,
+    ) -> tuple[Optional[bool], str]:
+        """Ask the Super-Critic for a compact verdict on specialist responses; returns (verdict, critique)."""
+        with self._stage(plan, [self.super_critic]), tracer.span("fabric.review") as span:
+            critique = await self._request_critique(specialist_responses)
+            verdict = parse_verdict(critique)
+            if span:
+                span.set(approved=verdict)
+            return verdict, critique or ""
+    
+    async def _request_critique(self, specialist_responses: dict[str, str]) -> Optional[str]:
+        review_budget = TokenBudget(
+            model=self.super_critic.model,
+            limit=settings.critic_review_budget,
+        )
+        fitted = review_budget.fit([
+            PromptSection(k, f"{k}: {v}") for k, v in specialist_responses.items()
+        ])
+        critique_content = "Review these responses:\n\n" + "\n\n".join(fitted.values())
+        
+        trace_id, span_id = tracer.context()
+        critique_msg = AgentMessage(
+            id="msg_critique_request",
+            from_agent=AgentType.COORDINATOR,
+            to_agent=AgentType.SUPER_CRITIC,
+            body=critique_content,
+            type=MessageType.REQUEST,
+            timestamp=0,
+            trace_id=trace_id,
+            span_id=span_id,
+        )
+        return await self.super_critic.process_message(critique_msg)
+    
+    async def _record_outcome(
+        self,
+        task: str,
+        final_answer: str,
+        metrics_map: Dict[AgentType, AgentMetrics],
+        critic_approved: Optional[bool],
+    ):
+        """Store task memory and feed the outcome to the adaptive router."""
+        agents_used = [str(a) for a in metrics_map.keys()]
+        metrics = list(metrics_map.values())
+        await memory_manager.store_task_memory(
+            task=task,
+            final_answer=final_answer,
+            agents_used=agents_used,
+            metrics=metrics,
+            success=True,
+            critic_approved=critic_approved,
+        )
+        
+        if settings.adaptive_routing:
+            adaptive_router.update(
+                task,
+                agents_used,
+                adaptive_router.reward(
+                    success=True,
+                    critic_approved=critic_approved,
+                    total_tokens=sum(m.tokens.total for m in metrics),
+                    total_time_ms=sum(m.processing_time for m in metrics),
+                ),
+            )
+    
+    async def _record_after_audit(
+        self,
+        audit_task: asyncio.Task,
+        task: str,
+        final_answer: str,
+        metrics_map: Dict[AgentType, AgentMetrics],
+    ):
+        """Wait for a post-hoc critic audit, then record the outcome."""
+        try:
+            critic_approved, _ = await audit_task
+        except Exception as e:
+            logger.error(f"Critic audit failed: {e}")
+            critic_approved = None
+        
+        if critic_approved is False:
+            logger.warning(f"Critic audit flagged answer for revision: {task[:100]}")
+        await self._record_outcome(task, final_answer, metrics_map, critic_approved)
+    
+    def _specialists(self, selection: Optional[tuple[bool, bool, bool]]) -> list:
+        """Specialist agents picked by routing (the analyst alone before routing)."""
+        if selection is None:
+            return [self.analyst]
+        agents = (self.analyst, self.math_specialist, self.text_specialist)
+        return [agent for agent, needed in zip(agents, selection) if needed]
+    
+    def _plan_stage(
+        self,
+        stage: str,
+        task: str,
+        selection: Optional[tuple[bool, bool, bool]] = None,
+    ) -> Optional[StagePlan]:
+        """
+        Plan ``stage`` and the stages after it within the remaining budget,
+        and apply the plan (models, completion cap, hedging) to its agents.
+        """
+        if not self.budget:
+            return None
+        
+        task_tokens = count_tokens(task) + PROMPT_OVERHEAD_TOKENS
+        expected = settings.sla_expected_output_tokens
+        specialists = self._specialists(selection)
+        coordinator = {AgentType.COORDINATOR.value: self._default_models[AgentType.COORDINATOR.value]}
+        stages = [
+            Stage("plan", coordinator, task_tokens),
+            Stage(
+                "specialists",
+                {a.agent_type.value: self._default_models[a.agent_type.value] for a in specialists},
+                task_tokens,
+            ),
+            Stage(
+                "review",
+                {AgentType.SUPER_CRITIC.value: self._default_models[AgentType.SUPER_CRITIC.value]},
+                min(settings.critic_review_budget, expected * len(specialists)),
+                output_tokens=settings.critic_verdict_max_tokens,
+                optional=True,
+            ),
+            Stage("synthesis", coordinator, task_tokens + expected * len(specialists)),
+        ]
+        names = [s.name for s in stages]
+        plan = self.budget.plan(stages[names.index(stage):])
+        
+        for agent_id, model in plan.models.items():
+            agent = self.agents[AgentType(agent_id)]
+            agent.model = model
+            agent.max_tokens_cap = plan.max_tokens
+            agent.hedge_model = plan.hedge_model
+        return plan
+    
+    def _stage(self, plan: Optional[StagePlan], agents: list):
+        """Measure a planned stage into the budget report (no-op without a budget)."""
+        return self.budget.stage(plan, agents) if plan else nullcontext()
+    
+    def _log_cancelled(self, task: str):
+        """Record what a cancelled task had spent and which calls it aborted."""
+        metrics = [agent.metrics for agent in self.agents.values()]
+        aborted = sum(m.cancelled_calls for m in metrics)
+        spent = sum(m.cost for m in metrics)
+        span = tracer.current()
+        if span:
+            span.set(cancelled=True, cancelled_calls=aborted)
+        logger.info(
+            f"Task cancelled: {aborted} LLM calls aborted, "
+            f"{sum(m.llm_calls for m in metrics)} completed (${spent:.6f}): {task[:100]}"
+        )
+    
+    def _run_in_background(self, coro):
+        """Run a coroutine without blocking the response, keeping a reference."""
+        background = asyncio.create_task(coro)
+        self._background_tasks.add(background)
+        background.add_done_callback(self._background_tasks.discard)
+    
+    async def _adaptive_ready(self) -> bool:
+        """Whether the adaptive router is enabled and has learned enough to route."""
+        if not settings.adaptive_routing:
+            return False
+        if not adaptive_router.loaded:
+            adaptive_router.train(await memory_manager.load_task_records())
+        return adaptive_router.ready
+    
+    async def _select_specialists(
+        self,
+        task: str,
+        decisions: Optional[dict[str, bool]] = None,
+    ) -> tuple[bool, bool, bool]:
+        """
+        Decide which specialists to invoke: (analyst, math, text).
+        
+        The adaptive router decides when ready; otherwise the coordinator's
+        ``decisions``, with keyword matching for fields it did not provide.
+        """
+        if await self._adaptive_ready():
+            arm = adaptive_router.select(task)
+            logger.info(f"Adaptive router selected: {sorted(arm)}")
+            return (
+                AgentType.ANALYST.value in arm,
+                AgentType.SPECIALIST_MATH.value in arm,
+                AgentType.SPECIALIST_TEXT.value in arm,
+            )
+        
+        decisions = decisions or {}
+        task_lower = task.lower()
+        needs_analyst = decisions.get("needs_analyst", "analy" in task_lower or "insight" in task_lower)
+        needs_math = decisions.get(
+            "needs_math",
+            any(word in task_lower for word in ["calculate", "number", "statistic", "data"]),
+        )
+        needs_text = decisions.get(
+            "needs_text",
+            any(word in task_lower for word in ["write", "summarize", "text", "document"]),
+        )
+        
+        # Always use at least analyst if nothing specific
+        if not (needs_math or needs_text):
+            needs_analyst = True
+        
+        return needs_analyst, needs_math, needs_text
+    
+    def _delegate(self, key: str, task: str, responses_dict: dict):
+        """Delegation to the specialist behind a response key."""
+        agent, agent_type, content = {
+            "analyst": (
+                self.analyst,
+                AgentType.ANALYST,
+                f"Analyze this task and provide insights: {task}",
+            ),
+            "math": (
+                self.math_specialist,
+                AgentType.SPECIALIST_MATH,
+                f"Handle mathematical/statistical aspects of: {task}",
+            ),
+            "text": (
+                self.text_specialist,
+                AgentType.SPECIALIST_TEXT,
+                f"Handle text processing aspects of: {task}",
+            ),
+        }[key]
+        return self._delegate_to_specialist(agent, agent_type, content, responses_dict, key)
     
     async def _delegate_to_specialist(
         self,
@@ -224,18 +595,59 @@ class NeuroFabricOrchestrator:
         key: str,
     ):
         """Delegate work to a specialist agent."""
-        msg = Message(
-            id=f"msg_delegate_{key}",
-            from_agent=AgentType.COORDINATOR,
-            to_agent=agent_type,
-            content=content,
-            type=MessageType.REQUEST,
-            timestamp=0,
-        )
-        response = await agent.process_message(msg)
+        with tracer.span("agent.delegate", agent=agent_type.value):
+            trace_id, span_id = tracer.context()
+            msg = AgentMessage(
+                id=f"msg_delegate_{key}",
+                from_agent=AgentType.COORDINATOR,
+                to_agent=agent_type,
+                body=content,
+                type=MessageType.REQUEST,
+                timestamp=0,
+                trace_id=trace_id,
+                span_id=span_id,
+            )
+            response = await agent.process_message(msg)
         if response:
             responses_dict[key] = response
 
 
-# Global orchestrator instance
-orchestrator = NeuroFabricOrchestrator()
+def cached_response(task: str) -> Optional[TaskResponse]:
+    """
+    Memoized result for ``task`` when the task cache is enabled.
+    
+    A stale hit is still returned; the task is then re-run in the background
+    at batch priority to refresh the entry.
+    """
+    if not settings.task_cache_enabled:
+        return None
+    return task_cache.get(task, refresh=lambda: _revalidate(task))
+
+
+async def _revalidate(task: str) -> Optional[TaskResponse]:
+    """Re-run a task to refresh its cache entry, unless the fabric is busy."""
+    try:
+        async with task_scheduler.slot(Priority.BATCH):
+            return await NeuroFabricOrchestrator().process_task(task)
+    except SchedulerOverloaded:
+        logger.info("Skipping task cache refresh: scheduler overloaded")
+        return None
+
+
+_orchestrator: Optional[NeuroFabricOrchestrator] = None
+
+
+def get_orchestrator() -> NeuroFabricOrchestrator:
+    """Shared orchestrator instance, constructed on first use."""
+    global _orchestrator
+    if _orchestrator is None:
+        _orchestrator = NeuroFabricOrchestrator()
+    return _orchestrator
+
+
+def __getattr__(name: str):
+    # Keeps ``from .orchestrator import orchestrator`` working without
+    # instantiating every agent at import time
+    if name == "orchestrator":
+        return get_orchestrator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
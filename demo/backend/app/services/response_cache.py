@@ -0,0 +1,116 @@
+"""Cross-process LLM response cache."""
+import asyncio
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Optional
+from ..core.config import settings
+from ..core.logger import get_logger
+from ..core.sqlite import connect
+
+logger = get_logger(__name__)
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of LLM responses, shared by all worker processes.
+
+    Entries expire after ``ttl`` seconds; beyond ``max_entries`` the least
+    recently written entries are dropped. Lookups and writes run SQLite in a
+    worker thread, off the event loop.
+    """
+
+    # Run eviction once per this many writes
+    PRUNE_EVERY = 100
+
+    def __init__(self, path: str, ttl: int, max_entries: int):
+        """Initialize response cache (the database is created on first use)."""
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._ready = False
+
+    @staticmethod
+    def key(
+        messages: list[dict],
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        kind: str = "chat",
+    ) -> str:
+        """Hash of everything that determines a response."""
+        payload = json.dumps([kind, model, temperature, max_tokens, messages], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _ensure_schema(self, conn):
+        if not self._ready:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._ready = True
+
+    async def get(self, key: str) -> Optional[dict]:
+        """Return a cached response payload, or None."""
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, value: dict):
+        """Store a response payload."""
+        await asyncio.to_thread(self._put, key, value)
+
+    def _get(self, key: str) -> Optional[dict]:
+        try:
+            with connect(self.path) as conn:
+                self._ensure_schema(conn)
+                row = conn.execute(
+                    "SELECT value FROM responses WHERE key = ? AND created > ?",
+                    (key, time.time() - self.ttl),
+                ).fetchone()
+        except Exception as e:
+            logger.error(f"Response cache read failed: {e}")
+            return None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def _put(self, key: str, value: dict):
+        try:
+            with connect(self.path) as conn:
+                self._ensure_schema(conn)
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), time.time()),
+                )
+                self._writes += 1
+                if self._writes % self.PRUNE_EVERY == 0:
+                    self._prune(conn)
+        except Exception as e:
+            logger.error(f"Response cache write failed: {e}")
+
+    def _prune(self, conn):
+        """Drop expired entries and enforce the size limit."""
+        conn.execute("DELETE FROM responses WHERE created <= ?", (time.time() - self.ttl,))
+        conn.execute(
+            "DELETE FROM responses WHERE key NOT IN "
+            "(SELECT key FROM responses ORDER BY created DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+
+    def stats(self) -> dict:
+        """Hit/miss counts for this process."""
+        return {"hits": self.hits, "misses": self.misses, "path": str(self.path)}
+
+
+# Global response cache instance
+response_cache = ResponseCache(
+    path=settings.response_cache_path,
+    ttl=settings.response_cache_ttl,
+    max_entries=settings.response_cache_max_entries,
+)
@@ -0,0 +1,250 @@
+"""Priority task scheduler with admission control and load shedding."""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Optional, TypeVar
+from ..core.config import settings
+from ..core.logger import get_logger
+from ..core.tracing import tracer
+from ..models.task import Priority
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Lower rank is served first
+PRIORITY_RANK = {
+    Priority.INTERACTIVE: 0,
+    Priority.STANDARD: 1,
+    Priority.BATCH: 2,
+}
+
+
+class SchedulerOverloaded(Exception):
+    """Raised when a task is shed instead of queued."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class QueueTicket:
+    """Handle on one task's place in the queue, for changing its priority while it waits."""
+
+    def __init__(self, priority: Priority = Priority.STANDARD):
+        """Initialize ticket; ``acquire`` attaches it to the queue entry."""
+        self.priority = priority
+        self.future: Optional[asyncio.Future] = None
+
+
+class TaskScheduler:
+    """
+    Bounded-concurrency scheduler for fabric tasks.
+
+    At most ``max_concurrent`` tasks run at once. Waiting tasks are served
+    by priority class, then FIFO. A task is shed (``SchedulerOverloaded``)
+    when its queue is full, when its estimated wait already exceeds its
+    class's queue-time SLA, or when it actually waits longer than the SLA.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        queue_slas: dict[str, float],
+    ):
+        """Initialize scheduler."""
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_slas = {Priority(p): sla for p, sla in queue_slas.items()}
+        self._queue: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._in_flight = 0
+        self._service_time = 10.0  # EWMA of task run time in seconds
+        self._waits = {p: deque(maxlen=1000) for p in Priority}
+        self._admitted = {p: 0 for p in Priority}
+        self._shed = {p: 0 for p in Priority}
+        self._cancelled = {p: 0 for p in Priority}
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of tasks waiting (excluding abandoned entries)."""
+        return sum(1 for _, _, f in self._queue if not f.done())
+
+    def _depth_ahead(self, priority: Priority) -> int:
+        """Waiting tasks that would be served before a new task of this priority."""
+        rank = PRIORITY_RANK[priority]
+        return sum(1 for r, _, f in self._queue if r <= rank and not f.done())
+
+    def estimated_wait(self, priority: Priority) -> float:
+        """Estimated queue wait in seconds for a new task."""
+        if self._in_flight < self.max_concurrent and not self.queue_depth:
+            return 0.0
+        ahead = self._depth_ahead(priority) + 1
+        return ahead / self.max_concurrent * self._service_time
+
+    def check_admission(self, priority: Priority = Priority.STANDARD):
+        """Shed early if the task would certainly miss its queue SLA."""
+        sla = self.queue_slas.get(priority, math.inf)
+        if self.queue_depth >= self.max_queue:
+            self._reject(priority, "Task queue is full", self._service_time)
+        estimate = self.estimated_wait(priority)
+        if estimate > sla:
+            self._reject(priority, f"Estimated queue wait {estimate:.1f}s exceeds {sla:.0f}s SLA", estimate)
+
+    def _reject(self, priority: Priority, reason: str, retry_after: float):
+        self._shed[priority] += 1
+        logger.warning(f"Shedding {priority.value} task: {reason}")
+        raise SchedulerOverloaded(reason, max(1, math.ceil(retry_after)))
+
+    async def acquire(
+        self,
+        priority: Priority = Priority.STANDARD,
+        ticket: Optional[QueueTicket] = None,
+        shed: bool = True,
+    ):
+        """
+        Wait for a run slot, or raise ``SchedulerOverloaded``.
+
+        With ``shed=False`` (background jobs, already admitted to their own
+        bounded queue) the task waits as long as it takes instead.
+        """
+        if shed:
+            self.check_admission(priority)
+        enqueued_at = time.monotonic()
+        enqueued_ns = time.time_ns()
+
+        if self._in_flight < self.max_concurrent and not self.queue_depth:
+            self._in_flight += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            if ticket:
+                ticket.future = future
+            heapq.heappush(self._queue, (PRIORITY_RANK[priority], next(self._counter), future))
+            sla = self.queue_slas.get(priority) if shed else None
+            try:
+                # The slot is handed over by release(), already counted in-flight
+                await asyncio.wait_for(asyncio.shield(future), timeout=sla)
+            except asyncio.TimeoutError:
+                if not future.done():
+                    future.cancel()
+                    self._reject(priority, f"Queue wait exceeded {sla:.0f}s SLA", self._service_time)
+                # Slot was granted at the deadline; keep it
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self.release()
+                else:
+                    future.cancel()
+                self._cancelled[priority] += 1
+                raise
+
+        self._waits[priority].append(time.monotonic() - enqueued_at)
+        self._admitted[priority] += 1
+        tracer.record("scheduler.wait", enqueued_ns, time.time_ns(), priority=priority.value)
+
+    def reprioritize(self, ticket: QueueTicket, priority: Priority) -> bool:
+        """
+        Move a waiting task to another priority class.
+
+        Returns:
+            False if the task is no longer waiting (already running or gone)
+        """
+        ticket.priority = priority
+        future = ticket.future
+        if future is None or future.done():
+            return False
+        for index, (_, order, queued) in enumerate(self._queue):
+            if queued is future:
+                # Keeps its FIFO position within the new class
+                self._queue[index] = (PRIORITY_RANK[priority], order, future)
+                heapq.heapify(self._queue)
+                return True
+        return False
+
+    def release(self, service_time: Optional[float] = None):
+        """Free a run slot and hand it to the next waiting task."""
+        if service_time is not None:
+            self._service_time = 0.8 * self._service_time + 0.2 * service_time
+        while self._queue:
+            _, _, future = heapq.heappop(self._queue)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: Priority = Priority.STANDARD,
+        ticket: Optional[QueueTicket] = None,
+        shed: bool = True,
+    ):
+        """Hold a run slot for the duration of the block."""
+        await self.acquire(priority, ticket, shed)
+        started = time.monotonic()
+        cancelled = False
+        try:
+            yield
+        except asyncio.CancelledError:
+            self._cancelled[priority] += 1
+            cancelled = True
+            raise
+        finally:
+            # A run cut short by cancellation is not a service-time sample
+            self.release(None if cancelled else time.monotonic() - started)
+
+    async def run(
+        self,
+        factory: Callable[[], Awaitable[T]],
+        priority: Priority = Priority.STANDARD,
+    ) -> T:
+        """Run a coroutine under the scheduler."""
+        async with self.slot(priority):
+            return await factory()
+
+    def stats(self) -> dict:
+        """Queue depth, wait time and shedding metrics."""
+        per_priority = {}
+        for priority in Priority:
+            waits = sorted(self._waits[priority])
+            per_priority[priority.value] = {
+                "queued": sum(
+                    1 for r, _, f in self._queue
+                    if r == PRIORITY_RANK[priority] and not f.done()
+                ),
+                "admitted": self._admitted[priority],
+                "shed": self._shed[priority],
+                "cancelled": self._cancelled[priority],
+                "wait_p50_ms": _percentile_ms(waits, 0.50),
+                "wait_p99_ms": _percentile_ms(waits, 0.99),
+                "queue_sla_s": self.queue_slas.get(priority),
+            }
+        return {
+            "in_flight": self._in_flight,
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "avg_service_time_s": round(self._service_time, 3),
+            "priorities": per_priority,
+        }
+
+
+def _percentile_ms(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile in milliseconds."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, math.ceil(q * len(sorted_values)) - 1)
+    return round(sorted_values[max(index, 0)] * 1000, 1)
+
+
+# Global task scheduler instance
+task_scheduler = TaskScheduler(
+    max_concurrent=settings.max_concurrent_tasks,
+    max_queue=settings.max_queued_tasks,
+    queue_slas=settings.queue_slas,
+)
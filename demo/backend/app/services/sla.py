@@ -0,0 +1,214 @@
+"""Planning task execution within a latency deadline and cost ceiling."""
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+from ..core.config import settings
+from ..core.logger import get_logger
+from ..models import BudgetReport, StageBudget
+from .llm_service import llm_service
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Stage:
+    """One pipeline stage to plan; its agents run in parallel."""
+    name: str
+    models: dict[str, str]  # Agent id -> default model
+    prompt_tokens: int  # Estimated prompt tokens per call
+    output_tokens: Optional[int] = None  # Fixed completion size, or None for the expected size
+    optional: bool = False
+
+
+@dataclass
+class StagePlan:
+    """Models, completion cap and hedging chosen for a stage."""
+    stage: Stage
+    models: dict[str, str]
+    max_tokens: Optional[int] = None
+    hedge_model: Optional[str] = None
+    skipped: bool = False
+    notes: list[str] = field(default_factory=list)
+
+    @property
+    def output_tokens(self) -> int:
+        expected = self.stage.output_tokens or settings.sla_expected_output_tokens
+        return min(expected, self.max_tokens) if self.max_tokens else expected
+
+    def estimate(self) -> tuple[float, float]:
+        """Expected (latency ms, cost USD) of the stage."""
+        if self.skipped:
+            return 0.0, 0.0
+        output = self.output_tokens
+        latency = cost = 0.0
+        for model in self.models.values():
+            call_ms = llm_service.estimate_latency(model, output)
+            cost += llm_service.estimate_cost(model, self.stage.prompt_tokens, output)
+            if self.hedge_model and self.hedge_model != model:
+                # Both run; the first answer wins
+                call_ms = min(call_ms, llm_service.estimate_latency(self.hedge_model, output))
+                cost += llm_service.estimate_cost(self.hedge_model, self.stage.prompt_tokens, output)
+            latency = max(latency, call_ms)
+        return latency, cost
+
+
+def plan_stages(
+    stages: list[Stage],
+    latency_ms: Optional[float],
+    cost_usd: Optional[float],
+) -> list[StagePlan]:
+    """
+    Fit a sequence of stages into a latency and cost budget.
+
+    Levers, in order, until the estimate fits:
+
+    1. skip optional stages (the critic review);
+    2. over the deadline but not the ceiling: race the fallback model against
+       the planned one (hedging), as far as the ceiling allows;
+    3. downgrade the most expensive (or slowest) calls to the fallback model;
+    4. cap completion tokens, down to ``sla_min_output_tokens``.
+
+    Hedging is also applied when the plan fits but uses more than
+    ``sla_hedge_slack`` of the deadline. Decisions are noted on each plan.
+    """
+    plans = [StagePlan(stage, dict(stage.models)) for stage in stages]
+    fallback = settings.sla_fallback_model
+
+    def totals() -> tuple[float, float]:
+        estimates = [plan.estimate() for plan in plans]
+        return sum(ms for ms, _ in estimates), sum(cost for _, cost in estimates)
+
+    def over() -> tuple[bool, bool]:
+        ms, cost = totals()
+        return (
+            latency_ms is not None and ms > latency_ms,
+            cost_usd is not None and cost > cost_usd,
+        )
+
+    slow, costly = over()
+    for plan in plans:
+        if (slow or costly) and plan.stage.optional:
+            plan.skipped = True
+            plan.notes.append(f"{plan.stage.name}: skipped ({'deadline' if slow else 'cost ceiling'})")
+            slow, costly = over()
+
+    if latency_ms is not None and not costly:
+        for plan in sorted(plans, key=lambda p: p.estimate()[0], reverse=True):
+            if plan.skipped or all(model == fallback for model in plan.models.values()):
+                continue
+            if totals()[0] <= latency_ms * settings.sla_hedge_slack:
+                break
+            plan.hedge_model = fallback
+            if cost_usd is not None and totals()[1] > cost_usd:
+                plan.hedge_model = None
+                continue
+            plan.notes.append(f"{plan.stage.name}: hedged with {fallback}")
+        slow, costly = over()
+
+    while slow or costly:
+        candidates = [
+            (plan, agent)
+            for plan in plans if not plan.skipped
+            for agent, model in plan.models.items() if model != fallback
+        ]
+        if not candidates:
+            break
+        # Largest saving on the violated dimension first
+        dimension = 1 if costly else 0
+        plan, agent = max(candidates, key=lambda c: c[0].estimate()[dimension] / len(c[0].models))
+        plan.notes.append(f"{plan.stage.name}: {agent} {plan.models[agent]} -> {fallback}")
+        plan.models[agent] = fallback
+        if all(model == fallback for model in plan.models.values()):
+            plan.hedge_model = None
+        slow, costly = over()
+
+    if slow or costly:
+        floor = settings.sla_min_output_tokens
+        cap = settings.sla_expected_output_tokens
+        capped = [plan for plan in plans if not plan.skipped and plan.stage.output_tokens is None]
+        while (slow or costly) and cap > floor:
+            cap = max(floor, int(cap * 0.8))
+            for plan in capped:
+                plan.max_tokens = cap
+            slow, costly = over()
+        for plan in capped:
+            plan.notes.append(f"{plan.stage.name}: max_tokens capped at {cap}")
+
+    if slow or costly:
+        ms, cost = totals()
+        plans[0].notes.append(
+            f"{plans[0].stage.name}: budget not reachable (estimated {ms:.0f}ms / ${cost:.4f})"
+        )
+    return plans
+
+
+class BudgetTracker:
+    """
+    Plans each stage against what is left of a task's budget and records spend.
+
+    Stages are re-planned at every boundary from the actual time and cost
+    spent so far, so an early overrun is absorbed by later stages.
+    """
+
+    def __init__(self, latency_budget_ms: Optional[int], cost_budget_usd: Optional[float]):
+        """Start the clock."""
+        self.started = time.monotonic()
+        self.report = BudgetReport(latency_budget_ms=latency_budget_ms, cost_budget_usd=cost_budget_usd)
+
+    def remaining(self) -> tuple[Optional[float], Optional[float]]:
+        """Milliseconds and USD left (None for unbounded)."""
+        elapsed = (time.monotonic() - self.started) * 1000
+        latency, ceiling = self.report.latency_budget_ms, self.report.cost_budget_usd
+        return (
+            max(0.0, latency - elapsed) if latency is not None else None,
+            max(0.0, ceiling - self.report.cost) if ceiling is not None else None,
+        )
+
+    def plan(self, stages: list[Stage]) -> StagePlan:
+        """Plan the remaining ``stages``; return the plan for the first one."""
+        plan = plan_stages(stages, *self.remaining())[0]
+        for note in plan.notes:
+            logger.info(f"Budget: {note}")
+            self.report.decisions.append(note)
+        return plan
+
+    @contextmanager
+    def stage(self, plan: StagePlan, agents: list) -> Iterator[None]:
+        """Measure a planned stage's latency and the cost its agents add."""
+        ms, cost = plan.estimate()
+        entry = StageBudget(
+            stage=plan.stage.name,
+            models=plan.models,
+            max_tokens=plan.max_tokens,
+            hedge_model=plan.hedge_model,
+            skipped=plan.skipped,
+            estimated_ms=int(ms),
+            estimated_cost=round(cost, 6),
+        )
+        self.report.stages.append(entry)
+        started = time.monotonic()
+        spent_before = sum(agent.metrics.cost for agent in agents)
+        winners_before = [len(agent.hedge_winners) for agent in agents]
+        try:
+            yield
+        finally:
+            entry.elapsed_ms = int((time.monotonic() - started) * 1000)
+            entry.cost = round(sum(agent.metrics.cost for agent in agents) - spent_before, 6)
+            for agent, before in zip(agents, winners_before):
+                entry.hedge_winners.extend(agent.hedge_winners[before:])
+            self.report.cost = round(self.report.cost + entry.cost, 6)
+
+    def skip(self, plan: StagePlan):
+        """Record a stage that was planned out."""
+        self.report.stages.append(StageBudget(stage=plan.stage.name, models=plan.models, skipped=True))
+
+    def finish(self) -> BudgetReport:
+        """Final report: totals and whether the limits were met."""
+        report = self.report
+        report.elapsed_ms = int((time.monotonic() - self.started) * 1000)
+        if report.latency_budget_ms is not None:
+            report.within_latency = report.elapsed_ms <= report.latency_budget_ms
+        if report.cost_budget_usd is not None:
+            report.within_cost = report.cost <= report.cost_budget_usd
+        return report
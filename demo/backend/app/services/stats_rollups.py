@@ -0,0 +1,167 @@
+"""NumPy rollup arrays behind the task statistics store (imported on first use)."""
+from pathlib import Path
+from typing import Optional
+import numpy as np
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Value columns per bucket and series
+COUNT, ERRORS, COST, PROMPT_TOKENS, COMPLETION_TOKENS, LATENCY_MS = range(6)
+COLUMNS = ["count", "errors", "cost", "prompt_tokens", "completion_tokens", "latency_ms"]
+
+# Latency histogram: log-spaced bin edges from 1 ms to 1 h (about 27% wide),
+# plus an underflow and an overflow bin
+LATENCY_EDGES_MS = np.geomspace(1.0, 3_600_000.0, 64)
+LATENCY_BINS = len(LATENCY_EDGES_MS) + 1
+
+
+def latency_bin(latency_ms: float) -> int:
+    """Histogram bin of a latency."""
+    return int(np.searchsorted(LATENCY_EDGES_MS, latency_ms, side="right"))
+
+
+class Rollup:
+    """
+    Ring buffer of cumulative totals for one resolution, backed by ``.npy`` memmaps.
+
+    Slot ``b % buckets`` holds the running totals up to and including
+    bucket ``b`` (``stamps`` records which ``b``). Totals over any bucket
+    range are one subtraction of two slots, whatever its length.
+    """
+
+    def __init__(self, directory: Path, name: str, width: int, buckets: int, series: int):
+        self.name = name
+        self.width = width
+        self.buckets = buckets
+        self.values = open_array(directory / f"{name}.values.npy", np.float64, (buckets, series, len(COLUMNS)))
+        # uint32 counts wrap, but differences stay exact (modular arithmetic)
+        self.hist = open_array(directory / f"{name}.hist.npy", np.uint32, (buckets, series, LATENCY_BINS))
+        self.stamps = open_array(directory / f"{name}.stamps.npy", np.int64, (buckets,), fill=-1)
+
+    def head(self) -> int:
+        """Latest bucket written (-1 when empty)."""
+        return int(self.stamps.max())
+
+    def advance(self, bucket: int):
+        """Carry the running totals forward to ``bucket``."""
+        head = self.head()
+        if bucket <= head:
+            return
+        if head < 0:
+            slots = np.array([bucket % self.buckets])
+            self.values[slots] = 0
+            self.hist[slots] = 0
+            self.stamps[slots] = bucket
+            return
+        first = max(head + 1, bucket - self.buckets + 1)
+        new = np.arange(first, bucket + 1)
+        slots = new % self.buckets
+        last = head % self.buckets
+        self.values[slots] = self.values[last]
+        self.hist[slots] = self.hist[last]
+        self.stamps[slots] = new
+
+    def add(self, bucket: int, row: int, values: list[float], bin_index: int):
+        """Add one sample to ``bucket`` and every running total after it."""
+        self.advance(bucket)
+        head = self.head()
+        # A sample for an earlier bucket (clock skew between workers) also counts in later totals
+        covered = np.arange(max(bucket, head - self.buckets + 1), head + 1)
+        slots = covered % self.buckets
+        before_first_write = self.stamps[slots] != covered
+        if before_first_write.any():
+            fresh = slots[before_first_write]
+            self.values[fresh] = 0
+            self.hist[fresh] = 0
+            self.stamps[fresh] = covered[before_first_write]
+        self.values[slots, row] += values
+        self.hist[slots, row, bin_index] += 1
+
+    def totals(self, bucket: int) -> tuple[np.ndarray, np.ndarray]:
+        """Running totals up to ``bucket`` (zeros before the first write)."""
+        head = self.head()
+        bucket = min(bucket, head)
+        slot = bucket % self.buckets
+        if bucket < 0 or self.stamps[slot] != bucket:
+            return np.zeros(self.values.shape[1:]), np.zeros(self.hist.shape[1:], dtype=np.uint32)
+        return self.values[slot], self.hist[slot]
+
+    def window(self, first: int, last: int) -> tuple[np.ndarray, np.ndarray]:
+        """Totals of buckets ``first..last`` per series."""
+        end_values, end_hist = self.totals(last)
+        start_values, start_hist = self.totals(first - 1)
+        return end_values - start_values, end_hist - start_hist
+
+    def oldest(self, now_bucket: int) -> int:
+        """Oldest bucket whose preceding running total is still retained."""
+        return now_bucket - self.buckets + 2
+
+    def per_bucket(self, rows: list[int], first: int, last: int) -> list[dict]:
+        """Column totals of buckets ``first..last``, summed over ``rows``."""
+        running = np.array([self.totals(bucket)[0][rows].sum(axis=0) for bucket in range(first - 1, last + 1)])
+        return [columns(row) for row in np.diff(running, axis=0)]
+
+    def latest(self, row: Optional[int]) -> dict:
+        """Column totals of a series since the store was created."""
+        if row is None:
+            return columns(np.zeros(len(COLUMNS)))
+        values, _ = self.totals(self.head())
+        return columns(values[row])
+
+
+def open_array(path: Path, dtype, shape: tuple, fill: int = 0) -> np.memmap:
+    """Open a ``.npy`` memmap, creating (or recreating, on a layout change) it."""
+    if path.exists():
+        array = np.lib.format.open_memmap(path, mode="r+")
+        if array.shape == shape and array.dtype == dtype:
+            return array
+        logger.warning(f"Stats layout changed; resetting {path.name}")
+        del array
+    array = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+    if fill:
+        array[:] = fill
+    return array
+
+
+def columns(values: np.ndarray) -> dict:
+    totals = dict(zip(COLUMNS, values.tolist()))
+    return {
+        "count": int(totals["count"]),
+        "errors": int(totals["errors"]),
+        "cost": round(totals["cost"], 6),
+        "tokens": {
+            "prompt": int(totals["prompt_tokens"]),
+            "completion": int(totals["completion_tokens"]),
+            "total": int(totals["prompt_tokens"] + totals["completion_tokens"]),
+        },
+        "latency_ms_sum": round(totals["latency_ms"], 1),
+    }
+
+
+def summarize(series: tuple[str, str], values: np.ndarray, hist: np.ndarray, percentiles: tuple) -> dict:
+    """Totals, means and histogram percentiles of one series."""
+    summary = {"agent": series[0], "model": series[1] or None, **columns(values)}
+    count = summary["count"]
+    summary["avg_cost"] = round(summary["cost"] / count, 6)
+    summary["latency_ms"] = {"mean": round(summary.pop("latency_ms_sum") / count, 1)}
+    summary["latency_ms"].update({f"p{q:g}": percentile(hist, q) for q in percentiles})
+    return summary
+
+
+def percentile(hist: np.ndarray, q: float) -> float:
+    """Latency percentile from a histogram, interpolated geometrically within the bin."""
+    cumulative = np.cumsum(hist, dtype=np.int64)
+    total = int(cumulative[-1])
+    if not total:
+        return 0.0
+    rank = q / 100 * total
+    index = int(np.searchsorted(cumulative, rank, side="left"))
+    if index == 0:
+        return float(LATENCY_EDGES_MS[0])
+    if index >= len(LATENCY_EDGES_MS):
+        return float(LATENCY_EDGES_MS[-1])
+    low, high = LATENCY_EDGES_MS[index - 1], LATENCY_EDGES_MS[index]
+    before = int(cumulative[index - 1])
+    fraction = (rank - before) / max(1, int(hist[index]))
+    return round(float(low * (high / low) ** fraction), 1)
@@ -0,0 +1,139 @@
+"""Whole-task memo cache with stale-while-revalidate."""
+import asyncio
+import hashlib
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+from ..core.config import settings
+from ..core.logger import get_logger
+from ..models import TaskResponse
+
+logger = get_logger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING = re.compile(r"[\s.!?;:,]+$")
+
+
+@dataclass(slots=True)
+class _Entry:
+    response: TaskResponse
+    stored_at: float  # time.monotonic()
+
+
+class TaskCache:
+    """
+    In-process memo of finished ``TaskResponse`` objects keyed by task fingerprint.
+
+    An entry is fresh for ``fresh_seconds`` and served as-is. For a further
+    ``stale_seconds`` it is still served immediately, but the first stale
+    hit starts one background re-run of the task whose result replaces the
+    entry (stale-while-revalidate). Older entries are misses. Beyond
+    ``max_entries`` the least recently used entries are dropped.
+    """
+
+    def __init__(self, fresh_seconds: float, stale_seconds: float, max_entries: int):
+        """Initialize empty cache."""
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def fingerprint(task: str) -> str:
+        """
+        Key for a task, insensitive to case, Unicode form, runs of whitespace
+        and trailing punctuation.
+        """
+        normalized = unicodedata.normalize("NFKC", task).casefold()
+        normalized = _TRAILING.sub("", _WHITESPACE.sub(" ", normalized).strip())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        task: str,
+        refresh: Optional[Callable[[], Awaitable[TaskResponse]]] = None,
+    ) -> Optional[TaskResponse]:
+        """
+        Return the memoized response for ``task``, or None.
+
+        Args:
+            task: Task as submitted
+            refresh: Re-runs the task; started in the background on a stale hit
+
+        Returns:
+            Copy of the stored response with ``cached`` set to "fresh" or "stale"
+        """
+        key = self.fingerprint(task)
+        entry = self._entries.get(key)
+        age = time.monotonic() - entry.stored_at if entry else None
+        if entry is None or age > self.fresh_seconds + self.stale_seconds:
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if age <= self.fresh_seconds:
+            self.hits += 1
+            state = "fresh"
+        else:
+            self.stale_hits += 1
+            state = "stale"
+            if refresh and key not in self._refreshing:
+                self._revalidate(key, refresh)
+        return entry.response.copy(update={"task": task, "cached": state})
+
+    def put(self, task: str, response: TaskResponse):
+        """Memoize a successful response."""
+        if not response.success:
+            return
+        key = self.fingerprint(task)
+        self._entries[key] = _Entry(response.copy(update={"cached": None}), time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _revalidate(self, key: str, refresh: Callable[[], Awaitable[TaskResponse]]):
+        """Re-run a task once in the background; its result replaces the entry."""
+        async def run():
+            try:
+                await refresh()  # process_task stores the new result
+            except Exception as e:
+                logger.warning(f"Task cache revalidation failed: {e}")
+
+        self.revalidations += 1
+        task = asyncio.create_task(run())
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    def clear(self):
+        """Drop all entries."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counts for this process."""
+        return {
+            "enabled": settings.task_cache_enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "refreshing": len(self._refreshing),
+        }
+
+
+# Global task cache instance
+task_cache = TaskCache(
+    fresh_seconds=settings.task_cache_fresh_seconds,
+    stale_seconds=settings.task_cache_stale_seconds,
+    max_entries=settings.task_cache_max_entries,
+)
@@ -0,0 +1,282 @@
+"""Columnar task and LLM-call statistics with time-bucketed rollups."""
+import asyncio
+import json
+import os
+import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+from ..core.config import settings
+from ..core.logger import get_logger
+from ..models import TokenUsage
+
+if TYPE_CHECKING:
+    from .stats_rollups import Rollup
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: single worker process only
+    fcntl = None
+
+logger = get_logger(__name__)
+
+# Rollup resolutions: name -> (bucket seconds, buckets retained)
+RESOLUTIONS = {
+    "minute": (60, 1440),  # 1 day
+    "hour": (3600, 1440),  # 60 days
+    "day": (86400, 730),  # 2 years
+}
+
+TASK_SERIES = ("task", "")  # Whole-task totals (wall time, all agents)
+OTHER_SERIES = ("other", "")  # Catch-all once max_series is reached
+
+_WINDOW = re.compile(r"^(\d+(?:\.\d+)?)\s*([smhdw])$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_window(window: str) -> float:
+    """Seconds in a window like ``"15m"``, ``"24h"`` or ``"7d"``."""
+    match = _WINDOW.match(window.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid window: {window!r} (expected e.g. 30s, 15m, 24h, 7d, 2w)")
+    return float(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+
+
+class TaskStatsStore:
+    """
+    Time-bucketed rollups of task and LLM-call metrics per agent and model.
+
+    Each LLM call is recorded under its ``(agent, model)`` series and each
+    task under ``("task", "")``. Calls add to the current minute, hour and
+    day buckets: count, errors, cost, prompt and completion tokens, latency
+    sum and a log-spaced latency histogram. Every resolution keeps running
+    totals, so a window's totals and percentiles cost two slot reads
+    whatever its length. The finest resolution still covering the window
+    start is used, so windows are rounded to its buckets.
+
+    Arrays are memory-mapped ``.npy`` files under ``stats_dir`` and survive
+    restarts. Writes take an ``flock`` on the directory, so worker processes
+    can share it. Series beyond ``max_series`` are counted as ``other``.
+    Records and queries run on one store thread, off the event loop and in
+    order, so a query sees every sample recorded before it.
+    """
+
+    def __init__(self, stats_dir: str, max_series: int = 32):
+        """Initialize store (files are opened on first use)."""
+        self.stats_dir = Path(stats_dir)
+        self.max_series = max_series
+        self._rollups: dict[str, "Rollup"] = {}
+        self._series: dict[tuple[str, str], int] = {}
+        self._lock_file = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-stats")
+
+    def _ensure_open(self):
+        if self._rollups:
+            return
+        # NumPy is imported here, so the store costs nothing at startup or while disabled
+        from .stats_rollups import Rollup
+        self.stats_dir.mkdir(parents=True, exist_ok=True)
+        for name, (width, buckets) in RESOLUTIONS.items():
+            self._rollups[name] = Rollup(self.stats_dir, name, width, buckets, self.max_series)
+        with self._locked():
+            self._row(TASK_SERIES)  # Always tracked, whatever the agent/model mix
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Exclusive access across worker processes."""
+        if fcntl is None:
+            yield
+            return
+        if self._lock_file is None:
+            self._lock_file = open(self.stats_dir / "lock", "a")
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _load_series(self):
+        path = self.stats_dir / "series.json"
+        if path.exists():
+            self._series = {tuple(key.split("|", 1)): row for key, row in json.loads(path.read_text()).items()}
+
+    def _row(self, series: tuple[str, str]) -> int:
+        """Row of a series, registering it (under the lock) if new."""
+        row = self._series.get(series)
+        if row is not None:
+            return row
+        self._load_series()  # Another worker may have added it
+        if series in self._series:
+            return self._series[series]
+        rows = len(self._series)
+        if series != OTHER_SERIES and rows >= self.max_series - 1:
+            return self._row(OTHER_SERIES)
+        self._series[series] = rows
+        path = self.stats_dir / "series.json"
+        temp = path.with_suffix(".tmp")
+        temp.write_text(json.dumps({"|".join(key): row for key, row in self._series.items()}))
+        os.replace(temp, path)
+        return rows
+
+    def _record(self, series: tuple[str, str], values: list[float], latency_ms: float, now: Optional[float]):
+        """Queue a sample on the store thread."""
+        now = time.time() if now is None else now
+        self._executor.submit(self._add, series, values, latency_ms, now).add_done_callback(_log_write_error)
+
+    def _add(self, series: tuple[str, str], values: list[float], latency_ms: float, now: float):
+        from .stats_rollups import latency_bin
+        self._ensure_open()
+        bin_index = latency_bin(latency_ms)
+        with self._locked():
+            row = self._row(series)
+            for rollup in self._rollups.values():
+                rollup.add(int(now // rollup.width), row, values, bin_index)
+
+    async def _read(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def record_call(
+        self,
+        agent: str,
+        model: str,
+        tokens: TokenUsage,
+        cost: float,
+        latency_ms: float,
+        now: Optional[float] = None,
+    ):
+        """Record one LLM call."""
+        self._record(
+            (agent, model),
+            [1, 0, cost, tokens.prompt, tokens.completion, latency_ms],
+            latency_ms,
+            now,
+        )
+
+    def record_task(
+        self,
+        success: bool,
+        cost: float,
+        tokens: TokenUsage,
+        latency_ms: float,
+        now: Optional[float] = None,
+    ):
+        """Record one finished task (wall-clock latency)."""
+        self._record(
+            TASK_SERIES,
+            [1, 0 if success else 1, cost, tokens.prompt, tokens.completion, latency_ms],
+            latency_ms,
+            now,
+        )
+
+    async def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        agent: Optional[str] = None,
+        model: Optional[str] = None,
+        percentiles: tuple[float, ...] = (50, 90, 99),
+    ) -> dict:
+        """
+        Totals and latency percentiles per series over ``[start, end]``.
+
+        Args:
+            start: Window start (Unix seconds); None for everything retained
+            end: Window end (Unix seconds); None for now
+            agent: Only series of this agent
+            model: Only series of this model
+            percentiles: Latency percentiles to report (0-100)
+
+        Returns:
+            The effective (bucket-aligned) window, its resolution, and one
+            entry per series with data in it
+        """
+        return await self._read(self._query, start, end, agent, model, percentiles)
+
+    def _query(self, start, end, agent, model, percentiles) -> dict:
+        from .stats_rollups import COUNT, summarize
+        self._ensure_open()
+        self._load_series()
+        now = time.time()
+        end = now if end is None else min(end, now)
+        start = 0.0 if start is None else start
+        # Finest resolution that still holds the running total before the window
+        for name, rollup in self._rollups.items():
+            if int(start // rollup.width) >= rollup.oldest(int(now // rollup.width)):
+                break
+        first = max(int(start // rollup.width), rollup.oldest(int(now // rollup.width)))
+        last = int(end // rollup.width)
+        values, hist = rollup.window(first, last)
+
+        series = []
+        for key, row in sorted(self._series.items(), key=lambda item: item[1]):
+            if last < first or (agent and key[0] != agent) or (model and key[1] != model) or not values[row, COUNT]:
+                continue
+            series.append(summarize(key, values[row], hist[row], percentiles))
+        return {
+            "start": first * rollup.width,
+            "end": (last + 1) * rollup.width,
+            "resolution": name,
+            "series": series,
+        }
+
+    async def rollups(
+        self,
+        resolution: str,
+        buckets: int,
+        agent: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> dict:
+        """
+        Per-bucket totals of the last ``buckets`` buckets at one resolution.
+
+        Totals are of whole tasks, or, with an ``agent`` or ``model``
+        filter, of the matching LLM-call series summed.
+        """
+        return await self._read(self._bucket_totals, resolution, buckets, agent, model)
+
+    def _bucket_totals(self, resolution, buckets, agent, model) -> dict:
+        self._ensure_open()
+        self._load_series()
+        rollup = self._rollups[resolution]
+        now_bucket = int(time.time() // rollup.width)
+        buckets = max(1, min(buckets, rollup.buckets - 1))
+        if agent or model:
+            rows = [
+                row for key, row in self._series.items()
+                if key != TASK_SERIES and (not agent or key[0] == agent) and (not model or key[1] == model)
+            ]
+        else:
+            rows = [self._series[TASK_SERIES]] if TASK_SERIES in self._series else []
+        first = now_bucket - buckets + 1
+        return {
+            "resolution": resolution,
+            "bucket_seconds": rollup.width,
+            "buckets": [
+                {"start": (first + i) * rollup.width, **totals}
+                for i, totals in enumerate(rollup.per_bucket(rows, first, now_bucket))
+            ],
+        }
+
+    async def all_time(self) -> dict:
+        """Task totals since the store was created."""
+        return await self._read(self._all_time)
+
+    def _all_time(self) -> dict:
+        self._ensure_open()
+        self._load_series()
+        return self._rollups["day"].latest(self._series.get(TASK_SERIES))
+
+    async def close(self):
+        """Finish queued records and stop the store thread."""
+        await asyncio.to_thread(self._executor.shutdown)
+
+
+def _log_write_error(future: Future):
+    if future.exception():
+        logger.error(f"Failed to record stats: {future.exception()}")
+
+
+# Global task statistics store
+task_stats = TaskStatsStore(settings.stats_dir, settings.stats_max_series)
@@ -0,0 +1,63 @@
+"""Shared fixtures: an in-process fake LLM and per-test state paths."""
+import asyncio
+import pytest
+from app.core.config import settings
+from app.models import TokenUsage
+from app.services import llm_service, memory_manager, task_stats
+
+
+@pytest.fixture(autouse=True)
+def isolated_settings(tmp_path, monkeypatch):
+    """Keep files written by a test under its temporary directory, and learned state per test."""
+    monkeypatch.setattr(settings, "stats_dir", str(tmp_path / "stats"))
+    monkeypatch.setattr(settings, "blob_spill_dir", str(tmp_path / "blobs"))
+    monkeypatch.setattr(settings, "shared_jobs_path", str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(settings, "response_cache_path", str(tmp_path / "response_cache.db"))
+    monkeypatch.setattr(settings, "trace_export_path", None)
+    monkeypatch.setattr(memory_manager, "memory_dir", tmp_path)
+    monkeypatch.setattr(memory_manager, "db_file", tmp_path / "memory.db")
+    monkeypatch.setattr(memory_manager, "consolidated_file", tmp_path / "consolidated_memory.json")
+    monkeypatch.setattr(memory_manager, "_ready", False)
+    monkeypatch.setattr(task_stats, "stats_dir", tmp_path / "stats")
+    monkeypatch.setattr(task_stats, "_rollups", {})
+    monkeypatch.setattr(task_stats, "_series", {})
+    monkeypatch.setattr(task_stats, "_lock_file", None)
+    # Latency profiles are learned online; start every test from the seeds
+    monkeypatch.setattr(llm_service, "latency", {m: dict(p) for m, p in settings.model_latency.items()})
+    return settings
+
+
+class FakeLLM:
+    """Answers every chat call from ``reply(messages, model)`` and records the calls."""
+
+    def __init__(self):
+        self.calls: list[dict] = []
+        self.reply = lambda messages, model: f"answer from {model}"
+        self.confidence = 0.9
+        self.delay = 0.0
+
+    async def chat_completion(self, messages, model=None, temperature=0.7, max_tokens=None, **kwargs):
+        self.calls.append({"messages": messages, "model": model, "max_tokens": max_tokens})
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        text = self.reply(messages, model)
+        prompt = sum(len(m["content"]) for m in messages) // 4
+        usage = TokenUsage(prompt=prompt, completion=10, total=prompt + 10, uncached_prompt=prompt)
+        return text, usage, 0.001, 10
+
+    async def chat_completion_scored(self, *args, **kwargs):
+        return (*await self.chat_completion(*args, **kwargs), self.confidence)
+
+    async def chat_completion_stream(self, messages, model=None, temperature=0.7, max_tokens=None):
+        text, *_ = await self.chat_completion(messages, model, temperature, max_tokens)
+        for i in range(0, len(text), 16):
+            yield text[i:i + 16]
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Replace the LLM service's API calls with a ``FakeLLM`` (streamed calls go through it too)."""
+    fake = FakeLLM()
+    for name in ("chat_completion", "chat_completion_scored", "chat_completion_stream"):
+        monkeypatch.setattr(llm_service, name, getattr(fake, name))
+    return fake
@@ -0,0 +1,56 @@
+"""Tests for the contextual-bandit specialist router."""
+import math
+import pytest
+from app.models import AgentType
+from app.services.adaptive_router import ARMS, SPECIALISTS, AdaptiveRouter
+
+MATH = frozenset({AgentType.SPECIALIST_MATH.value})
+TEXT = frozenset({AgentType.SPECIALIST_TEXT.value})
+
+
+def test_arms_are_every_nonempty_subset():
+    assert len(ARMS) == 2 ** len(SPECIALISTS) - 1
+
+
+def test_features_are_normalized_with_bias():
+    router = AdaptiveRouter(dim=64)
+    features = router.featurize("compute compute growth")
+    assert features[-1] == (64, 1.0)
+    assert math.isclose(sum(x * x for _, x in features[:-1]), 1.0)
+
+
+def test_learns_best_arm_per_task_kind():
+    router = AdaptiveRouter(min_samples=5)
+    for _ in range(60):
+        for arm in ARMS:
+            router.update("calculate the compound interest", arm, 1.0 if arm == MATH else 0.0)
+            router.update("rewrite this paragraph politely", arm, 1.0 if arm == TEXT else 0.0)
+    assert router.ready
+    assert router.select("calculate the compound interest", explore=False) == MATH
+    assert router.select("rewrite this paragraph politely", explore=False) == TEXT
+
+
+def test_unknown_agents_are_ignored():
+    router = AdaptiveRouter()
+    router.update("task", ["traditional"], 1.0)
+    assert router.samples == 0
+
+
+def test_reward_penalizes_rejection_tokens_and_latency(isolated_settings):
+    good = AdaptiveRouter.reward(True, True, 0, 0)
+    assert good == 1.0
+    assert AdaptiveRouter.reward(True, False, 0, 0) == 0.0
+    assert AdaptiveRouter.reward(False, None, 0, 0) == 0.0
+    assert AdaptiveRouter.reward(True, None, 2000, 3000) == pytest.approx(
+        1.0 - 2 * isolated_settings.router_token_penalty - 3 * isolated_settings.router_latency_penalty
+    )
+
+
+def test_train_from_memory_records():
+    router = AdaptiveRouter()
+    router.train([
+        {"task": "sum these", "agents_used": ["coordinator", "specialist_math"], "success": True,
+         "critic_approved": True, "metrics": {"total_tokens": 100, "total_time_ms": 500}},
+    ])
+    assert router.loaded and router.samples == 1
+    assert router.models[MATH].pulls == 1
@@ -0,0 +1,142 @@
+"""Tests for batch execution, shared routing and sub-prompt dedup."""
+import asyncio
+import json
+import pytest
+from app.models import BatchRequest
+from app.services import batch
+from app.services.batch import PromptMemo, _Memo, run_batch, task_shape
+
+
+def test_task_shape_masks_payload():
+    assert task_shape("Summarize reviews for product 12: great") == task_shape("Summarize reviews for product 97: bad")
+    assert task_shape('Translate "hello" to French') == task_shape("Translate 'bye' to French")
+    assert task_shape("Summarize this") != task_shape("Translate this")
+
+
+def test_memo_single_flight_and_no_memoized_failures():
+    memo = _Memo()
+    calls = 0
+
+    async def slow():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def failing():
+        raise ValueError("boom")
+
+    async def main():
+        results = await asyncio.gather(*(memo.get("k", slow) for _ in range(5)))
+        with pytest.raises(ValueError):
+            await memo.get("bad", failing)
+        assert "bad" not in memo._futures
+        return results
+
+    results = asyncio.run(main())
+    assert calls == 1
+    assert [hit for _, hit in results].count(False) == 1
+    assert memo.hits == 4
+
+
+def test_cancelled_owner_hands_the_call_to_a_waiter():
+    memo = _Memo()
+    calls = 0
+
+    async def slow():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return "value"
+
+    async def main():
+        owner = asyncio.create_task(memo.get("k", slow))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(memo.get("k", slow)) for _ in range(2)]
+        await asyncio.sleep(0.005)
+        owner.cancel()
+        return owner, await asyncio.gather(*waiters)
+
+    owner, results = asyncio.run(main())
+    assert owner.cancelled()
+    assert [value for value, _ in results] == ["value", "value"]
+    assert sorted(hit for _, hit in results) == [False, True]
+    assert calls == 2
+
+
+def test_cancelled_waiter_does_not_cancel_the_call():
+    memo = _Memo()
+
+    async def main():
+        owner = asyncio.create_task(memo.get("k", lambda: asyncio.sleep(0.02, "value")))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(memo.get("k", lambda: asyncio.sleep(0.02, "other")))
+        await asyncio.sleep(0.005)
+        waiter.cancel()
+        return await owner, waiter
+
+    (value, hit), waiter = asyncio.run(main())
+    assert value == "value" and not hit
+    assert waiter.cancelled()
+
+
+def test_task_cancelled_from_elsewhere_still_reports(monkeypatch):
+    async def process_task(self, task):
+        if task == "doomed":
+            raise asyncio.CancelledError
+        return batch.TaskResponse(task=task, final_answer="ok", success=True)
+
+    monkeypatch.setattr(batch.NeuroFabricOrchestrator, "process_task", process_task)
+
+    async def main():
+        lines = run_batch(BatchRequest(tasks=["doomed", "fine"]))
+        return [json.loads(line) async for line in lines]
+
+    lines = asyncio.run(asyncio.wait_for(main(), 5))
+    results = {line["index"]: line["result"] for line in lines[:-1]}
+    assert results[0]["success"] is False
+    assert results[0]["error"] == "Task was cancelled"
+    assert results[1]["success"] is True
+    assert lines[-1]["succeeded"] == 1
+
+
+def test_prompt_memo_repeats_cost_nothing():
+    memo = PromptMemo()
+
+    async def call():
+        from app.models import TokenUsage
+        return "text", TokenUsage(prompt=5, completion=5, total=10), 0.01, 100
+
+    async def main():
+        first = await memo.call([{"role": "user", "content": "x"}], "gpt-4", None, call)
+        second = await memo.call([{"role": "user", "content": "x"}], "gpt-4", None, call)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first[2] == 0.01
+    assert second[0] == "text" and second[2] == 0.0 and second[1].total == 0
+
+
+def test_batch_dedups_tasks_and_shares_routing(fake_llm):
+    def reply(messages, model):
+        if "Respond with a JSON object" in messages[-1]["content"]:
+            return '{"needs_analyst": true, "needs_math": false, "needs_text": false, "delegation_plan": "x"}'
+        return "APPROVED" if "Reply with exactly one line" in messages[-1]["content"] else "ok"
+    fake_llm.reply = reply
+    request = BatchRequest(tasks=[
+        "Describe product 1: red",
+        "Describe product 2: blue",
+        "Describe product 1: red",
+    ])
+
+    async def main():
+        return [json.loads(line) async for line in run_batch(request)]
+
+    lines = asyncio.run(main())
+    results, summary = lines[:-1], lines[-1]
+    assert sorted(r["index"] for r in results) == [0, 1, 2]
+    assert next(r for r in results if r["index"] == 2)["duplicate_of"] == 0
+    assert summary["unique_tasks"] == 2
+    assert summary["succeeded"] == 3
+    assert summary["routing_plans"] == 1
+    assert summary["routing_reused"] == 1
@@ -0,0 +1,81 @@
+"""Tests for the reference-counted blob store and its spill files."""
+import gc
+import os
+import subprocess
+import sys
+import pytest
+from app.core.blob_store import BlobStore, blob_store
+from app.models import AgentMessage, AgentType, MessageType
+
+TEXT = "x" * 5000
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore(min_chars=100, max_memory_bytes=6000, spill_dir=str(tmp_path / "blobs"))
+
+
+def test_identical_texts_share_one_entry_until_the_last_release(store):
+    first, second = store.put(TEXT), store.offload(TEXT)
+    assert first == second
+    assert store.stats()["in_memory"] == 1
+    store.release(first)
+    assert store.get(second) == TEXT
+    store.release(second)
+    assert store.stats()["in_memory"] == 0
+    with pytest.raises(KeyError):
+        store.get(first)
+
+
+def test_short_text_stays_inline(store):
+    assert store.offload("short") == "short"
+
+
+def test_releasing_a_spilled_blob_deletes_its_file(store):
+    old, new = store.put(TEXT), store.put("y" * 5000)
+    spilled = os.listdir(store.spill_path)
+    assert spilled == [old.key + ".txt"]
+    assert store.get(old) == TEXT
+    store.release(old)
+    assert os.listdir(store.spill_path) == []
+    assert store.stats()["spilled"] == 0
+    store.release(new)
+    assert store.stats()["memory_bytes"] == 0
+
+
+def test_close_deletes_this_process_spill_directory(store):
+    store.put(TEXT), store.put("y" * 5000)
+    store.close()
+    assert not os.path.exists(store.spill_path)
+
+
+def test_startup_removes_spills_of_stopped_processes(store):
+    finished = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    dead = os.path.join(store.spill_dir, finished.stdout.strip())
+    alive = os.path.join(store.spill_dir, str(os.getppid()))
+    for path in (dead, alive, store.spill_path):
+        os.makedirs(path)
+    legacy = os.path.join(store.spill_dir, "abc.zst")
+    open(legacy, "w").close()
+    store.remove_stale_spills()
+    assert sorted(os.listdir(store.spill_dir)) == sorted([os.path.basename(alive), os.path.basename(store.spill_path)])
+
+
+def test_compression_is_off_by_default():
+    assert BlobStore(min_chars=100).stats()["compression"] == "none"
+
+
+def test_collected_messages_release_their_blob():
+    before = blob_store.stats()["in_memory"]
+    message = AgentMessage(
+        id="msg-1",
+        from_agent=AgentType.COORDINATOR,
+        to_agent=AgentType.ANALYST,
+        body="z" * (blob_store.min_chars + 1),
+        type=MessageType.REQUEST,
+        timestamp=1,
+    )
+    assert blob_store.stats()["in_memory"] == before + 1
+    del message
+    gc.collect()
+    assert blob_store.stats()["in_memory"] == before
@@ -0,0 +1,126 @@
+"""Tests for cancelling abandoned tasks and their in-flight LLM calls."""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+from app.models import AgentType
+from app.models.task import Priority
+from app.routers.tasks import _cancel_on_disconnect
+from app.services import llm_service
+from app.services.orchestrator import NeuroFabricOrchestrator
+from app.services.scheduler import TaskScheduler
+
+PLAN = '{"needs_analyst": true, "needs_math": false, "needs_text": false, "delegation_plan": "analysis"}'
+
+
+def test_cancelling_a_task_aborts_its_llm_calls(fake_llm, isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, "critic_mode", "off")
+
+    def reply(messages, model):
+        if "Respond with a JSON object" in messages[-1]["content"]:
+            fake_llm.delay = 5.0  # Everything after routing hangs
+            return PLAN
+        return "ok"
+
+    fake_llm.reply = reply
+    orchestrator = NeuroFabricOrchestrator()
+
+    async def run():
+        task = asyncio.create_task(orchestrator.process_task("Compare two approaches"))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    analyst = orchestrator.agents[AgentType.ANALYST].metrics
+    assert analyst.status == "cancelled"
+    assert analyst.cancelled_calls == 1
+    assert analyst.llm_calls == 0
+
+
+def test_cancelled_runs_release_their_slot():
+    scheduler = TaskScheduler(max_concurrent=1, max_queue=10, queue_slas={"standard": 30.0})
+
+    async def run():
+        task = asyncio.create_task(scheduler.run(lambda: asyncio.sleep(5)))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        # The slot is free again for the next task
+        await asyncio.wait_for(scheduler.run(lambda: asyncio.sleep(0)), 1)
+
+    asyncio.run(run())
+    stats = scheduler.stats()
+    assert stats["in_flight"] == 0
+    assert stats["priorities"][Priority.STANDARD.value]["cancelled"] == 1
+
+
+class _Request:
+    def __init__(self, disconnect_after: int):
+        self.polls = 0
+        self.disconnect_after = disconnect_after
+
+    async def is_disconnected(self):
+        self.polls += 1
+        return self.polls > self.disconnect_after
+
+
+def test_disconnect_cancels_the_work(isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, "disconnect_poll_ms", 5)
+
+    async def run():
+        with pytest.raises(HTTPException) as error:
+            await _cancel_on_disconnect(_Request(disconnect_after=2), asyncio.sleep(5))
+        return error.value
+
+    error = asyncio.run(run())
+    assert error.status_code == 499
+
+
+def test_finished_work_is_returned_while_connected(isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, "disconnect_poll_ms", 5)
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    assert asyncio.run(_cancel_on_disconnect(_Request(disconnect_after=1000), work())) == "done"
+
+
+class _Stream:
+    def __init__(self):
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="x"))])
+
+    async def close(self):
+        self.closed = True
+
+
+def test_cancelled_stream_closes_the_http_response(monkeypatch):
+    stream = _Stream()
+
+    async def create(**kwargs):
+        return stream
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(llm_service, "_openai_client", client)
+
+    async def consume():
+        async for _ in llm_service.chat_completion_stream([{"role": "user", "content": "hi"}], model="gpt-4"):
+            pass
+
+    async def run():
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+    assert stream.closed
@@ -0,0 +1,46 @@
+"""Tests for the cheap-model-first cascade."""
+import asyncio
+import pytest
+from app.agents.base_agent import BaseAgent
+from app.models import AgentType
+from app.services.cascade import score_confidence
+
+
+@pytest.fixture
+def cascade_on(monkeypatch, isolated_settings):
+    monkeypatch.setattr(isolated_settings, "cascade_enabled", True)
+
+
+def test_score_confidence_penalties():
+    assert score_confidence("") == 0.0
+    assert score_confidence("42") == 1.0
+    assert score_confidence("42", finish_reason="length") == 0.5
+    assert score_confidence("I'm not sure, maybe 42") == pytest.approx(0.6)
+    assert score_confidence("42", mean_logprob=-0.1) == pytest.approx(0.905, abs=1e-3)
+
+
+def test_confident_cheap_answer_is_kept(fake_llm, cascade_on):
+    agent = BaseAgent(AgentType.COORDINATOR, model="gpt-4")
+    response, *_ = asyncio.run(agent._call_llm("plan this"))
+    assert response == "answer from gpt-3.5-turbo"
+    assert [call["model"] for call in fake_llm.calls] == ["gpt-3.5-turbo"]
+    assert agent.metrics.cascade_calls == 1
+    assert agent.metrics.escalations == 0
+
+
+def test_low_confidence_escalates(fake_llm, cascade_on):
+    fake_llm.confidence = 0.2
+    agent = BaseAgent(AgentType.COORDINATOR, model="gpt-4")
+    response, tokens, cost, _ = asyncio.run(agent._call_llm("plan this"))
+    assert response == "answer from gpt-4"
+    assert [call["model"] for call in fake_llm.calls] == ["gpt-3.5-turbo", "gpt-4"]
+    assert agent.metrics.escalations == 1
+    assert agent.metrics.llm_calls == 2
+    assert cost == pytest.approx(0.002)
+    assert tokens.completion == 20
+
+
+def test_agents_without_cascade_config_call_their_model(fake_llm, cascade_on):
+    agent = BaseAgent(AgentType.SPECIALIST_MATH, model="gpt-4")
+    asyncio.run(agent._call_llm("2 + 2"))
+    assert [call["model"] for call in fake_llm.calls] == ["gpt-4"]
@@ -0,0 +1,67 @@
+"""Tests for the Super-Critic review policy and verdict handling."""
+import asyncio
+import pytest
+from app.agents import parse_verdict, verdict_issues
+from app.services import NeuroFabricOrchestrator
+from app.services.critic_policy import ReviewMode, review_mode, task_class
+
+MATH = ["specialist_math"]
+
+
+def test_verdict_parsing():
+    assert parse_verdict("APPROVED") is True
+    assert parse_verdict("  revise: the sum is wrong") is False
+    assert parse_verdict("Looks fine") is None
+    assert parse_verdict(None) is None
+    assert verdict_issues("REVISE: the sum is wrong") == "the sum is wrong"
+    assert verdict_issues("APPROVED") == "APPROVED"
+    assert verdict_issues(None) == ""
+
+
+@pytest.mark.parametrize("overrides, confidence, expected", [
+    ({}, None, ReviewMode.BLOCKING),
+    ({"critic_mode": "audit"}, None, ReviewMode.AUDIT),
+    ({"critic_mode": "off"}, None, ReviewMode.SKIP),
+    ({"critic_skip_task_classes": ["specialist_math"]}, None, ReviewMode.SKIP),
+    ({"critic_skip_confidence": 0.9}, 0.95, ReviewMode.SKIP),
+    ({"critic_skip_confidence": 0.9}, 0.5, ReviewMode.BLOCKING),
+    ({"critic_sample_rate": 0.0}, None, ReviewMode.SKIP),
+])
+def test_review_mode(monkeypatch, isolated_settings, overrides, confidence, expected):
+    for name, value in overrides.items():
+        monkeypatch.setattr(isolated_settings, name, value)
+    assert review_mode(MATH, confidence) == expected
+
+
+def test_task_class_is_order_independent():
+    assert task_class(["specialist_text", "analyst"]) == "analyst+specialist_text"
+
+
+def _run(fake_llm, verdict):
+    def reply(messages, model):
+        prompt = messages[-1]["content"]
+        if "Reply with exactly one line" in prompt:
+            return verdict
+        if "Respond with a JSON object" in prompt:
+            return '{"needs_analyst": false, "needs_math": false, "needs_text": true, "delegation_plan": "text"}'
+        return "draft answer"
+    fake_llm.reply = reply
+    return asyncio.run(NeuroFabricOrchestrator().process_task("Write a haiku about autumn"))
+
+
+def test_blocking_revise_is_corrected_in_synthesis(fake_llm, isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, "local_text_mode", "off")
+    result = _run(fake_llm, "REVISE: the haiku has four lines")
+    assert result.success
+    assert result.critic_approved is False
+    assert result.critic_issues == "the haiku has four lines"
+    synthesis_prompt = fake_llm.calls[-1]["messages"][-1]["content"]
+    assert "the haiku has four lines" in synthesis_prompt
+
+
+def test_blocking_approval_synthesizes_normally(fake_llm, isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, "local_text_mode", "off")
+    result = _run(fake_llm, "APPROVED")
+    assert result.critic_approved is True
+    assert result.critic_issues is None
+    assert "reviewer flagged" not in fake_llm.calls[-1]["messages"][-1]["content"]
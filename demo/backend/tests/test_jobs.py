@@ -0,0 +1,75 @@
+"""Tests for the background job manager."""
+import asyncio
+import pytest
+from app.models import Priority
+from app.models.job import JobStatus
+from app.services import jobs as jobs_module
+from app.services.jobs import JobManager, SharedJobStore
+from app.services.scheduler import TaskScheduler
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = TaskScheduler(max_concurrent=1, max_queue=10, queue_slas={"standard": 0.01, "batch": 0.01})
+    monkeypatch.setattr(jobs_module, "task_scheduler", scheduler)
+    return scheduler
+
+
+def _answer(messages, model):
+    prompt = messages[-1]["content"]
+    if "Respond with a JSON object" in prompt:
+        return '{"needs_analyst": true, "needs_math": false, "needs_text": false, "delegation_plan": "x"}'
+    if "Reply with exactly one line" in prompt:
+        return "APPROVED"
+    return "done"
+
+
+def test_jobs_run_under_the_task_scheduler(fake_llm, scheduler):
+    fake_llm.reply = _answer
+    fake_llm.delay = 0.01
+    manager = JobManager(workers=3, max_jobs=10, max_queued=10)
+    peak = 0
+
+    async def main():
+        nonlocal peak
+        submitted = [manager.submit(f"Task {i}", Priority.BATCH) for i in range(3)]
+        while not all(job.finished for job in submitted):
+            peak = max(peak, scheduler.stats()["in_flight"])
+            await asyncio.sleep(0.005)
+        await manager.shutdown()
+        return submitted
+
+    submitted = asyncio.run(main())
+    # One slot, and jobs waited past the 10 ms queue SLA instead of being shed
+    assert peak == 1
+    assert [job.status for job in submitted] == [JobStatus.SUCCEEDED] * 3
+    assert scheduler.stats()["priorities"]["batch"]["admitted"] == 3
+    assert scheduler.stats()["priorities"]["batch"]["shed"] == 0
+
+
+def test_shutdown_cancels_running_and_queued_jobs(fake_llm, scheduler, tmp_path):
+    fake_llm.reply = _answer
+    fake_llm.delay = 10
+    store = SharedJobStore(str(tmp_path / "jobs.db"))
+    manager = JobManager(workers=1, max_jobs=10, max_queued=10, shared_store=store)
+
+    async def main():
+        running = manager.submit("Slow task")
+        queued = manager.submit("Waiting task")
+        while running.status != JobStatus.RUNNING:
+            await asyncio.sleep(0.005)
+        await manager.shutdown()
+        return running, queued
+
+    running, queued = asyncio.run(main())
+    for job in (running, queued):
+        assert job.status == JobStatus.CANCELLED
+        assert job.finished_at is not None
+        assert job.events.closed
+        assert job.events.events[-1]["event"] == "cancelled"
+    # The closed store flushed its queued writes; read them back from another process's view
+    other_process = SharedJobStore(str(tmp_path / "jobs.db"))
+    for job in (running, queued):
+        info = asyncio.run(other_process.load(job.id))
+        assert info.status == JobStatus.CANCELLED.value
+    assert scheduler.stats()["in_flight"] == 0
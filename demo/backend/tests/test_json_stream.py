@@ -0,0 +1,57 @@
+"""Tests for incremental parsing of a streamed JSON object."""
+import pytest
+from app.core.json_stream import JsonFieldParser
+
+PLAN = '{"needs_analyst": true, "needs_math": false, "score": 0.5, "plan": "a \\"quoted\\" step", "tags": ["x", {"y": "}"}]}'
+EXPECTED = [
+    ("needs_analyst", True),
+    ("needs_math", False),
+    ("score", 0.5),
+    ("plan", 'a "quoted" step'),
+    ("tags", ["x", {"y": "}"}]),
+]
+
+
+def _feed(chunks):
+    parser = JsonFieldParser()
+    fields = []
+    for chunk in chunks:
+        fields += parser.feed(chunk)
+    return parser, fields
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, len(PLAN)])
+def test_fields_are_the_same_for_any_chunking(size):
+    parser, fields = _feed([PLAN[i:i + size] for i in range(0, len(PLAN), size)])
+    assert fields == EXPECTED
+    assert parser.done
+
+
+def test_fields_complete_as_soon_as_their_value_closes():
+    parser = JsonFieldParser()
+    assert parser.feed('{"needs_analyst": tr') == []
+    assert parser.feed('ue, "needs_math"') == [("needs_analyst", True)]
+
+
+def test_escapes_in_keys_and_values_are_decoded():
+    _, fields = _feed(['{"a\\tb": "line\\nbreak \\u00e9"}'])
+    assert fields == [("a\tb", "line\nbreak é")]
+
+
+def test_prose_and_code_fences_before_the_object_are_skipped():
+    parser, fields = _feed(["Here is the plan:\n```json\n", '{"needs_text": true}', "\n```"])
+    assert fields == [("needs_text", True)]
+    assert parser.done
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"needs_math": true, "bad\\q": 1}', [("needs_math", True)]),
+    ('{"needs_math": true, "n": tru}', [("needs_math", True)]),
+    ('{"needs_math": true "n": 1}', [("needs_math", True)]),
+    ('{"needs_math": true, oops}', [("needs_math", True)]),
+])
+def test_malformed_input_stops_quietly_keeping_earlier_fields(text, expected):
+    parser, fields = _feed([text])
+    assert fields == expected
+    assert parser.done
+    assert parser.feed('"more": 1}') == []
@@ -0,0 +1,88 @@
+"""Tests for event-loop monitoring, the sampling profiler and /debug."""
+import asyncio
+import threading
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.loop_monitor import LoopMonitor, sample_profile
+from app.routers import debug_router
+
+
+def _monitored(body):
+    async def run():
+        monitor = LoopMonitor(interval_ms=10, slow_ms=40)
+        monitor.install()
+        try:
+            await body()
+        finally:
+            await monitor.uninstall()
+        return monitor
+
+    return asyncio.run(run())
+
+
+def test_lag_is_sampled_and_uninstall_restores_the_factory():
+    monitor = _monitored(lambda: asyncio.sleep(0.1))
+    report = monitor.report()
+    assert not report["installed"]
+    assert report["lag_ms"]["samples"] > 0
+    assert report["lag_ms"]["p50"] is not None
+
+
+def test_blocking_call_is_captured_as_a_stall():
+    async def blocks():
+        await asyncio.sleep(0.05)
+        time.sleep(0.3)
+        await asyncio.sleep(0.05)
+
+    monitor = _monitored(blocks)
+    assert monitor.stalls
+    stall = monitor.stalls[0]
+    assert any("blocks" in line for line in stall["stack"])
+    assert stall["duration_ms"] >= 100
+
+
+def test_task_steps_are_timed_per_coroutine():
+    async def busy():
+        time.sleep(0.06)
+
+    async def body():
+        await asyncio.create_task(busy())
+
+    monitor = _monitored(body)
+    names = {entry["name"]: entry for entry in monitor.report()["coroutines"]}
+    busy_name = next(name for name in names if name.endswith("busy"))
+    assert names[busy_name]["wall_ms"] >= 50
+    assert any(step["coroutine"] == busy_name for step in monitor.slow_steps)
+
+
+def test_sample_profile_folds_the_target_thread_stack():
+    stop = threading.Event()
+
+    def spin():
+        while not stop.is_set():
+            sum(range(1000))
+
+    thread = threading.Thread(target=spin)
+    thread.start()
+    try:
+        report = sample_profile(thread.ident, 0.1, 1)
+    finally:
+        stop.set()
+        thread.join()
+    assert report["samples"] > 0
+    assert any("spin" in entry["frame"] for entry in report["top_total"])
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in report["folded"])
+
+
+def test_debug_endpoints():
+    app = FastAPI()
+    app.include_router(debug_router)
+    with TestClient(app) as client:
+        assert client.get("/debug/loop").json()["installed"] is False
+        profile = client.get("/debug/profile", params={"seconds": 0.05, "interval_ms": 1})
+        assert profile.status_code == 200
+        assert profile.json()["samples"] > 0
+        folded = client.get("/debug/profile", params={"seconds": 0.05, "format": "folded"})
+        assert folded.headers["content-type"].startswith("text/plain")
+        assert client.get("/debug/profile", params={"format": "svg"}).status_code == 422
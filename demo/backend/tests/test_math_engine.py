@@ -0,0 +1,105 @@
+"""Tests for the local math engine and when it may skip the LLM."""
+import asyncio
+import pytest
+from app.agents.specialist_math import MathSpecialistAgent
+from app.core.math_engine import extract_ratings, safe_eval, solve
+from app.models import AgentMessage, AgentType, MessageType
+
+REVENUE = "What was the total revenue growth for Q3 2023 if sales grew 15% compared to 2022?"
+DAYS = "How many days are between March 3 and April 10?"
+REVIEWS = "Average rating of these reviews: 'Great' 5/5 … 'Meh' 2/5 … 'OK' 3 out of 5"
+
+
+@pytest.mark.parametrize("request_text", [REVENUE, DAYS, "Revenue 2019-2021 summary"])
+def test_prose_numbers_dates_and_years_are_not_operands(request_text):
+    assert solve(request_text) is None
+
+
+def test_bare_ratings_count_next_to_rating_words():
+    assert extract_ratings(REVIEWS) == ([5.0, 2.0, 3.0], 5)
+    assert extract_ratings("Split 3/4 of the budget") == ([], None)
+    result = solve(REVIEWS)
+    assert result.complete
+    assert result.statistics["mean"] == pytest.approx(10 / 3)
+
+
+@pytest.mark.parametrize("request_text, name, expected", [
+    ("Compute the mean of 12, 15, 18, 22 and 30", "mean", 19.4),
+    ("Find the max of: 4 8 15 16 23 42", "max", 42),
+    ("Daily visitors:\n1. 120\n2. 135\n3. 150\nWhat is the average?", "mean", 135),
+    ("Total of sales: 1,200, 1,500, 2,000", "sum", 4700),
+])
+def test_operation_over_an_explicit_list_is_complete(request_text, name, expected):
+    result = solve(request_text)
+    assert result.complete
+    assert result.statistics[name] == expected
+
+
+def test_bare_arithmetic_is_complete_but_embedded_arithmetic_is_narrated():
+    assert solve("What is 17 * 23 + 4?").expressions == {"17 * 23 + 4": 395}
+    assert solve("What is 17 * 23 + 4?").complete
+    assert solve("What is 15% of 200?").complete
+    embedded = solve("Sales went from 1200 to 1500; work out 1500 - 1200 for the board deck")
+    assert embedded.expressions == {"1500 - 1200": 300}
+    assert not embedded.complete
+
+
+def test_reasoning_requests_are_never_complete():
+    assert not solve("Explain why the mean of 2, 4, 6 matters").complete
+
+
+def test_safe_eval_rejects_huge_exponents_and_names():
+    with pytest.raises(ValueError):
+        safe_eval("9 ** 9 ** 9")
+    with pytest.raises(ValueError):
+        safe_eval("__import__('os')")
+
+
+@pytest.mark.parametrize("expression", ["((10**1000)**1000)**1000", "(9**99)**999", "10**400"])
+def test_safe_eval_rejects_oversized_powers_quickly(expression):
+    with pytest.raises(ValueError):
+        safe_eval(expression)
+
+
+def test_results_beyond_float_range_go_to_the_llm():
+    assert solve("What is 10^400?") is None
+
+
+def test_large_integers_are_exact_and_rounded_floats_are_narrated():
+    result = solve("What is 99999999999999999999 * 99999999999999999999999?")
+    assert result.complete
+    assert result.to_text().endswith("= 9999999999999999999899900000000000000000001")
+    assert not solve("What is 123456789012345678.5 * 100?").complete
+
+
+def test_no_regression_without_variance_in_x():
+    assert solve("Fit a regression to (1, 2), (1, 3)") is None
+
+
+def _ask(content):
+    agent = MathSpecialistAgent()
+    message = AgentMessage(
+        id="msg-1",
+        from_agent=AgentType.COORDINATOR,
+        to_agent=AgentType.SPECIALIST_MATH,
+        body=content,
+        type=MessageType.REQUEST,
+        timestamp=1,
+    )
+    return agent, asyncio.run(agent.process_message(message))
+
+
+@pytest.mark.parametrize("request_text", [REVENUE, DAYS])
+def test_specialist_asks_the_llm_without_explicit_data(fake_llm, request_text):
+    agent, response = _ask(request_text)
+    assert response == "answer from gpt-3.5-turbo"
+    assert agent.metrics.local_calls == 0
+    assert len(fake_llm.calls) == 1
+
+
+def test_specialist_answers_explicit_data_locally(fake_llm):
+    agent, response = _ask(REVIEWS)
+    assert response.startswith("Computed exactly:")
+    assert "mean: 3.3333" in response
+    assert agent.metrics.local_calls == 1
+    assert not fake_llm.calls
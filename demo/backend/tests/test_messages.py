@@ -0,0 +1,35 @@
+"""Tests for slotted internal messages and one-time serialization."""
+import json
+from app.core.serialization import dumps
+from app.models import AgentMessage, AgentType, Message, MessageType
+
+
+def _message(body="hello"):
+    return AgentMessage(
+        id="msg-1",
+        from_agent=AgentType.COORDINATOR,
+        to_agent=AgentType.ANALYST,
+        body=body,
+        type=MessageType.REQUEST,
+        timestamp=1,
+    )
+
+
+def test_dumps_is_compact_unicode_json():
+    assert dumps({"a": [1, "é"]}) == '{"a":[1,"é"]}'
+
+
+def test_agent_message_is_slotted():
+    assert not hasattr(_message(), "__dict__")
+
+
+def test_json_matches_the_api_model():
+    message = _message()
+    api = json.loads(message.to_model().json(by_alias=True))
+    assert json.loads(message.to_json()) == api
+    assert isinstance(message.to_model(), Message)
+
+
+def test_json_is_serialized_once():
+    message = _message()
+    assert message.to_json() is message.to_json()
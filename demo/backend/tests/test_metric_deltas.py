@@ -0,0 +1,94 @@
+"""Tests for metric deltas, their reducer and windowed aggregation."""
+import asyncio
+import json
+from app.models import AgentType, MetricDelta, apply_delta
+from app.services.events import MetricAggregator, TaskEventLog, attach_event_log
+from app.services.orchestrator import NeuroFabricOrchestrator
+
+PLAN = '{"needs_analyst": true, "needs_math": false, "needs_text": false, "delegation_plan": "analysis"}'
+
+
+def _deltas(log):
+    return [
+        delta
+        for event in log.events if event["event"] == "metrics"
+        for delta in json.loads(event["data"])["deltas"]
+    ]
+
+
+def test_merge_sums_counters_and_keeps_the_last_status():
+    delta = MetricDelta(agent_id="analyst", status="thinking", add={"llm_calls": 1})
+    delta.merge(MetricDelta(agent_id="analyst", add={"llm_calls": 1, "cost": 0.5}))
+    delta.merge(MetricDelta(agent_id="analyst", status="done"))
+    assert delta.status == "done"
+    assert delta.add == {"llm_calls": 2, "cost": 0.5}
+
+
+def test_to_dict_omits_unchanged_fields():
+    assert MetricDelta(agent_id="critic", seq=3).to_dict() == {"seq": 3, "agent": "critic"}
+    assert not MetricDelta(agent_id="critic")
+    assert MetricDelta(agent_id="critic", add={"cost": 0.1})
+
+
+def test_apply_delta_updates_counters_and_token_fields():
+    state = {}
+    apply_delta(state, {"seq": 1, "agent": "analyst", "status": "thinking"})
+    apply_delta(state, {"seq": 2, "agent": "analyst", "status": "done", "add": {"llm_calls": 1, "tokens.prompt": 40}})
+    metrics = state["analyst"]
+    assert metrics.status == "done"
+    assert metrics.llm_calls == 1
+    assert metrics.tokens.prompt == 40
+
+
+def test_zero_window_publishes_every_delta():
+    async def run():
+        log = TaskEventLog()
+        aggregator = MetricAggregator(log, 0)
+        aggregator.add(MetricDelta(agent_id="analyst", status="thinking"))
+        aggregator.add(MetricDelta(agent_id="analyst", status="done"))
+        return log
+
+    assert [delta["seq"] for delta in _deltas(asyncio.run(run()))] == [1, 2]
+
+
+def test_window_coalesces_deltas_per_agent():
+    async def run():
+        log = TaskEventLog()
+        aggregator = MetricAggregator(log, 0.05)
+        aggregator.add(MetricDelta(agent_id="analyst", status="thinking"))
+        aggregator.add(MetricDelta(agent_id="analyst", status="done", add={"llm_calls": 1}))
+        aggregator.add(MetricDelta(agent_id="critic", status="thinking"))
+        assert not log.events
+        await asyncio.sleep(0.1)
+        return log
+
+    log = asyncio.run(run())
+    assert len(log.events) == 1
+    assert _deltas(log) == [
+        {"seq": 1, "agent": "analyst", "status": "done", "add": {"llm_calls": 1}},
+        {"seq": 2, "agent": "critic", "status": "thinking"},
+    ]
+
+
+def test_replaying_the_stream_reproduces_agent_metrics(fake_llm, isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, "critic_mode", "off")
+    fake_llm.reply = lambda messages, model: PLAN if "Respond with a JSON object" in messages[-1]["content"] else "ok"
+
+    async def run():
+        orchestrator = NeuroFabricOrchestrator()
+        log = TaskEventLog()
+        attach_event_log(orchestrator, log, window_ms=20)
+        result = await orchestrator.process_task("Compare two approaches")
+        log.flush()
+        return orchestrator, log, result
+
+    orchestrator, log, result = asyncio.run(run())
+    assert result.success
+    deltas = _deltas(log)
+    assert [delta["seq"] for delta in deltas] == list(range(1, len(deltas) + 1))
+    state = {}
+    for delta in deltas:
+        apply_delta(state, delta)
+    for agent_type in (AgentType.COORDINATOR, AgentType.ANALYST):
+        expected = orchestrator.agents[agent_type].metrics
+        assert state[agent_type.value] == expected
@@ -0,0 +1,118 @@
+"""Tests for task streams multiplexed over one WebSocket."""
+import asyncio
+import json
+import zlib
+import pytest
+from app.services import multiplex
+from app.services.multiplex import FrameEncoder, MultiplexSession
+
+PLAN = '{"needs_analyst": true, "needs_math": false, "needs_text": false, "delegation_plan": "analysis"}'
+
+
+class FakeWebSocket:
+    """Records decoded frames."""
+
+    def __init__(self):
+        self.frames: list[dict] = []
+
+    async def send_text(self, text: str):
+        self.frames.append(json.loads(text))
+
+    async def send_bytes(self, data: bytes):
+        self.frames.append(json.loads(zlib.decompress(data)))
+
+
+@pytest.fixture
+def session(fake_llm, isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, "critic_mode", "off")
+    monkeypatch.setattr(isolated_settings, "metric_window_ms", 0)
+    fake_llm.reply = lambda messages, model: PLAN if "Respond with a JSON object" in messages[-1]["content"] else "ok"
+    return MultiplexSession(FakeWebSocket())
+
+
+def _events(session, stream_id):
+    return [frame["e"] for frame in session.websocket.frames if frame["s"] == stream_id]
+
+
+async def _drain(session):
+    await asyncio.gather(*(stream.pump for stream in list(session.streams.values())))
+
+
+def test_event_frames_splice_serialized_data():
+    frame = FrameEncoder().event("a", {"id": "3", "event": "answer", "data": '{"answer":"ok"}'})
+    assert json.loads(frame) == {"s": "a", "i": 3, "e": "answer", "d": {"answer": "ok"}}
+
+
+def test_large_frames_are_compressed():
+    encoder = FrameEncoder("deflate", min_bytes=64)
+    assert isinstance(encoder.control(1, "hello", {}), str)
+    frame = encoder.control(1, "error", {"error": "x" * 100})
+    assert isinstance(frame, bytes)
+    assert json.loads(zlib.decompress(frame))["d"]["error"] == "x" * 100
+
+
+def test_zstd_falls_back_to_deflate_without_zstandard(monkeypatch):
+    monkeypatch.setattr(multiplex, "zstandard", None)
+    assert FrameEncoder("zstd").compression == "deflate"
+
+
+def test_streams_run_side_by_side(session):
+    async def run():
+        await session.handle({"type": "open", "stream": "a", "task": "Compare two approaches"})
+        await session.handle({"type": "open", "stream": 2, "task": "Compare two designs", "progress": False})
+        await _drain(session)
+
+    asyncio.run(run())
+    a, b = _events(session, "a"), _events(session, 2)
+    assert "message" in a and "metrics" in a
+    assert a[-2:] == ["answer", "done"]
+    assert b == ["answer", "done"]
+    assert not session.streams
+
+
+def test_progress_waits_for_credit(session, isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, "ws_initial_credit", 1)
+
+    async def run():
+        await session.handle({"type": "open", "stream": "a", "task": "Compare two approaches"})
+        stream = session.streams["a"]
+        await stream.runner
+        await asyncio.sleep(0.01)
+        held = _events(session, "a")
+        await session.handle({"type": "credit", "stream": "a", "n": 1000})
+        await _drain(session)
+        return held
+
+    held = asyncio.run(run())
+    assert len(held) == 1 and held[0] in multiplex.PROGRESS_EVENTS
+    assert _events(session, "a")[-1] == "done"
+
+
+def test_cancel_ends_the_stream(session, fake_llm):
+    fake_llm.delay = 5.0
+
+    async def run():
+        await session.handle({"type": "open", "stream": "a", "task": "Compare two approaches"})
+        await asyncio.sleep(0.01)
+        await session.handle({"type": "cancel", "stream": "a"})
+        await _drain(session)
+
+    asyncio.run(run())
+    assert _events(session, "a")[-1] == "cancelled"
+
+
+@pytest.mark.parametrize("message, error", [
+    ({"type": "nope", "stream": "a"}, "Unknown message type: nope"),
+    ({"type": "cancel", "stream": "missing"}, "Unknown stream: missing"),
+    ({"type": "open", "task": "x"}, "Stream id missing or already open"),
+    ([1, 2], "Expected a JSON object"),
+])
+def test_invalid_messages_get_error_frames(session, message, error):
+    asyncio.run(session.handle(message))
+    assert session.websocket.frames[-1]["e"] == "error"
+    assert session.websocket.frames[-1]["d"]["error"] == error
+
+
+def test_credit_for_a_finished_stream_is_ignored(session):
+    asyncio.run(session.handle({"type": "credit", "stream": "gone", "n": 5}))
+    assert session.websocket.frames == []
@@ -0,0 +1,41 @@
+"""Tests for precompiled prompt templates and cached-prompt pricing."""
+import pytest
+from app.core.prompt_builder import PromptTemplate, compact
+from app.models import TokenUsage
+from app.services import llm_service
+
+
+def test_template_literal_is_compacted():
+    template = PromptTemplate("""
+        Instructions:   
+
+
+        Answer {task}
+    """)
+    assert template.template == "Instructions:\n\nAnswer {task}"
+    assert template.fields == ("task",)
+    assert template.static_prefix == "Instructions:\n\nAnswer "
+
+
+def test_values_are_substituted_verbatim():
+    code = "def f():\n    return 1   \n\n\n\n| a | b |\n|---|---|\n"
+    rendered = PromptTemplate("Review:\n{code}").render(code=code)
+    assert rendered == "Review:\n" + code
+
+
+def test_missing_field_raises():
+    with pytest.raises(KeyError, match="task"):
+        PromptTemplate("{context} {task}").render(context="x")
+
+
+def test_compact():
+    assert compact("  a  \n\n\n\n    b") == "a\n\n  b"
+
+
+def test_cached_prompt_tokens_are_discounted():
+    uncached = TokenUsage(prompt=1000, completion=100, uncached_prompt=1000)
+    cached = TokenUsage(prompt=1000, completion=100, cached_prompt=800, uncached_prompt=200)
+    full = llm_service._calculate_cost("gpt-4", uncached)
+    discounted = llm_service._calculate_cost("gpt-4", cached)
+    prompt_price = llm_service.pricing["gpt-4"]["prompt"]
+    assert full - discounted == pytest.approx(800 * prompt_price * 0.5)
@@ -0,0 +1,143 @@
+"""Tests for the priority task scheduler."""
+import asyncio
+import pytest
+from app.models.task import Priority
+from app.services.scheduler import QueueTicket, SchedulerOverloaded, TaskScheduler
+
+SLAS = {"interactive": 5.0, "standard": 30.0, "batch": 300.0}
+
+
+def _scheduler(max_concurrent=1, max_queue=10, slas=SLAS):
+    return TaskScheduler(max_concurrent=max_concurrent, max_queue=max_queue, queue_slas=slas)
+
+
+def test_concurrency_is_bounded():
+    scheduler = _scheduler(max_concurrent=2)
+    running = peak = 0
+
+    async def work():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    async def main():
+        await asyncio.gather(*(scheduler.run(work) for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak == 2
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_waiting_tasks_are_served_by_priority_then_fifo():
+    scheduler = _scheduler(slas={"interactive": 60.0, "standard": 60.0, "batch": 60.0})
+    order = []
+
+    async def main():
+        gate = asyncio.Event()
+
+        async def hold():
+            await gate.wait()
+
+        async def task(name, priority):
+            async with scheduler.slot(priority):
+                order.append(name)
+
+        first = asyncio.create_task(scheduler.run(hold))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(task("batch", Priority.BATCH)),
+            asyncio.create_task(task("standard-1", Priority.STANDARD)),
+            asyncio.create_task(task("interactive", Priority.INTERACTIVE)),
+            asyncio.create_task(task("standard-2", Priority.STANDARD)),
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(first, *waiters)
+
+    asyncio.run(main())
+    assert order == ["interactive", "standard-1", "standard-2", "batch"]
+
+
+def test_full_queue_is_shed():
+    scheduler = _scheduler(max_queue=1)
+
+    async def main():
+        gate = asyncio.Event()
+        holder = asyncio.create_task(scheduler.run(gate.wait))
+        queued = asyncio.create_task(scheduler.run(gate.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerOverloaded) as shed:
+            scheduler.check_admission(Priority.STANDARD)
+        gate.set()
+        await asyncio.gather(holder, queued)
+        return shed.value
+
+    error = asyncio.run(main())
+    assert error.retry_after >= 1
+    assert scheduler.stats()["priorities"]["standard"]["shed"] == 1
+
+
+def test_queue_wait_over_sla_is_shed():
+    scheduler = _scheduler(slas={"interactive": 0.01, "standard": 30.0, "batch": 300.0})
+
+    async def main():
+        gate = asyncio.Event()
+        holder = asyncio.create_task(scheduler.run(gate.wait))
+        await asyncio.sleep(0)
+        # Estimated wait (one running task) is far above the 10 ms SLA
+        with pytest.raises(SchedulerOverloaded):
+            await scheduler.acquire(Priority.INTERACTIVE)
+        gate.set()
+        await holder
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    scheduler = _scheduler()
+
+    async def main():
+        gate = asyncio.Event()
+        holder = asyncio.create_task(scheduler.run(gate.wait))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(scheduler.run(gate.wait))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        gate.set()
+        await holder
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(main())
+    stats = scheduler.stats()
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["priorities"]["standard"]["cancelled"] == 1
+
+
+def test_reprioritize_moves_a_waiting_task():
+    scheduler = _scheduler()
+    order = []
+
+    async def main():
+        gate = asyncio.Event()
+        holder = asyncio.create_task(scheduler.run(gate.wait))
+        await asyncio.sleep(0)
+        ticket = QueueTicket(Priority.BATCH)
+
+        async def task(name, priority, ticket=None):
+            async with scheduler.slot(priority, ticket):
+                order.append(name)
+
+        batch = asyncio.create_task(task("promoted", Priority.BATCH, ticket))
+        standard = asyncio.create_task(task("standard", Priority.STANDARD))
+        await asyncio.sleep(0)
+        assert scheduler.reprioritize(ticket, Priority.INTERACTIVE)
+        gate.set()
+        await asyncio.gather(holder, batch, standard)
+        assert not scheduler.reprioritize(ticket, Priority.BATCH)
+
+    asyncio.run(main())
+    assert order == ["promoted", "standard"]
@@ -0,0 +1,94 @@
+"""Tests for the SQLite-backed state shared between worker processes."""
+import asyncio
+import threading
+from app.models import AgentMetrics, AgentType
+from app.services import llm_service, memory_manager
+from app.services.jobs import Job, SharedJobStore
+from app.services.response_cache import ResponseCache
+
+MESSAGES = [{"role": "user", "content": "2 + 2"}]
+
+
+def _on_worker_thread(monkeypatch, obj, name, threads):
+    original = getattr(obj, name)
+
+    def wrapped(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return original(*args, **kwargs)
+    monkeypatch.setattr(obj, name, wrapped)
+
+
+def test_job_events_are_written_in_order_off_the_loop(tmp_path, monkeypatch):
+    store = SharedJobStore(str(tmp_path / "jobs.db"))
+    threads = []
+    _on_worker_thread(monkeypatch, store, "_execute", threads)
+    job = Job(id="job-1", task="t", priority="standard")
+    job.events.sink = lambda record: store.append_event(job.id, record)
+
+    async def main():
+        store.save(job)
+        for i in range(50):
+            job.events.append("message", {"n": i})
+        job.status = "succeeded"
+        store.save(job)
+        events = [event async for event in store.follow(job.id)]
+        await store.close()
+        return events
+
+    events = asyncio.run(main())
+    assert [event["id"] for event in events] == [str(i) for i in range(50)]
+    assert threads and threading.main_thread() not in threads
+
+
+def test_response_cache_runs_sqlite_in_a_thread(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "cache.db"), ttl=60, max_entries=10)
+    threads = []
+    _on_worker_thread(monkeypatch, cache, "_get", threads)
+    _on_worker_thread(monkeypatch, cache, "_put", threads)
+
+    async def main():
+        assert await cache.get("k") is None
+        await cache.put("k", {"text": "4"})
+        return await cache.get("k")
+
+    assert asyncio.run(main()) == {"text": "4"}
+    assert len(threads) == 3 and threading.main_thread() not in threads
+    assert cache.stats()["hits"] == 1
+
+
+def test_only_deterministic_calls_are_cached(monkeypatch, isolated_settings):
+    monkeypatch.setattr(isolated_settings, "response_cache_enabled", True)
+    assert llm_service._cache_key(MESSAGES, "gpt-4", 0.0, None, "chat")
+    assert llm_service._cache_key(MESSAGES, "gpt-4", 0.7, None, "chat") is None
+    monkeypatch.setattr(isolated_settings, "response_cache_max_temperature", 0.7)
+    assert llm_service._cache_key(MESSAGES, "gpt-4", 0.7, None, "chat")
+
+
+def test_memory_round_trip_off_the_loop(monkeypatch):
+    threads = []
+    _on_worker_thread(monkeypatch, memory_manager, "_append_memory", threads)
+    _on_worker_thread(monkeypatch, memory_manager, "_load_memories", threads)
+    metrics = [AgentMetrics(agent_id=AgentType.ANALYST, cost=0.01, processing_time=100)]
+
+    async def main():
+        await memory_manager.store_task_memory("Forecast quarterly revenue", "answer", ["analyst"], metrics)
+        return await memory_manager.retrieve_similar_tasks("quarterly revenue forecast")
+
+    similar = asyncio.run(main())
+    assert [m["task"] for m in similar] == ["Forecast quarterly revenue"]
+    assert len(threads) == 2 and threading.main_thread() not in threads
+
+
+def test_clearing_old_memories_runs_off_the_loop(monkeypatch):
+    threads = []
+    _on_worker_thread(monkeypatch, memory_manager, "_keep_recent", threads)
+    metrics = [AgentMetrics(agent_id=AgentType.ANALYST)]
+
+    async def main():
+        for task in ("first task", "second task", "third task"):
+            await memory_manager.store_task_memory(task, "answer", ["analyst"], metrics)
+        await memory_manager.clear_old_memories(keep_last=1)
+        return await memory_manager.load_task_records()
+
+    assert [m["task"] for m in asyncio.run(main())] == ["third task"]
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,69 @@
+"""Tests for planning stages within a latency deadline and cost ceiling."""
+import asyncio
+from types import SimpleNamespace
+from app.services.orchestrator import NeuroFabricOrchestrator
+from app.services.sla import BudgetTracker, Stage, plan_stages
+
+BIG, FALLBACK = "gpt-4-turbo-preview", "gpt-3.5-turbo"
+# Seeded estimates at 400 output tokens: BIG 11s / $0.022, FALLBACK 3.6s / $0.0011
+ANALYSIS = Stage("analysis", {"coordinator": BIG}, prompt_tokens=1000)
+REVIEW = Stage("review", {"critic": BIG}, prompt_tokens=1000, optional=True)
+
+
+def test_no_budget_keeps_the_plan():
+    plan, = plan_stages([ANALYSIS], None, None)
+    assert plan.models == {"coordinator": BIG}
+    assert plan.hedge_model is None and plan.max_tokens is None and not plan.notes
+
+
+def test_optional_stages_are_skipped_first():
+    analysis, review = plan_stages([ANALYSIS, REVIEW], 15_000, None)
+    assert review.skipped
+    assert analysis.models == {"coordinator": BIG}
+    assert analysis.hedge_model is None
+
+
+def test_tight_deadline_hedges_with_the_fallback():
+    plan, = plan_stages([ANALYSIS], 12_000, None)
+    assert plan.hedge_model == FALLBACK
+    assert plan.models == {"coordinator": BIG}
+    assert plan.estimate()[0] < 12_000
+
+
+def test_hedging_stays_under_the_cost_ceiling():
+    plan, = plan_stages([ANALYSIS], 12_000, 0.0225)
+    assert plan.hedge_model is None
+
+
+def test_cost_ceiling_downgrades_models():
+    plan, = plan_stages([ANALYSIS], None, 0.005)
+    assert plan.models == {"coordinator": FALLBACK}
+    assert plan.notes == [f"analysis: coordinator {BIG} -> {FALLBACK}"]
+
+
+def test_unreachable_budget_caps_output_and_says_so(isolated_settings):
+    plan, = plan_stages([ANALYSIS], 100, None)
+    assert plan.models == {"coordinator": FALLBACK}
+    assert plan.max_tokens == isolated_settings.sla_min_output_tokens
+    assert "budget not reachable" in plan.notes[-1]
+
+
+def test_tracker_records_stage_spend_and_limits():
+    tracker = BudgetTracker(latency_budget_ms=60_000, cost_budget_usd=0.02)
+    agent = SimpleNamespace(metrics=SimpleNamespace(cost=0.0), hedge_winners=[])
+    plan = tracker.plan([ANALYSIS])
+    with tracker.stage(plan, [agent]):
+        agent.metrics.cost += 0.01
+        agent.hedge_winners.append(FALLBACK)
+    report = tracker.finish()
+    assert report.stages[0].cost == 0.01
+    assert report.stages[0].hedge_winners == [FALLBACK]
+    assert report.within_cost and report.within_latency
+    assert tracker.remaining()[1] == 0.01
+
+
+def test_budgeted_task_reports_its_plan(fake_llm):
+    result = asyncio.run(NeuroFabricOrchestrator().process_task("Compare two approaches", cost_budget_usd=0.002))
+    assert result.budget.cost_budget_usd == 0.002
+    assert result.budget.decisions
+    assert {call["model"] for call in fake_llm.calls} == {FALLBACK}
@@ -0,0 +1,47 @@
+"""Tests for lazy service construction and startup profiling."""
+import os
+import subprocess
+import sys
+import pytest
+from app.core.startup import StartupProfile
+from app.profile_imports import import_profile
+from app.services import llm_service
+
+
+def test_startup_profile_records_phases():
+    profile = StartupProfile()
+    with profile.phase("imports"):
+        pass
+    with profile.phase("warmup"):
+        pass
+    report = profile.report()
+    assert list(report["phases_ms"]) == ["imports", "warmup"]
+    assert report["total_ms"] == round(sum(report["phases_ms"].values()), 1)
+
+
+def test_importing_the_app_creates_no_client():
+    env = {k: v for k, v in os.environ.items() if k != "OPENAI_API_KEY"}
+    code = "import sys, app.main; from app.services import llm_service; print(llm_service._openai_client, 'openai' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, cwd=os.getcwd())
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["None", "False"]
+
+
+def test_importing_the_app_loads_no_numpy():
+    code = "import sys, app.main; print('numpy' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=os.getcwd())
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
+
+
+def test_client_needs_a_key_only_when_used(monkeypatch, isolated_settings):
+    monkeypatch.setattr(isolated_settings, "openai_api_key", None)
+    monkeypatch.setattr(llm_service, "_openai_client", None)
+    with pytest.raises(RuntimeError, match="OPENAI_API_KEY"):
+        llm_service.openai_client
+
+
+def test_import_profile_lists_slowest_imports():
+    rows = import_profile("app.core.startup", top=3)
+    assert 0 < len(rows) <= 3
+    assert rows == sorted(rows, key=lambda row: row[2], reverse=True)
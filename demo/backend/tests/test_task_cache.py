@@ -0,0 +1,35 @@
+"""Tests for the task memo cache."""
+import asyncio
+import pytest
+from app.services import task_cache
+from app.services.orchestrator import NeuroFabricOrchestrator, cached_response
+
+PLAN = '{"needs_analyst": true, "needs_math": false, "needs_text": false, "delegation_plan": "analysis"}'
+
+
+@pytest.fixture
+def memo(fake_llm, isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, "task_cache_enabled", True)
+    monkeypatch.setattr(isolated_settings, "critic_mode", "off")
+    fake_llm.reply = lambda messages, model: PLAN if "Respond with a JSON object" in messages[-1]["content"] else "ok"
+    task_cache.clear()
+    yield fake_llm
+    task_cache.clear()
+
+
+def test_fingerprint_ignores_case_whitespace_and_trailing_punctuation():
+    assert task_cache.fingerprint("Compare  two approaches?") == task_cache.fingerprint("compare two approaches")
+
+
+def test_unbudgeted_runs_are_memoized(memo):
+    result = asyncio.run(NeuroFabricOrchestrator().process_task("Compare two approaches"))
+    cached = cached_response("compare two approaches.")
+    assert cached.cached == "fresh"
+    assert cached.final_answer == result.final_answer
+
+
+@pytest.mark.parametrize("budget", [{"latency_budget_ms": 60_000}, {"cost_budget_usd": 1.0}])
+def test_budgeted_runs_are_not_memoized(memo, budget):
+    result = asyncio.run(NeuroFabricOrchestrator().process_task("Compare two approaches", **budget))
+    assert result.success
+    assert cached_response("Compare two approaches") is None
@@ -0,0 +1,150 @@
+"""Tests for the time-bucketed task statistics store and the task summary."""
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.models import AgentMetrics, AgentType, TokenUsage
+from app.routers import tasks_router
+from app.services import memory_manager, task_stats
+from app.services.task_stats import TaskStatsStore, parse_window
+
+TOKENS = TokenUsage(prompt=100, completion=20)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TaskStatsStore(str(tmp_path / "stats"), max_series=4)
+
+
+def test_parse_window():
+    assert parse_window("30s") == 30
+    assert parse_window(" 15M ") == 900
+    assert parse_window("1.5h") == 5400
+    assert parse_window("2w") == 1209600
+    with pytest.raises(ValueError):
+        parse_window("yesterday")
+
+
+def test_query_totals_and_percentiles_per_series(store):
+    now = time.time()
+    for latency in (10, 20, 40, 1000):
+        store.record_call("analyst", "gpt-4", TOKENS, 0.01, latency, now=now - 120)
+    store.record_task(False, 0.05, TOKENS, 2000, now=now - 60)
+    result = asyncio.run(store.query(start=now - 3600))
+    assert result["resolution"] == "minute"
+    series = {(entry["agent"], entry["model"]): entry for entry in result["series"]}
+    analyst = series[("analyst", "gpt-4")]
+    assert analyst["count"] == 4
+    assert analyst["cost"] == pytest.approx(0.04)
+    assert analyst["tokens"] == {"prompt": 400, "completion": 80, "total": 480}
+    assert analyst["latency_ms"]["mean"] == 267.5
+    assert 15 <= analyst["latency_ms"]["p50"] <= 30
+    assert analyst["latency_ms"]["p99"] > 500
+    assert series[("task", None)]["errors"] == 1
+    only_tasks = asyncio.run(store.query(start=now - 3600, agent="task"))["series"]
+    assert [entry["agent"] for entry in only_tasks] == ["task"]
+
+
+def test_window_excludes_older_samples(store):
+    now = time.time()
+    store.record_task(True, 0.01, TOKENS, 100, now=now - 7200)
+    store.record_task(True, 0.01, TOKENS, 100, now=now - 60)
+    recent = asyncio.run(store.query(start=now - 600))["series"]
+    assert recent[0]["count"] == 1
+    everything = asyncio.run(store.query())
+    assert everything["resolution"] == "day"
+    assert everything["series"][0]["count"] == 2
+
+
+def test_rollups_report_per_bucket_totals(store):
+    now = time.time()
+    store.record_task(True, 0.01, TOKENS, 100, now=now - 120)
+    store.record_task(True, 0.02, TOKENS, 100, now=now)
+    store.record_call("critic", "gpt-4", TOKENS, 0.5, 100, now=now)
+    buckets = asyncio.run(store.rollups("minute", 5))["buckets"]
+    assert len(buckets) == 5
+    assert [bucket["count"] for bucket in buckets] == [0, 0, 1, 0, 1]
+    critic = asyncio.run(store.rollups("minute", 5, agent="critic"))["buckets"]
+    assert critic[-1]["cost"] == 0.5
+
+
+def test_series_beyond_the_limit_count_as_other(store):
+    for agent in ("a", "b", "c", "d"):
+        store.record_call(agent, "gpt-4", TOKENS, 0.01, 10)
+    agents = {entry["agent"]: entry["count"] for entry in asyncio.run(store.query())["series"]}
+    assert agents == {"a": 1, "b": 1, "other": 2}
+
+
+def test_records_run_on_the_store_thread(store, monkeypatch):
+    threads = []
+    add = store._add
+
+    def tracked(*args):
+        threads.append(threading.current_thread())
+        add(*args)
+
+    monkeypatch.setattr(store, "_add", tracked)
+    store.record_task(True, 0.01, TOKENS, 100)
+    assert asyncio.run(store.all_time())["count"] == 1
+    assert threads and threading.main_thread() not in threads
+    asyncio.run(store.close())
+
+
+def _store_memories():
+    metrics = [AgentMetrics(agent_id=AgentType.ANALYST, cost=0.02, processing_time=100)]
+    failed = [AgentMetrics(agent_id=AgentType.ANALYST, cost=1.0, processing_time=9000)]
+
+    async def main():
+        await memory_manager.store_task_memory("Forecast revenue", "answer", ["analyst"], metrics)
+        await memory_manager.store_task_memory("Forecast costs", "", ["analyst"], failed, success=False)
+        return await memory_manager.get_task_stats()
+
+    return asyncio.run(main())
+
+
+def test_disabled_summary_reads_memories_and_averages_successes(isolated_settings, tmp_path):
+    stats = _store_memories()
+    assert stats["total_tasks"] == 2
+    assert stats["successful_tasks"] == 1
+    assert stats["avg_cost"] == pytest.approx(0.02)
+    assert stats["avg_time_ms"] == 100
+    assert not (tmp_path / "stats").exists()
+
+
+def test_enabled_summary_reads_rollups_and_averages_all_tasks(isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, "stats_enabled", True)
+    task_stats.record_task(True, 0.02, TOKENS, 100)
+    task_stats.record_task(False, 1.0, TOKENS, 900)
+    stats = asyncio.run(memory_manager.get_task_stats())
+    assert stats["total_tasks"] == 2
+    assert stats["successful_tasks"] == 1
+    assert stats["avg_cost"] == pytest.approx(0.51)
+    assert stats["avg_time_ms"] == 500
+    assert stats["total_tokens"] == 240
+
+
+def test_stats_endpoints(isolated_settings, monkeypatch):
+    app = FastAPI()
+    app.include_router(tasks_router)
+    with TestClient(app) as client:
+        assert client.get("/api/stats").status_code == 404
+        monkeypatch.setattr(isolated_settings, "stats_enabled", True)
+        task_stats.record_task(True, 0.01, TOKENS, 100)
+        response = client.get("/api/stats", params={"window": "1h", "percentiles": "50,99.9"})
+        assert response.status_code == 200
+        assert set(response.json()["series"][0]["latency_ms"]) == {"mean", "p50", "p99.9"}
+        assert client.get("/api/stats", params={"window": "soon"}).status_code == 400
+        assert client.get("/api/stats", params={"percentiles": "150"}).status_code == 400
+        assert client.get("/api/stats/rollups", params={"resolution": "week"}).status_code == 400
+
+
+def test_numpy_rollups_load_on_first_use():
+    code = "import sys, app.services.task_stats; print('app.services.stats_rollups' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=os.getcwd())
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
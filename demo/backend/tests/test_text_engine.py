@@ -0,0 +1,64 @@
+"""Tests for local text analytics and when the text specialist may use it."""
+import asyncio
+import pytest
+from app.agents.specialist_text import TextSpecialistAgent
+from app.core.text_engine import analyze, label, split_payload
+from app.models import AgentMessage, AgentType, MessageType
+
+KNOWLEDGE = [
+    "Summarize the plot of Hamlet.",
+    "Give me a summary of the French revolution and its causes.",
+    "Explain the keywords in Python, like yield and async.",
+    "What is the sentiment of the word positive in economics?",
+    "Explain the tone of this: the author clearly admired the king",
+]
+REVIEWS = "What is the sentiment of these reviews:\n1. Great phone, love it\n2. Terrible battery, very bad"
+
+
+def test_split_payload_finds_supplied_text():
+    assert split_payload(REVIEWS) == (
+        "What is the sentiment of these reviews:",
+        ["Great phone, love it", "Terrible battery, very bad"],
+    )
+    assert split_payload('Tone of "we regret to inform you"') == ("Tone of", ["we regret to inform you"])
+    assert split_payload("Sentiment of this review: Great phone. Rating: 4/5") == (
+        "Sentiment of this review",
+        ["Great phone. Rating: 4/5"],
+    )
+    assert split_payload("Summarize the plot of Hamlet.") == ("Summarize the plot of Hamlet.", [])
+
+
+def test_analyze_scores_each_document():
+    analysis = analyze(REVIEWS)
+    assert [label(score) for score in analysis.sentiment] == ["positive", "negative"]
+
+
+@pytest.mark.parametrize("request_text", KNOWLEDGE)
+def test_requests_without_a_payload_or_about_the_world_use_the_llm(request_text):
+    assert TextSpecialistAgent()._local_route(request_text) is None
+
+
+def test_writing_instructions_use_the_llm_even_with_a_payload():
+    assert TextSpecialistAgent()._local_route("Rewrite with a positive tone: the launch slipped again") is None
+
+
+def test_analytic_request_over_supplied_text_is_local(isolated_settings, monkeypatch):
+    agent = TextSpecialistAgent()
+    assert agent._local_route(REVIEWS) == "simple"
+    assert agent._local_route('Sentiment of "I will write to complain, this is awful"') == "simple"
+    monkeypatch.setattr(isolated_settings, "local_text_mode", "always")
+    assert agent._local_route(KNOWLEDGE[0]) is None
+
+
+def test_specialist_sends_knowledge_questions_to_the_llm(fake_llm):
+    agent = TextSpecialistAgent()
+    message = AgentMessage(
+        id="msg-1",
+        from_agent=AgentType.COORDINATOR,
+        to_agent=AgentType.SPECIALIST_TEXT,
+        body=KNOWLEDGE[0],
+        type=MessageType.REQUEST,
+        timestamp=1,
+    )
+    assert asyncio.run(agent.process_message(message)) == "answer from gpt-3.5-turbo"
+    assert agent.metrics.local_calls == 0
@@ -0,0 +1,60 @@
+"""Tests for token counting and prompt section budgeting."""
+from app.core import token_budget
+from app.core.token_budget import PromptSection, TokenBudget, count_tokens
+
+
+def test_count_tokens_caches_by_digest_not_text():
+    text = "word " * 5000
+    first = count_tokens(text, "gpt-4")
+    assert count_tokens(text, "gpt-4") == first
+    assert all(isinstance(digest, bytes) and len(digest) == 16 for digest, _ in token_budget._token_counts)
+    assert text not in {key for key, _ in token_budget._token_counts}
+
+
+def test_count_tokens_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(token_budget, "TOKEN_CACHE_SIZE", 10)
+    for i in range(50):
+        count_tokens(f"text {i}", "gpt-4")
+    assert len(token_budget._token_counts) <= 10
+
+
+def test_fit_leaves_sections_that_fit():
+    sections = [PromptSection("task", "short task", priority=1), PromptSection("a", "short answer")]
+    assert TokenBudget("gpt-4", limit=1000).fit(sections) == {"task": "short task", "a": "short answer"}
+
+
+def test_fit_truncates_low_priority_first():
+    task = "Compute the thing. " * 20
+    budget = TokenBudget("gpt-4", limit=count_tokens(task, "gpt-4") + 60)
+    fitted = budget.fit([
+        PromptSection("task", task, priority=1),
+        PromptSection("a", "Alpha sentence. " * 100),
+        PromptSection("b", "Beta. " * 10),
+    ])
+    assert fitted["task"] == task
+    assert fitted["b"] == "Beta. " * 10
+    assert fitted["a"].endswith(token_budget.TRUNCATION_MARKER)
+
+
+def test_fit_never_cuts_task_for_min_token_floors():
+    task = "Analyze the quarterly numbers and report growth. " * 10
+    task_tokens = count_tokens(task, "gpt-4")
+    sections = [PromptSection("task", task, priority=1)] + [
+        PromptSection(name, f"{name}: " + "Details follow here. " * 60, min_tokens=50)
+        for name in ("math", "text", "research")
+    ]
+    # The three floors (150 tokens) do not fit next to the task
+    fitted = TokenBudget("gpt-4", limit=task_tokens + 100).fit(sections)
+    assert fitted["task"] == task
+    assert sum(count_tokens(fitted[name], "gpt-4") for name in ("math", "text", "research")) <= 100
+
+
+def test_fit_truncates_task_only_when_it_alone_overflows():
+    task = "Long task sentence. " * 200
+    fitted = TokenBudget("gpt-4", limit=100).fit([
+        PromptSection("task", task, priority=1),
+        PromptSection("a", "Some answer. " * 20, min_tokens=50),
+    ])
+    assert fitted["a"] == ""
+    assert fitted["task"].endswith(token_budget.TRUNCATION_MARKER)
+    assert count_tokens(fitted["task"], "gpt-4") <= 100
@@ -0,0 +1,90 @@
+"""Tests for span propagation and OTLP/JSON export."""
+import asyncio
+import json
+import pytest
+from app.core.tracing import OTLPJsonExporter, SPAN_KIND_CLIENT, Tracer
+
+
+@pytest.fixture
+def traced(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    return Tracer(OTLPJsonExporter("test", path=str(path)), enabled=True), path
+
+
+def _spans(path):
+    return [
+        span
+        for line in path.read_text().splitlines()
+        for span in json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    ]
+
+
+def test_disabled_tracer_records_nothing(tmp_path):
+    tracer = Tracer(OTLPJsonExporter("test", path=str(tmp_path / "t.jsonl")), enabled=False)
+    with tracer.span("task") as span:
+        assert span is None
+        assert tracer.context() == (None, None)
+    assert not (tmp_path / "t.jsonl").exists()
+
+
+def test_tracer_without_exporter_is_disabled():
+    assert not Tracer(None, enabled=True).enabled
+
+
+def test_nested_spans_share_the_trace_and_export_with_the_root(traced):
+    tracer, path = traced
+    with tracer.span("task") as root:
+        with tracer.span("llm.call", kind=SPAN_KIND_CLIENT, model="gpt-4") as child:
+            child.set(prompt_tokens=12, cost=0.5, cached=False)
+        assert not path.exists()
+    spans = {span["name"]: span for span in _spans(path)}
+    assert spans["llm.call"]["traceId"] == root.trace_id
+    assert spans["llm.call"]["parentSpanId"] == root.span_id
+    assert "parentSpanId" not in spans["task"]
+    assert spans["llm.call"]["kind"] == SPAN_KIND_CLIENT
+    assert {a["key"]: a["value"] for a in spans["llm.call"]["attributes"]} == {
+        "model": {"stringValue": "gpt-4"},
+        "prompt_tokens": {"intValue": "12"},
+        "cost": {"doubleValue": 0.5},
+        "cached": {"boolValue": False},
+    }
+
+
+def test_exceptions_mark_the_span_as_failed(traced):
+    tracer, path = traced
+    with pytest.raises(ValueError):
+        with tracer.span("task"):
+            raise ValueError("boom")
+    assert _spans(path)[0]["status"] == {"code": 2, "message": "ValueError: boom"}
+
+
+def test_context_follows_awaits_and_child_tasks(traced):
+    tracer, path = traced
+
+    async def child(name):
+        await asyncio.sleep(0)
+        with tracer.span(name):
+            pass
+
+    async def run():
+        with tracer.span("task") as root:
+            await asyncio.gather(child("a"), child("b"))
+        return root
+
+    root = asyncio.run(run())
+    children = [span for span in _spans(path) if span["name"] in ("a", "b")]
+    assert len(children) == 2
+    assert all(span["parentSpanId"] == root.span_id for span in children)
+
+
+def test_explicit_parent_and_recorded_intervals(traced):
+    tracer, path = traced
+    tracer.record("queue.wait", 100, 200, parent=("t" * 32, "s" * 16))
+    with tracer.span("hop", parent=("t" * 32, "s" * 16)):
+        pass
+    tracer.flush()
+    spans = {span["name"]: span for span in _spans(path)}
+    assert spans["queue.wait"]["startTimeUnixNano"] == "100"
+    assert spans["queue.wait"]["endTimeUnixNano"] == "200"
+    assert spans["hop"]["traceId"] == "t" * 32
+    assert spans["hop"]["parentSpanId"] == "s" * 16
@@ -6,9 +6,29 @@ Synthesizes results from specialists and provides coherent insights
 from typing import Optional
 from core.agent_base import Agent
 from core.message import Message, Performative
+from core.prompt import PromptTemplate
+from core.critic_policy import CriticPolicy, ReviewMode, parse_verdict, score_confidence
+from core.revision import RevisionEngine
+from core import checkpoint
+from core.checkpoint import get_checkpoints
 from core.logger import get_logger
 
 
+SYNTHESIS_PROMPT = PromptTemplate("""
+    You are synthesizing results from multiple specialist agents.
+    
+    Your task:
+    1. Integrate the findings into a coherent narrative
+    2. Highlight key insights and patterns
+    3. Provide actionable conclusions
+    4. Note any conflicts or uncertainties
+    
+    Be clear, concise, and insightful.
+    
+    {findings}
+""")
+
+
 class Analyst(Agent):
     """
     Analyst interprets context and synthesizes specialist outputs.
@@ -20,6 +40,12 @@ class Analyst(Agent):
     - Pass to Super-Critic for validation
     """
     
+    def __init__(self, agent_id: str, config: dict, message_bus, fabric_config: Optional[dict] = None):
+        super().__init__(agent_id, config, message_bus)
+        self.critic_policy = CriticPolicy((fabric_config or {}).get("critic"))
+        self.revision_engine = RevisionEngine((fabric_config or {}).get("revision"))
+        self.pending_syntheses = {}  # reply_to -> RevisionState awaiting verdict
+    
     async def process(self, message: Message) -> Optional[Message]:
         """Synthesize specialist responses"""
         
@@ -35,22 +61,32 @@ class Analyst(Agent):
         """Synthesize specialist findings into coherent output"""
         
         
-        synthesis_prompt = f"""
-        You are synthesizing results from multiple specialist agents.
+        synthesis_prompt = SYNTHESIS_PROMPT.render(findings=message.content)
         
-        {message.content}
-        
-        Your task:
-        1. Integrate the findings into a coherent narrative
-        2. Highlight key insights and patterns
-        3. Provide actionable conclusions
-        4. Note any conflicts or uncertainties
+        synthesis = await self.call_llm(synthesis_prompt)
         
-        Be clear, concise, and insightful.
-        """
         
-        synthesis = await self.call_llm(synthesis_prompt)
+        logger = get_logger()
+        mode = self.critic_policy.decide(message.metadata.get("specialists", []), score_confidence(synthesis))
+        logger.log_workflow(self.agent_id, "CRITIC_POLICY", f"Review mode: {mode.value}")
         
+        if mode != ReviewMode.BLOCKING:
+            # Deliver immediately; an audit reviews it after the fact
+            await self.send_message(
+                receiver="fabric",
+                content=synthesis,
+                performative=Performative.INFORM,
+                reply_to=message.reply_to,
+                summary="Final synthesized result"
+            )
+            if mode == ReviewMode.SKIP:
+                return None
+        else:
+            state = self.revision_engine.start(synthesis)
+            self.pending_syntheses[message.reply_to] = state
+            get_checkpoints().record(message.reply_to, checkpoint.SYNTHESIS, text=synthesis, rounds=0)
+            # Tagged sections let the critic point at exactly what to fix
+            synthesis = state.numbered()
         
         # Send to Super-Critic for validation
         await self.send_message(
@@ -58,11 +94,29 @@ class Analyst(Agent):
             content=f"SYNTHESIS TO VALIDATE:\n\n{synthesis}",
             performative=Performative.EVALUATE,
             reply_to=message.reply_to,
-            summary="Requesting quality evaluation"
+            summary="Requesting post-hoc audit" if mode == ReviewMode.AUDIT else "Requesting quality evaluation",
+            metadata={"audit": mode == ReviewMode.AUDIT}
         )
         
         return None  # Wait for critic's response
     
+    async def resume(self, task_id: str, cp: checkpoint.TaskCheckpoint):
+        """Put a checkpointed synthesis back under review without regenerating it"""
+        
+        state = self.revision_engine.start(cp.synthesis)
+        state.rounds = cp.rounds
+        self.pending_syntheses[task_id] = state
+        
+        # The critic's earlier verdicts were lost with the crash, so it reviews the whole text
+        await self.send_message(
+            receiver="super_critic",
+            content=f"SYNTHESIS TO VALIDATE:\n\n{state.numbered()}",
+            performative=Performative.EVALUATE,
+            reply_to=task_id,
+            summary="Requesting quality evaluation (resumed)",
+            metadata={"audit": False}
+        )
+    
     async def handle_critic_feedback(self, message: Message) -> Optional[Message]:
         """Handle feedback from Super-Critic"""
         
@@ -70,24 +124,27 @@ class Analyst(Agent):
         logger.log_workflow(self.agent_id, "HANDLE_CRITIC_FEEDBACK", "Processing critic response")
         
         content = message.content
-        
-        # Extract approved content - handle both explicit APPROVED and implicit approval
-        if content.startswith("APPROVED:"):
-            approved_content = content.replace("APPROVED:", "", 1).strip()
-        elif "REVISE:" in content[:50]:
-            # Send back with critic's note
-            reason = content.replace("REVISE:", "").strip()
+        state = self.pending_syntheses.get(message.reply_to)
+        
+        if parse_verdict(content) is False:
+            issues = content.replace("REVISE:", "", 1).strip()
+            if state and self.revision_engine.can_revise(state):
+                return await self.revise(message, state, issues)
+            
+            # Out of revision budget: deliver with critic's note
+            self.pending_syntheses.pop(message.reply_to, None)
             await self.send_message(
                 receiver="fabric",
-                content=f"[Note: Super-Critic flagged for revision]\n\n{reason}",
+                content=f"[Note: Super-Critic flagged for revision: {issues}]\n\n{state.text if state else ''}".rstrip(),
                 performative=Performative.INFORM,
                 reply_to=message.reply_to,
                 summary="Result with critic notes"
             )
             return None
-        else:
-            # Treat as implicit approval - the critic's evaluation itself
-            approved_content = content
+        
+        # Critic verdicts are compact; the approved content is our own synthesis
+        self.pending_syntheses.pop(message.reply_to, None)
+        approved_content = state.text if state else content.replace("APPROVED:", "", 1).strip()
         
         logger.log_workflow(self.agent_id, "SEND_FINAL_RESULT", "Sending to fabric")
         
@@ -101,3 +158,46 @@ class Analyst(Agent):
         )
         
         return None
+    
+    async def revise(self, message: Message, state, issues: str) -> None:
+        """Revise only the flagged sections and send just those back for review"""
+        
+        logger = get_logger()
+        indices = self.revision_engine.affected_sections(state, issues)
+        logger.log_workflow(
+            self.agent_id,
+            "REVISE_SECTIONS",
+            f"Round {state.rounds + 1}: sections {', '.join(str(i + 1) for i in indices)}"
+        )
+        
+        revised = await self.call_llm(self.revision_engine.build_prompt(state, issues, indices))
+        changed = self.revision_engine.apply(state, indices, revised)
+        
+        if not changed:
+            # Nothing to re-review; treat the current text as final
+            logger.log_workflow(self.agent_id, "REVISION_NO_CHANGE", "Delivering current synthesis")
+            self.pending_syntheses.pop(message.reply_to, None)
+            await self.send_message(
+                receiver="fabric",
+                content=state.text,
+                performative=Performative.INFORM,
+                reply_to=message.reply_to,
+                summary="Final synthesized result"
+            )
+            return None
+        
+        get_checkpoints().record(message.reply_to, checkpoint.SYNTHESIS, text=state.text, rounds=state.rounds)
+        
+        # Unchanged sections were already reviewed; only the patches go back
+        await self.send_message(
+            receiver="super_critic",
+            content=(
+                f"REVISED SECTIONS (round {state.rounds}) addressing: {issues}\n\n"
+                f"{state.numbered(changed)}"
+            ),
+            performative=Performative.EVALUATE,
+            reply_to=message.reply_to,
+            summary=f"Requesting re-evaluation (round {state.rounds})"
+        )
+        
+        return None
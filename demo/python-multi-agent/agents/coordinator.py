@@ -5,9 +5,37 @@ Decomposes goals, delegates tasks, and synthesizes final outputs
 
 from typing import Optional
 from core.agent_base import Agent
+from core.blob_store import resolve
+from core import checkpoint
+from core.checkpoint import get_checkpoints
 from core.message import Message, Performative
+from core.prompt import PromptTemplate
 from core.router import SimpleRouter
+from core.token_budget import TokenBudget, PromptSection, count_tokens
 from core.logger import get_logger
+from core.tracing import get_tracer
+
+
+DECOMPOSITION_PROMPT = PromptTemplate("""
+    Analyze the user request below and break it into clear subtasks.
+    
+    Respond with:
+    1. A brief analysis of what's needed
+    2. List of specific subtasks (be concrete and actionable)
+    
+    Keep it concise.
+    
+    USER REQUEST: {request}
+""")
+
+SYNTHESIS_REQUEST = PromptTemplate("""
+    Please synthesize these findings into a coherent response.
+    
+    ORIGINAL REQUEST: {request}
+    
+    SPECIALIST RESPONSES:
+    {responses}
+""")
 
 
 class Coordinator(Agent):
@@ -24,6 +52,8 @@ class Coordinator(Agent):
     def __init__(self, agent_id: str, config: dict, message_bus, fabric_config: dict):
         super().__init__(agent_id, config, message_bus)
         self.router = SimpleRouter(fabric_config)
+        self.budgets = fabric_config.get("budgets", {})
+        self.analyst_model = fabric_config.get("agents", {}).get("analyst", {}).get("model", self.model)
         self.pending_tasks = {}  # Track delegated tasks
     
     async def process(self, message: Message) -> Optional[Message]:
@@ -44,41 +74,29 @@ class Coordinator(Agent):
         logger.log_workflow(self.agent_id, "DECOMPOSE_TASK", "Analyzing user request")
         
         # Use LLM to analyze and decompose the task
-        decomposition_prompt = f"""
-        Analyze this user request and break it into clear subtasks:
-        
-        USER REQUEST: {message.content}
-        
-        Respond with:
-        1. A brief analysis of what's needed
-        2. List of specific subtasks (be concrete and actionable)
-        
-        Keep it concise.
-        """
+        request = message.content
+        decomposition_prompt = DECOMPOSITION_PROMPT.render(request=request)
         
         analysis = await self.call_llm(decomposition_prompt)
         
         # Route to appropriate specialists
-        specialists = self.router.route(message.content)
+        with get_tracer().span("coordinator.route") as span:
+            specialists = self.router.route(request)
+            if span:
+                span.set(specialists=",".join(sorted(specialists)))
         logger.log_workflow(self.agent_id, "ROUTE_TO_SPECIALISTS", f"Routing to: {', '.join(specialists)}")
+        get_checkpoints().record(message.message_id, checkpoint.ROUTED, specialists=specialists)
         
-        # Track this task
+        # Track this task (large contents stay in the blob store until synthesis)
         self.pending_tasks[message.message_id] = {
-            "original_request": message.content,
+            "original_request": message.payload,
             "specialists": specialists,
             "responses": {},
             "requester": message.sender
         }
         
         # Delegate to specialists
-        for specialist_id in specialists:
-            await self.send_message(
-                receiver=specialist_id,
-                content=message.content,
-                performative=Performative.REQUEST,
-                reply_to=message.message_id,
-                summary=f"Subtask delegation to {specialist_id}"
-            )
+        await self._delegate(message.message_id, specialists, message.payload, message.metadata.get("deadline"))
         
         # Send acknowledgment to fabric
         return await self.send_message(
@@ -99,37 +117,101 @@ class Coordinator(Agent):
             return None
         
         task_data = self.pending_tasks[task_id]
-        task_data["responses"][message.sender] = message.content
+        task_data["responses"][message.sender] = message.payload
+        get_checkpoints().record(task_id, checkpoint.SPECIALIST, specialist=message.sender, content=message.content)
         
         progress = f"{len(task_data['responses'])}/{len(task_data['specialists'])}"
         logger.log_workflow(self.agent_id, "COLLECT_RESPONSE", f"Progress: {progress}")
         
         # Check if all specialists have responded
         if len(task_data["responses"]) == len(task_data["specialists"]):
-            logger.log_workflow(self.agent_id, "ALL_RESPONSES_READY", "Sending to Analyst")
-            
-            # Send to Analyst for synthesis
-            synthesis_request = f"""
-            ORIGINAL REQUEST: {task_data['original_request']}
-            
-            SPECIALIST RESPONSES:
-            {self._format_responses(task_data['responses'])}
-            
-            Please synthesize these findings into a coherent response.
-            """
-            
+            await self._request_synthesis(task_id)
+        
+        return None
+    
+    async def resume(self, task_id: str, cp: checkpoint.TaskCheckpoint):
+        """Continue a checkpointed task: ask only the specialists that had not answered, then synthesize"""
+        
+        logger = get_logger()
+        if cp.stage == checkpoint.SYNTHESIS_REQUEST:
+            await self._send_synthesis_request(task_id, cp.synthesis_request, cp.specialists)
+            return
+        
+        self.pending_tasks[task_id] = {
+            "original_request": cp.request,
+            "specialists": cp.specialists,
+            "responses": dict(cp.responses),
+            "requester": "fabric"
+        }
+        missing = [s for s in cp.specialists if s not in cp.responses]
+        logger.log_workflow(
+            self.agent_id,
+            "RESUME_TASK",
+            f"{len(cp.responses)}/{len(cp.specialists)} specialist responses recovered"
+        )
+        
+        if missing:
+            await self._delegate(task_id, missing, cp.request)
+        else:
+            await self._request_synthesis(task_id)
+    
+    async def _delegate(self, task_id: str, specialists: list, request, deadline: Optional[float] = None):
+        """Send the request to each specialist"""
+        for specialist_id in specialists:
             await self.send_message(
-                receiver="analyst",
-                content=synthesis_request,
+                receiver=specialist_id,
+                content=request,  # Shared, not copied per specialist
                 performative=Performative.REQUEST,
                 reply_to=task_id,
-                summary="Request synthesis from Analyst"
+                summary=f"Subtask delegation to {specialist_id}",
+                metadata={"deadline": deadline}
             )
-            
-            # Clean up
-            del self.pending_tasks[task_id]
+    
+    async def _request_synthesis(self, task_id: str):
+        """Hand a task's collected responses to the Analyst"""
         
-        return None
+        logger = get_logger()
+        logger.log_workflow(self.agent_id, "ALL_RESPONSES_READY", "Sending to Analyst")
+        
+        task_data = self.pending_tasks.pop(task_id)
+        synthesis_request = self._build_synthesis_request(task_data)
+        get_checkpoints().record(
+            task_id,
+            checkpoint.SYNTHESIS_REQUEST,
+            content=synthesis_request,
+            specialists=task_data["specialists"]
+        )
+        await self._send_synthesis_request(task_id, synthesis_request, task_data["specialists"])
+    
+    async def _send_synthesis_request(self, task_id: str, synthesis_request: str, specialists: list):
+        await self.send_message(
+            receiver="analyst",
+            content=synthesis_request,
+            performative=Performative.REQUEST,
+            reply_to=task_id,
+            summary="Request synthesis from Analyst",
+            metadata={"specialists": specialists}
+        )
+    
+    def _build_synthesis_request(self, task_data: dict) -> str:
+        """Render the Analyst request within the analyst model's context budget"""
+        budget = TokenBudget(
+            model=self.analyst_model,
+            budgets=self.budgets,
+            reserve=count_tokens(SYNTHESIS_REQUEST.template, self.analyst_model)
+        )
+        
+        # Original request is kept whole; specialist responses shrink evenly
+        responses = task_data["responses"]
+        fitted = budget.fit(
+            [PromptSection("request", resolve(task_data["original_request"]), priority=1)]
+            + [PromptSection(name, resolve(text), min_tokens=50) for name, text in responses.items()]
+        )
+        
+        return SYNTHESIS_REQUEST.render(
+            request=fitted["request"],
+            responses=self._format_responses({name: fitted[name] for name in responses})
+        )
     
     def _format_responses(self, responses: dict) -> str:
         """Format specialist responses for synthesis"""
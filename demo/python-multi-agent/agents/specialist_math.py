@@ -2,9 +2,38 @@
 Math Specialist Agent - Numerical reasoning and statistical analysis
 """
 
+import time
 from typing import Optional
 from core.agent_base import Agent
 from core.message import Message, Performative
+from core.prompt import PromptTemplate
+from core.logger import get_logger
+
+
+ANALYSIS_PROMPT = PromptTemplate("""
+    You are a specialized mathematical and statistical agent.
+    
+    Provide:
+    1. Relevant calculations or statistical metrics
+    2. Data trends or patterns (if applicable)
+    3. Numerical insights
+    
+    Be precise and show your work. Use concrete numbers.
+    
+    USER REQUEST: {request}
+""")
+
+NARRATION_PROMPT = PromptTemplate("""
+    You are a specialized mathematical and statistical agent.
+    
+    The figures below were computed exactly. Use them as given; do not recompute them.
+    Explain what they mean and address the parts of the request they do not cover.
+    
+    COMPUTED RESULTS:
+    {results}
+    
+    USER REQUEST: {request}
+""")
 
 
 class SpecialistMath(Agent):
@@ -16,8 +45,15 @@ class SpecialistMath(Agent):
     - Numerical calculations
     - Data aggregation
     - Trend analysis
+    
+    Arithmetic and descriptive statistics are computed locally (core.math_engine);
+    the LLM is only called to narrate results or for requests the engine can't answer.
     """
     
+    def __init__(self, agent_id: str, config: dict, message_bus):
+        super().__init__(agent_id, config, message_bus)
+        self.local_engine = config.get("local_engine", True)
+    
     async def process(self, message: Message) -> Optional[Message]:
         """Process mathematical/statistical tasks"""
         
@@ -29,22 +65,23 @@ class SpecialistMath(Agent):
     async def analyze(self, message: Message) -> Message:
         """Perform mathematical analysis"""
         
+        start_time = time.perf_counter()
+        computed = None
+        if self.local_engine:
+            from core.math_engine import solve  # Loads NumPy on first use, not at startup
+            computed = solve(message.content)
         
-        analysis_prompt = f"""
-        You are a specialized mathematical and statistical agent.
-        
-        USER REQUEST: {message.content}
-        
-        Provide:
-        1. Relevant calculations or statistical metrics
-        2. Data trends or patterns (if applicable)
-        3. Numerical insights
-        
-        Be precise and show your work. Use concrete numbers.
-        """
-        
-        result = await self.call_llm(analysis_prompt)
-        
+        if computed and computed.complete:
+            # Pure computation: answer without an LLM call
+            result = f"Computed exactly:\n{computed.to_text()}"
+            get_logger().log_local_call(self.agent_id, "math", (time.perf_counter() - start_time) * 1000)
+        elif computed:
+            result = await self.call_llm(NARRATION_PROMPT.render(
+                results=computed.to_text(),
+                request=message.content
+            ))
+        else:
+            result = await self.call_llm(ANALYSIS_PROMPT.render(request=message.content))
         
         # Send result back to coordinator
         await self.send_message(
@@ -2,9 +2,30 @@
 Text Specialist Agent - Natural language understanding and analysis
 """
 
+import time
 from typing import Optional
 from core.agent_base import Agent
 from core.message import Message, Performative
+from core.prompt import PromptTemplate
+from core.logger import get_logger
+
+# Smoothing factor for the running LLM latency estimate
+LATENCY_ALPHA = 0.3
+
+
+ANALYSIS_PROMPT = PromptTemplate("""
+    You are a specialized natural language processing agent.
+    
+    Provide:
+    1. Sentiment analysis (if applicable)
+    2. Key themes or topics
+    3. Linguistic insights or patterns
+    4. Text summary (if needed)
+    
+    Be clear and interpretable. Focus on qualitative insights.
+    
+    USER REQUEST: {request}
+""")
 
 
 class SpecialistText(Agent):
@@ -16,8 +37,19 @@ class SpecialistText(Agent):
     - Text summarization
     - Semantic understanding
     - Language pattern recognition
+    
+    Analytic requests (sentiment, keywords, summaries, ratings) on short text the
+    request supplies are answered locally (core.text_engine), as are longer ones
+    when the task deadline is closer than the expected LLM latency; the LLM handles
+    everything else, including questions about the world.
     """
     
+    def __init__(self, agent_id: str, config: dict, message_bus):
+        super().__init__(agent_id, config, message_bus)
+        self.local_engine = config.get("local_engine", "auto")
+        self.local_max_words = config.get("local_max_words", 300)
+        self.expected_llm_ms = config.get("expected_llm_ms", 3000.0)
+    
     async def process(self, message: Message) -> Optional[Message]:
         """Process text analysis tasks"""
         
@@ -29,23 +61,17 @@ class SpecialistText(Agent):
     async def analyze(self, message: Message) -> Message:
         """Perform text analysis"""
         
+        start_time = time.perf_counter()
         
-        analysis_prompt = f"""
-        You are a specialized natural language processing agent.
-        
-        USER REQUEST: {message.content}
-        
-        Provide:
-        1. Sentiment analysis (if applicable)
-        2. Key themes or topics
-        3. Linguistic insights or patterns
-        4. Text summary (if needed)
-        
-        Be clear and interpretable. Focus on qualitative insights.
-        """
-        
-        result = await self.call_llm(analysis_prompt)
-        
+        if self._answer_locally(message):
+            from core.text_engine import analyze
+            analysis = analyze(message.content)
+            result = f"Analyzed locally:\n{analysis.to_text()}"
+            get_logger().log_local_call(self.agent_id, "text", (time.perf_counter() - start_time) * 1000)
+        else:
+            result = await self.call_llm(ANALYSIS_PROMPT.render(request=message.content))
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            self.expected_llm_ms += LATENCY_ALPHA * (duration_ms - self.expected_llm_ms)
         
         # Send result back to coordinator
         await self.send_message(
@@ -57,3 +83,22 @@ class SpecialistText(Agent):
         )
         
         return None
+    
+    def _answer_locally(self, message: Message) -> bool:
+        """Whether the local engine should answer (local_engine: auto, always or off)"""
+        if self.local_engine in ("off", False):
+            return False
+        # The engine (and NumPy) loads on the first request that could use it
+        from core.text_engine import detect_intents, is_generative, is_knowledge_question, split_payload, tokenize
+        if not detect_intents(message.content):
+            return False
+        # Only text the request supplies; questions about the world go to the LLM
+        instruction, documents = split_payload(message.content)
+        if not documents or is_generative(instruction) or is_knowledge_question(instruction):
+            return False
+        if self.local_engine in ("always", True):
+            return True
+        if len(tokenize(message.content)) <= self.local_max_words:
+            return True
+        deadline = message.metadata.get("deadline")
+        return deadline is not None and (deadline - time.time()) * 1000 < self.expected_llm_ms
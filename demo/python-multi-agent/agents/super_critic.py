@@ -6,6 +6,32 @@ Inspired by basal ganglia and anterior cingulate cortex
 from typing import Optional
 from core.agent_base import Agent
 from core.message import Message, Performative
+from core.prompt import PromptTemplate
+from core.critic_policy import parse_verdict
+from core.logger import get_logger
+
+
+CRITIQUE_PROMPT = PromptTemplate("""
+    You are a critical evaluator ensuring quality control.
+    
+    Evaluate the output below for:
+    1. Logical consistency and coherence
+    2. Factual accuracy (flag any potential errors)
+    3. Completeness (does it address the original request?)
+    4. Clarity and usefulness
+    
+    Respond with EXACTLY ONE line in one of these formats:
+    
+    APPROVED
+    
+    OR
+    
+    REVISE: <specific issues that must be fixed, citing section tags like [2]>
+    
+    Do not repeat or rewrite the output. Be thorough but fair.
+    
+    {content}
+""")
 
 
 class SuperCritic(Agent):
@@ -19,6 +45,11 @@ class SuperCritic(Agent):
     - Approve or request revisions
     """
     
+    def __init__(self, agent_id: str, config: dict, message_bus, fabric_config: Optional[dict] = None):
+        super().__init__(agent_id, config, message_bus)
+        critic_config = (fabric_config or {}).get("critic", {})
+        self.max_tokens = critic_config.get("max_tokens", 80)
+    
     async def process(self, message: Message) -> Optional[Message]:
         """Evaluate outputs from Analyst"""
         
@@ -31,37 +62,20 @@ class SuperCritic(Agent):
         """Critically evaluate analyst's synthesis"""
         
         
-        critique_prompt = f"""
-        You are a critical evaluator ensuring quality control.
-        
-        {message.content}
-        
-        Evaluate this output for:
-        1. Logical consistency and coherence
-        2. Factual accuracy (flag any potential errors)
-        3. Completeness (does it address the original request?)
-        4. Clarity and usefulness
-        
-        Respond with EXACTLY ONE of these formats:
-        
-        APPROVED: <the original content to send to user>
-        
-        OR
-        
-        REVISE: <specific reason why revision is needed>
+        critique_prompt = CRITIQUE_PROMPT.render(content=message.content)
         
-        Be thorough but fair.
-        """
+        # Compact verdict only - the Analyst still holds the content
+        evaluation = await self.call_llm(critique_prompt, max_tokens=self.max_tokens)
         
-        evaluation = await self.call_llm(critique_prompt)
+        # Anything that is not an explicit revision request counts as approval
+        if parse_verdict(evaluation) is None:
+            evaluation = "APPROVED"
         
-        # Parse the evaluation
-        if "APPROVED" in evaluation[:20]:
-            pass  # evaluation already contains APPROVED
-        elif "REVISE" in evaluation[:20]:
-            pass  # evaluation already contains REVISE
-        else:
-            evaluation = f"APPROVED: {evaluation}"
+        if message.metadata.get("audit"):
+            # Post-hoc audit: the result was already delivered
+            logger = get_logger()
+            logger.log_workflow(self.agent_id, "AUDIT_VERDICT", evaluation.strip()[:80])
+            return None
         
         # Send feedback to Analyst
         await self.send_message(
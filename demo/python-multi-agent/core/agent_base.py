@@ -5,12 +5,15 @@ Base Agent class for NeuroFabric cognitive architecture
 import asyncio
 import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Union
 import yaml
 from litellm import acompletion
 
-from core.message import Message, Performative, MessageBus
+from core.blob_store import BlobRef
+from core.message import Message, Performative, MessageBus, preview
 from core.logger import get_logger
+from core.prompt import compact
+from core.tracing import get_tracer, SPAN_KIND_CLIENT, SPAN_KIND_CONSUMER
 
 
 class Agent(ABC):
@@ -32,37 +35,43 @@ class Agent(ABC):
         
         # Agent-specific configuration
         self.model = config.get("model", "gpt-4o-mini")
-        self.system_prompt = config.get("system_prompt", "You are a helpful AI agent.")
+        self.system_prompt = compact(config.get("system_prompt", "You are a helpful AI agent."))
         self.temperature = config.get("temperature", 0.7)
     
     async def receive_message(self, message: Message):
         """Handle incoming message"""
-        await self.inbox.put(message)
+        # Enqueue time, for the inbox wait span
+        await self.inbox.put((time.time_ns(), message))
         
         logger = get_logger()
         logger.log_message(
             sender=message.sender,
             receiver=self.agent_id,
             performative=message.performative.value,
-            summary=message.summary or message.content[:50]
+            summary=message.preview
         )
     
     async def send_message(
         self, 
         receiver: str, 
-        content: str, 
+        content: Union[str, BlobRef], 
         performative: Performative = Performative.INFORM,
         reply_to: Optional[str] = None,
-        summary: str = ""
+        summary: str = "",
+        metadata: Optional[dict] = None
     ) -> Message:
-        """Send message to another agent"""
+        """Send message to another agent (content may be a blob reference to forward)"""
+        trace_id, span_id = get_tracer().context()
         message = Message(
             performative=performative,
             sender=self.agent_id,
             receiver=receiver,
             content=content,
             reply_to=reply_to,
-            summary=summary
+            summary=summary,
+            metadata=metadata or {},
+            trace_id=trace_id,
+            parent_span_id=span_id
         )
         
         logger = get_logger()
@@ -70,17 +79,34 @@ class Agent(ABC):
             sender=self.agent_id,
             receiver=receiver,
             performative=performative.value,
-            summary=summary or content[:50]
+            summary=summary or preview(content)
         )
         
         await self.message_bus.publish(message)
         return message
     
-    async def call_llm(self, prompt: str, system_override: Optional[str] = None) -> str:
+    async def call_llm(
+        self,
+        prompt: str,
+        system_override: Optional[str] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
         """
         Call LLM with agent's configuration.
         Uses LiteLLM for unified API across providers.
         """
+        with get_tracer().span("llm.call", kind=SPAN_KIND_CLIENT, agent=self.agent_id, model=self.model) as span:
+            response = await self._call_llm(prompt, system_override, max_tokens)
+            if span and response.startswith("ERROR:"):
+                span.error = response
+            return response
+    
+    async def _call_llm(
+        self,
+        prompt: str,
+        system_override: Optional[str],
+        max_tokens: Optional[int]
+    ) -> str:
         logger = get_logger()
         start_time = time.time()
         
@@ -91,10 +117,11 @@ class Agent(ABC):
                 acompletion(
                     model=self.model,
                     messages=[
-                        {"role": "system", "content": system_override or self.system_prompt},
+                        {"role": "system", "content": compact(system_override) if system_override else self.system_prompt},
                         {"role": "user", "content": prompt}
                     ],
-                    temperature=self.temperature
+                    temperature=self.temperature,
+                    max_tokens=max_tokens
                 ),
                 timeout=30.0
             )
@@ -105,13 +132,20 @@ class Agent(ABC):
             usage = response.usage
             prompt_tokens = usage.prompt_tokens if usage else 0
             completion_tokens = usage.completion_tokens if usage else 0
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached_tokens = getattr(details, "cached_tokens", 0) or 0
+            
+            span = get_tracer().current()
+            if span:
+                span.set(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, cached_tokens=cached_tokens)
             
             logger.log_llm_call(
                 agent=self.agent_id,
                 model=self.model,
                 prompt_tokens=prompt_tokens,
                 completion_tokens=completion_tokens,
-                duration_ms=duration_ms
+                duration_ms=duration_ms,
+                cached_tokens=cached_tokens
             )
             
             logger.log_workflow(
@@ -146,11 +180,23 @@ class Agent(ABC):
         logger = get_logger()
         logger.log_workflow(self.agent_id, "AGENT_STARTED", "Ready to process messages")
         
+        tracer = get_tracer()
+        
         while True:
-            message = await self.inbox.get()
+            enqueued_ns, message = await self.inbox.get()
+            parent = (message.trace_id, message.parent_span_id)
+            tracer.record("inbox.wait", enqueued_ns, time.time_ns(), parent=parent, agent=self.agent_id)
             
             try:
-                response = await self.process(message)
+                with tracer.span(
+                    "agent.process",
+                    parent=parent,
+                    kind=SPAN_KIND_CONSUMER,
+                    agent=self.agent_id,
+                    sender=message.sender,
+                    performative=message.performative.value
+                ):
+                    response = await self.process(message)
                 if response:
                     await self.message_bus.publish(response)
             except Exception as e:
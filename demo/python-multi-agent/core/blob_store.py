@@ -0,0 +1,150 @@
+"""
+Content-addressed blob store for NeuroFabric
+Large message contents are stored once, keyed by their SHA-256, and messages
+carry a small BlobRef that is resolved when the content is read
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Optional, Union
+from pydantic import BaseModel
+
+try:
+    import zstandard
+except ImportError:  # Optional: blobs are kept uncompressed without it
+    zstandard = None
+
+
+class BlobRef(BaseModel):
+    """Reference to a stored content"""
+    key: str                # SHA-256 of the UTF-8 text
+    size: int               # Characters
+    preview: str = ""       # First characters, for logs
+
+
+class BlobStore:
+    """
+    In-process content-addressed store for large texts
+
+    - identical texts (a request fanned out to every specialist) share one entry
+    - entries are zstd-compressed when the zstandard package is installed
+    - beyond max_memory_mb, least recently used entries spill to spill_dir
+      and are read back on access (kept in memory when spill_dir is null)
+
+    config.yaml:
+        blobs:
+          min_chars: 2048
+          compression: "zstd"
+          max_memory_mb: 64
+          spill_dir: ".blobs"
+    """
+
+    PREVIEW_CHARS = 50
+
+    def __init__(self, config: Optional[dict] = None):
+        config = config or {}
+        self.min_chars = config.get("min_chars", 2048)
+        self.max_memory = config.get("max_memory_mb", 64) * 1024 * 1024
+        self.spill_dir = config.get("spill_dir")
+        compress = config.get("compression", "zstd") == "zstd" and zstandard is not None
+        self._compressor = zstandard.ZstdCompressor(level=3) if compress else None
+        self._decompressor = zstandard.ZstdDecompressor() if compress else None
+        self._memory: OrderedDict = OrderedDict()  # key -> stored bytes
+        self._memory_bytes = 0
+        self._spilled = set()
+        self._last = (None, "")  # Most recently resolved (key, text)
+        self.stored_chars = 0
+        self.deduplicated_chars = 0
+
+    def offload(self, text: Union[str, BlobRef]) -> Union[str, BlobRef]:
+        """Store text of at least min_chars and return its reference; shorter text is returned as is"""
+        if isinstance(text, BlobRef) or len(text) < self.min_chars:
+            return text
+        return self.put(text)
+
+    def put(self, text: str) -> BlobRef:
+        """Store text (once per distinct content)"""
+        data = text.encode("utf-8")
+        key = hashlib.sha256(data).hexdigest()
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.deduplicated_chars += len(text)
+        elif key in self._spilled:
+            self.deduplicated_chars += len(text)
+        else:
+            stored = self._compressor.compress(data) if self._compressor else data
+            self._memory[key] = stored
+            self._memory_bytes += len(stored)
+            self.stored_chars += len(text)
+            self._spill()
+        return BlobRef(key=key, size=len(text), preview=text[:self.PREVIEW_CHARS])
+
+    def get(self, ref: Union[BlobRef, str]) -> str:
+        """Text of a reference (or key)"""
+        key = ref.key if isinstance(ref, BlobRef) else ref
+        if self._last[0] == key:
+            return self._last[1]
+        stored = self._memory.get(key)
+        if stored is not None:
+            self._memory.move_to_end(key)
+        elif key in self._spilled:
+            with open(self._path(key), "rb") as f:
+                stored = f.read()
+        else:
+            raise KeyError(f"Unknown blob {key}")
+        data = self._decompressor.decompress(stored) if self._decompressor else stored
+        text = data.decode("utf-8")
+        self._last = (key, text)
+        return text
+
+    def _spill(self):
+        """Move least recently used entries to disk while over the memory limit"""
+        if not self.spill_dir:
+            return
+        while self._memory_bytes > self.max_memory and len(self._memory) > 1:
+            key, stored = self._memory.popitem(last=False)
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with open(self._path(key), "wb") as f:
+                f.write(stored)
+            self._memory_bytes -= len(stored)
+            self._spilled.add(key)
+
+    def _path(self, key: str) -> str:
+        suffix = ".zst" if self._compressor else ".txt"
+        return os.path.join(self.spill_dir, key + suffix)
+
+    def stats(self) -> dict:
+        """Entry counts and sizes"""
+        return {
+            "in_memory": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "spilled": len(self._spilled),
+            "stored_chars": self.stored_chars,
+            "deduplicated_chars": self.deduplicated_chars,
+            "compression": "zstd" if self._compressor else "none",
+        }
+
+
+# Global blob store
+_global_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Get global blob store (defaults until configured)"""
+    global _global_store
+    if _global_store is None:
+        _global_store = BlobStore()
+    return _global_store
+
+
+def resolve(content: Union[str, BlobRef]) -> str:
+    """Text of an inline content or a reference"""
+    return get_blob_store().get(content) if isinstance(content, BlobRef) else content
+
+
+def configure_blob_store(config: Optional[dict]) -> BlobStore:
+    """Replace global blob store from the config.yaml blobs section"""
+    global _global_store
+    _global_store = BlobStore(config)
+    return _global_store
@@ -0,0 +1,196 @@
+"""
+Durable checkpoints for NeuroFabric tasks
+Write-ahead log of stage outputs, so a restart resumes a task from its last
+completed stage instead of paying for finished LLM calls again
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+# Task stages, in pipeline order
+REQUEST = "request"                      # fabric accepted the task: {content}
+ROUTED = "routed"                        # coordinator chose specialists: {specialists}
+SPECIALIST = "specialist"                # one specialist answered: {specialist, content}
+SYNTHESIS_REQUEST = "synthesis_request"  # analyst asked to synthesize: {content, specialists}
+SYNTHESIS = "synthesis"                  # analyst synthesis under review: {text, rounds}
+DONE = "done"                            # result delivered to the fabric
+RESUMED = "resumed"                      # a restart picked the task up again (stage unchanged)
+ABANDONED = "abandoned"                  # given up after too many resumes or too long
+FINISHED = (DONE, ABANDONED)
+
+
+@dataclass
+class TaskCheckpoint:
+    """Everything a task had completed when the log was last written"""
+    task_id: str
+    stage: str = REQUEST
+    request: str = ""
+    specialists: List[str] = field(default_factory=list)
+    responses: Dict[str, str] = field(default_factory=dict)
+    synthesis_request: str = ""
+    synthesis: str = ""
+    rounds: int = 0
+    created: float = 0.0                 # Time of the task's first record
+    attempts: int = 0                    # Times a restart has resumed the task
+
+    def apply(self, stage: str, data: dict):
+        """Fold one log record into the checkpoint"""
+        if stage == RESUMED:
+            self.attempts += 1
+            return
+        self.stage = stage
+        if stage == REQUEST:
+            self.request = data["content"]
+        elif stage == ROUTED:
+            self.specialists = data["specialists"]
+        elif stage == SPECIALIST:
+            self.responses[data["specialist"]] = data["content"]
+        elif stage == SYNTHESIS_REQUEST:
+            self.synthesis_request = data["content"]
+            self.specialists = data.get("specialists", self.specialists)
+        elif stage == SYNTHESIS:
+            self.synthesis = data["text"]
+            self.rounds = data.get("rounds", 0)
+
+
+class CheckpointLog:
+    """
+    Append-only JSONL log of task stages
+
+    Each record is flushed (and fsynced) before the stage's output is handed
+    on, so anything a later stage saw survives a crash. Records of finished
+    tasks are dropped by compaction, which rewrites the log atomically every
+    compact_every finished tasks and on startup.
+
+    A task that keeps failing after a restart would otherwise be re-run (and
+    re-billed) on every start; it is abandoned once it has been resumed
+    max_attempts times or is older than max_age_s.
+
+    config.yaml:
+        checkpoints:
+          enabled: false
+          path: "checkpoints.jsonl"
+          fsync: true
+          compact_every: 50
+          max_attempts: 3
+          max_age_s: 86400
+    """
+
+    def __init__(self, config: Optional[dict] = None):
+        config = config or {}
+        self.enabled = bool(config.get("enabled", False))
+        self.path = config.get("path", "checkpoints.jsonl")
+        self.fsync = bool(config.get("fsync", True))
+        self.compact_every = config.get("compact_every", 50)
+        self.max_attempts = config.get("max_attempts", 3)
+        self.max_age_s = config.get("max_age_s", 86400)
+        self._file = None
+        self._finished_since_compaction = 0
+
+    def record(self, task_id: str, stage: str, **data):
+        """Durably append one stage of a task (no-op when disabled)"""
+        if not self.enabled:
+            return
+        if self._file is None:
+            self._open()
+        line = json.dumps({"task": task_id, "stage": stage, "ts": time.time(), "data": data})
+        self._file.write(line + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        if stage in FINISHED:
+            self._finished_since_compaction += 1
+            if self._finished_since_compaction >= self.compact_every:
+                self.compact()
+
+    def load(self) -> Dict[str, TaskCheckpoint]:
+        """Replay the log into per-task checkpoints (finished tasks included)"""
+        tasks: Dict[str, TaskCheckpoint] = {}
+        if not self.enabled or not os.path.exists(self.path):
+            return tasks
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Torn write from a crash
+                task = tasks.get(record["task"])
+                if task is None:
+                    task = tasks[record["task"]] = TaskCheckpoint(record["task"], created=record.get("ts", 0.0))
+                task.apply(record["stage"], record["data"])
+        return tasks
+
+    def unfinished(self) -> Dict[str, TaskCheckpoint]:
+        """Tasks that were interrupted before delivering a result"""
+        return {task_id: task for task_id, task in self.load().items() if task.stage not in FINISHED}
+
+    def exhausted(self, task: TaskCheckpoint) -> Optional[str]:
+        """Why an unfinished task should not be resumed again, or None to resume it"""
+        if self.max_attempts is not None and task.attempts >= self.max_attempts:
+            return f"resumed {task.attempts} times"
+        if self.max_age_s is not None and task.created and time.time() - task.created > self.max_age_s:
+            return f"older than {self.max_age_s}s"
+        return None
+
+    def compact(self):
+        """Rewrite the log with only the records of unfinished tasks"""
+        if not self.enabled or not os.path.exists(self.path):
+            return
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        unfinished = set(self.unfinished())
+        temp_path = self.path + ".tmp"
+        with open(self.path, encoding="utf-8") as src, open(temp_path, "w", encoding="utf-8") as dst:
+            for line in src:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record["task"] in unfinished:
+                    dst.write(line if line.endswith("\n") else line + "\n")
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(temp_path, self.path)
+        self._finished_since_compaction = 0
+
+    def _open(self):
+        torn = False
+        if os.path.exists(self.path) and os.path.getsize(self.path):
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+        self._file = open(self.path, "a", encoding="utf-8")
+        if torn:
+            self._file.write("\n")  # Keep the next record off a torn last line
+
+    def close(self):
+        """Close the log file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# Global checkpoint log
+_global_log: Optional[CheckpointLog] = None
+
+
+def get_checkpoints() -> CheckpointLog:
+    """Get global checkpoint log (disabled until configured)"""
+    global _global_log
+    if _global_log is None:
+        _global_log = CheckpointLog()
+    return _global_log
+
+
+def configure_checkpoints(config: Optional[dict]) -> CheckpointLog:
+    """Replace global checkpoint log from the config.yaml checkpoints section"""
+    global _global_log
+    if _global_log is not None:
+        _global_log.close()
+    _global_log = CheckpointLog(config)
+    return _global_log
@@ -0,0 +1,77 @@
+"""
+Super-Critic review policy
+Decides per result whether the critic blocks, audits after the fact, or is skipped
+"""
+
+import random
+import re
+from enum import Enum
+from typing import Iterable, Optional
+
+
+# Phrases that indicate the model is unsure or refusing
+_HEDGES = re.compile(
+    r"\b(i'?m not sure|i am not sure|not certain|i cannot|i can'?t|unable to|"
+    r"insufficient information|not enough information|as an ai)\b",
+    re.IGNORECASE,
+)
+
+
+class ReviewMode(str, Enum):
+    BLOCKING = "blocking"   # Wait for the verdict before answering
+    AUDIT = "audit"         # Answer immediately, review asynchronously
+    SKIP = "skip"           # No review
+
+
+class CriticPolicy:
+    """
+    Config-driven critic policy.
+    
+    config.yaml:
+        critic:
+          mode: blocking             # blocking | audit | off
+          sample_rate: 1.0           # Fraction of results reviewed at all
+          skip_task_classes: []      # e.g. ["specialist_math"]
+          skip_confidence: null      # Skip when result confidence is at least this
+    """
+    
+    def __init__(self, config: Optional[dict] = None):
+        config = config or {}
+        self.mode = config.get("mode", "blocking")
+        self.sample_rate = config.get("sample_rate", 1.0)
+        self.skip_task_classes = set(config.get("skip_task_classes") or [])
+        self.skip_confidence = config.get("skip_confidence")
+    
+    def decide(self, specialists: Iterable[str] = (), confidence: Optional[float] = None) -> ReviewMode:
+        """Choose how the critic should handle a result"""
+        if self.mode == "off":
+            return ReviewMode.SKIP
+        if task_class(specialists) in self.skip_task_classes:
+            return ReviewMode.SKIP
+        if self.skip_confidence is not None and confidence is not None and confidence >= self.skip_confidence:
+            return ReviewMode.SKIP
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return ReviewMode.SKIP
+        return ReviewMode.AUDIT if self.mode == "audit" else ReviewMode.BLOCKING
+
+
+def score_confidence(text: str) -> float:
+    """Heuristic confidence in an answer (0-1): empty, failed or hedging answers score low"""
+    if not text.strip() or text.startswith("ERROR:"):
+        return 0.0
+    return 0.6 if _HEDGES.search(text) else 1.0
+
+
+def task_class(specialists: Iterable[str]) -> str:
+    """Task class label, e.g. 'specialist_math+specialist_text'"""
+    return "+".join(sorted(specialists))
+
+
+def parse_verdict(evaluation: str) -> Optional[bool]:
+    """Parse APPROVED / REVISE verdict; None if neither"""
+    head = evaluation.lstrip()[:20].upper()
+    if head.startswith("APPROVED"):
+        return True
+    if head.startswith("REVISE"):
+        return False
+    return None
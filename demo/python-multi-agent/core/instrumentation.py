@@ -0,0 +1,196 @@
+"""
+Event-loop health instrumentation for NeuroFabric
+Measures loop lag, captures stacks of blocking calls, tracks per-coroutine CPU time
+and samples the loop thread on demand
+"""
+
+import asyncio
+import collections.abc
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Optional
+
+
+class _TimedCoroutine(collections.abc.Coroutine):
+    """Wraps a task's coroutine to time each step"""
+
+    __slots__ = ("_coro", "_monitor", "_stats", "name")
+
+    def __init__(self, coro, monitor: "LoopMonitor"):
+        self._coro = coro
+        self._monitor = monitor
+        self.name = getattr(coro, "__qualname__", type(coro).__name__)
+        self._stats = monitor.coroutines.setdefault(self.name, [0, 0, 0, 0])
+
+    @property
+    def __name__(self) -> str:
+        return self.name
+
+    def send(self, value):
+        return self._step(self._coro.send, value)
+
+    def throw(self, *args):
+        return self._step(self._coro.throw, *args)
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    def _step(self, method, *args):
+        cpu = time.thread_time_ns()
+        wall = time.perf_counter_ns()
+        try:
+            return method(*args)
+        finally:
+            wall = time.perf_counter_ns() - wall
+            stats = self._stats  # [steps, cpu_ns, wall_ns, max_step_ns]
+            stats[0] += 1
+            stats[1] += time.thread_time_ns() - cpu
+            stats[2] += wall
+            stats[3] = max(stats[3], wall)
+            if wall > self._monitor.slow_ns:
+                self._monitor.slow_steps.append((self.name, wall / 1e6))
+
+
+class LoopMonitor:
+    """
+    Opt-in event-loop instrumentation
+
+    Blocking work on the loop (config loading, synchronous logging, file I/O)
+    stalls every agent at once. This makes those stalls visible:
+    - lag: a probe sleeps lag_interval_ms and records how late it wakes up
+    - stalls: a watchdog thread captures the loop's stack while it is blocked
+      for more than slow_callback_ms
+    - per-coroutine CPU/wall time via a task factory (awaited sub-coroutines
+      count towards the task's own coroutine)
+
+    config.yaml:
+        instrumentation:
+          enabled: false
+          lag_interval_ms: 50
+          slow_callback_ms: 100
+    """
+
+    def __init__(self, config: Optional[dict] = None):
+        config = config or {}
+        self.enabled = bool(config.get("enabled", False))
+        self.interval = config.get("lag_interval_ms", 50) / 1000
+        self.slow = config.get("slow_callback_ms", 100) / 1000
+        self.slow_ns = self.slow * 1e9
+        self.lags = deque(maxlen=1000)
+        self.stalls = deque(maxlen=50)
+        self.slow_steps = deque(maxlen=50)
+        self.coroutines = {}
+        self._loop = None
+        self._thread_id = None
+        self._heartbeat = 0.0
+        self._probe = None
+        self._stop = threading.Event()
+
+    def install(self):
+        """Start measuring the running loop (no-op when disabled)"""
+        if not self.enabled or self._loop:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._loop.set_task_factory(
+            lambda loop, coro, **kwargs: asyncio.Task(_TimedCoroutine(coro, self), loop=loop, **kwargs)
+        )
+        self._heartbeat = time.perf_counter()
+        self._probe = self._loop.create_task(self._measure_lag())
+        self._stop.clear()
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+
+    async def uninstall(self):
+        """Stop measuring and restore the default task factory"""
+        if not self._loop:
+            return
+        self._stop.set()
+        self._probe.cancel()
+        await asyncio.gather(self._probe, return_exceptions=True)
+        self._loop.set_task_factory(None)
+        self._loop = None
+
+    async def _measure_lag(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self.lags.append(max(0.0, now - expected) * 1000)
+            self._heartbeat = now
+
+    def _watch(self):
+        """Watchdog thread: grab the loop's stack while it is blocked"""
+        stall = None
+        due = 0.0
+        while not self._stop.wait(self.slow / 4):
+            if stall is not None:
+                if self._heartbeat + self.interval != due:
+                    stall["duration_ms"] = (self._heartbeat - due) * 1000
+                    stall = None
+                continue
+            due = self._heartbeat + self.interval
+            if time.perf_counter() - due > self.slow:
+                frame = sys._current_frames().get(self._thread_id)
+                stall = {"duration_ms": None, "stack": traceback.format_stack(frame) if frame else []}
+                self.stalls.append(stall)
+
+    async def profile(
+        self,
+        seconds: float,
+        interval_ms: float = 5.0,
+        stop: Optional[threading.Event] = None
+    ) -> Counter:
+        """Sample the loop thread's innermost frames for `seconds` or until `stop` is set"""
+        thread_id = self._thread_id or threading.get_ident()
+        return await asyncio.to_thread(sample_frames, thread_id, seconds, interval_ms, stop)
+
+    def print_report(self, top: int = 10):
+        """Print lag percentiles, stalls and the busiest coroutines"""
+        lags = sorted(self.lags)
+        print("\n" + "="*80)
+        print("🩺 EVENT LOOP HEALTH")
+        print("="*80 + "\n")
+
+        if lags:
+            p50 = lags[len(lags) // 2]
+            p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+            print(f"⏱️  Loop lag: p50 {p50:.1f}ms | p99 {p99:.1f}ms | max {lags[-1]:.1f}ms ({len(lags)} samples)")
+
+        print(f"🧱 Stalls over {self.slow * 1000:.0f}ms: {len(self.stalls)}")
+        for stall in self.stalls:
+            duration = f"{stall['duration_ms']:.0f}ms" if stall["duration_ms"] is not None else "ongoing"
+            where = stall["stack"][-1].strip().splitlines()[0] if stall["stack"] else "?"
+            print(f"   - {duration:>8} at {where}")
+
+        print(f"\n{'Coroutine':<50} {'Steps':<8} {'CPU (ms)':<10} {'Max step (ms)':<12}")
+        print("-" * 80)
+        busiest = sorted(self.coroutines.items(), key=lambda item: item[1][1], reverse=True)[:top]
+        for name, (steps, cpu, _, longest) in busiest:
+            print(f"{name[:49]:<50} {steps:<8} {cpu / 1e6:<10.1f} {longest / 1e6:<12.1f}")
+        print()
+
+
+def sample_frames(
+    thread_id: int,
+    seconds: float,
+    interval_ms: float,
+    stop: Optional[threading.Event] = None
+) -> Counter:
+    """Count innermost frames of a thread at a fixed interval (blocking; idle waits excluded)"""
+    samples = Counter()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline and not (stop and stop.is_set()):
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            break
+        code = frame.f_code
+        if code.co_name != "select":
+            samples[f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})"] += 1
+        time.sleep(interval_ms / 1000)
+    return samples
@@ -26,10 +26,12 @@ class AgentMetrics:
     total_tokens: int = 0
     prompt_tokens: int = 0
     completion_tokens: int = 0
+    cached_prompt_tokens: int = 0
     total_cost_usd: float = 0.0
     processing_time: float = 0.0
     messages_sent: int = 0
     messages_received: int = 0
+    local_calls: int = 0
 
 
 @dataclass
@@ -113,7 +115,8 @@ class NeuroFabricLogger:
         print(f"{icon} [{performative}] {sender} → {receiver}: {summary}")
     
     def log_llm_call(self, agent: str, model: str, prompt_tokens: int = 0, 
-                     completion_tokens: int = 0, duration_ms: float = 0):
+                     completion_tokens: int = 0, duration_ms: float = 0,
+                     cached_tokens: int = 0):
         """Log LLM API call with token usage"""
         self._ensure_agent_metrics(agent)
         
@@ -121,17 +124,31 @@ class NeuroFabricLogger:
         metrics.llm_calls += 1
         metrics.prompt_tokens += prompt_tokens
         metrics.completion_tokens += completion_tokens
+        metrics.cached_prompt_tokens += cached_tokens
         metrics.total_tokens += (prompt_tokens + completion_tokens)
         metrics.processing_time += duration_ms / 1000
         
         # Estimate cost (OpenAI GPT-4o-mini pricing as of 2024)
-        # $0.15 per 1M input tokens, $0.60 per 1M output tokens
-        cost = (prompt_tokens * 0.15 / 1_000_000) + (completion_tokens * 0.60 / 1_000_000)
+        # $0.15 per 1M input tokens ($0.075 when cached), $0.60 per 1M output tokens
+        cost = ((prompt_tokens - cached_tokens) * 0.15 / 1_000_000
+                + cached_tokens * 0.075 / 1_000_000
+                + completion_tokens * 0.60 / 1_000_000)
         metrics.total_cost_usd += cost
         
-        print(f"🔄 [{agent}] LLM Call: {model} | Tokens: {prompt_tokens}→{completion_tokens} | "
+        print(f"🔄 [{agent}] LLM Call: {model} | Tokens: {prompt_tokens}→{completion_tokens} "
+              f"(cached: {cached_tokens}) | "
               f"Time: {duration_ms:.0f}ms | Cost: ${cost:.6f}")
     
+    def log_local_call(self, agent: str, engine: str, duration_ms: float = 0):
+        """Log a subtask answered by a local engine (no tokens, no cost)"""
+        self._ensure_agent_metrics(agent)
+        
+        metrics = self.agent_metrics[agent]
+        metrics.local_calls += 1
+        metrics.processing_time += duration_ms / 1000
+        
+        print(f"⚡ [{agent}] Local {engine} | Time: {duration_ms:.1f}ms | Cost: $0")
+    
     def log_error(self, agent: str, error: str):
         """Log error"""
         print(f"❌ [{agent}] ERROR: {error}")
@@ -175,12 +192,24 @@ class NeuroFabricLogger:
         print(f"{'TOTAL':<20} {'':<12} {total_tokens:<15,} ${total_cost:<11.6f}")
         print()
         
+        local_calls = sum(m.local_calls for m in self.agent_metrics.values())
+        if local_calls:
+            print(f"⚡ Subtasks answered locally (no LLM call): {local_calls}")
+            print()
+        
         # Cost efficiency analysis
         if total_tokens > 0:
             cost_per_1k_tokens = (total_cost / total_tokens) * 1000
             print(f"💰 Cost Efficiency:")
             print(f"   - Average: ${cost_per_1k_tokens:.4f} per 1K tokens")
             print(f"   - Processing rate: {total_tokens / total_time:.0f} tokens/second")
+            
+            prompt_tokens = sum(m.prompt_tokens for m in self.agent_metrics.values())
+            cached_tokens = sum(m.cached_prompt_tokens for m in self.agent_metrics.values())
+            if prompt_tokens > 0:
+                print(f"   - Prompt tokens: {cached_tokens:,} cached / "
+                      f"{prompt_tokens - cached_tokens:,} uncached "
+                      f"({cached_tokens / prompt_tokens:.0%} cache hit)")
             print()
         
         # Workflow visualization
@@ -3,12 +3,14 @@ FIPA-ACL Inspired Message Protocol for NeuroFabric
 Based on FIPA ACL Message Structure Specification (2002)
 """
 
-from typing import Optional, List, Any
-from pydantic import BaseModel, Field
+from typing import Optional, List, Any, Union
+from pydantic import BaseModel, Field, model_validator
 from enum import Enum
 from datetime import datetime
 import uuid
 
+from core.blob_store import BlobRef, get_blob_store
+
 
 class Performative(str, Enum):
     """FIPA-ACL performatives adapted for cognitive agents"""
@@ -39,8 +41,10 @@ class Message(BaseModel):
     reply_to: Optional[str] = None
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     
-    # Content
-    content: str
+    # Content: passed as content=, kept inline when short, otherwise stored
+    # once in the blob store and read back on access
+    inline_content: str = ""
+    content_ref: Optional[BlobRef] = None
     metadata: dict = Field(default_factory=dict)
     
     # Semantic Layer (optional, for future vector routing)
@@ -49,8 +53,47 @@ class Message(BaseModel):
     # Summary Layer
     summary: str = ""
     
+    # Trace context of the span that sent this message
+    trace_id: Optional[str] = None
+    parent_span_id: Optional[str] = None
+    
+    @model_validator(mode="before")
+    @classmethod
+    def _offload_content(cls, data: Any) -> Any:
+        """Move large content into the blob store"""
+        if isinstance(data, dict) and "content" in data:
+            data = dict(data)
+            content = get_blob_store().offload(data.pop("content"))
+            if isinstance(content, BlobRef):
+                data["content_ref"] = content
+            else:
+                data["inline_content"] = content
+        return data
+    
+    @property
+    def content(self) -> str:
+        """Message text, resolved from the blob store if offloaded"""
+        if self.content_ref is None:
+            return self.inline_content
+        return get_blob_store().get(self.content_ref)
+    
+    @property
+    def payload(self) -> Union[str, BlobRef]:
+        """Content as stored, for forwarding without a copy"""
+        return self.content_ref or self.inline_content
+    
+    @property
+    def preview(self) -> str:
+        """Short description for logs, without resolving the content"""
+        return self.summary or preview(self.payload)
+    
     def __str__(self):
-        return f"[{self.performative}] {self.sender} → {self.receiver}: {self.summary or self.content[:50]}"
+        return f"[{self.performative}] {self.sender} → {self.receiver}: {self.preview}"
+
+
+def preview(content: Union[str, BlobRef]) -> str:
+    """First characters of a content or its reference"""
+    return content.preview if isinstance(content, BlobRef) else content[:50]
 
 
 class MessageBus:
@@ -0,0 +1,48 @@
+"""
+Prompt assembly for NeuroFabric agents
+Precompiled templates with whitespace compaction and cache-friendly ordering
+"""
+
+import re
+import textwrap
+from string import Formatter
+
+
+_TRAILING_WHITESPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def compact(text: str) -> str:
+    """Strip indentation and redundant whitespace from prompt text"""
+    text = textwrap.dedent(text).strip()
+    text = _TRAILING_WHITESPACE.sub("", text)
+    return _BLANK_LINES.sub("\n\n", text)
+
+
+class PromptTemplate:
+    """
+    Prompt template compiled once at import time.
+    
+    Templates are written with their static instructions first and the
+    variable fields last, so repeated calls from the same agent share a long
+    identical prefix that providers can serve from their prompt cache.
+    """
+    
+    def __init__(self, template: str):
+        self.template = compact(template)
+        self._parts = list(Formatter().parse(self.template))
+        self.fields = tuple(name for _, name, _, _ in self._parts if name)
+        self.static_prefix = self._parts[0][0] if self._parts else ""
+    
+    def render(self, **values) -> str:
+        """Fill in template fields (values are inserted verbatim)"""
+        missing = set(self.fields) - values.keys()
+        if missing:
+            raise KeyError(f"Missing prompt fields: {', '.join(sorted(missing))}")
+        
+        rendered = []
+        for literal, name, _, _ in self._parts:
+            rendered.append(literal)
+            if name:
+                rendered.append(str(values[name]))
+        return "".join(rendered)
@@ -0,0 +1,143 @@
+"""
+Revision engine for the Analyst <-> Super-Critic loop
+Bounded, section-level revisions so each round only pays for what the critic flagged
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from core.prompt import PromptTemplate
+
+
+REVISION_PROMPT = PromptTemplate("""
+    Revise ONLY the tagged sections below so that they fix the reviewer's issues.
+    Keep each section's tag (e.g. [2]) at the start of its revised text.
+    Do not add new sections or rewrite anything that is not affected.
+
+    REVIEWER ISSUES: {issues}
+
+    SECTIONS TO REVISE:
+    {sections}
+""")
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SECTION_TAG = re.compile(r"^\[(\d+)\]\s*", re.MULTILINE)
+_WORD = re.compile(r"[a-z0-9]{4,}")
+
+
+def split_sections(text: str) -> List[str]:
+    """Split a synthesis into paragraph sections, keeping headings with their body"""
+    sections: List[str] = []
+    pending_heading = ""
+    for block in _PARAGRAPH_BREAK.split(text.strip()):
+        block = block.strip()
+        if not block:
+            continue
+        is_heading = "\n" not in block and (block.startswith("#") or block.endswith(":"))
+        if is_heading:
+            pending_heading = f"{pending_heading}\n{block}".strip()
+            continue
+        sections.append(f"{pending_heading}\n{block}".strip())
+        pending_heading = ""
+    if pending_heading:
+        sections.append(pending_heading)
+    return sections
+
+
+@dataclass
+class RevisionState:
+    """A synthesis under review, held as independently revisable sections"""
+    sections: List[str]
+    started_at: float = field(default_factory=time.monotonic)
+    rounds: int = 0
+    last_revised: List[int] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(self.sections)
+
+    def numbered(self, indices: Optional[List[int]] = None) -> str:
+        """Render sections with [n] tags (1-based) for the critic and reviser"""
+        if indices is None:
+            indices = list(range(len(self.sections)))
+        return "\n\n".join(f"[{i + 1}] {self.sections[i]}" for i in indices)
+
+
+class RevisionEngine:
+    """
+    Bounded revision loop.
+
+    config.yaml:
+        revision:
+          max_rounds: 2                # Revision rounds after the first review
+          latency_budget_seconds: 30   # Total time allowed from first synthesis
+    """
+
+    def __init__(self, config: Optional[dict] = None):
+        config = config or {}
+        self.max_rounds = config.get("max_rounds", 2)
+        self.latency_budget = config.get("latency_budget_seconds", 30.0)
+
+    def start(self, synthesis: str) -> RevisionState:
+        return RevisionState(sections=split_sections(synthesis) or [synthesis])
+
+    def can_revise(self, state: RevisionState) -> bool:
+        """Whether another round fits in the round and latency budgets"""
+        elapsed = time.monotonic() - state.started_at
+        return state.rounds < self.max_rounds and elapsed < self.latency_budget
+
+    def affected_sections(self, state: RevisionState, issues: str) -> List[int]:
+        """
+        Sections the critic's issues refer to.
+
+        Explicit [n] tags win; otherwise pick the sections sharing the most
+        words with the issue text (the whole synthesis only as a last resort).
+        """
+        tagged = sorted({
+            int(n) - 1 for n in re.findall(r"\[(\d+)\]", issues)
+            if 0 < int(n) <= len(state.sections)
+        })
+        if tagged:
+            return tagged
+
+        issue_words = set(_WORD.findall(issues.lower()))
+        overlaps = [
+            len(issue_words & set(_WORD.findall(section.lower())))
+            for section in state.sections
+        ]
+        best = max(overlaps, default=0)
+        if best == 0:
+            return list(range(len(state.sections)))
+        return [i for i, overlap in enumerate(overlaps) if overlap == best]
+
+    def build_prompt(self, state: RevisionState, issues: str, indices: List[int]) -> str:
+        return REVISION_PROMPT.render(issues=issues, sections=state.numbered(indices))
+
+    def apply(self, state: RevisionState, indices: List[int], revised: str) -> List[int]:
+        """Patch revised sections into the state; unchanged sections are kept as-is"""
+        patches = _parse_tagged(revised)
+        if not patches and len(indices) == 1:
+            patches = {indices[0]: revised.strip()}
+
+        changed = []
+        for i in indices:
+            new_text = patches.get(i)
+            if new_text and new_text != state.sections[i]:
+                state.sections[i] = new_text
+                changed.append(i)
+
+        state.rounds += 1
+        state.last_revised = changed
+        return changed
+
+
+def _parse_tagged(text: str) -> Dict[int, str]:
+    """Parse '[n] text' blocks into {index: text}"""
+    matches = list(_SECTION_TAG.finditer(text))
+    patches = {}
+    for k, match in enumerate(matches):
+        end = matches[k + 1].start() if k + 1 < len(matches) else len(text)
+        patches[int(match.group(1)) - 1] = text[match.end():end].strip()
+    return patches
@@ -4,10 +4,16 @@ NeuroFabric cognitive router - orchestrates multi-agent collaboration
 
 import asyncio
 import re
+import time
 from typing import List, Dict, Any, Optional
-from core.message import MessageBus, Message, Performative
+from core.message import MessageBus, Message, Performative, preview
 from core.agent_base import Agent, load_agent_config
+from core.blob_store import configure_blob_store
+from core import checkpoint
+from core.checkpoint import configure_checkpoints
 from core.logger import get_logger
+from core.tracing import configure_tracer, SPAN_KIND_SERVER
+from core.instrumentation import LoopMonitor
 
 
 class NeuroFabric:
@@ -21,7 +27,12 @@ class NeuroFabric:
         self.message_bus = MessageBus()
         self.agents: Dict[str, Agent] = {}
         self.tasks: List[asyncio.Task] = []
-        self.result_queue: asyncio.Queue = asyncio.Queue()
+        self.pending: Dict[str, asyncio.Future] = {}  # Request message_id -> final result
+        self.resumed: Dict[str, asyncio.Future] = {}  # Tasks recovered from the checkpoint log
+        self.tracer = configure_tracer(self.config.get("tracing"))
+        self.blobs = configure_blob_store(self.config.get("blobs"))
+        self.checkpoints = configure_checkpoints(self.config.get("checkpoints"))
+        self.monitor = LoopMonitor(self.config.get("instrumentation"))
         
         # Register fabric as a special subscriber for final results
         self.message_bus.subscribe("fabric", self._receive_result)
@@ -35,12 +46,60 @@ class NeuroFabric:
     async def start(self):
         """Start all agents"""
         logger = get_logger()
+        self.monitor.install()
         
         for agent in self.agents.values():
             task = asyncio.create_task(agent.run())
             self.tasks.append(task)
         
         logger.log_workflow("fabric", "FABRIC_STARTED", f"{len(self.agents)} agents active")
+        await self.resume()
+    
+    async def resume(self):
+        """Resume tasks left unfinished in the checkpoint log from their last completed stage"""
+        logger = get_logger()
+        self.checkpoints.compact()
+        
+        for task_id, cp in self.checkpoints.unfinished().items():
+            reason = self.checkpoints.exhausted(cp)
+            if reason:
+                logger.log_error("fabric", f"Abandoning task {task_id[:8]} at stage {cp.stage}: {reason}")
+                self.checkpoints.record(task_id, checkpoint.ABANDONED, reason=reason)
+                continue
+            logger.log_workflow("fabric", "RESUME_TASK", f"{task_id[:8]} from stage: {cp.stage}")
+            self.checkpoints.record(task_id, checkpoint.RESUMED)
+            future = asyncio.get_running_loop().create_future()
+            future.add_done_callback(
+                lambda f, task_id=task_id: logger.log_workflow(
+                    "fabric", "RESUMED_RESULT", f"{task_id[:8]}: {preview(f.result())}"
+                )
+            )
+            self.pending[task_id] = future
+            self.resumed[task_id] = future
+            
+            if cp.stage == checkpoint.REQUEST:
+                # Nothing was routed yet: replay the request (without its old deadline)
+                await self.message_bus.publish(Message(
+                    message_id=task_id,
+                    performative=Performative.REQUEST,
+                    sender="fabric",
+                    receiver="coordinator",
+                    content=cp.request,
+                    summary="Resumed task request"
+                ))
+            elif cp.stage == checkpoint.SYNTHESIS:
+                await self.agents["analyst"].resume(task_id, cp)
+            else:
+                await self.agents["coordinator"].resume(task_id, cp)
+    
+    async def resumed_results(self, timeout: float = 90.0) -> Dict[str, Optional[str]]:
+        """Wait for the tasks resumed at startup; task id -> result (None if not finished in time)"""
+        if self.resumed:
+            await asyncio.wait(list(self.resumed.values()), timeout=timeout)
+        return {
+            task_id: future.result() if future.done() and not future.cancelled() else None
+            for task_id, future in self.resumed.items()
+        }
     
     async def stop(self):
         """Stop all agents"""
@@ -49,6 +108,9 @@ class NeuroFabric:
         for task in self.tasks:
             task.cancel()
         await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tracer.flush()
+        self.checkpoints.close()
+        await self.monitor.uninstall()
         
         logger.log_workflow("fabric", "FABRIC_STOPPED", "All agents stopped")
     
@@ -56,10 +118,13 @@ class NeuroFabric:
         """Callback to receive final results from agents"""
         logger = get_logger()
         
-        # Only queue INFORM messages (final results), ignore CONFIRM (acknowledgments)
+        # Only deliver INFORM messages (final results), ignore CONFIRM (acknowledgments)
         if message.performative == Performative.INFORM:
             logger.log_workflow("fabric", "RESULT_RECEIVED", f"From: {message.sender}")
-            await self.result_queue.put(message)
+            self.checkpoints.record(message.reply_to, checkpoint.DONE)
+            future = self.pending.pop(message.reply_to, None)
+            if future and not future.done():
+                future.set_result(message.content)
     
     async def process(self, user_input: str, timeout: float = 90.0) -> str:
         """
@@ -75,27 +140,40 @@ class NeuroFabric:
         logger = get_logger()
         logger.log_workflow("fabric", "PROCESS_START", f"Timeout: {timeout}s")
         
-        # Send initial request to Coordinator
-        await self.message_bus.publish(Message(
-            performative=Performative.REQUEST,
-            sender="fabric",
-            receiver="coordinator",
-            content=user_input,
-            summary="User task request"
-        ))
-        
-        # Wait for final response (with timeout)
-        try:
-            result_message = await asyncio.wait_for(
-                self.result_queue.get(),
-                timeout=timeout
+        with self.tracer.span("fabric.process", kind=SPAN_KIND_SERVER, input_length=len(user_input)) as span:
+            trace_id, span_id = self.tracer.context()
+            
+            request = Message(
+                performative=Performative.REQUEST,
+                sender="fabric",
+                receiver="coordinator",
+                content=user_input,
+                summary="User task request",
+                metadata={"deadline": time.time() + timeout},  # Lets agents trade depth for speed
+                trace_id=trace_id,
+                parent_span_id=span_id
             )
-            logger.log_workflow("fabric", "PROCESS_COMPLETE", "Result received")
-            return result_message.content
-                
-        except asyncio.TimeoutError:
-            logger.log_error("fabric", f"Processing timeout after {timeout}s")
-            return "Processing timeout - cognitive network took too long"
+            
+            # Results are matched to their request, so a late answer never reaches another task
+            result = asyncio.get_running_loop().create_future()
+            self.pending[request.message_id] = result
+            self.checkpoints.record(request.message_id, checkpoint.REQUEST, content=user_input)
+            
+            # Send initial request to Coordinator
+            await self.message_bus.publish(request)
+            
+            # Wait for final response (with timeout)
+            try:
+                content = await asyncio.wait_for(result, timeout=timeout)
+                logger.log_workflow("fabric", "PROCESS_COMPLETE", "Result received")
+                return content
+                    
+            except asyncio.TimeoutError:
+                self.pending.pop(request.message_id, None)
+                logger.log_error("fabric", f"Processing timeout after {timeout}s")
+                if span:
+                    span.error = f"Timeout after {timeout}s"
+                return "Processing timeout - cognitive network took too long"
 
 
 class SimpleRouter:
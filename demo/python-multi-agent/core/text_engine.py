@@ -0,0 +1,327 @@
+"""
+Local text engine for NeuroFabric
+Lexicon sentiment, keywords, extractive summaries and ratings over batches of documents, without an LLM
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+import numpy as np
+from core.math_engine import extract_ratings, format_number
+
+# Polarity lexicon (VADER-style valences, -3..3)
+LEXICON: dict[str, float] = {
+    # Positive
+    "amazing": 2.8, "awesome": 3.0, "beautiful": 2.6, "best": 3.0, "better": 1.9, "brilliant": 2.8,
+    "comfortable": 1.8, "delighted": 2.8, "durable": 1.5, "easy": 1.5, "effective": 1.8,
+    "efficient": 1.8, "enjoy": 2.2, "enjoyed": 2.2, "excellent": 2.7, "exceptional": 2.7,
+    "fantastic": 2.6, "fast": 1.2, "favorite": 2.0, "fine": 0.8, "friendly": 2.2, "glad": 2.0,
+    "good": 1.9, "great": 3.1, "happy": 2.7, "helpful": 1.9, "impressed": 2.2, "impressive": 2.3,
+    "love": 3.2, "loved": 2.9, "lovely": 2.8, "nice": 1.8, "outstanding": 3.0, "perfect": 2.7,
+    "pleasant": 2.3, "pleased": 2.2, "quick": 1.0, "recommend": 1.5, "reliable": 1.8,
+    "satisfied": 1.8, "smooth": 1.2, "solid": 1.3, "superb": 3.1, "useful": 1.6, "value": 0.8,
+    "well": 1.1, "wonderful": 2.7, "worth": 1.2, "decent": 0.9, "affordable": 1.4, "responsive": 1.4,
+    # Negative
+    "angry": -2.3, "annoying": -1.9, "awful": -2.0, "bad": -2.5, "broken": -2.1, "buggy": -1.8,
+    "cheap": -0.6, "complicated": -1.0, "confusing": -1.3, "defective": -2.0, "difficult": -1.3,
+    "disappointed": -1.9, "disappointing": -2.2, "expensive": -1.1, "fail": -2.3, "failed": -2.3,
+    "faulty": -1.8, "flimsy": -1.5, "frustrated": -2.2, "frustrating": -2.2, "hate": -2.7,
+    "horrible": -2.5, "junk": -2.1, "lacking": -1.2, "late": -1.0, "mediocre": -1.0, "poor": -2.1,
+    "overpriced": -1.6, "problem": -1.7, "problems": -1.7, "refund": -1.0, "regret": -2.0,
+    "rude": -2.0, "sad": -2.1, "slow": -1.3, "terrible": -2.1, "unhappy": -1.8, "unreliable": -1.9,
+    "useless": -1.8, "waste": -1.8, "worse": -2.1, "worst": -3.1, "wrong": -2.1, "issue": -1.0,
+    "issues": -1.0, "damaged": -1.9, "delayed": -1.1, "unusable": -2.2, "dissatisfied": -1.9,
+}
+_NEGATORS = {"not", "no", "never", "none", "nothing", "neither", "nor", "hardly", "without",
+             "isn't", "wasn't", "aren't", "don't", "doesn't", "didn't", "won't", "can't", "couldn't"}
+_BOOSTERS = {"very": 1.5, "really": 1.4, "extremely": 1.7, "so": 1.3, "super": 1.5, "highly": 1.5,
+             "incredibly": 1.7, "totally": 1.4, "slightly": 0.5, "somewhat": 0.6, "fairly": 0.8,
+             "barely": 0.4, "quite": 1.2}
+_CONTRAST = {"but", "however", "although", "though"}
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have
+having he her here hers herself him himself his how i if in into is it its itself just me more most
+my myself no nor not now of off on once only or other our ours ourselves out over own same she should
+so some such than that the their theirs them themselves then there these they this those through to
+too under until up very was we were what when where which while who whom why will with would you your
+yours yourself yourselves also get got one really much many even still rating ratings review reviews
+""".split())
+
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+(?=[\"'A-Z0-9])")
+_LIST_ITEM = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s+(.+?)\s*$", re.MULTILINE)
+_QUOTED = re.compile(r"\"([^\"]{3,})\"|“([^”]{3,})”")
+_COLON = re.compile(r":\s+")
+
+# Request intents the engine can serve
+INTENTS: dict[str, re.Pattern] = {
+    "sentiment": re.compile(r"\b(sentiment|tone|mood|feel\w*|opinions?|positive|negative|satisf\w*)\b", re.I),
+    "summary": re.compile(r"\b(summar\w*|tl;?dr|gist|overview|condense|key points|main points)\b", re.I),
+    "keywords": re.compile(r"\b(keywords?|key terms|key phrases|themes?|topics?|recurring)\b", re.I),
+    "ratings": re.compile(r"\b(ratings?|stars?|scores?)\b", re.I),
+}
+# Requests that need generated prose rather than analytics
+_GENERATIVE = re.compile(
+    r"\b(write|draft|compose|rewrite|rephrase|paraphrase|translate|generate|create|reply|respond|"
+    r"email|letter|poem|story|slogan|persuasive|explain why|improve)\b",
+    re.I,
+)
+# Questions about the world rather than about text the request supplies
+_KNOWLEDGE = re.compile(
+    r"\b(explain\w*|describe|defin\w+|meaning|history|historical|who|why|"
+    r"how (?:do|does|did|can|could|would|is|are)|tell me about)\b",
+    re.I,
+)
+
+# Neutral band for the compound score
+NEUTRAL_BAND = 0.05
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-case word tokens (apostrophe contractions kept)"""
+    return _TOKEN.findall(text.lower().replace("’", "'"))
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into sentences"""
+    return [s.strip() for s in _SENTENCE.split(text.strip()) if s.strip()]
+
+
+def split_payload(text: str) -> tuple[str, list[str]]:
+    """
+    Split a request into its instruction and the text it supplies.
+
+    The supplied documents are list items (two or more), quoted passages,
+    or the text after a colon. A request without any, such as "Summarize
+    the plot of Hamlet", returns no documents.
+
+    Returns:
+        The instruction and the documents
+    """
+    items = _LIST_ITEM.findall(text)
+    if len(items) >= 2:
+        return _LIST_ITEM.sub(" ", text).strip(), [m.strip().strip("\"“”") for m in items]
+    quoted = [a or b for a, b in _QUOTED.findall(text)]
+    if quoted and (len(quoted) >= 2 or len(quoted[0].split()) >= 3):
+        return _QUOTED.sub(" ", text).strip(), quoted
+    for colon in _COLON.finditer(text):
+        head, tail = text[:colon.start()], text[colon.end():]
+        if len(head) >= 300:
+            break
+        if len(tail.split()) >= 3:
+            return head.strip(), [tail.strip()]
+    return text.strip(), []
+
+
+def split_documents(text: str) -> list[str]:
+    """
+    Documents in a request (see ``split_payload``), or the whole request
+    as one document when it supplies none.
+    """
+    return split_payload(text)[1] or [text.strip()]
+
+
+def detect_intents(text: str) -> set[str]:
+    """Analytics the request asks for"""
+    return {name for name, pattern in INTENTS.items() if pattern.search(text)}
+
+
+def is_generative(text: str) -> bool:
+    """Whether the request asks for written output the engine can't produce"""
+    return bool(_GENERATIVE.search(text))
+
+
+def is_knowledge_question(instruction: str) -> bool:
+    """Whether an instruction asks about the world (explain, history, ...) rather than supplied text"""
+    return bool(_KNOWLEDGE.search(instruction))
+
+
+class TermMatrix:
+    """
+    Sparse document-term matrix of a batch of documents.
+
+    Stored as CSR-style parallel arrays over token occurrences
+    (``doc_ids``, ``term_ids``), so per-document and per-term aggregates are
+    single ``np.bincount`` calls.
+    """
+
+    def __init__(self, documents: list[str]):
+        """Tokenize and index a batch of documents"""
+        self.documents = documents
+        tokens = [tokenize(doc) for doc in documents]
+        self.lengths = np.fromiter((len(t) for t in tokens), dtype=np.int64, count=len(tokens))
+        flat = [token for doc_tokens in tokens for token in doc_tokens]
+        vocabulary, self.term_ids = np.unique(np.asarray(flat, dtype=object), return_inverse=True)
+        self.vocabulary: list[str] = [str(term) for term in vocabulary]
+        self.term_ids = self.term_ids.astype(np.int64)
+        self.doc_ids = np.repeat(np.arange(len(documents)), self.lengths)
+        self.indptr = np.concatenate([[0], np.cumsum(self.lengths)])
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.documents), len(self.vocabulary)
+
+    def term_mask(self, terms) -> np.ndarray:
+        """Per-occurrence mask of tokens belonging to ``terms``"""
+        in_set = np.fromiter((term in terms for term in self.vocabulary), dtype=bool, count=len(self.vocabulary))
+        return in_set[self.term_ids] if self.term_ids.size else np.zeros(0, dtype=bool)
+
+    def term_values(self, table: dict[str, float], default: float = 0.0) -> np.ndarray:
+        """Per-occurrence values looked up from a term table"""
+        values = np.fromiter((table.get(t, default) for t in self.vocabulary), dtype=float, count=len(self.vocabulary))
+        return values[self.term_ids] if self.term_ids.size else np.zeros(0)
+
+    def tfidf(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        TF-IDF weights as sparse ``(doc, term, weight)`` entries, L2-normalized
+        per document.
+        """
+        n_docs, n_terms = self.shape
+        keys, tf = np.unique(self.doc_ids * n_terms + self.term_ids, return_counts=True)
+        docs, terms = keys // n_terms, keys % n_terms
+        df = np.bincount(terms, minlength=n_terms)
+        weights = tf * (np.log((1 + n_docs) / (1 + df)) + 1)[terms]
+        norms = np.sqrt(np.bincount(docs, weights=weights * weights, minlength=n_docs))
+        return docs, terms, weights / norms[docs]
+
+    def stopword_mask(self) -> np.ndarray:
+        """Per-term mask of stopwords and very short terms"""
+        return np.fromiter(
+            (t in STOPWORDS or len(t) < 3 for t in self.vocabulary), dtype=bool, count=len(self.vocabulary)
+        )
+
+    def same_doc_shift(self, values: np.ndarray, k: int, fill) -> np.ndarray:
+        """``values`` shifted right by ``k`` tokens, with ``fill`` across document starts"""
+        shifted = np.full_like(values, fill)
+        if values.size > k:
+            shifted[k:] = values[:-k]
+            crosses = np.zeros(values.size, dtype=bool)
+            crosses[k:] = self.doc_ids[k:] != self.doc_ids[:-k]
+            shifted[crosses] = fill
+        return shifted
+
+
+def sentiment_scores(matrix: TermMatrix) -> np.ndarray:
+    """
+    Compound sentiment per document in [-1, 1].
+
+    Lexicon valences are flipped by a negator up to two tokens before,
+    scaled by a booster just before, and clauses after a contrast word
+    ("but", "however") weigh 1.5× while the clause before weighs 0.5×.
+    """
+    n_docs = len(matrix.documents)
+    if not matrix.term_ids.size:
+        return np.zeros(n_docs)
+    valence = matrix.term_values(LEXICON)
+    negated = matrix.term_mask(_NEGATORS)
+    flips = np.where(
+        matrix.same_doc_shift(negated, 1, False) | matrix.same_doc_shift(negated, 2, False), -0.74, 1.0
+    )
+    boost = matrix.same_doc_shift(matrix.term_values(_BOOSTERS, 1.0), 1, 1.0)
+
+    contrast = matrix.term_mask(_CONTRAST).astype(np.int64)
+    running = np.concatenate([[0], np.cumsum(contrast)])
+    seen = running[1:] - running[matrix.indptr[:-1]][matrix.doc_ids]  # Contrast words so far in this document
+    has_contrast = np.bincount(matrix.doc_ids, weights=contrast, minlength=n_docs)[matrix.doc_ids] > 0
+    clause = np.where(has_contrast, np.where(seen > 0, 1.5, 0.5), 1.0)
+
+    raw = np.bincount(matrix.doc_ids, weights=valence * flips * boost * clause, minlength=n_docs)
+    return raw / np.sqrt(raw * raw + 15.0)
+
+
+def label(score: float) -> str:
+    """Sentiment label for a compound score"""
+    if score >= NEUTRAL_BAND:
+        return "positive"
+    if score <= -NEUTRAL_BAND:
+        return "negative"
+    return "neutral"
+
+
+def keywords(matrix: TermMatrix, top: int = 8) -> list[tuple[str, float]]:
+    """Highest summed TF-IDF terms across the batch, stopwords excluded"""
+    if not matrix.term_ids.size:
+        return []
+    _, terms, weights = matrix.tfidf()
+    scores = np.bincount(terms, weights=weights, minlength=len(matrix.vocabulary))
+    scores[matrix.stopword_mask()] = 0.0
+    order = [i for i in np.argsort(-scores)[:top] if scores[i] > 0]
+    return [(matrix.vocabulary[i], float(scores[i])) for i in order]
+
+
+def summarize(text: str, sentences: int = 3) -> list[str]:
+    """Extractive summary: sentences closest to the text's TF-IDF centroid, in original order"""
+    candidates = split_sentences(text)
+    if len(candidates) <= sentences:
+        return candidates
+    matrix = TermMatrix(candidates)
+    docs, terms, weights = matrix.tfidf()
+    weights = np.where(matrix.stopword_mask()[terms], 0.0, weights)
+    centroid = np.bincount(terms, weights=weights, minlength=len(matrix.vocabulary)) / len(candidates)
+    scores = np.bincount(docs, weights=weights * centroid[terms], minlength=len(candidates))
+    chosen = np.sort(np.argsort(-scores)[:sentences])
+    return [candidates[i] for i in chosen]
+
+
+@dataclass
+class TextAnalysis:
+    """Result of local text analytics over a batch of documents"""
+    documents: list[str]
+    intents: set[str]
+    sentiment: Optional[np.ndarray] = None
+    keywords: list[tuple[str, float]] = field(default_factory=list)
+    summary: list[str] = field(default_factory=list)
+    ratings: list[float] = field(default_factory=list)
+    rating_scale: Optional[int] = None
+
+    def to_text(self) -> str:
+        """Human-readable report"""
+        lines = []
+        if self.sentiment is not None:
+            labels = [label(s) for s in self.sentiment]
+            counts = ", ".join(f"{labels.count(name)} {name}" for name in ("positive", "neutral", "negative"))
+            overall = float(self.sentiment.mean())
+            lines.append(
+                f"Sentiment ({len(self.documents)} document{'s' if len(self.documents) != 1 else ''}): "
+                f"{counts}; overall {label(overall)} ({overall:+.2f})"
+            )
+            if len(self.documents) > 1:
+                for i, (doc, score) in enumerate(zip(self.documents, self.sentiment), 1):
+                    excerpt = doc if len(doc) <= 80 else doc[:77] + "..."
+                    lines.append(f"{i}. {label(score)} ({score:+.2f}): {excerpt}")
+        if self.ratings:
+            scale = f" / {self.rating_scale}" if self.rating_scale else ""
+            mean = sum(self.ratings) / len(self.ratings)
+            values = ", ".join(format_number(r) for r in self.ratings)
+            lines.append(f"Ratings: {values} (mean {format_number(mean)}{scale})")
+        if self.keywords:
+            lines.append("Key terms: " + ", ".join(term for term, _ in self.keywords))
+        if self.summary:
+            lines.append("Summary: " + " ".join(self.summary))
+        return "\n".join(lines)
+
+
+def analyze(text: str, intents: Optional[set[str]] = None, summary_sentences: int = 3) -> TextAnalysis:
+    """
+    Run the requested analytics over the documents in ``text``.
+
+    Args:
+        text: Request containing the documents
+        intents: Analytics to run (detected from the request if omitted)
+        summary_sentences: Sentences in an extractive summary
+    """
+    intents = detect_intents(text) if intents is None else intents
+    documents = split_documents(text)
+    matrix = TermMatrix(documents)
+    result = TextAnalysis(documents=documents, intents=intents)
+    # Sentiment is cheap and almost always useful context for reviews
+    if "sentiment" in intents or "ratings" in intents:
+        result.sentiment = sentiment_scores(matrix)
+    if "keywords" in intents or len(documents) > 1:
+        result.keywords = keywords(matrix)
+    if "summary" in intents:
+        result.summary = summarize(" ".join(documents), summary_sentences)
+    ratings, scale = extract_ratings(text)
+    result.ratings, result.rating_scale = ratings, scale
+    return result
@@ -0,0 +1,132 @@
+"""
+Token budgeting for NeuroFabric prompts
+Keeps multi-section prompts (e.g. synthesis requests) inside a per-model context budget
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from litellm import token_counter
+
+
+TRUNCATION_MARKER = " …[truncated]"
+DEFAULT_BUDGET = 4000
+TOKEN_CACHE_SIZE = 4096     # Token counts remembered, keyed by content hash
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n")
+_token_counts: "OrderedDict[tuple, int]" = OrderedDict()
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Count tokens with the model's tokenizer (cached by content hash, not by the text itself)"""
+    if not text:
+        return 0
+    key = (hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest(), model)
+    count = _token_counts.get(key)
+    if count is not None:
+        _token_counts.move_to_end(key)
+        return count
+    count = token_counter(model=model, text=text)
+    _token_counts[key] = count
+    while len(_token_counts) > TOKEN_CACHE_SIZE:
+        _token_counts.popitem(last=False)
+    return count
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """Truncate text to a token limit, preferring sentence boundaries"""
+    total = count_tokens(text, model)
+    if total <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    
+    # Proportional cut, then trim until it fits
+    limit = max(max_tokens - count_tokens(TRUNCATION_MARKER, model), 1)
+    head = text[:int(len(text) * limit / total)]
+    while head and count_tokens(head, model) > limit:
+        head = head[:int(len(head) * 0.9)]
+    
+    boundaries = [m.start() for m in _SENTENCE_END.finditer(head)]
+    if boundaries and boundaries[-1] > len(head) // 2:
+        head = head[:boundaries[-1]]
+    
+    return head.rstrip() + TRUNCATION_MARKER
+
+
+@dataclass
+class PromptSection:
+    """A named piece of prompt content with a retention priority"""
+    name: str
+    content: str
+    priority: int = 0       # Higher priority content is kept longer
+    min_tokens: int = 0
+
+
+class TokenBudget:
+    """
+    Allocates a per-model context budget across prompt sections.
+    
+    Lowest-priority sections are truncated first; sections sharing a priority
+    shrink together, largest first. ``min_tokens`` floors give way before a
+    higher-priority section is cut, so the request is only truncated when it
+    alone exceeds the budget.
+    """
+    
+    def __init__(self, model: str, budgets: Optional[Dict[str, int]] = None,
+                 limit: Optional[int] = None, reserve: int = 0):
+        self.model = model
+        budgets = budgets or {}
+        if limit is None:
+            limit = budgets.get(model, budgets.get("default", DEFAULT_BUDGET))
+        self.limit = max(limit - reserve, 0)
+    
+    def fit(self, sections: List[PromptSection]) -> Dict[str, str]:
+        """Return section contents truncated to fit the budget"""
+        sizes = {s.name: count_tokens(s.content, self.model) for s in sections}
+        overflow = sum(sizes.values()) - self.limit
+        allowed = dict(sizes)
+        
+        lower: List[List[PromptSection]] = []
+        for priority in sorted({s.priority for s in sections}):
+            # Lower-priority floors give way, lowest first, before this priority is cut
+            for lower_group in lower:
+                if overflow <= 0:
+                    break
+                overflow -= _shrink(lower_group, allowed, overflow, keep_floors=False)
+            if overflow <= 0:
+                break
+            group = [s for s in sections if s.priority == priority]
+            overflow -= _shrink(group, allowed, overflow, keep_floors=True)
+            lower.append(group)
+        
+        return {
+            s.name: s.content if allowed[s.name] >= sizes[s.name]
+            else truncate_to_tokens(s.content, allowed[s.name], self.model)
+            for s in sections
+        }
+
+
+def _shrink(group: List[PromptSection], allowed: Dict[str, int], overflow: int, keep_floors: bool) -> int:
+    """Lower the group's allowances by up to overflow tokens; returns tokens freed"""
+    total = sum(allowed[s.name] for s in group)
+    floors = {s.name: min(s.min_tokens, allowed[s.name]) if keep_floors else 0 for s in group}
+    cap = _water_level([allowed[s.name] for s in group], max(total - overflow, sum(floors.values())))
+    for s in group:
+        allowed[s.name] = max(min(allowed[s.name], cap), floors[s.name])
+    return total - sum(allowed[s.name] for s in group)
+
+
+def _water_level(sizes: List[int], target: int) -> int:
+    """Largest per-item cap such that the capped sizes sum to at most target"""
+    remaining = target
+    ordered = sorted(sizes)
+    for i, size in enumerate(ordered):
+        share = remaining // (len(ordered) - i)
+        if size > share:
+            return share
+        remaining -= size
+    return ordered[-1] if ordered else 0
@@ -0,0 +1,216 @@
+"""
+Distributed tracing for NeuroFabric
+Spans follow a task across agent hops and are exported as OTLP/JSON
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional, Tuple
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+SPAN_KIND_CONSUMER = 5
+
+# (trace_id, span_id) carried by messages
+TraceContext = Tuple[Optional[str], Optional[str]]
+
+
+@dataclass
+class Span:
+    """One timed operation within a trace"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    kind: int = SPAN_KIND_INTERNAL
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    attributes: dict = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set(self, **attributes: Any):
+        """Add attributes"""
+        self.attributes.update(attributes)
+
+    def to_otlp(self) -> dict:
+        """OTLP/JSON span"""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_attribute(k, v) for k, v in self.attributes.items() if v is not None],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def _attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class Tracer:
+    """
+    Creates spans and exports finished ones in batches
+
+    The current span is a context variable, so it follows awaits within an
+    agent. Across the message bus the context travels on the Message itself
+    (trace_id, parent_span_id).
+
+    config.yaml:
+        tracing:
+          enabled: false
+          service_name: neurofabric-mvp
+          export_path: traces.jsonl     # One OTLP/JSON payload per line
+          endpoint: null                # e.g. http://localhost:4318/v1/traces
+    """
+
+    def __init__(self, config: Optional[dict] = None):
+        config = config or {}
+        self.service_name = config.get("service_name", "neurofabric-mvp")
+        self.export_path = config.get("export_path", "traces.jsonl")
+        self.endpoint = config.get("endpoint")
+        self.enabled = bool(config.get("enabled", False)) and bool(self.export_path or self.endpoint)
+        self.batch_size = config.get("batch_size", 256)
+        self._current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+        self._finished = []
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[Span]:
+        """Span active in this context, if any"""
+        return self._current.get()
+
+    def context(self) -> TraceContext:
+        """(trace_id, span_id) of the current span, for outgoing messages"""
+        span = self._current.get()
+        return (span.trace_id, span.span_id) if span else (None, None)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        parent: Optional[TraceContext] = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        **attributes: Any
+    ) -> Iterator[Optional[Span]]:
+        """Time the enclosed block; yields None when tracing is off"""
+        if not self.enabled:
+            yield None
+            return
+
+        span = self._start(name, parent, kind, attributes)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._current.reset(token)
+            self._finish(span)
+
+    def record(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        parent: Optional[TraceContext] = None,
+        **attributes: Any
+    ):
+        """Record an interval that already elapsed, e.g. time spent in an inbox"""
+        if not self.enabled:
+            return
+        span = self._start(name, parent, SPAN_KIND_INTERNAL, attributes)
+        span.start_ns = start_ns
+        self._finish(span, end_ns)
+
+    def _start(self, name: str, parent: Optional[TraceContext], kind: int, attributes: dict) -> Span:
+        trace_id, parent_id = parent if parent and parent[0] else self.context()
+        return Span(
+            name=name,
+            trace_id=trace_id or os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            parent_span_id=parent_id,
+            kind=kind,
+            attributes=attributes,
+        )
+
+    def _finish(self, span: Span, end_ns: Optional[int] = None):
+        span.end_ns = end_ns or time.time_ns()
+        self._finished.append(span)
+        if span.parent_span_id is None or len(self._finished) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Export finished spans off the event loop"""
+        if not self._finished:
+            return
+        batch, self._finished = self._finished, []
+        try:
+            asyncio.get_running_loop().run_in_executor(None, self._export, batch)
+        except RuntimeError:
+            self._export(batch)
+
+    def _export(self, spans: list):
+        body = json.dumps({
+            "resourceSpans": [{
+                "resource": {"attributes": [_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "neurofabric"},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }],
+        })
+        try:
+            if self.export_path:
+                with self._lock, open(self.export_path, "a") as f:
+                    f.write(body + "\n")
+            if self.endpoint:
+                request = urllib.request.Request(
+                    self.endpoint,
+                    data=body.encode("utf-8"),
+                    headers={"Content-Type": "application/json"},
+                )
+                urllib.request.urlopen(request, timeout=5).close()
+        except Exception as e:
+            print(f"⚠️  Trace export failed: {e}")
+
+
+# Global tracer instance
+_global_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Get global tracer (disabled until configured)"""
+    global _global_tracer
+    if _global_tracer is None:
+        _global_tracer = Tracer()
+    return _global_tracer
+
+
+def configure_tracer(config: Optional[dict]) -> Tracer:
+    """Replace global tracer from the config.yaml tracing section"""
+    global _global_tracer
+    _global_tracer = Tracer(config)
+    return _global_tracer
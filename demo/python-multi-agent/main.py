@@ -6,6 +6,7 @@ Demonstrates a 5-agent cognitive network collaborating to solve tasks.
 
 import asyncio
 import os
+import threading
 from dotenv import load_dotenv
 
 from core.message import MessageBus
@@ -41,7 +42,8 @@ async def initialize_fabric():
     analyst = Analyst(
         agent_id="analyst",
         config=config["agents"]["analyst"],
-        message_bus=message_bus
+        message_bus=message_bus,
+        fabric_config=config
     )
     
     math_specialist = SpecialistMath(
@@ -59,7 +61,8 @@ async def initialize_fabric():
     critic = SuperCritic(
         agent_id="super_critic",
         config=config["agents"]["super_critic"],
-        message_bus=message_bus
+        message_bus=message_bus,
+        fabric_config=config
     )
     
     # Register all agents
@@ -88,6 +91,10 @@ async def run_demo():
     # Give agents time to initialize
     await asyncio.sleep(1)
     
+    # Tasks recovered from the checkpoint log finish first
+    for task_id, resumed in (await fabric.resumed_results()).items():
+        print(f"\n♻️  Resumed task {task_id[:8]}:\n{resumed if resumed is not None else '(not finished)'}\n")
+    
     # Demo task: Customer review analysis
     demo_task = """
     Analyze these customer reviews and provide insights:
@@ -116,6 +123,8 @@ async def run_demo():
     
     # Print metrics summary
     logger.print_summary()
+    if fabric.monitor.enabled:
+        fabric.monitor.print_report()
 
 
 async def interactive_mode():
@@ -130,6 +139,8 @@ async def interactive_mode():
     await asyncio.sleep(1)
     
     print("Enter your tasks (or 'quit' to exit):\n")
+    if fabric.monitor.enabled:
+        print("Prefix a task with '/profile ' to sample the event loop while it runs\n")
     
     while True:
         try:
@@ -141,7 +152,18 @@ async def interactive_mode():
             if not user_input:
                 continue
             
-            result = await fabric.process(user_input, timeout=15.0)
+            if fabric.monitor.enabled and user_input.startswith("/profile "):
+                user_input = user_input[len("/profile "):]
+                done = threading.Event()
+                profile = asyncio.create_task(fabric.monitor.profile(seconds=15.0, stop=done))
+                result = await fabric.process(user_input, timeout=15.0)
+                done.set()
+                samples = await profile
+                print(f"\n🔬 Hottest frames ({sum(samples.values())} busy samples):")
+                for frame, count in samples.most_common(10):
+                    print(f"   {count:>5}  {frame}")
+            else:
+                result = await fabric.process(user_input, timeout=15.0)
             
             print(f"\n{'='*60}")
             print("🎉 RESULT:")
@@ -0,0 +1,74 @@
+"""Tests for the checkpoint log and when interrupted tasks are given up"""
+import json
+import time
+from core import checkpoint
+from core.checkpoint import CheckpointLog
+
+
+def _log(tmp_path, **config):
+    return CheckpointLog({"enabled": True, "path": str(tmp_path / "checkpoints.jsonl"), "fsync": False, **config})
+
+
+def test_replay_resumes_from_the_last_completed_stage(tmp_path):
+    log = _log(tmp_path)
+    log.record("t1", checkpoint.REQUEST, content="task")
+    log.record("t1", checkpoint.ROUTED, specialists=["math", "text"])
+    log.record("t1", checkpoint.SPECIALIST, specialist="math", content="42")
+    log.record("t2", checkpoint.REQUEST, content="other")
+    log.record("t2", checkpoint.DONE)
+    unfinished = _log(tmp_path).unfinished()
+    assert list(unfinished) == ["t1"]
+    task = unfinished["t1"]
+    assert task.stage == checkpoint.SPECIALIST
+    assert task.responses == {"math": "42"}
+    assert task.created > 0
+
+
+def test_resumes_are_counted_without_changing_the_stage(tmp_path):
+    log = _log(tmp_path)
+    log.record("t1", checkpoint.REQUEST, content="task")
+    log.record("t1", checkpoint.RESUMED)
+    log.record("t1", checkpoint.RESUMED)
+    task = log.unfinished()["t1"]
+    assert task.stage == checkpoint.REQUEST
+    assert task.attempts == 2
+
+
+def test_tasks_are_exhausted_after_max_attempts_or_max_age(tmp_path):
+    log = _log(tmp_path, max_attempts=2, max_age_s=60)
+    log.record("t1", checkpoint.REQUEST, content="task")
+    task = log.unfinished()["t1"]
+    assert log.exhausted(task) is None
+    task.attempts = 2
+    assert log.exhausted(task) == "resumed 2 times"
+    task.attempts, task.created = 0, time.time() - 120
+    assert log.exhausted(task) == "older than 60s"
+
+
+def test_abandoned_tasks_are_finished_and_compacted_away(tmp_path):
+    log = _log(tmp_path)
+    log.record("t1", checkpoint.REQUEST, content="task")
+    log.record("t1", checkpoint.ABANDONED, reason="resumed 3 times")
+    log.record("t2", checkpoint.REQUEST, content="other")
+    assert list(log.unfinished()) == ["t2"]
+    log.compact()
+    with open(log.path, encoding="utf-8") as f:
+        assert {json.loads(line)["task"] for line in f} == {"t2"}
+
+
+def test_torn_last_line_is_skipped(tmp_path):
+    log = _log(tmp_path)
+    log.record("t1", checkpoint.REQUEST, content="task")
+    log.close()
+    with open(log.path, "a", encoding="utf-8") as f:
+        f.write('{"task": "t1", "stage": "rou')
+    reopened = _log(tmp_path)
+    reopened.record("t1", checkpoint.ROUTED, specialists=["text"])
+    assert reopened.unfinished()["t1"].specialists == ["text"]
+
+
+def test_disabled_log_writes_nothing(tmp_path):
+    log = CheckpointLog({"path": str(tmp_path / "checkpoints.jsonl")})
+    log.record("t1", checkpoint.REQUEST, content="task")
+    assert not (tmp_path / "checkpoints.jsonl").exists()
+    assert log.unfinished() == {}
@@ -0,0 +1,42 @@
+"""Tests for the local math engine and when it may skip the LLM"""
+import pytest
+from core.math_engine import extract_ratings, safe_eval, solve
+
+REVENUE = "What was the total revenue growth for Q3 2023 if sales grew 15% compared to 2022?"
+DAYS = "How many days are between March 3 and April 10?"
+REVIEWS = "Average rating of these reviews: 'Great' 5/5 … 'Meh' 2/5 … 'OK' 3 out of 5"
+
+
+@pytest.mark.parametrize("request_text", [REVENUE, DAYS])
+def test_prose_numbers_and_dates_go_to_the_llm(request_text):
+    assert solve(request_text) is None
+
+
+def test_bare_ratings_count_next_to_rating_words():
+    assert extract_ratings(REVIEWS) == ([5.0, 2.0, 3.0], 5)
+    result = solve(REVIEWS)
+    assert result.complete
+    assert result.statistics["mean"] == pytest.approx(10 / 3)
+
+
+def test_operation_over_an_explicit_list_is_complete():
+    result = solve("Compute the mean and median of 12, 15, 18, 22 and 30")
+    assert result.complete
+    assert result.statistics == {"mean": 19.4, "median": 18}
+
+
+def test_embedded_arithmetic_is_narrated():
+    assert solve("What is 17 * 23 + 4?").complete
+    assert not solve("Sales went from 1200 to 1500; work out 1500 - 1200 for the board deck").complete
+
+
+@pytest.mark.parametrize("expression", ["((10**1000)**1000)**1000", "10**400"])
+def test_oversized_powers_are_rejected(expression):
+    with pytest.raises(ValueError):
+        safe_eval(expression)
+
+
+def test_large_integers_are_exact():
+    assert solve("What is 10^400?") is None
+    result = solve("What is 99999999999999999999 * 99999999999999999999999?")
+    assert result.to_text().endswith("= 9999999999999999999899900000000000000000001")
@@ -0,0 +1,71 @@
+"""Tests for the bounded section-level revision loop"""
+
+from core.revision import RevisionEngine, split_sections
+
+SYNTHESIS = """## Growth:
+
+Revenue grew 12% year over year.
+
+## Risks:
+
+Churn rose among small customers.
+
+Margins are stable."""
+
+
+def test_split_sections_keeps_headings_with_body():
+    sections = split_sections(SYNTHESIS)
+    assert sections == [
+        "## Growth:\nRevenue grew 12% year over year.",
+        "## Risks:\nChurn rose among small customers.",
+        "Margins are stable.",
+    ]
+
+
+def test_tagged_issues_select_sections():
+    engine = RevisionEngine()
+    state = engine.start(SYNTHESIS)
+    assert engine.affected_sections(state, "[2] churn figure is unsupported") == [1]
+    assert engine.affected_sections(state, "[9] out of range, [1] wrong") == [0]
+
+
+def test_untagged_issues_match_by_words():
+    engine = RevisionEngine()
+    state = engine.start(SYNTHESIS)
+    assert engine.affected_sections(state, "The revenue number needs a source") == [0]
+    assert engine.affected_sections(state, "xyz") == [0, 1, 2]
+
+
+def test_apply_patches_only_revised_sections():
+    engine = RevisionEngine()
+    state = engine.start(SYNTHESIS)
+    changed = engine.apply(state, [0, 1], "[1] Revenue grew 11%.\n\n[2] ## Risks:\nChurn rose among small customers.")
+    assert changed == [0]
+    assert state.sections[0] == "Revenue grew 11%."
+    assert state.rounds == 1
+    assert state.last_revised == [0]
+
+
+def test_untagged_reply_patches_a_single_section():
+    engine = RevisionEngine()
+    state = engine.start(SYNTHESIS)
+    assert engine.apply(state, [2], "Margins fell 1 point.") == [2]
+    assert state.text.endswith("Margins fell 1 point.")
+
+
+def test_rounds_and_latency_are_bounded():
+    engine = RevisionEngine({"max_rounds": 1, "latency_budget_seconds": 30})
+    state = engine.start(SYNTHESIS)
+    assert engine.can_revise(state)
+    engine.apply(state, [0], "[1] Revised.")
+    assert not engine.can_revise(state)
+    state = RevisionEngine({"latency_budget_seconds": 0}).start(SYNTHESIS)
+    assert not RevisionEngine({"latency_budget_seconds": 0}).can_revise(state)
+
+
+def test_prompt_lists_only_affected_sections():
+    engine = RevisionEngine()
+    state = engine.start(SYNTHESIS)
+    prompt = engine.build_prompt(state, "fix churn", [1])
+    assert "[2] ## Risks:" in prompt
+    assert "[1]" not in prompt.split("SECTIONS TO REVISE:")[1]
@@ -0,0 +1,24 @@
+"""Tests for finding the text a request supplies to the local text engine"""
+import pytest
+from core.text_engine import is_knowledge_question, split_payload
+
+
+@pytest.mark.parametrize("request_text", [
+    "Summarize the plot of Hamlet.",
+    "Give me a summary of the French revolution and its causes.",
+    "What is the sentiment of the word positive in economics?",
+])
+def test_requests_without_supplied_text_have_no_payload(request_text):
+    assert split_payload(request_text)[1] == []
+
+
+def test_list_items_quotes_and_colons_are_payloads():
+    assert split_payload("Sentiment of:\n- Great phone\n- Bad battery")[1] == ["Great phone", "Bad battery"]
+    assert split_payload('Tone of "we regret to inform you"')[1] == ["we regret to inform you"]
+    assert split_payload("Summarize this: The meeting ran long today.")[1] == ["The meeting ran long today."]
+
+
+def test_knowledge_questions_are_detected_on_the_instruction():
+    instruction, _ = split_payload("Explain the keywords in Python, like yield and async.")
+    assert is_knowledge_question(instruction)
+    assert not is_knowledge_question(split_payload("Keywords of: alpha beta gamma delta")[0])